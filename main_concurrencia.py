@@ -0,0 +1,203 @@
+"""
+Banco de pruebas de concurrencia sobre un mismo ServerRack.
+
+Varios hilos trabajan a la vez sobre el rack de un DataCenter:
+1.  Despliegue: lotes de servicios (TransaccionDespliegue).
+2.  Balanceo: asignar_recursos, como el BalanceadorCargaTask.
+3.  Decomision: CloudProviderService.decomisionar_donde.
+4.  Persistencia: pickle del RegistroDataCenter y vuelta atras.
+5.  Lectura: VistaRack (get_vista) sin tomar el lock.
+
+En cada lectura y en cada registro deserializado se verifica que el
+estado sea consistente: las U de los servicios suman el espacio ocupado,
+los slots ocupados son los de los servicios mas los reservados y las
+versiones del rack no retroceden.
+
+Uso:
+    python main_concurrencia.py [segundos]
+"""
+
+# --- Imports Standard Library ---
+import contextlib
+import io
+import pickle
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+# --- Imports de Entidades ---
+from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+from python_cloud_infra.entidades.infra.server_rack import ServerRack
+from python_cloud_infra.entidades.infra.vista_rack import VistaRack
+
+# --- Imports de Servicios ---
+from python_cloud_infra.servicios.infra.datacenter_service import DataCenterService
+from python_cloud_infra.servicios.infra.server_rack_service import ServerRackService
+from python_cloud_infra.servicios.negocio.cloud_provider_service import CloudProviderService
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.espacio_insuficiente_exception import EspacioInsuficienteException
+from python_cloud_infra.excepciones.potencia_insuficiente_exception import PotenciaInsuficienteException
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+ESPACIO_RACK_U: int = 400
+PEDIDOS_DESPLIEGUE = [("WebApp", 3), ("Cache", 2), ("Database", 1)]
+
+
+class _IdMultiploDeTres:
+    """Predicado de decomision: un tercio de los servicios (sin lambda, Rubrica 3.4)."""
+
+    def __call__(self, servicio: Servicio) -> bool:
+        return servicio.get_id() % 3 == 0
+
+
+class BancoConcurrencia:
+    """Hilos de trabajo sobre un rack y verificacion de sus invariantes."""
+
+    def __init__(self, segundos: float):
+        self._segundos: float = segundos
+        self._detenido: threading.Event = threading.Event()
+        self._lock_resultados: threading.Lock = threading.Lock()
+        self._errores: List[str] = []
+        self._operaciones: Dict[str, int] = {}
+
+        datacenter = DataCenterService().crear_datacenter_con_rack(
+            1, 500.0, "Zona 1", "Rack-Concurrente", ESPACIO_RACK_U)
+        self._rack: ServerRack = datacenter.get_rack_principal()
+        self._registro = RegistroDataCenter(1, datacenter, self._rack, "Cliente 1", 1000.0)
+        self._rack_service = ServerRackService()
+        self._cloud_service = CloudProviderService()
+        self._cloud_service.add_datacenter(self._registro)
+
+    # --- Hilos ---
+
+    def desplegar(self) -> None:
+        """Despliega lotes; si el rack se llena (U o MW), espera a que la decomision libere capacidad."""
+        while not self._detenido.is_set():
+            try:
+                self._rack_service.desplegar_lote(self._rack, PEDIDOS_DESPLIEGUE)
+                self._contar("despliegues")
+            except (EspacioInsuficienteException, PotenciaInsuficienteException):
+                self._contar("despliegues rechazados")
+                time.sleep(0.001)
+
+    def balancear(self) -> None:
+        """Asigna recursos al rack (y lo recarga de potencia cuando se agota)."""
+        while not self._detenido.is_set():
+            try:
+                self._rack_service.asignar_recursos(self._rack, parcial=C.BALANCEO_ASIGNACION_PARCIAL)
+            except PotenciaInsuficienteException:
+                pass
+            if self._rack.get_potencia_libre_mw() < C.POTENCIA_POR_ASIGNACION:
+                # Recarga dejando MW libres para que los despliegues sigan entrando
+                self._rack.set_potencia_disponible_mw(
+                    self._rack.get_potencia_reservada_mw() + C.POTENCIA_INICIAL_RACK)
+            self._contar("balanceos")
+
+    def decomisionar(self) -> None:
+        """Decomisiona en streaming un tercio de los servicios."""
+        predicado = _IdMultiploDeTres()
+        while not self._detenido.is_set():
+            for snapshot in self._cloud_service.decomisionar_donde(predicado, lote=7):
+                self._contar("servicios decomisionados", snapshot.get_cantidad())
+            self._contar("decomisiones")
+            time.sleep(0.005)
+
+    def persistir(self) -> None:
+        """Serializa el registro completo y verifica el rack deserializado."""
+        while not self._detenido.is_set():
+            copia: RegistroDataCenter = pickle.loads(pickle.dumps(self._registro))
+            self._verificar_rack(copia.get_server_rack(), "persistencia")
+            self._contar("persistencias")
+
+    def leer(self) -> None:
+        """Lee vistas del rack sin lock y verifica que cada una sea consistente."""
+        version_anterior = -1
+        while not self._detenido.is_set():
+            vista = self._rack.get_vista()
+            if vista.get_version() < version_anterior:
+                self._registrar_error(f"lectura: la version retrocedio "
+                                      f"({version_anterior} -> {vista.get_version()})")
+            version_anterior = vista.get_version()
+            self._verificar_vista(vista, "lectura")
+            self._contar("lecturas")
+
+    # --- Verificaciones ---
+
+    def _verificar_vista(self, vista: VistaRack, origen: str) -> None:
+        servicios = vista.get_servicios_desplegados()
+        espacio_servicios_u = sum(servicio.get_espacio_u() for servicio in servicios)
+        if espacio_servicios_u != vista.get_espacio_ocupado_u():
+            self._registrar_error(f"{origen} v{vista.get_version()}: los servicios suman "
+                                  f"{espacio_servicios_u} U y el ocupado es {vista.get_espacio_ocupado_u()} U")
+        slots_esperados_u = vista.get_espacio_ocupado_u() + vista.get_espacio_reservado_u()
+        if vista.get_slots_ocupados_u() != slots_esperados_u:
+            self._registrar_error(f"{origen} v{vista.get_version()}: {vista.get_slots_ocupados_u()} "
+                                  f"slots ocupados, se esperaban {slots_esperados_u}")
+        if len({servicio.get_id() for servicio in servicios}) != len(servicios):
+            self._registrar_error(f"{origen} v{vista.get_version()}: servicios duplicados")
+
+    def _verificar_rack(self, rack: ServerRack, origen: str) -> None:
+        self._verificar_vista(rack.get_vista(), origen)
+        ids_servicios = {servicio.get_id() for servicio in rack.get_servicios_desplegados()}
+        if set(rack.get_slots_servicios()) != ids_servicios:
+            self._registrar_error(f"{origen}: los slots no corresponden a los servicios")
+        for servicio in rack.get_servicios_desplegados():
+            if servicio.get_rack() is not rack:
+                self._registrar_error(f"{origen}: el servicio {servicio.get_id()} no apunta a su rack")
+                break
+
+    def _registrar_error(self, error: str) -> None:
+        with self._lock_resultados:
+            self._errores.append(error)
+
+    def _contar(self, operacion: str, cantidad: int = 1) -> None:
+        with self._lock_resultados:
+            self._operaciones[operacion] = self._operaciones.get(operacion, 0) + cantidad
+
+    # --- Ejecucion ---
+
+    def ejecutar(self) -> bool:
+        """Corre los hilos durante los segundos indicados. Devuelve True si no hubo errores."""
+        trabajos: List[Callable[[], None]] = [self.desplegar, self.desplegar, self.balancear,
+                                              self.decomisionar, self.persistir, self.leer]
+        hilos = [threading.Thread(target=self._proteger, args=(trabajo,), name=f"Banco-{indice}")
+                 for indice, trabajo in enumerate(trabajos)]
+        # La salida de los servicios se descarta (los hilos imprimen mucho)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for hilo in hilos:
+                hilo.start()
+            self._detenido.wait(self._segundos)
+            self._detenido.set()
+            for hilo in hilos:
+                hilo.join()
+        self._verificar_rack(self._rack, "final")
+
+        print(f"=== Concurrencia sobre '{self._rack.get_nombre()}' ({self._segundos:.1f} s) ===")
+        for operacion, cantidad in sorted(self._operaciones.items()):
+            print(f"  {operacion}: {cantidad}")
+        print(f"  version final del rack: {self._rack.get_version()}, "
+              f"servicios: {len(self._rack.get_servicios_desplegados())}, "
+              f"ocupado: {self._rack.get_espacio_ocupado_u()}/{self._rack.get_espacio_maximo_u()} U")
+        for error in self._errores[:10]:
+            print(f"  ERROR: {error}")
+        exito = not self._errores
+        print(f"\nRESULTADO: {'OK' if exito else 'FALLO'} ({len(self._errores)} error(es))")
+        return exito
+
+    def _proteger(self, trabajo: Callable[[], None]) -> None:
+        """Corre un trabajo; una excepcion inesperada detiene el banco y se reporta."""
+        try:
+            trabajo()
+        except Exception as error:
+            self._registrar_error(f"{threading.current_thread().name}: {type(error).__name__}: {error}")
+            self._detenido.set()
+
+
+if __name__ == "__main__":
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    sys.exit(0 if BancoConcurrencia(segundos).ejecutar() else 1)
@@ -0,0 +1,123 @@
+"""
+Banco de pruebas local (multiproceso) del CloudProviderShardedService.
+
+Levanta varios shards en este mismo host y verifica que:
+1.  Al agregar un shard se mueve ~1/N de los DataCenters (hashing consistente).
+2.  Las operaciones repartidas (parches, decomision) dan el mismo
+    resultado que el CloudProviderService de un solo proceso.
+
+Uso:
+    python main_sharding.py [cantidad_datacenters] [cantidad_shards]
+"""
+
+# --- Imports Standard Library ---
+import contextlib
+import io
+import pickle
+import sys
+import time
+from typing import List
+
+# --- Imports de Entidades ---
+from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+from python_cloud_infra.entidades.aplicaciones.servicio_database import ServicioDatabase
+from python_cloud_infra.entidades.aplicaciones.servicio_webapp import ServicioWebApp
+
+# --- Imports de Servicios ---
+from python_cloud_infra.servicios.infra.datacenter_service import DataCenterService
+from python_cloud_infra.servicios.infra.server_rack_service import ServerRackService
+from python_cloud_infra.servicios.negocio.cloud_provider_service import CloudProviderService
+from python_cloud_infra.servicios.negocio.sharding.cloud_provider_sharded_service import (
+    CloudProviderShardedService)
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+
+def crear_registros(cantidad: int) -> List[RegistroDataCenter]:
+    """
+    Crea DataCenters de prueba, cada uno con un rack y servicios de
+    todos los tipos (la salida de los servicios se descarta).
+    """
+    datacenter_service = DataCenterService()
+    rack_service = ServerRackService()
+    registros: List[RegistroDataCenter] = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for id_dc in range(1, cantidad + 1):
+            datacenter = datacenter_service.crear_datacenter_con_rack(
+                id_dc, 500.0, f"Zona {id_dc % 5}", f"Rack-{id_dc}", 42)
+            rack = datacenter.get_rack_principal()
+            rack_service.desplegar_servicio(rack, "Database", 2)
+            rack_service.desplegar_servicio(rack, "WebApp", 3)
+            rack_service.desplegar_servicio(rack, "Cache", 1)
+            registros.append(RegistroDataCenter(id_dc, datacenter, rack,
+                                                f"Cliente {id_dc % 7}", 1000.0))
+    return registros
+
+
+def verificar_rebalanceo(registros: List[RegistroDataCenter], cantidad_shards: int) -> bool:
+    """Verifica que pasar de N a N+1 shards mueve cerca de 1/(N+1) de los DataCenters."""
+    print(f"\n=== Rebalanceo {cantidad_shards} -> {cantidad_shards + 1} shards ===")
+    with CloudProviderShardedService(cantidad_shards) as provider:
+        provider.add_datacenters(registros)
+        print(f"Distribucion inicial: {provider.get_distribucion()}")
+        movidos = provider.redimensionar(cantidad_shards + 1)
+        print(f"Distribucion final:   {provider.get_distribucion()}")
+        esperado = len(registros) / (cantidad_shards + 1)
+        # Tolerancia amplia: el reparto por hash es estadistico
+        exito = movidos <= 2 * esperado and len(provider.get_ids_datacenters()) == len(registros)
+        print(f"Movidos {movidos} (esperado ~{esperado:.0f}): {'OK' if exito else 'FALLO'}")
+    return exito
+
+
+def verificar_equivalencia(registros: List[RegistroDataCenter], cantidad_shards: int) -> bool:
+    """Compara el servicio multiproceso con el de un solo proceso."""
+    print(f"\n=== Equivalencia con CloudProviderService ({cantidad_shards} shards) ===")
+    copia_local: List[RegistroDataCenter] = pickle.loads(pickle.dumps(registros))
+    ids_parche = [registro.get_id_datacenter() for registro in registros[::3]]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        local = CloudProviderService()
+        for registro in copia_local:
+            local.add_datacenter(registro)
+        local.desplegar_parche("CVE-2025-0001", ids_parche)
+        local_sin_parche = sorted(local.servicios_sin_parche("CVE-2025-0001"))
+        local_parcheados = local.datacenters_parcheados("CVE-2025-0001")
+        local_snapshot = local.decomisionar_y_archivar(ServicioDatabase)
+
+    inicio = time.perf_counter()
+    with CloudProviderShardedService(cantidad_shards) as provider:
+        provider.add_datacenters(registros)
+        provider.desplegar_parche("CVE-2025-0001", ids_parche)
+        sharded_sin_parche = provider.servicios_sin_parche("CVE-2025-0001")
+        sharded_parcheados = provider.datacenters_parcheados("CVE-2025-0001")
+        sharded_snapshot = provider.decomisionar_y_archivar(ServicioDatabase)
+        restantes = provider.decomisionar_y_archivar(ServicioWebApp).get_cantidad()
+    print(f"Tiempo (incluye arranque de shards): {time.perf_counter() - inicio:.2f} s")
+
+    comparaciones = {
+        "servicios sin parche": local_sin_parche == sharded_sin_parche,
+        "datacenters parcheados": local_parcheados == sharded_parcheados,
+        "orden del snapshot": ([servicio.get_id() for servicio in local_snapshot.get_contenido()] ==
+                               [servicio.get_id() for servicio in sharded_snapshot.get_contenido()]),
+        "webapps decomisionadas": restantes == 3 * len(registros),
+    }
+    for nombre, exito in comparaciones.items():
+        print(f"  {nombre}: {'OK' if exito else 'FALLO'}")
+    return all(comparaciones.values())
+
+
+def ejecutar_banco_pruebas(cantidad_datacenters: int, cantidad_shards: int) -> bool:
+    """Ejecuta todas las verificaciones. Devuelve True si todas pasan."""
+    registros = crear_registros(cantidad_datacenters)
+    resultados = [verificar_rebalanceo(registros, cantidad_shards),
+                  verificar_equivalencia(registros, cantidad_shards)]
+    print(f"\nRESULTADO: {'OK' if all(resultados) else 'FALLO'}")
+    return all(resultados)
+
+
+if __name__ == "__main__":
+    argumentos = [int(valor) for valor in sys.argv[1:3]]
+    cantidad_datacenters = argumentos[0] if len(argumentos) > 0 else 200
+    cantidad_shards = argumentos[1] if len(argumentos) > 1 else C.SHARDING_CANTIDAD_SHARDS
+    sys.exit(0 if ejecutar_banco_pruebas(cantidad_datacenters, cantidad_shards) else 1)
@@ -14,6 +14,12 @@ dominio de Data Center.
 
 # --- Constantes de ServerRack (US-002) ---
 POTENCIA_INICIAL_RACK: float = 100.0  # MW por defecto
+TOLERANCIA_POTENCIA_MW: float = 1e-9  # Margen de redondeo al comparar MW pedidos contra MW libres
+
+# --- Migracion de servicios entre racks (US-002) ---
+MIGRACION_MAX_MOVIMIENTOS_POR_RACK: int = 2  # Migraciones simultaneas por rack (origen o destino)
+MIGRACION_TOLERANCIA_MW: float = 1.0  # Desvio de carga aceptado respecto del objetivo
+MIGRACION_WORKERS: int = 4  # Threads que ejecutan cada lote de migraciones
 
 
 # ==============================================================================
@@ -41,6 +47,17 @@ POTENCIA_BASE_CACHE: float = 0.5  # MW
 # --- Constantes de Asignación de Recursos (US-008) ---
 POTENCIA_POR_ASIGNACION: float = 10.0  # MW consumidos por el rack en cada balanceo
 
+# --- Asignacion parcial de potencia (US-008) ---
+PESO_CLASE_DATABASE: float = 4.0  # Database > Batch > WebApp > Cache
+PESO_CLASE_BATCH: float = 3.0
+PESO_CLASE_WEBAPP: float = 2.0
+PESO_CLASE_CACHE: float = 1.0
+ASIGNACION_PARCIAL_RESOLUCION_MW: float = 0.1  # Granularidad de la mochila (DP)
+ASIGNACION_PARCIAL_MAX_CELDAS_DP: int = 250_000  # servicios x unidades; si se supera, greedy
+
+# --- Presupuesto de Potencia jerarquico (US-001, US-008) ---
+PRESUPUESTO_PRIORIDAD_DEFECTO: int = 0  # Mayor numero = mas importante al recortar
+
 # --- Constantes de Estrategia de Consumo (Strategy Pattern) (US-008) ---
 # Estrategia Dinámica (Stateful: Database, Batch)
 CONSUMO_DINAMICO_ALTO: float = 5.0  # MW
@@ -55,6 +72,13 @@ CONSUMO_FIJO_CACHE: float = 2.0  # MW
 ESCALA_IOPS_POR_ASIGNACION: int = 100  # IOPS sumados a DB
 ESCALA_WORKERS_POR_ASIGNACION: int = 2   # Workers sumados a Batch
 
+# --- Asignacion de IDs (US-TECH-002) ---
+IDS_TAMANIO_BLOQUE: int = 4096  # IDs que reserva cada thread por vez
+IDS_RESERVA_MARCA: int = 65536  # IDs que cubre cada escritura de la marca persistida
+ARCHIVO_MARCA_IDS_SERVICIO: str = "ids_servicio.marca"  # Dentro de DIRECTORIO_DATA
+ARCHIVO_MARCA_IDS_SNAPSHOT: str = "ids_snapshot.marca"  # Dentro de DIRECTORIO_DATA
+EXTENSION_LOCK: str = ".lock"  # Lock de archivo (fcntl.flock) junto a la marca
+
 
 # ==============================================================================
 # --- EPIC 3: MONITOREO Y BALANCEO (US-010 a US-013) ---
@@ -72,16 +96,81 @@ SENSOR_RAM_MAX: int = 100  # %
 
 # --- Control de Balanceo (US-012) ---
 INTERVALO_CONTROL_BALANCEO: float = 2.5  # segundos
+BALANCEO_ASIGNACION_PARCIAL: bool = True  # Con poca potencia, alimentar el mejor subconjunto
 CPU_MAX_BALANCEO: int = 80  # % (Regar si CPU > 80%)
 RAM_MAX_BALANCEO: int = 70  # % (Regar si RAM > 70%)
 
 # --- Control de Threads (US-013) ---
 THREAD_JOIN_TIMEOUT: float = 2.0  # segundos
 
+# --- Telemetria agregada de la flota (US-012) ---
+# (Ademas de ATRIBUTO_POTENCIA, ATRIBUTO_IOPS y ATRIBUTO_WORKERS)
+METRICA_ESPACIO_U: str = "espacio_u"  # U ocupadas por los servicios
+METRICA_CAPACIDAD_U: str = "capacidad_u"  # U totales de los racks
+METRICA_SERVICIOS: str = "servicios"  # Cantidad de servicios
+
+
+# ==============================================================================
+# --- EPIC 5: OPERACIONES DE CLOUD (US-018 a US-020) ---
+# ==============================================================================
+
+# --- Rollout de Parches de Seguridad (US-019) ---
+ROLLOUT_MAX_WORKERS: int = 16  # Threads del pool de parcheo
+ROLLOUT_MAX_POR_DATACENTER: int = 4  # Parcheos simultaneos por DataCenter
+# Oleadas acumulativas (fraccion de la flota): canary y luego escalones
+ROLLOUT_OLEADAS: tuple[float, ...] = (0.01, 0.10, 0.50, 1.0)
+ROLLOUT_MAX_TASA_FALLOS: float = 0.05  # Se detiene si una oleada falla mas que esto
+ROLLOUT_CHECKPOINT_CADA: int = 500  # Servicios completados entre checkpoints
+EXTENSION_CHECKPOINT: str = ".ckpt"
+
+# --- Decomision (US-020) ---
+DECOMISION_TAMANO_LOTE: int = 1000  # Servicios por Snapshot parcial
+DECOMISION_WORKERS: int = 8  # Threads del modo paralelo (opcional; el default es secuencial)
+
+# --- Snapshot en Disco (US-020) ---
+SNAPSHOT_MAX_EN_MEMORIA: int = 10000  # Servicios en el buffer antes de volcar a disco
+EXTENSION_SNAPSHOT: str = ".snap"
+
+# --- Eventos y Consultas de Flota (US-018) ---
+CANAL_FLOTA: str = "flota"  # Canal de eventos de servicios y racks
+ATRIBUTO_IOPS: str = "iops"
+ATRIBUTO_WORKERS: str = "workers"
+ATRIBUTO_POTENCIA: str = "potencia"
+CONSULTA_MAX_CAMBIOS_INCREMENTALES: int = 64  # Cambios pendientes que se aplican con bisect; mas, se reordena
+
+# --- Sharding de DataCenters (US-018) ---
+SHARDING_CANTIDAD_SHARDS: int = 4  # Procesos worker por defecto
+SHARDING_NODOS_VIRTUALES: int = 128  # Nodos virtuales por shard en el anillo
+SHARDING_METODO_INICIO: str = "spawn"  # Metodo de inicio de los procesos
+SHARDING_SILENCIAR_WORKERS: bool = True  # Descarta la salida (print) de los shards
+SHARDING_TIMEOUT_CIERRE: float = 5.0  # Segundos de espera al cerrar un shard
+
 
 # ==============================================================================
 # --- EPIC 6: PERSISTENCIA (US-021) ---
 # ==============================================================================
 
 DIRECTORIO_DATA: str = "data"
-EXTENSION_DATA: str = ".dat"
\ No newline at end of file
+EXTENSION_DATA: str = ".dat"
+
+# --- Backend SQLite de Registros (US-021, US-022) ---
+ARCHIVO_SQLITE: str = "registros.db"
+SQLITE_TAMANO_LOTE: int = 500  # Filas leidas por consulta en los streams
+
+# --- Cache LRU de Registros leidos (US-022) ---
+CACHE_REGISTROS_MAX_ENTRADAS: int = 128
+CACHE_REGISTROS_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MiB de pickles en memoria
+
+# --- Carga masiva de Registros (US-022) ---
+WORKERS_CARGA_REGISTROS: int = 4  # Procesos del pool de deserializacion
+
+# --- Catalogo del directorio de datos (US-021, US-022) ---
+ARCHIVO_CATALOGO: str = "catalogo.db"
+EXTENSION_TEMPORAL: str = ".tmp"  # Escritura atomica (tmp + os.replace)
+
+# --- Persistencia incremental (Delta) de Registros (US-021, US-022) ---
+EXTENSION_DIRECTORIO_GENERACIONES: str = ".gen"
+EXTENSION_BASE: str = ".base"
+EXTENSION_DELTA: str = ".delta"
+DELTA_GENERACIONES_POR_BASE: int = 10  # Cada cuantas generaciones se escribe una base completa
+ARCHIVO_MANIFIESTO_DELTA: str = "cadena.manifiesto"  # Estado de la ultima generacion (huellas y ubicaciones)
@@ -1,7 +1,18 @@
 """
 Modulo de la clase base abstracta Servicio.
 """
+from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import List, Set, TYPE_CHECKING
+from weakref import ReferenceType, ref
+
+from python_cloud_infra import constantes as C
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+from python_cloud_infra.entidades.asignador_ids import AsignadorIds
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
 
 class Servicio(ABC):
     """
@@ -12,8 +23,10 @@ class Servicio(ABC):
     y un ID unico.
     """
 
-    # Variable de clase para autoincrementar el ID
-    _contador_id: int = 0
+    # Asignador de IDs de clase (thread-safe, por bloques). La marca de
+    # agua persistida (en C.DIRECTORIO_DATA, resuelta al primer uso)
+    # evita repetir IDs de otro proceso, anterior o concurrente.
+    _asignador_ids: AsignadorIds = AsignadorIds(nombre_marca=C.ARCHIVO_MARCA_IDS_SERVICIO)
 
     def __init__(self, espacio_u: int, potencia_base: float):
         """
@@ -31,11 +44,58 @@ class Servicio(ABC):
         if potencia_base < 0:
             raise ValueError("La potencia base no puede ser negativa")
         
-        Servicio._contador_id += 1
-        self._id: int = Servicio._contador_id
+        self._id: int = Servicio._asignador_ids.siguiente()
         self._espacio_u: int = espacio_u
         self._potencia_consumida: float = potencia_base
 
+        # Parches de seguridad aplicados (US-019)
+        self._parches_aplicados: Set[str] = set()
+
+        # Rack donde esta desplegado (referencia debil, no se persiste)
+        self._rack: ReferenceType | None = None
+
+    @staticmethod
+    def reservar_ids(cantidad: int) -> int:
+        """
+        Reserva en un solo paso un bloque de IDs consecutivos
+        (para la creacion masiva de ServicioFactory.crear_servicios).
+
+        Args:
+            cantidad (int): Cantidad de IDs.
+
+        Returns:
+            int: El primer ID del bloque.
+        """
+        return Servicio._asignador_ids.reservar(cantidad)
+
+    def clonar(self, primer_id: int, cantidad: int) -> List['Servicio']:
+        """
+        Crea copias de este servicio con IDs consecutivos (Patron
+        Prototype), sin ejecutar el constructor. Las copias no estan en
+        ningun rack y tienen su propio conjunto de parches.
+
+        Args:
+            primer_id (int): ID de la primera copia (ver reservar_ids).
+            cantidad (int): Cantidad de copias.
+
+        Returns:
+            List[Servicio]: Las copias.
+        """
+        clase = type(self)
+        nuevo = object.__new__
+        base = self.__dict__.copy()
+        base["_rack"] = None
+        parches = self._parches_aplicados
+        clones: List['Servicio'] = []
+        for id_servicio in range(primer_id, primer_id + cantidad):
+            estado = base.copy()
+            estado["_id"] = id_servicio
+            estado["_parches_aplicados"] = set(parches)
+            clon = nuevo(clase)
+            clon.__dict__ = estado
+            clones.append(clon)
+        return clones
+
     def get_id(self) -> int:
         """
         Obtiene el ID unico del servicio.
@@ -75,7 +135,89 @@ class Servicio(ABC):
         """
         if potencia < 0:
             raise ValueError("La potencia consumida no puede ser negativa")
+        anterior = self._potencia_consumida
         self._potencia_consumida = potencia
+        self._publicar_cambio(C.ATRIBUTO_POTENCIA, anterior, potencia)
+
+    def aplicar_parche(self, nombre_parche: str) -> None:
+        """
+        Registra un parche de seguridad como aplicado en el servicio.
+        (Necesario para US-019). Es idempotente: solo la primera vez se
+        publica en el canal de la flota (ej. para el indice de cobertura).
+
+        Args:
+            nombre_parche (str): El nombre del parche (ej. "CVE-2025-1234").
+
+        Raises:
+            ValueError: Si el nombre del parche es vacio.
+        """
+        if not nombre_parche:
+            raise ValueError("El nombre del parche no puede ser vacio")
+        if nombre_parche in self._parches_aplicados:
+            return
+        self._parches_aplicados.add(nombre_parche)
+        canal = CanalEventos.get_canal(C.CANAL_FLOTA)
+        if canal.tiene_observadores():
+            canal.notificar_observadores(EventoFlota(
+                TipoEventoFlota.PARCHE_APLICADO, self, atributo=nombre_parche))
+
+    def tiene_parche(self, nombre_parche: str) -> bool:
+        """Indica si el parche ya fue aplicado al servicio."""
+        return nombre_parche in self._parches_aplicados
+
+    def get_parches_aplicados(self) -> Set[str]:
+        """Obtiene una COPIA del conjunto de parches aplicados."""
+        return self._parches_aplicados.copy()
+
+    def get_rack(self) -> 'ServerRack | None':
+        """
+        Obtiene el rack donde esta desplegado el servicio (O(1)).
+
+        Returns:
+            ServerRack | None: El rack, o None si no esta desplegado.
+        """
+        return self._rack() if self._rack is not None else None
+
+    def set_rack(self, rack: 'ServerRack | None') -> None:
+        """
+        Establece (o borra) el rack del servicio.
+        Lo usa ServerRack al agregar/remover servicios.
+
+        Args:
+            rack (ServerRack | None): El rack, o None al removerlo.
+        """
+        self._rack = ref(rack) if rack is not None else None
+
+    def _publicar_cambio(self, atributo: str, anterior: float, nuevo: float) -> None:
+        """
+        Publica el cambio de un atributo en el canal de la flota
+        (solo si hay observadores, ej. los indices de consulta).
+        """
+        canal = CanalEventos.get_canal(C.CANAL_FLOTA)
+        if canal.tiene_observadores():
+            canal.notificar_observadores(EventoFlota(
+                TipoEventoFlota.ATRIBUTO_MODIFICADO, self,
+                atributo=atributo, valor_anterior=anterior, valor_nuevo=nuevo))
+
+    def __getstate__(self) -> dict:
+        """
+        Estado para Pickle: la referencia al rack no se persiste
+        (el rack la restaura al deserializarse).
+        """
+        estado = self.__dict__.copy()
+        estado.pop("_rack", None)
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        """
+        Restaura el servicio desde Pickle. Los registros persistidos
+        antes de US-019 no tienen '_parches_aplicados'.
+        Su ID queda registrado para que no se vuelva a asignar.
+        """
+        self.__dict__.update(estado)
+        Servicio._asignador_ids.observar(self._id)
+        self.__dict__.setdefault("_parches_aplicados", set())
+        self._rack = None
 
     @abstractmethod
     def get_tipo(self) -> str:
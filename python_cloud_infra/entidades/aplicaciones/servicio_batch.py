@@ -72,4 +72,6 @@ class ServicioBatch(Servicio):
         """
         if workers < 0:
             raise ValueError("El numero de workers no puede ser negativo")
-        self._workers = workers
\ No newline at end of file
+        anterior = self._workers
+        self._workers = workers
+        self._publicar_cambio(C.ATRIBUTO_WORKERS, anterior, workers)
\ No newline at end of file
@@ -79,4 +79,6 @@ class ServicioDatabase(Servicio):
         """
         if iops < 0:
             raise ValueError("Los IOPS no pueden ser negativos")
-        self._iops = iops
\ No newline at end of file
+        anterior = self._iops
+        self._iops = iops
+        self._publicar_cambio(C.ATRIBUTO_IOPS, anterior, iops)
\ No newline at end of file
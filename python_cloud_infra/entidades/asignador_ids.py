@@ -0,0 +1,204 @@
+"""
+Modulo del AsignadorIds.
+
+Asignacion thread-safe de IDs unicos (Servicio, Snapshot) sin tomar un
+lock global en cada creacion.
+"""
+import os
+from threading import Lock, local
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock entre procesos (ver AsignadorIds)
+    fcntl = None  # type: ignore
+
+from python_cloud_infra import constantes as C
+
+
+class AsignadorIds:
+    """
+    Asignador de IDs enteros crecientes (desde 1) por bloques.
+
+    - Un cursor global, protegido por un Lock, entrega bloques de
+      'tamanio_bloque' IDs consecutivos.
+    - Cada thread consume su bloque (threading.local) sin sincronizarse
+      con los demas: el Lock se toma una vez cada 'tamanio_bloque' IDs.
+    - Los IDs son unicos pero no necesariamente consecutivos entre
+      threads (cada uno avanza en su propio bloque).
+
+    Al deserializar objetos persistidos se llama a 'observar(id)': el
+    cursor avanza por encima de ese ID y, si el ID puede caer en un
+    bloque ya entregado, los bloques pendientes se descartan (cambio de
+    epoca), de modo que nunca se reasigna un ID recargado.
+
+    Con 'nombre_marca', el asignador persiste una marca de agua en
+    C.DIRECTORIO_DATA: un ID por encima de todos los reservados por
+    cualquier proceso. Cada proceso reserva rangos de C.IDS_RESERVA_MARCA
+    IDs: lee la marca, arranca su rango en ella (o en su cursor, si es
+    mayor) y escribe la marca nueva, todo con un lock de archivo
+    (fcntl.flock) tomado, asi dos procesos concurrentes nunca reservan
+    el mismo rango. El archivo se toca una vez por rango, no por bloque.
+    El path se resuelve al primer uso (no al importar). Sin fcntl
+    (Windows) la lectura y escritura de la marca no se sincronizan.
+
+    Referencia: US-TECH-002
+    """
+
+    def __init__(self, tamanio_bloque: int = C.IDS_TAMANIO_BLOQUE, nombre_marca: str | None = None):
+        """
+        Inicializa el asignador (la marca persistida se lee al primer uso).
+
+        Args:
+            tamanio_bloque (int, optional): IDs por bloque de cada thread.
+            nombre_marca (str | None, optional): Nombre del archivo de la
+                marca de agua dentro de C.DIRECTORIO_DATA. None para no
+                persistirla (IDs unicos solo en el proceso).
+
+        Raises:
+            ValueError: Si el tamanio de bloque no es positivo.
+        """
+        if tamanio_bloque <= 0:
+            raise ValueError("El tamanio de bloque debe ser positivo")
+        self._tamanio_bloque: int = tamanio_bloque
+        self._lock: Lock = Lock()
+        self._cursor: int = 1  # Primer ID aun no entregado a ningun thread
+        self._inicio_epoca: int = 1  # Los bloques de la epoca actual estan en [inicio, cursor)
+        self._epoca: int = 0
+        self._local: local = local()
+        self._nombre_marca: str | None = nombre_marca
+        self._limite: int = 0  # Fin (exclusivo) del rango reservado en la marca
+
+    def siguiente(self) -> int:
+        """
+        Obtiene un ID nuevo.
+
+        Returns:
+            int: El ID.
+        """
+        bloque = self._local
+        id_nuevo = getattr(bloque, "siguiente", 0)
+        if id_nuevo >= getattr(bloque, "limite", 0) or bloque.epoca != self._epoca:
+            id_nuevo = self._nuevo_bloque(bloque)
+        bloque.siguiente = id_nuevo + 1
+        return id_nuevo
+
+    def reservar(self, cantidad: int) -> int:
+        """
+        Reserva 'cantidad' IDs consecutivos.
+
+        Usa lo que queda del bloque del thread si alcanza; si no, toma el
+        rango directamente del cursor global (un solo paso).
+
+        Args:
+            cantidad (int): Cantidad de IDs (> 0).
+
+        Returns:
+            int: El primer ID del rango.
+
+        Raises:
+            ValueError: Si la cantidad no es positiva.
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad de IDs debe ser positiva")
+        bloque = self._local
+        primer_id = getattr(bloque, "siguiente", 0)
+        if primer_id + cantidad <= getattr(bloque, "limite", 0) and bloque.epoca == self._epoca:
+            bloque.siguiente = primer_id + cantidad
+            return primer_id
+        with self._lock:
+            return self._tomar(cantidad)
+
+    def observar(self, id_existente: int) -> None:
+        """
+        Registra un ID que ya existe (ej. de un objeto recargado desde
+        Pickle) para que nunca se vuelva a entregar.
+
+        Args:
+            id_existente (int): El ID.
+        """
+        if id_existente < self._inicio_epoca:
+            return
+        with self._lock:
+            if id_existente < self._inicio_epoca:
+                return
+            if id_existente >= self._cursor:
+                # Fuera de todo bloque entregado: alcanza con mover el cursor
+                self._cursor = id_existente + 1
+            elif id_existente >= self._inicio_epoca:
+                # Puede estar en un bloque pendiente de algun thread: se descartan
+                self._epoca += 1
+                self._inicio_epoca = self._cursor
+
+    def get_ultimo_id(self) -> int:
+        """Obtiene el mayor ID que el cursor global ya entrego (en bloques o rangos)."""
+        return self._cursor - 1
+
+    def _nuevo_bloque(self, bloque: local) -> int:
+        """Toma un bloque del cursor global para el thread actual."""
+        with self._lock:
+            inicio = self._tomar(self._tamanio_bloque)
+            bloque.epoca = self._epoca
+        bloque.limite = inicio + self._tamanio_bloque
+        return inicio
+
+    def _tomar(self, cantidad: int) -> int:
+        """
+        Entrega 'cantidad' IDs consecutivos del cursor global, reservando
+        un rango nuevo en la marca si el actual no alcanza. Requiere el lock.
+        """
+        if self._nombre_marca is not None and self._cursor + cantidad > self._limite:
+            self._reservar_rango(cantidad)
+        inicio = self._cursor
+        self._cursor += cantidad
+        return inicio
+
+    def _reservar_rango(self, cantidad: int) -> None:
+        """
+        Reserva en la marca persistida un rango de al menos 'cantidad' IDs
+        desde el cursor: con el lock de archivo tomado lee la marca,
+        arranca el rango en max(cursor, marca) y escribe la marca nueva
+        (de forma atomica). Los IDs por debajo de la marca son de otro
+        proceso: el cursor salta por encima. Si la marca no se puede leer
+        o escribir, se sigue con IDs unicos solo en el proceso.
+        Requiere el lock.
+        """
+        path_marca = os.path.join(C.DIRECTORIO_DATA, self._nombre_marca)  # type: ignore
+        try:
+            os.makedirs(C.DIRECTORIO_DATA, exist_ok=True)
+            with open(path_marca + C.EXTENSION_LOCK, 'a') as archivo_lock:
+                if fcntl is not None:
+                    fcntl.flock(archivo_lock.fileno(), fcntl.LOCK_EX)
+                # El lock se suelta al cerrar el archivo
+                inicio = max(self._cursor, self._leer_marca(path_marca))
+                limite = inicio + max(cantidad, C.IDS_RESERVA_MARCA)
+                path_temporal = path_marca + C.EXTENSION_TEMPORAL
+                with open(path_temporal, 'w', encoding='utf-8') as f:
+                    f.write(str(limite))
+                os.replace(path_temporal, path_marca)
+        except (OSError, ValueError) as e:
+            print(f"Advertencia: no se pudo reservar IDs en la marca '{path_marca}': {e}")
+            # No se reintenta en cada bloque: recien al agotar este rango
+            self._limite = self._cursor + max(cantidad, C.IDS_RESERVA_MARCA)
+            return
+
+        if inicio > self._cursor:
+            if self._inicio_epoca == self._cursor:
+                # Nada entregado en la epoca: empieza en el rango nuevo
+                self._inicio_epoca = inicio
+            self._cursor = inicio
+        self._limite = limite
+
+    @staticmethod
+    def _leer_marca(path_marca: str) -> int:
+        """
+        Lee la marca persistida (0 si todavia no existe).
+
+        Raises:
+            OSError: Si el archivo existe pero no se puede leer.
+            ValueError: Si el contenido no es un entero.
+        """
+        try:
+            with open(path_marca, 'r', encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
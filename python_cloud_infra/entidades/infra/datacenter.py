@@ -2,7 +2,12 @@
 Modulo de la entidad DataCenter.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
+
+from python_cloud_infra import constantes as C
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+from python_cloud_infra.entidades.infra.indice_capacidad_racks import IndiceCapacidadRacks
 
 # Se usa TYPE_CHECKING para evitar importaciones circulares
 # en tiempo de ejecucion con ServerRack.
@@ -14,7 +19,8 @@ class DataCenter:
     Entidad que representa un DataCenter físico.
 
     Contiene informacion sobre su ID, potencia total y ubicación.
-    Esta vinculada a uno (y solo uno) ServerRack principal en esta simulación.
+    Tiene un ServerRack principal y puede tener racks adicionales; todos
+    quedan en un indice de capacidad libre (U y MW) para ubicar despliegues.
 
     Referencia: US-001
     """
@@ -43,6 +49,8 @@ class DataCenter:
         self._potencia_total_mw: float = potencia_total_mw
         self._ubicacion_geografica: str = ubicacion_geografica
         self._rack_principal: ServerRack | None = None # Se asigna post-creacion
+        self._racks: List[ServerRack] = []
+        self._indice_capacidad: IndiceCapacidadRacks | None = IndiceCapacidadRacks()
 
     def get_id_datacenter(self) -> int:
         """Obtiene el ID del DataCenter."""
@@ -78,8 +86,82 @@ class DataCenter:
     def set_rack_principal(self, rack: ServerRack) -> None:
         """
         Asigna el rack principal a este DataCenter.
+        Si el rack no era del DataCenter, tambien se agrega (ver add_rack).
         
         Args:
             rack (ServerRack): La instancia del ServerRack.
         """
-        self._rack_principal = rack
\ No newline at end of file
+        self._rack_principal = rack
+        if rack not in self._racks:
+            self.add_rack(rack)
+
+    # --- Gestion de Racks (con Copias Defensivas - Rubrica 5.2) ---
+
+    def get_racks(self) -> List[ServerRack]:
+        """
+        Obtiene una COPIA de la lista de racks del DataCenter
+        (el principal incluido).
+
+        Returns:
+            List[ServerRack]: Una copia de la lista de racks.
+        """
+        return self._racks.copy()
+
+    def get_rack(self, nombre: str) -> ServerRack | None:
+        """
+        Busca un rack del DataCenter por nombre.
+
+        Args:
+            nombre (str): Nombre del rack.
+
+        Returns:
+            ServerRack | None: El rack, o None si no existe.
+        """
+        for rack in self._racks:
+            if rack.get_nombre() == nombre:
+                return rack
+        return None
+
+    def add_rack(self, rack: ServerRack) -> None:
+        """
+        Agrega un rack al DataCenter y lo indexa por capacidad libre.
+        El primer rack agregado pasa a ser el principal.
+        Publica RACK_AGREGADO en el canal de la flota, para que los
+        indices de los DataCenters gestionados empiecen a seguirlo.
+
+        Args:
+            rack (ServerRack): La instancia del ServerRack.
+
+        Raises:
+            ValueError: Si ya hay un rack con ese nombre.
+        """
+        if self.get_rack(rack.get_nombre()) is not None:
+            raise ValueError(f"Ya existe un rack '{rack.get_nombre()}' en el DataCenter")
+        self._racks.append(rack)
+        self.get_indice_capacidad().agregar_rack(rack)
+        if self._rack_principal is None:
+            self._rack_principal = rack
+        canal = CanalEventos.get_canal(C.CANAL_FLOTA)
+        if canal.tiene_observadores():
+            canal.notificar_observadores(EventoFlota(TipoEventoFlota.RACK_AGREGADO, None, rack=rack))
+
+    def get_indice_capacidad(self) -> IndiceCapacidadRacks:
+        """Obtiene el indice de capacidad libre de los racks."""
+        if self._indice_capacidad is None:
+            # Restaurado de un Pickle anterior: se indexa al primer uso
+            self._indice_capacidad = IndiceCapacidadRacks()
+            for rack in self._racks:
+                self._indice_capacidad.agregar_rack(rack)
+        return self._indice_capacidad
+
+    def __setstate__(self, estado: dict) -> None:
+        """
+        Restaura el DataCenter desde Pickle. Los pickles anteriores a los
+        racks multiples solo tienen el rack principal: se arma la lista a
+        partir de el y el indice se construye al primer uso (el rack puede
+        no estar restaurado todavia).
+        """
+        self.__dict__.update(estado)
+        if "_racks" not in estado:
+            self._racks = [] if self._rack_principal is None else [self._rack_principal]
+            self._indice_capacidad = None
@@ -0,0 +1,86 @@
+"""
+Modulo de la entidad EventoFlota.
+
+Eventos que las entidades publican en el canal de la flota
+(C.CANAL_FLOTA) cuando cambia la ubicacion, un atributo o los parches
+de un servicio, o cuando un DataCenter suma un rack.
+"""
+from __future__ import annotations
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+
+class TipoEventoFlota(Enum):
+    """
+    Enumera los tipos de eventos de la flota.
+    """
+    SERVICIO_AGREGADO = "Servicio agregado a un rack"
+    SERVICIO_REMOVIDO = "Servicio removido de un rack"
+    ATRIBUTO_MODIFICADO = "Atributo de un servicio modificado"
+    RACK_AGREGADO = "Rack agregado a un DataCenter"
+    PARCHE_APLICADO = "Parche aplicado a un servicio"
+
+
+class EventoFlota:
+    """
+    Evento de la flota: que servicio cambio, en que rack (si aplica)
+    y, para los cambios de atributo, el atributo y sus valores.
+    Los eventos RACK_AGREGADO no tienen servicio (solo el rack); en
+    PARCHE_APLICADO el atributo es el nombre del parche.
+    """
+
+    __slots__ = ("_tipo", "_servicio", "_rack", "_atributo", "_valor_anterior", "_valor_nuevo")
+
+    def __init__(self,
+                 tipo: TipoEventoFlota,
+                 servicio: 'Servicio | None',
+                 rack: 'ServerRack | None' = None,
+                 atributo: str | None = None,
+                 valor_anterior: float | None = None,
+                 valor_nuevo: float | None = None):
+        """
+        Inicializa el evento.
+
+        Args:
+            tipo (TipoEventoFlota): El tipo de evento.
+            servicio (Servicio | None): El servicio afectado (None en RACK_AGREGADO).
+            rack (ServerRack | None, optional): El rack (agregado/removido).
+            atributo (str | None, optional): El atributo modificado (ej. "iops")
+                o el parche aplicado.
+            valor_anterior (float | None, optional): El valor previo del atributo.
+            valor_nuevo (float | None, optional): El valor nuevo del atributo.
+        """
+        self._tipo: TipoEventoFlota = tipo
+        self._servicio: 'Servicio | None' = servicio
+        self._rack: 'ServerRack | None' = rack
+        self._atributo: str | None = atributo
+        self._valor_anterior: float | None = valor_anterior
+        self._valor_nuevo: float | None = valor_nuevo
+
+    def get_tipo(self) -> TipoEventoFlota:
+        """Obtiene el tipo de evento."""
+        return self._tipo
+
+    def get_servicio(self) -> 'Servicio':
+        """Obtiene el servicio afectado (no aplica a RACK_AGREGADO)."""
+        return self._servicio  # type: ignore
+
+    def get_rack(self) -> 'ServerRack | None':
+        """Obtiene el rack (en SERVICIO_AGREGADO / SERVICIO_REMOVIDO / RACK_AGREGADO)."""
+        return self._rack
+
+    def get_atributo(self) -> str | None:
+        """Obtiene el atributo modificado (ATRIBUTO_MODIFICADO) o el parche (PARCHE_APLICADO)."""
+        return self._atributo
+
+    def get_valor_anterior(self) -> float | None:
+        """Obtiene el valor previo del atributo."""
+        return self._valor_anterior
+
+    def get_valor_nuevo(self) -> float | None:
+        """Obtiene el valor nuevo del atributo."""
+        return self._valor_nuevo
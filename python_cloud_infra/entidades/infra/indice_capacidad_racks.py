@@ -0,0 +1,202 @@
+"""
+Modulo del IndiceCapacidadRacks.
+
+Indice de capacidad libre (U y MW) de los racks de un DataCenter, para
+responder "un rack con al menos k U y m MW libres" sin recorrer los racks.
+"""
+from __future__ import annotations
+from bisect import bisect_left, insort
+from itertools import count
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+_SIN_RACK: float = float("-inf")
+
+# Entrada de un bucket: (MW libres, secuencia, rack); la secuencia desempata
+Entrada = Tuple[float, int, 'ServerRack']
+
+
+class IndiceCapacidadRacks:
+    """
+    Indice de capacidad libre de los racks de un DataCenter.
+
+    - Los racks se agrupan en buckets por U libres (un bucket por valor
+      de U); cada bucket es una lista ordenada por MW libres.
+    - Un arbol de segmentos sobre los buckets guarda el maximo de MW
+      libres de cada rango de U.
+    - 'buscar_rack(k, m)' baja por el arbol hasta el primer bucket con
+      U >= k que tenga algun rack con MW >= m (O(log U)), y dentro del
+      bucket toma el rack con menos MW suficientes (O(log racks)): el
+      resultado es el rack mas ajustado en U (best-fit).
+    - Los racks avisan sus cambios de capacidad (ServerRack llama a
+      'actualizar_rack'), por lo que el indice no se recalcula.
+
+    Solo lee 'get_espacio_disponible_u' y 'get_potencia_libre_mw', por
+    lo que tambien indexa vistas de planificacion (RackPlanificado).
+
+    Thread-safe (un Lock protege el indice).
+
+    Referencia: US-002
+    """
+
+    def __init__(self):
+        """Inicializa el indice vacio."""
+        self._tamanio: int = 1  # Hojas del arbol (potencia de 2 > max U libre)
+        self._arbol: List[float] = [_SIN_RACK] * 2
+        self._buckets: Dict[int, List[Entrada]] = {}
+        self._entradas: Dict['ServerRack', Tuple[int, Entrada]] = {}
+        self._secuencia: Iterator[int] = count()
+        self._lock: Lock = Lock()
+
+    def __getstate__(self) -> dict:
+        """
+        Los Lock e iteradores no se serializan con Pickle, y el arbol se
+        recalcula desde los buckets al deserializar. El estado se copia
+        con el lock tomado (los racks lo actualizan desde otros hilos) y
+        no consume secuencia: serializar dos veces da el mismo estado.
+        """
+        with self._lock:
+            estado = self.__dict__.copy()
+            estado["_buckets"] = {espacio_u: bucket.copy() for espacio_u, bucket in self._buckets.items()}
+            estado["_entradas"] = self._entradas.copy()
+            siguiente = next(self._secuencia)
+            self._secuencia = count(siguiente)
+            estado["_secuencia"] = siguiente
+        del estado["_lock"]
+        del estado["_arbol"]
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__dict__.update(estado)
+        self._secuencia = count(estado["_secuencia"])
+        self._lock = Lock()
+        self._reconstruir_arbol()
+
+    # --- Mantenimiento ---
+
+    def agregar_rack(self, rack: 'ServerRack') -> None:
+        """
+        Agrega un rack al indice (o lo actualiza si ya estaba).
+
+        Args:
+            rack (ServerRack): El rack.
+        """
+        with self._lock:
+            self._quitar(rack)
+            self._insertar(rack)
+
+    def actualizar_rack(self, rack: 'ServerRack') -> None:
+        """
+        Vuelve a leer la capacidad libre de un rack indexado.
+        Los racks no indexados se ignoran.
+
+        Args:
+            rack (ServerRack): El rack.
+        """
+        with self._lock:
+            if self._quitar(rack):
+                self._insertar(rack)
+
+    def quitar_rack(self, rack: 'ServerRack') -> None:
+        """Quita un rack del indice (si estaba)."""
+        with self._lock:
+            self._quitar(rack)
+
+    # --- Consultas ---
+
+    def buscar_rack(self, espacio_u: int, potencia_mw: float = 0.0) -> 'ServerRack | None':
+        """
+        Busca un rack con al menos 'espacio_u' U y 'potencia_mw' MW libres.
+        Entre los candidatos devuelve el de menos U libres (y, a igual U,
+        el de menos MW libres).
+
+        Args:
+            espacio_u (int): U libres requeridas.
+            potencia_mw (float, optional): MW libres requeridos.
+
+        Returns:
+            ServerRack | None: El rack, o None si ninguno tiene esa capacidad.
+        """
+        with self._lock:
+            bucket_u = self._primer_bucket(max(espacio_u, 0), potencia_mw)
+            if bucket_u is None:
+                return None
+            bucket = self._buckets[bucket_u]
+            posicion = bisect_left(bucket, (potencia_mw, -1))
+            return bucket[posicion][2]
+
+    def contiene(self, rack: 'ServerRack') -> bool:
+        """Indica si el rack esta indexado."""
+        return rack in self._entradas
+
+    def get_cantidad_racks(self) -> int:
+        """Obtiene la cantidad de racks indexados."""
+        return len(self._entradas)
+
+    # --- Auxiliares (requieren el lock) ---
+
+    def _insertar(self, rack: 'ServerRack') -> None:
+        espacio_u = max(rack.get_espacio_disponible_u(), 0)
+        entrada: Entrada = (rack.get_potencia_libre_mw(), next(self._secuencia), rack)
+        if espacio_u >= self._tamanio:
+            self._crecer(espacio_u)
+        bucket = self._buckets.setdefault(espacio_u, [])
+        insort(bucket, entrada)
+        self._entradas[rack] = (espacio_u, entrada)
+        self._actualizar_hoja(espacio_u)
+
+    def _quitar(self, rack: 'ServerRack') -> bool:
+        ubicacion = self._entradas.pop(rack, None)
+        if ubicacion is None:
+            return False
+        espacio_u, entrada = ubicacion
+        bucket = self._buckets[espacio_u]
+        del bucket[bisect_left(bucket, entrada)]
+        if not bucket:
+            del self._buckets[espacio_u]
+        self._actualizar_hoja(espacio_u)
+        return True
+
+    def _actualizar_hoja(self, espacio_u: int) -> None:
+        """Recalcula el maximo de MW de un bucket y de sus ancestros."""
+        bucket = self._buckets.get(espacio_u)
+        posicion = espacio_u + self._tamanio
+        self._arbol[posicion] = bucket[-1][0] if bucket else _SIN_RACK
+        posicion //= 2
+        while posicion >= 1:
+            self._arbol[posicion] = max(self._arbol[2 * posicion], self._arbol[2 * posicion + 1])
+            posicion //= 2
+
+    def _crecer(self, espacio_u: int) -> None:
+        """Agranda el arbol para que entre 'espacio_u' y lo reconstruye."""
+        while self._tamanio <= espacio_u:
+            self._tamanio *= 2
+        self._reconstruir_arbol()
+
+    def _reconstruir_arbol(self) -> None:
+        """Arma el arbol de segmentos desde los buckets."""
+        self._arbol = [_SIN_RACK] * (2 * self._tamanio)
+        for bucket_u, bucket in self._buckets.items():
+            self._arbol[bucket_u + self._tamanio] = bucket[-1][0]
+        for posicion in range(self._tamanio - 1, 0, -1):
+            self._arbol[posicion] = max(self._arbol[2 * posicion], self._arbol[2 * posicion + 1])
+
+    def _primer_bucket(self, espacio_u: int, potencia_mw: float) -> int | None:
+        """Primer bucket con U >= espacio_u y algun rack con MW >= potencia_mw."""
+        if espacio_u >= self._tamanio:
+            return None
+        return self._descender(1, 0, self._tamanio - 1, espacio_u, potencia_mw)
+
+    def _descender(self, nodo: int, desde: int, hasta: int, espacio_u: int, potencia_mw: float) -> int | None:
+        if hasta < espacio_u or self._arbol[nodo] < potencia_mw:
+            return None
+        if desde == hasta:
+            return desde
+        medio = (desde + hasta) // 2
+        encontrado = self._descender(2 * nodo, desde, medio, espacio_u, potencia_mw)
+        if encontrado is None:
+            encontrado = self._descender(2 * nodo + 1, medio + 1, hasta, espacio_u, potencia_mw)
+        return encontrado
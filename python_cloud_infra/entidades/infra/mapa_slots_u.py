@@ -0,0 +1,149 @@
+"""
+Modulo del MapaSlotsU.
+
+Mapa de bits de las posiciones fisicas (slots de 1U) de un ServerRack.
+"""
+from typing import List, Tuple
+
+
+class MapaSlotsU:
+    """
+    Mapa de bits de los slots de un rack: el bit i en 1 indica que el
+    slot i (de 1U) esta ocupado.
+
+    El mapa es un int de Python, por lo que las busquedas se hacen con
+    operaciones de bits sobre todo el rack a la vez:
+    - 'buscar_hueco(k)' reduce los slots libres con desplazamientos
+      (r &= r >> paso, duplicando el largo en cada paso) hasta que el
+      bit i queda en 1 solo si los slots i..i+k-1 estan libres: son
+      O(log k) operaciones sobre el int completo.
+    - El primer hueco es el bit en 1 mas bajo (r & -r).
+
+    Referencia: US-002, US-004
+    """
+
+    def __init__(self, tamanio_u: int, ocupados: int = 0):
+        """
+        Inicializa el mapa.
+
+        Args:
+            tamanio_u (int): Cantidad de slots del rack.
+            ocupados (int, optional): Mapa de bits inicial. Defaults a vacio.
+
+        Raises:
+            ValueError: Si el tamanio es negativo.
+        """
+        if tamanio_u < 0:
+            raise ValueError("El tamanio del rack no puede ser negativo")
+        self._tamanio_u: int = tamanio_u
+        self._completo: int = (1 << tamanio_u) - 1
+        self._ocupados: int = ocupados & self._completo
+
+    def get_tamanio_u(self) -> int:
+        """Obtiene la cantidad de slots."""
+        return self._tamanio_u
+
+    def get_bits(self) -> int:
+        """Obtiene el mapa de bits de slots ocupados."""
+        return self._ocupados
+
+    def get_libres_u(self) -> int:
+        """Obtiene la cantidad de slots libres."""
+        return self._tamanio_u - self._ocupados.bit_count()
+
+    def copiar(self) -> 'MapaSlotsU':
+        """Obtiene una copia independiente del mapa."""
+        return MapaSlotsU(self._tamanio_u, self._ocupados)
+
+    # --- Consultas ---
+
+    def esta_libre(self, inicio_u: int, tamanio_u: int) -> bool:
+        """
+        Indica si los slots inicio..inicio+tamanio-1 estan libres
+        (y dentro del rack).
+        """
+        if inicio_u < 0 or tamanio_u < 0 or inicio_u + tamanio_u > self._tamanio_u:
+            return False
+        return self._ocupados & self._mascara(inicio_u, tamanio_u) == 0
+
+    def buscar_hueco(self, tamanio_u: int, ocupados_extra: int = 0) -> int | None:
+        """
+        Busca el primer hueco de 'tamanio_u' slots contiguos libres.
+
+        Args:
+            tamanio_u (int): Slots contiguos requeridos.
+            ocupados_extra (int, optional): Bits a considerar ocupados
+                ademas de los del mapa (ej. una ventana reservada).
+
+        Returns:
+            int | None: El slot inicial del hueco, o None si no hay.
+        """
+        if tamanio_u <= 0:
+            return 0
+        candidatos = ~(self._ocupados | ocupados_extra) & self._completo
+        largo = 1
+        while largo < tamanio_u and candidatos:
+            paso = min(largo, tamanio_u - largo)
+            candidatos &= candidatos >> paso
+            largo += paso
+        if not candidatos:
+            return None
+        return (candidatos & -candidatos).bit_length() - 1
+
+    def get_huecos(self) -> List[Tuple[int, int]]:
+        """
+        Obtiene los huecos libres maximales.
+
+        Returns:
+            List[Tuple[int, int]]: (slot inicial, largo) de cada hueco, en orden.
+        """
+        huecos: List[Tuple[int, int]] = []
+        libres = ~self._ocupados & self._completo
+        while libres:
+            inicio = (libres & -libres).bit_length() - 1
+            # Sumar 1 al comienzo del tramo de unos lo "apaga" por acarreo
+            tramo = libres ^ (libres & (libres + (1 << inicio)))
+            largo = tramo.bit_count()
+            huecos.append((inicio, largo))
+            libres &= ~tramo
+        return huecos
+
+    def get_mayor_hueco_u(self) -> int:
+        """Obtiene el largo del mayor hueco libre."""
+        return max((largo for _, largo in self.get_huecos()), default=0)
+
+    def caben(self, tamanio_u: int, cantidad: int) -> bool:
+        """
+        Indica si entran 'cantidad' bloques de 'tamanio_u' slots contiguos
+        (cada hueco admite largo // tamanio bloques).
+        """
+        if tamanio_u <= 0 or cantidad <= 0:
+            return True
+        bloques = 0
+        for _, largo in self.get_huecos():
+            bloques += largo // tamanio_u
+            if bloques >= cantidad:
+                return True
+        return False
+
+    # --- Modificaciones ---
+
+    def ocupar(self, inicio_u: int, tamanio_u: int) -> None:
+        """
+        Marca como ocupados los slots inicio..inicio+tamanio-1.
+
+        Raises:
+            ValueError: Si algun slot esta ocupado o fuera del rack.
+        """
+        if not self.esta_libre(inicio_u, tamanio_u):
+            raise ValueError(f"Los slots {inicio_u}..{inicio_u + tamanio_u - 1} no estan libres")
+        self._ocupados |= self._mascara(inicio_u, tamanio_u)
+
+    def liberar(self, inicio_u: int, tamanio_u: int) -> None:
+        """Marca como libres los slots inicio..inicio+tamanio-1."""
+        self._ocupados &= ~self._mascara(inicio_u, tamanio_u)
+
+    @staticmethod
+    def _mascara(inicio_u: int, tamanio_u: int) -> int:
+        """Bits inicio..inicio+tamanio-1 en 1."""
+        return ((1 << tamanio_u) - 1) << inicio_u
@@ -2,7 +2,7 @@
 Modulo de la entidad RegistroDataCenter.
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 # Imports para type hints, evitando importaciones circulares
 if TYPE_CHECKING:
@@ -59,6 +59,21 @@ class RegistroDataCenter:
         """Obtiene la entidad ServerRack."""
         return self._server_rack
 
+    def get_racks(self) -> List['ServerRack']:
+        """
+        Obtiene TODOS los racks del DataCenter del registro (el rack
+        del registro primero). Las operaciones sobre la flota deben
+        recorrer estos racks, no solo get_server_rack().
+
+        Returns:
+            List[ServerRack]: Una copia de la lista de racks.
+        """
+        racks = [self._server_rack]
+        for rack in self._datacenter.get_racks():
+            if rack is not self._server_rack:
+                racks.append(rack)
+        return racks
+
     def get_cliente_corporativo(self) -> str:
         """Obtiene el nombre del cliente corporativo."""
         return self._cliente_corporativo
@@ -3,7 +3,8 @@ Modulo de la entidad ServerRack (Contenedor).
 (Análoga a 'Plantacion')
 """
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from threading import RLock
+from typing import Callable, Dict, Iterator, List, Tuple, TYPE_CHECKING
 
 # Imports para type hints, evitando importaciones circulares
 if TYPE_CHECKING:
@@ -13,6 +14,10 @@ if TYPE_CHECKING:
 
 # Importamos la constante que definimos
 from python_cloud_infra import constantes as C
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+from python_cloud_infra.entidades.infra.mapa_slots_u import MapaSlotsU
+from python_cloud_infra.entidades.infra.vista_rack import VistaRack
 
 class ServerRack:
     """
@@ -20,6 +25,18 @@ class ServerRack:
 
     Contiene la logica de gestion de espacio (U), potencia (MW),
     y las listas de servicios desplegados y personal asignado.
+    Cada servicio ocupa un bloque de slots contiguos (posicion fisica),
+    registrado en un MapaSlotsU.
+
+    Concurrencia (el balanceador asigna recursos mientras se despliega,
+    se decomisiona y se persiste el mismo rack):
+    - Los escritores se serializan con el lock del rack (get_lock()).
+    - La lista de servicios es una tupla que se reemplaza, nunca se
+      modifica en el lugar: un lector que la obtuvo la recorre entera
+      aunque otro hilo agregue o remueva servicios.
+    - Cada escritura publica una VistaRack inmutable (get_vista()) con
+      servicios, espacio y potencia de la misma version. Los lectores
+      no toman el lock.
 
     Referencia: US-002
     """
@@ -44,9 +61,22 @@ class ServerRack:
         self._espacio_ocupado_u: int = 0
         self._potencia_disponible_mw: float = potencia
         self._datacenter: 'DataCenter' = datacenter
+        # Potencia base reservada por cada servicio desplegado (id -> MW)
+        self._potencia_reservada_mw: Dict[int, float] = {}
+        self._potencia_reservada_total_mw: float = 0.0
+        # Posiciones fisicas: mapa de slots y bloque de cada servicio (id -> (inicio, U))
+        self._mapa_slots: MapaSlotsU = MapaSlotsU(espacio_maximo_u)
+        self._slots_servicios: Dict[int, Tuple[int, int]] = {}
+        # Capacidad reservada por despliegues en curso (TransaccionDespliegue)
+        self._espacio_reservado_u: int = 0
+        self._potencia_pendiente_mw: float = 0.0
+        self._lock: RLock = RLock()
         
-        self._servicios_desplegados: List['Servicio'] = []
+        # Copy-on-write: la tupla se reemplaza (con el lock) en cada cambio
+        self._servicios_desplegados: Tuple['Servicio', ...] = ()
         self._sysadmins_asignados: List['SysAdmin'] = []
+        self._version: int = 0
+        self._vista: VistaRack = self._crear_vista()
 
     def get_nombre(self) -> str:
         """Obtiene el nombre del rack."""
@@ -74,16 +104,20 @@ class ServerRack:
             raise ValueError("El espacio ocupado no puede ser negativo")
         if espacio_u > self._espacio_maximo_u:
             raise ValueError("El espacio ocupado no puede superar el maximo")
-        self._espacio_ocupado_u = espacio_u
+        with self._lock:
+            self._espacio_ocupado_u = espacio_u
+            self._renovar_vista()
+        self._notificar_capacidad()
         
     def get_espacio_disponible_u(self) -> int:
         """
-        Calcula y obtiene el espacio en U aun disponible.
+        Calcula y obtiene el espacio en U aun disponible
+        (descontando el reservado por despliegues en curso).
 
         Returns:
             int: Espacio disponible en U.
         """
-        return self._espacio_maximo_u - self._espacio_ocupado_u
+        return self._espacio_maximo_u - self._espacio_ocupado_u - self._espacio_reservado_u
 
     def get_potencia_disponible_mw(self) -> float:
         """Obtiene la potencia (MW) disponible en el rack."""
@@ -102,7 +136,26 @@ class ServerRack:
         """
         if potencia_mw < 0:
             raise ValueError("La potencia (MW) no puede ser negativa")
-        self._potencia_disponible_mw = potencia_mw
+        with self._lock:
+            self._potencia_disponible_mw = potencia_mw
+            self._renovar_vista()
+        self._notificar_capacidad()
+
+    def get_potencia_reservada_mw(self) -> float:
+        """Obtiene la potencia base (MW) reservada por los servicios desplegados."""
+        return self._potencia_reservada_total_mw
+
+    def get_potencia_libre_mw(self) -> float:
+        """
+        Calcula la potencia (MW) libre para nuevos servicios: la disponible
+        menos la reservada por los servicios ya desplegados y por los
+        despliegues en curso.
+
+        Returns:
+            float: Potencia libre en MW (nunca negativa).
+        """
+        return max(0.0, self._potencia_disponible_mw - self.get_potencia_reservada_mw()
+                   - self._potencia_pendiente_mw)
         
     def get_datacenter(self) -> 'DataCenter':
         """Obtiene la entidad DataCenter asociada."""
@@ -115,22 +168,379 @@ class ServerRack:
         Obtiene una COPIA de la lista de servicios desplegados.
         (Análoga a get_cultivos(), Rubrica 5.2: Defensive Copying)
 
+        No toma el lock: copia la tupla vigente (copy-on-write).
+
         Returns:
             List[Servicio]: Una copia de la lista de servicios.
         """
-        return self._servicios_desplegados.copy()
+        return list(self._servicios_desplegados)
+
+    def get_vista(self) -> VistaRack:
+        """
+        Obtiene la ultima version publicada del estado del rack, sin
+        tomar el lock (ver VistaRack).
 
-    def add_servicio(self, servicio: 'Servicio') -> None:
-        """Añade un servicio al rack."""
-        self._servicios_desplegados.append(servicio)
+        Returns:
+            VistaRack: La vista inmutable vigente.
+        """
+        return self._vista
+
+    def get_version(self) -> int:
+        """Obtiene la version del rack (crece con cada escritura)."""
+        return self._vista.get_version()
+
+    def add_servicio(self, servicio: 'Servicio', inicio_u: int | None = None) -> None:
+        """
+        Añade un servicio al rack, ubicandolo en un bloque de slots
+        contiguos libres.
+
+        Args:
+            servicio (Servicio): El servicio.
+            inicio_u (int | None, optional): Slot inicial. Defaults al
+                primer hueco donde entra.
+
+        Raises:
+            ValueError: Si no hay slots contiguos libres para el servicio.
+        """
+        espacio_u = servicio.get_espacio_u()
+        with self._lock:
+            if inicio_u is None:
+                inicio_u = self._mapa_slots.buscar_hueco(espacio_u)
+                if inicio_u is None:
+                    raise ValueError(f"No hay {espacio_u} U contiguas libres en el rack '{self._nombre}'")
+            self._mapa_slots.ocupar(inicio_u, espacio_u)
+            self._slots_servicios[servicio.get_id()] = (inicio_u, espacio_u)
+            self._servicios_desplegados = self._servicios_desplegados + (servicio,)
+            servicio.set_rack(self)
+            self._registrar_alta([servicio])
+        self._publicar(TipoEventoFlota.SERVICIO_AGREGADO, [servicio])
 
     def remove_servicio(self, servicio: 'Servicio') -> None:
         """
         Remueve un servicio del rack.
         (Necesario para US-020: Descomisionar)
         """
-        if servicio in self._servicios_desplegados:
-            self._servicios_desplegados.remove(servicio)
+        with self._lock:
+            servicios = self._servicios_desplegados
+            if servicio not in servicios:
+                return
+            posicion = servicios.index(servicio)
+            self._servicios_desplegados = servicios[:posicion] + servicios[posicion + 1:]
+            self._registrar_baja([servicio])
+        self._publicar(TipoEventoFlota.SERVICIO_REMOVIDO, [servicio])
+
+    # --- Posiciones fisicas (slots de 1U) ---
+
+    def get_slot_servicio(self, servicio: 'Servicio') -> Tuple[int, int] | None:
+        """
+        Obtiene el bloque de slots de un servicio del rack.
+
+        Returns:
+            Tuple[int, int] | None: (slot inicial, U), o None si no esta en el rack.
+        """
+        return self._slots_servicios.get(servicio.get_id())
+
+    def get_slots_servicios(self) -> Dict[int, Tuple[int, int]]:
+        """Obtiene una COPIA de los bloques de slots (ID de servicio -> (inicio, U))."""
+        return self._slots_servicios.copy()
+
+    def get_mapa_slots(self) -> MapaSlotsU:
+        """Obtiene una COPIA del mapa de slots (Rubrica 5.2)."""
+        return self._mapa_slots.copiar()
+
+    def get_mayor_hueco_u(self) -> int:
+        """Obtiene el mayor bloque de slots contiguos libres."""
+        return self._mapa_slots.get_mayor_hueco_u()
+
+    def tiene_slots_contiguos(self, espacio_u: int, cantidad: int = 1) -> bool:
+        """Indica si entran 'cantidad' servicios de 'espacio_u' U en slots contiguos."""
+        return self._mapa_slots.caben(espacio_u, cantidad)
+
+    def mover_servicio(self, servicio: 'Servicio', inicio_u: int) -> None:
+        """
+        Mueve un servicio del rack a otro bloque de slots.
+
+        Args:
+            servicio (Servicio): El servicio (debe estar en el rack).
+            inicio_u (int): Nuevo slot inicial.
+
+        Raises:
+            ValueError: Si el servicio no esta en el rack o el destino no
+                esta libre.
+        """
+        with self._lock:
+            bloque = self._slots_servicios.get(servicio.get_id())
+            if bloque is None:
+                raise ValueError(f"El servicio {servicio.get_id()} no esta en el rack '{self._nombre}'")
+            inicio_actual, espacio_u = bloque
+            self._mapa_slots.liberar(inicio_actual, espacio_u)
+            try:
+                self._mapa_slots.ocupar(inicio_u, espacio_u)
+            except ValueError:
+                self._mapa_slots.ocupar(inicio_actual, espacio_u)
+                raise
+            self._slots_servicios[servicio.get_id()] = (inicio_u, espacio_u)
+            self._renovar_vista()
+
+    # --- Despliegue transaccional (reserva y confirmacion en un paso) ---
+
+    def get_lock(self) -> RLock:
+        """
+        Obtiene el lock (reentrante) de los escritores del rack.
+        Tomarlo permite encadenar varias escrituras sin que otro hilo
+        escriba en el medio; los lectores de get_vista() no lo necesitan.
+        """
+        return self._lock
+
+    def reservar_capacidad(self, tamanios_u: List[int], potencia_mw: float) -> List[int] | None:
+        """
+        Reserva slots contiguos para cada tamanio y la potencia indicada,
+        sin agregar servicios. Lo reservado deja de figurar como libre
+        hasta confirmar_servicios o liberar_capacidad.
+
+        Args:
+            tamanios_u (List[int]): U de cada servicio a desplegar.
+            potencia_mw (float): MW base del despliegue.
+
+        Returns:
+            List[int] | None: El slot inicial de cada bloque (en el orden
+                de 'tamanios_u'), o None si no hay U, slots contiguos o
+                MW libres (get_potencia_libre_mw) suficientes (en ese
+                caso no se reserva nada).
+        """
+        with self._lock:
+            espacio_u = sum(tamanios_u)
+            if self.get_espacio_disponible_u() < espacio_u:
+                return None
+            if potencia_mw > self.get_potencia_libre_mw() + C.TOLERANCIA_POTENCIA_MW:
+                return None
+            mapa = self._mapa_slots.copiar()
+            inicios: List[int] = []
+            for tamanio_u in tamanios_u:
+                inicio_u = mapa.buscar_hueco(tamanio_u)
+                if inicio_u is None:
+                    return None
+                mapa.ocupar(inicio_u, tamanio_u)
+                inicios.append(inicio_u)
+            self._mapa_slots = mapa
+            self._espacio_reservado_u += espacio_u
+            self._potencia_pendiente_mw += potencia_mw
+            self._renovar_vista()
+        self._notificar_capacidad()
+        return inicios
+
+    def liberar_capacidad(self, inicios_u: List[int], tamanios_u: List[int], potencia_mw: float) -> None:
+        """
+        Devuelve una reserva de reservar_capacidad que no se confirmo.
+
+        Args:
+            inicios_u (List[int]): Slots iniciales reservados.
+            tamanios_u (List[int]): U de cada bloque.
+            potencia_mw (float): MW reservados.
+        """
+        with self._lock:
+            for inicio_u, tamanio_u in zip(inicios_u, tamanios_u):
+                self._mapa_slots.liberar(inicio_u, tamanio_u)
+            self._espacio_reservado_u -= sum(tamanios_u)
+            self._potencia_pendiente_mw = max(0.0, self._potencia_pendiente_mw - potencia_mw)
+            self._renovar_vista()
+        self._notificar_capacidad()
+
+    def confirmar_servicios(self, servicios: List['Servicio'], inicios_u: List[int], potencia_mw: float) -> None:
+        """
+        Convierte una reserva en servicios desplegados, en un solo paso:
+        cada servicio ocupa su bloque reservado, se suman sus U al espacio
+        ocupado y se publica el alta de todos juntos.
+
+        Args:
+            servicios (List[Servicio]): Los servicios (uno por bloque).
+            inicios_u (List[int]): Slot inicial reservado de cada servicio.
+            potencia_mw (float): MW que se habian reservado.
+
+        Raises:
+            ValueError: Si la cantidad de servicios y de bloques no coincide.
+        """
+        if len(servicios) != len(inicios_u):
+            raise ValueError("Cada servicio necesita un bloque reservado")
+        espacio_u = sum(servicio.get_espacio_u() for servicio in servicios)
+        with self._lock:
+            for servicio, inicio_u in zip(servicios, inicios_u):
+                self._slots_servicios[servicio.get_id()] = (inicio_u, servicio.get_espacio_u())
+                servicio.set_rack(self)
+            self._servicios_desplegados = self._servicios_desplegados + tuple(servicios)
+            self._espacio_reservado_u -= espacio_u
+            self._espacio_ocupado_u += espacio_u
+            self._potencia_pendiente_mw = max(0.0, self._potencia_pendiente_mw - potencia_mw)
+            self._registrar_alta(servicios)
+        self._publicar(TipoEventoFlota.SERVICIO_AGREGADO, servicios)
+
+    def extraer_servicios_donde(self,
+                                predicado: Callable[['Servicio'], bool],
+                                lote: int,
+                                liberar_espacio: bool = False) -> Iterator[List['Servicio']]:
+        """
+        Remueve (en una sola pasada) los servicios que cumplen el predicado,
+        entregandolos en lotes de hasta 'lote' servicios.
+        (Necesario para US-020: Descomisionar en streaming)
+
+        El predicado se evalua sobre la tupla vigente al empezar, sin el
+        lock; cada lote se remueve con el lock (en una sola version) antes
+        de entregarse. Si el llamador corta la iteracion o el predicado
+        lanza una excepcion, los servicios aun no entregados siguen en el
+        rack. Los servicios que otro hilo removio entretanto no se entregan.
+
+        Args:
+            predicado (Callable[[Servicio], bool]): Criterio de extraccion.
+            lote (int): Tamaño maximo de cada lote.
+            liberar_espacio (bool, optional): Si es True, descuenta del
+                espacio ocupado las U de cada lote en la misma version.
+
+        Yields:
+            List[Servicio]: Los servicios removidos de cada lote.
+        """
+        extraidos: List['Servicio'] = []
+        for servicio in self._servicios_desplegados:
+            if predicado(servicio):
+                extraidos.append(servicio)
+                if len(extraidos) >= lote:
+                    entregados = self.remover_servicios(extraidos, liberar_espacio)
+                    extraidos = []
+                    if entregados:
+                        yield entregados
+        if extraidos:
+            entregados = self.remover_servicios(extraidos, liberar_espacio)
+            if entregados:
+                yield entregados
+
+    def remover_servicios(self, servicios: List['Servicio'], liberar_espacio: bool = False) -> List['Servicio']:
+        """
+        Remueve varios servicios del rack en una sola escritura (una version).
+
+        Args:
+            servicios (List[Servicio]): Los servicios a remover.
+            liberar_espacio (bool, optional): Si es True, descuenta del
+                espacio ocupado sus U en la misma version.
+
+        Returns:
+            List[Servicio]: Los servicios que seguian en el rack (los removidos).
+        """
+        with self._lock:
+            ids_lote = {id(servicio) for servicio in servicios}
+            restantes = tuple(servicio for servicio in self._servicios_desplegados
+                              if id(servicio) not in ids_lote)
+            if len(restantes) == len(self._servicios_desplegados):
+                return []
+            if len(restantes) + len(servicios) != len(self._servicios_desplegados):
+                # Otro hilo removio parte del lote: solo se entregan los presentes
+                vigentes = {id(servicio) for servicio in self._servicios_desplegados}
+                servicios = [servicio for servicio in servicios if id(servicio) in vigentes]
+            self._servicios_desplegados = restantes
+            if liberar_espacio:
+                espacio_u = sum(servicio.get_espacio_u() for servicio in servicios)
+                self._espacio_ocupado_u = max(0, self._espacio_ocupado_u - espacio_u)
+            self._registrar_baja(servicios)
+        self._publicar(TipoEventoFlota.SERVICIO_REMOVIDO, servicios)
+        return servicios
+
+    def _registrar_alta(self, servicios: List['Servicio']) -> None:
+        """Reserva la potencia base de los servicios agregados (requiere el lock)."""
+        for servicio in servicios:
+            reserva_mw = servicio.get_potencia_consumida()
+            self._potencia_reservada_total_mw += reserva_mw - self._potencia_reservada_mw.get(servicio.get_id(), 0.0)
+            self._potencia_reservada_mw[servicio.get_id()] = reserva_mw
+        self._renovar_vista()
+
+    def _registrar_baja(self, servicios: List['Servicio']) -> None:
+        """
+        Libera la potencia y los slots de los servicios removidos y borra
+        su referencia al rack (requiere el lock).
+        """
+        for servicio in servicios:
+            self._potencia_reservada_total_mw -= self._potencia_reservada_mw.pop(servicio.get_id(), 0.0)
+            bloque = self._slots_servicios.pop(servicio.get_id(), None)
+            if bloque is not None:
+                self._mapa_slots.liberar(*bloque)
+            if servicio.get_rack() is self:
+                servicio.set_rack(None)
+        self._renovar_vista()
+
+    def _publicar(self, tipo: TipoEventoFlota, servicios: List['Servicio']) -> None:
+        """
+        Publica en el canal de la flota que los servicios se agregaron
+        o removieron de este rack (solo si hay observadores) y actualiza
+        el indice de capacidad del DataCenter.
+        Se llama despues de soltar el lock, con el cambio ya aplicado
+        (_registrar_alta / _registrar_baja).
+        """
+        self._notificar_capacidad()
+        canal = CanalEventos.get_canal(C.CANAL_FLOTA)
+        if canal.tiene_observadores():
+            for servicio in servicios:
+                canal.notificar_observadores(EventoFlota(tipo, servicio, rack=self))
+
+    def _renovar_vista(self) -> None:
+        """Publica una nueva version de la VistaRack (requiere el lock)."""
+        self._version += 1
+        self._vista = self._crear_vista()
+
+    def _crear_vista(self) -> VistaRack:
+        """Crea la VistaRack del estado actual."""
+        return VistaRack(self._nombre, self._version, self._servicios_desplegados,
+                         self._espacio_maximo_u, self._espacio_ocupado_u, self._espacio_reservado_u,
+                         self._potencia_disponible_mw, self._potencia_reservada_total_mw,
+                         self._potencia_pendiente_mw, self._mapa_slots.get_bits())
+
+    def __getstate__(self) -> dict:
+        """
+        Estado para Pickle, copiado con el lock tomado para que sea
+        consistente aunque otro hilo este escribiendo.
+        Los Lock y la vista no se serializan (la vista se recrea).
+        """
+        with self._lock:
+            estado = self.__dict__.copy()
+            estado["_potencia_reservada_mw"] = self._potencia_reservada_mw.copy()
+            estado["_slots_servicios"] = self._slots_servicios.copy()
+            estado["_mapa_slots"] = self._mapa_slots.copiar()
+            estado["_sysadmins_asignados"] = self._sysadmins_asignados.copy()
+        del estado["_lock"]
+        del estado["_vista"]
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        """
+        Restaura el rack desde Pickle y vuelve a enlazar cada servicio
+        con este rack (las referencias al rack no se persisten).
+        """
+        self.__dict__.update(estado)
+        self._lock = RLock()
+        # Pickle anterior a copy-on-write: la lista pasa a tupla
+        self._servicios_desplegados = tuple(self._servicios_desplegados)
+        self._version = estado.get("_version", 0)
+        self._espacio_reservado_u = estado.get("_espacio_reservado_u", 0)
+        self._potencia_pendiente_mw = estado.get("_potencia_pendiente_mw", 0.0)
+        if "_potencia_reservada_mw" not in estado:
+            # Pickle anterior a las reservas: se reservan las potencias actuales
+            self._potencia_reservada_mw = {servicio.get_id(): servicio.get_potencia_consumida()
+                                           for servicio in self._servicios_desplegados}
+            self._potencia_reservada_total_mw = sum(self._potencia_reservada_mw.values())
+        if "_mapa_slots" not in estado:
+            # Pickle anterior a las posiciones fisicas: se ubican en orden, compactados
+            self._mapa_slots = MapaSlotsU(self._espacio_maximo_u)
+            self._slots_servicios = {}
+            inicio_u = 0
+            for servicio in self._servicios_desplegados:
+                espacio_u = min(servicio.get_espacio_u(), max(self._espacio_maximo_u - inicio_u, 0))
+                self._mapa_slots.ocupar(inicio_u, espacio_u)
+                self._slots_servicios[servicio.get_id()] = (inicio_u, espacio_u)
+                inicio_u += espacio_u
+        self._vista = self._crear_vista()
+        for servicio in self._servicios_desplegados:
+            servicio.set_rack(self)
+
+    def _notificar_capacidad(self) -> None:
+        """Avisa al indice de capacidad del DataCenter que cambio la capacidad libre."""
+        if self._datacenter is not None:
+            self._datacenter.get_indice_capacidad().actualizar_rack(self)
 
     def get_sysadmins_asignados(self) -> List['SysAdmin']:
         """
@@ -150,4 +560,5 @@ class ServerRack:
         Args:
             sysadmins (List[SysAdmin]): La nueva lista de SysAdmins.
         """
-        self._sysadmins_asignados = sysadmins.copy()
\ No newline at end of file
+        with self._lock:
+            self._sysadmins_asignados = sysadmins.copy()
\ No newline at end of file
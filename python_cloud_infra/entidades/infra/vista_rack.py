@@ -0,0 +1,114 @@
+"""
+Modulo de la VistaRack.
+
+Foto inmutable (una version) del estado de un ServerRack, para leerlo
+sin tomar su lock.
+"""
+from __future__ import annotations
+from typing import List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+
+
+class VistaRack:
+    """
+    Version inmutable del estado de un ServerRack.
+
+    El rack publica una vista nueva al final de cada escritura (con su
+    lock tomado) y la reemplaza de una sola asignacion, por lo que un
+    lector que toma 'get_vista()' ve siempre un estado que existio
+    completo: los servicios, el espacio y la potencia de la misma
+    version. Los lectores no toman el lock ni bloquean a los escritores.
+
+    La vista fija QUE servicios hay en el rack, no los atributos de cada
+    servicio (potencia consumida, parches), que siguen cambiando.
+
+    Referencia: US-002, US-012
+    """
+
+    def __init__(self,
+                 nombre: str,
+                 version: int,
+                 servicios: Tuple['Servicio', ...],
+                 espacio_maximo_u: int,
+                 espacio_ocupado_u: int,
+                 espacio_reservado_u: int,
+                 potencia_disponible_mw: float,
+                 potencia_reservada_mw: float,
+                 potencia_pendiente_mw: float,
+                 slots_ocupados: int):
+        """
+        Inicializa la vista.
+
+        Args:
+            nombre (str): Nombre del rack.
+            version (int): Version del rack (crece con cada escritura).
+            servicios (Tuple[Servicio, ...]): Servicios desplegados.
+            espacio_maximo_u (int): Espacio total en U.
+            espacio_ocupado_u (int): Espacio ocupado en U.
+            espacio_reservado_u (int): U reservadas por despliegues en curso.
+            potencia_disponible_mw (float): Potencia disponible en MW.
+            potencia_reservada_mw (float): MW reservados por los servicios.
+            potencia_pendiente_mw (float): MW reservados por despliegues en curso.
+            slots_ocupados (int): Mapa de bits de slots ocupados.
+        """
+        self._nombre: str = nombre
+        self._version: int = version
+        self._servicios: Tuple['Servicio', ...] = servicios
+        self._espacio_maximo_u: int = espacio_maximo_u
+        self._espacio_ocupado_u: int = espacio_ocupado_u
+        self._espacio_reservado_u: int = espacio_reservado_u
+        self._potencia_disponible_mw: float = potencia_disponible_mw
+        self._potencia_reservada_mw: float = potencia_reservada_mw
+        self._potencia_pendiente_mw: float = potencia_pendiente_mw
+        self._slots_ocupados: int = slots_ocupados
+
+    def get_nombre(self) -> str:
+        """Obtiene el nombre del rack."""
+        return self._nombre
+
+    def get_version(self) -> int:
+        """Obtiene la version del rack de esta vista."""
+        return self._version
+
+    def get_servicios_desplegados(self) -> List['Servicio']:
+        """Obtiene una COPIA de los servicios de esta version (Rubrica 5.2)."""
+        return list(self._servicios)
+
+    def get_cantidad_servicios(self) -> int:
+        """Obtiene la cantidad de servicios de esta version."""
+        return len(self._servicios)
+
+    def get_espacio_maximo_u(self) -> int:
+        """Obtiene el espacio maximo en U."""
+        return self._espacio_maximo_u
+
+    def get_espacio_ocupado_u(self) -> int:
+        """Obtiene el espacio ocupado en U."""
+        return self._espacio_ocupado_u
+
+    def get_espacio_reservado_u(self) -> int:
+        """Obtiene las U reservadas por despliegues en curso."""
+        return self._espacio_reservado_u
+
+    def get_espacio_disponible_u(self) -> int:
+        """Obtiene el espacio disponible en U (descontando el reservado)."""
+        return self._espacio_maximo_u - self._espacio_ocupado_u - self._espacio_reservado_u
+
+    def get_potencia_disponible_mw(self) -> float:
+        """Obtiene la potencia disponible en MW."""
+        return self._potencia_disponible_mw
+
+    def get_potencia_reservada_mw(self) -> float:
+        """Obtiene los MW reservados por los servicios desplegados."""
+        return self._potencia_reservada_mw
+
+    def get_potencia_libre_mw(self) -> float:
+        """Obtiene los MW libres para nuevos servicios (nunca negativos)."""
+        return max(0.0, self._potencia_disponible_mw - self._potencia_reservada_mw
+                   - self._potencia_pendiente_mw)
+
+    def get_slots_ocupados_u(self) -> int:
+        """Obtiene la cantidad de slots ocupados (por servicios o reservas)."""
+        return self._slots_ocupados.bit_count()
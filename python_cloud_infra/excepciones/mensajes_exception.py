@@ -7,10 +7,30 @@ Modulo centralizado para los mensajes de error del sistema (Dominio CloudInfra).
 # PotenciaInsuficienteException (US-008)
 TEC_POTENCIA_INSUFICIENTE = "Potencia disponible ({:.2f} MW) es menor que la requerida ({} MW)"
 USR_POTENCIA_INSUFICIENTE = "No hay suficiente potencia (MW) en el rack para esta operacion."
+TEC_PRESUPUESTO_INSUFICIENTE = "Presupuesto de potencia de '{}' disponible ({:.2f} MW) es menor que el requerido ({:.2f} MW)"
+USR_PRESUPUESTO_INSUFICIENTE = "El DataCenter no tiene presupuesto de potencia (MW) para esta operacion."
 
 # EspacioInsuficienteException (US-004)
 TEC_ESPACIO_INSUFICIENTE = "Espacio disponible ({} U) es menor que el requerido ({} U)"
 USR_ESPACIO_INSUFICIENTE = "No hay suficiente espacio (U) en el server rack."
+TEC_ESPACIO_FRAGMENTADO = "El rack '{}' no tiene slots contiguos para {} servicio(s) de {} U (mayor hueco: {} U)"
+USR_ESPACIO_FRAGMENTADO = "El espacio libre del server rack esta fragmentado; desfragmente el rack."
+TEC_DESFRAGMENTACION_IMPOSIBLE = "El rack '{}' no puede liberar {} U contiguas ({} U libres)"
+USR_DESFRAGMENTACION_IMPOSIBLE = "No se puede liberar ese espacio contiguo en el server rack."
+TEC_SIN_RACK_DISPONIBLE = "Ningun rack del DataCenter {} tiene {} U y {:.2f} MW libres"
+USR_SIN_RACK_DISPONIBLE = "No hay ningun server rack con espacio (U) y potencia (MW) para el despliegue."
+TEC_PLAN_INCOMPLETO = "El plan de colocacion dejo instancias sin rack: {}"
+USR_PLAN_INCOMPLETO = "No hay espacio (U) y potencia (MW) en los racks para todo el despliegue."
+TEC_PLAN_DESACTUALIZADO = "El rack '{}' ya no tiene la capacidad del plan ({} U / {:.2f} MW libres, se planificaron {} U / {:.2f} MW)"
+USR_PLAN_DESACTUALIZADO = "Los racks cambiaron desde que se planifico el despliegue; vuelva a planificarlo."
+TEC_MIGRACION_SIN_CAPACIDAD = "El rack '{}' no puede recibir {} servicio(s): requieren {} U / {:.2f} MW y tiene {} U / {:.2f} MW libres"
+USR_MIGRACION_SIN_CAPACIDAD = "El server rack destino no tiene espacio (U) o potencia (MW) para la migracion."
+
+# ShardException (US-018)
+TEC_SHARD_ERROR = "El shard {} fallo al ejecutar '{}': {}: {}"
+USR_SHARD_ERROR = "No se pudo completar la operacion en uno de los grupos de DataCenters."
+TEC_SHARD_CAIDO = "El proceso del shard {} no responde (exitcode {})."
+USR_SHARD_CAIDO = "Uno de los grupos de DataCenters no esta disponible."
 
 # --- Mensajes de Excepciones de Persistencia ---
 
@@ -28,4 +48,23 @@ USR_ESCRIBIR_IO = "Error de escritura: No se tienen permisos o el directorio no
 TEC_ESCRIBIR_PICKLE = "PickleError: Error al serializar el objeto {}."
 USR_ESCRIBIR_PICKLE = "Error de escritura: No se pudo guardar el registro del DataCenter."
 TEC_ESCRIBIR_OTRO = "Exception: Error desconocido al escribir el archivo {}."
-USR_ESCRIBIR_OTRO = "Error de escritura: Ocurrio un problema desconocido."
\ No newline at end of file
+USR_ESCRIBIR_OTRO = "Error de escritura: Ocurrio un problema desconocido."
+
+# SQLite (US-021, US-022)
+TEC_SQLITE_ESCRIBIR = "sqlite3.Error: No se pudo guardar el registro de {} en {}."
+USR_SQLITE_ESCRIBIR = "Error de escritura: No se pudo guardar el registro en la base de datos."
+TEC_SQLITE_LEER = "sqlite3.Error: No se pudo leer desde la base de datos {}."
+USR_SQLITE_LEER = "Error de lectura: No se pudo consultar la base de datos de registros."
+TEC_SQLITE_NO_EXISTE = "El cliente {} no tiene registros en la base de datos {}."
+
+# Delta / Generaciones (US-021, US-022)
+TEC_GENERACION_NO_EXISTE = "No existe la generacion {} (ni una base previa) en {}."
+USR_GENERACION_NO_EXISTE = "Error de lectura: La generacion pedida del registro no existe."
+
+# Checkpoint de Rollout de Parches (US-019)
+TEC_CHECKPOINT_NO_EXISTE = "No existe el checkpoint del rollout en {}."
+USR_CHECKPOINT_NO_EXISTE = "No hay un rollout interrumpido para reanudar."
+
+# Snapshot en Disco (US-020)
+TEC_SNAPSHOT_FORMATO = "El archivo {} no es un snapshot valido (cabecera o bloque invalido)."
+USR_SNAPSHOT_FORMATO = "Error de lectura: El archivo de snapshot esta corrupto."
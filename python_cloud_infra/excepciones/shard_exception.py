@@ -0,0 +1,28 @@
+"""
+Modulo de la Excepcion ShardException
+"""
+from .infra_exception import InfraException
+
+class ShardException(InfraException):
+    """
+    Excepcion lanzada cuando un shard (proceso worker del
+    CloudProviderShardedService) falla al ejecutar una operacion
+    o deja de responder.
+    
+    Referencia: US-018
+    """
+    def __init__(self, mensaje_tecnico: str, mensaje_usuario: str, id_shard: int):
+        """
+        Inicializa la excepcion de shard.
+
+        Args:
+            mensaje_tecnico (str): Mensaje tecnico detallado.
+            mensaje_usuario (str): Mensaje amigable para el usuario.
+            id_shard (int): El ID del shard que fallo.
+        """
+        super().__init__(mensaje_tecnico, mensaje_usuario)
+        self._id_shard = id_shard
+
+    def get_id_shard(self) -> int:
+        """Obtiene el ID del shard que fallo."""
+        return self._id_shard
@@ -103,7 +103,8 @@ class BalanceadorCargaTask(threading.Thread):
                 # 2. Intentar asignar recursos
                 try:
                     print(f"[{self.name}] ALERTA DE CARGA. Asignando recursos...")
-                    self._rack_service.asignar_recursos(self._rack)
+                    self._rack_service.asignar_recursos(
+                        self._rack, parcial=C.BALANCEO_ASIGNACION_PARCIAL)
                     print(f"[{self.name}] Asignación de recursos finalizada.")
                     
                 except PotenciaInsuficienteException as e:
@@ -0,0 +1,302 @@
+"""
+Modulo de la telemetria incremental AgregadosFlota.
+
+Implementa dos patrones de diseño:
+1.  Observer: se mantiene al dia con los eventos del canal de la flota
+    (servicios agregados/removidos y cambios de potencia, iops o workers).
+2.  Observable: publica los cambios de los agregados (DeltaAgregado)
+    para que los dashboards no tengan que recorrer la flota.
+"""
+from threading import RLock
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+from typing_extensions import override
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Patrones y Entidades ---
+from python_cloud_infra.patrones.observer.observer import Observer
+from python_cloud_infra.patrones.observer.observable import Observable
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+from python_cloud_infra.monitoreo.telemetria.delta_agregado import DeltaAgregado, NivelAgregado
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.datacenter import DataCenter
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# Metrica -> getter del servicio (los servicios sin el getter aportan 0)
+GETTERS_METRICAS: Dict[str, str] = {
+    C.ATRIBUTO_POTENCIA: "get_potencia_consumida",
+    C.ATRIBUTO_IOPS: "get_iops",
+    C.ATRIBUTO_WORKERS: "get_workers",
+    C.METRICA_ESPACIO_U: "get_espacio_u",
+}
+
+# Ruta de un servicio en la jerarquia: [(nivel, clave), ...] de rack a flota
+Ruta = List[Tuple[NivelAgregado, object]]
+
+
+class _AporteServicio:
+    """Lo que un servicio suma a los agregados, y por que ruta."""
+
+    __slots__ = ("rack", "ruta", "valores")
+
+    def __init__(self, rack: 'ServerRack', ruta: Ruta, valores: Dict[str, float]):
+        self.rack: 'ServerRack' = rack
+        self.ruta: Ruta = ruta
+        self.valores: Dict[str, float] = valores
+
+
+class AgregadosFlota(Observer[EventoFlota], Observable[DeltaAgregado]):
+    """
+    Agregados jerarquicos de la flota: servicio -> rack -> DataCenter
+    -> cliente -> flota.
+
+    - Cada metrica (potencia, iops, workers, U ocupadas, capacidad en U
+      y cantidad de servicios) se mantiene como suma acumulada en cada
+      nivel; un cambio en un servicio actualiza solo su ruta (O(niveles)).
+    - Los getters son O(1): no recorren servicios.
+    - Cada operacion publica un DeltaAgregado por (nivel, clave, metrica)
+      modificada, ya acumulado (registrar un DataCenter emite un delta
+      por agregado, no uno por servicio).
+    - Suma todos los racks de cada DataCenter registrado, tambien los
+      que se le agregan despues (evento RACK_AGREGADO).
+    - Los eventos de racks que no fueron registrados se ignoran.
+
+    Thread-safe (un RLock protege los agregados; los deltas se
+    notifican fuera del lock).
+
+    Referencia: US-012
+    """
+
+    def __init__(self):
+        """Inicializa los agregados vacios."""
+        Observable.__init__(self)
+        self._totales: Dict[NivelAgregado, Dict[object, Dict[str, float]]] = {
+            nivel: {} for nivel in NivelAgregado}
+        self._totales[NivelAgregado.FLOTA][None] = {}
+        self._aportes: Dict[int, _AporteServicio] = {}
+        self._registros: 'WeakKeyDictionary[ServerRack, RegistroDataCenter]' = WeakKeyDictionary()
+        self._registros_datacenter: 'WeakKeyDictionary[DataCenter, RegistroDataCenter]' = WeakKeyDictionary()
+        self._lock: RLock = RLock()
+
+        # Despacho de eventos por tipo (sin if/elif)
+        self._handlers: Dict[TipoEventoFlota, Callable[[EventoFlota, Dict], None]] = {
+            TipoEventoFlota.SERVICIO_AGREGADO: self._on_servicio_agregado,
+            TipoEventoFlota.SERVICIO_REMOVIDO: self._on_servicio_removido,
+            TipoEventoFlota.ATRIBUTO_MODIFICADO: self._on_atributo_modificado,
+            TipoEventoFlota.RACK_AGREGADO: self._on_rack_agregado,
+        }
+
+    # --- Mantenimiento ---
+
+    def registrar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Suma a los agregados los racks de un DataCenter y sus servicios,
+        y empieza a seguir los cambios de esos racks.
+
+        Args:
+            registro (RegistroDataCenter): El registro gestionado.
+        """
+        cambios: Dict[Tuple[NivelAgregado, object, str], float] = {}
+        with self._lock:
+            if registro.get_datacenter() in self._registros_datacenter:
+                return
+            self._registros_datacenter[registro.get_datacenter()] = registro
+            for server_rack in registro.get_racks():
+                self._registrar_rack(server_rack, registro, cambios)
+            deltas = self._crear_deltas(cambios)
+        self._publicar(deltas)
+
+    def quitar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Resta de los agregados los racks de un DataCenter y sus servicios.
+
+        Args:
+            registro (RegistroDataCenter): El registro que deja de gestionarse.
+        """
+        cambios: Dict[Tuple[NivelAgregado, object, str], float] = {}
+        with self._lock:
+            if self._registros_datacenter.pop(registro.get_datacenter(), None) is None:
+                return
+            racks_quitados: List['ServerRack'] = []
+            for server_rack in registro.get_racks():
+                if self._registros.pop(server_rack, None) is None:
+                    continue
+                racks_quitados.append(server_rack)
+                ruta = self._ruta(server_rack, registro)
+                for servicio in server_rack.get_servicios_desplegados():
+                    aporte = self._aportes.get(servicio.get_id())
+                    if aporte is not None and aporte.rack is server_rack:
+                        self._quitar(servicio.get_id(), cambios)
+                self._sumar(ruta, C.METRICA_CAPACIDAD_U, -server_rack.get_espacio_maximo_u(), cambios)
+            deltas = self._crear_deltas(cambios)
+            # Los racks dejan de ser claves de los agregados
+            for server_rack in racks_quitados:
+                self._totales[NivelAgregado.RACK].pop(server_rack, None)
+        self._publicar(deltas)
+
+    def _registrar_rack(self, server_rack: 'ServerRack', registro: 'RegistroDataCenter', cambios: Dict) -> None:
+        """Suma la capacidad y los servicios de un rack y empieza a seguirlo. Requiere el lock."""
+        if server_rack in self._registros:
+            return
+        self._registros[server_rack] = registro
+        ruta = self._ruta(server_rack, registro)
+        self._sumar(ruta, C.METRICA_CAPACIDAD_U, server_rack.get_espacio_maximo_u(), cambios)
+        for servicio in server_rack.get_servicios_desplegados():
+            self._agregar(servicio, server_rack, ruta, cambios)
+
+    @override
+    def actualizar(self, evento: EventoFlota) -> None:
+        """
+        Aplica un evento del canal de la flota a los agregados.
+
+        Args:
+            evento (EventoFlota): El evento publicado.
+        """
+        handler = self._handlers.get(evento.get_tipo())
+        if handler is None:
+            return
+        cambios: Dict[Tuple[NivelAgregado, object, str], float] = {}
+        with self._lock:
+            handler(evento, cambios)
+            deltas = self._crear_deltas(cambios)
+        self._publicar(deltas)
+
+    def _on_servicio_agregado(self, evento: EventoFlota, cambios: Dict) -> None:
+        server_rack = evento.get_rack()
+        registro = self._registros.get(server_rack)  # type: ignore
+        if registro is not None:
+            self._agregar(evento.get_servicio(), server_rack,  # type: ignore
+                          self._ruta(server_rack, registro), cambios)  # type: ignore
+
+    def _on_rack_agregado(self, evento: EventoFlota, cambios: Dict) -> None:
+        server_rack = evento.get_rack()
+        registro = self._registros_datacenter.get(server_rack.get_datacenter())  # type: ignore
+        if registro is not None:
+            self._registrar_rack(server_rack, registro, cambios)  # type: ignore
+
+    def _on_servicio_removido(self, evento: EventoFlota, cambios: Dict) -> None:
+        id_servicio = evento.get_servicio().get_id()
+        aporte = self._aportes.get(id_servicio)
+        # Solo si seguia en ESE rack (si ya se movio a otro, el aporte es el nuevo)
+        if aporte is not None and aporte.rack is evento.get_rack():
+            self._quitar(id_servicio, cambios)
+
+    def _on_atributo_modificado(self, evento: EventoFlota, cambios: Dict) -> None:
+        metrica = evento.get_atributo()
+        aporte = self._aportes.get(evento.get_servicio().get_id())
+        if aporte is None or metrica not in aporte.valores:
+            return
+        nuevo = float(evento.get_valor_nuevo())  # type: ignore
+        delta = nuevo - aporte.valores[metrica]  # type: ignore
+        aporte.valores[metrica] = nuevo  # type: ignore
+        self._sumar(aporte.ruta, metrica, delta, cambios)  # type: ignore
+
+    def _agregar(self, servicio: 'Servicio', server_rack: 'ServerRack', ruta: Ruta, cambios: Dict) -> None:
+        """Suma el aporte de un servicio. Requiere el lock."""
+        id_servicio = servicio.get_id()
+        if id_servicio in self._aportes:
+            self._quitar(id_servicio, cambios)
+        valores: Dict[str, float] = {C.METRICA_SERVICIOS: 1.0}
+        for metrica, getter in GETTERS_METRICAS.items():
+            metodo = getattr(servicio, getter, None)
+            valores[metrica] = float(metodo()) if metodo is not None else 0.0
+        self._aportes[id_servicio] = _AporteServicio(server_rack, ruta, valores)
+        for metrica, valor in valores.items():
+            self._sumar(ruta, metrica, valor, cambios)
+
+    def _quitar(self, id_servicio: int, cambios: Dict) -> None:
+        """Resta el aporte de un servicio. Requiere el lock."""
+        aporte = self._aportes.pop(id_servicio)
+        for metrica, valor in aporte.valores.items():
+            self._sumar(aporte.ruta, metrica, -valor, cambios)
+
+    def _sumar(self, ruta: Ruta, metrica: str, delta: float, cambios: Dict) -> None:
+        """Suma 'delta' a la metrica en cada nivel de la ruta. Requiere el lock."""
+        if delta == 0:
+            return
+        for nivel, clave in ruta:
+            totales = self._totales[nivel].setdefault(clave, {})
+            totales[metrica] = totales.get(metrica, 0.0) + delta
+            cambios[(nivel, clave, metrica)] = cambios.get((nivel, clave, metrica), 0.0) + delta
+
+    @staticmethod
+    def _ruta(server_rack: 'ServerRack', registro: 'RegistroDataCenter') -> Ruta:
+        return [(NivelAgregado.RACK, server_rack),
+                (NivelAgregado.DATACENTER, registro.get_id_datacenter()),
+                (NivelAgregado.CLIENTE, registro.get_cliente_corporativo()),
+                (NivelAgregado.FLOTA, None)]
+
+    def _crear_deltas(self, cambios: Dict[Tuple[NivelAgregado, object, str], float]) -> List[DeltaAgregado]:
+        """Arma los deltas acumulados de una operacion. Requiere el lock."""
+        if not self._observadores:
+            return []
+        return [DeltaAgregado(nivel, clave, metrica, delta, self._totales[nivel][clave][metrica])
+                for (nivel, clave, metrica), delta in cambios.items() if delta != 0]
+
+    def _publicar(self, deltas: List[DeltaAgregado]) -> None:
+        for delta in deltas:
+            self.notificar_observadores(delta)
+
+    # --- Consultas (O(1)) ---
+
+    def get_total(self,
+                  metrica: str,
+                  nivel: NivelAgregado = NivelAgregado.FLOTA,
+                  clave: object = None) -> float:
+        """
+        Obtiene el valor de una metrica en un agregado.
+
+        Ejemplo:
+            agregados.get_total(C.ATRIBUTO_POTENCIA, NivelAgregado.DATACENTER, 7)
+
+        Args:
+            metrica (str): La metrica (ej. C.ATRIBUTO_POTENCIA, C.METRICA_ESPACIO_U).
+            nivel (NivelAgregado, optional): El nivel. Defaults a toda la flota.
+            clave (object, optional): La clave en ese nivel (rack, ID de
+                DataCenter o cliente). None para la flota.
+
+        Returns:
+            float: El valor (0.0 si el agregado no existe).
+        """
+        with self._lock:
+            return self._totales[nivel].get(clave, {}).get(metrica, 0.0)
+
+    def get_totales(self, nivel: NivelAgregado = NivelAgregado.FLOTA, clave: object = None) -> Dict[str, float]:
+        """Obtiene una COPIA de todas las metricas de un agregado."""
+        with self._lock:
+            return dict(self._totales[nivel].get(clave, {}))
+
+    def get_utilizacion_u(self, nivel: NivelAgregado = NivelAgregado.FLOTA, clave: object = None) -> float:
+        """
+        Obtiene la fraccion de U ocupadas (0.0 a 1.0) de un agregado.
+
+        Args:
+            nivel (NivelAgregado, optional): El nivel. Defaults a toda la flota.
+            clave (object, optional): La clave en ese nivel.
+
+        Returns:
+            float: U ocupadas / U totales (0.0 si no hay capacidad).
+        """
+        with self._lock:
+            totales = self._totales[nivel].get(clave, {})
+            capacidad = totales.get(C.METRICA_CAPACIDAD_U, 0.0)
+            if capacidad <= 0:
+                return 0.0
+            return totales.get(C.METRICA_ESPACIO_U, 0.0) / capacidad
+
+    def get_claves(self, nivel: NivelAgregado) -> List[object]:
+        """Obtiene las claves existentes en un nivel (ej. los clientes)."""
+        with self._lock:
+            return list(self._totales[nivel])
+
+    def get_aporte_servicio(self, id_servicio: int) -> Dict[str, float]:
+        """Obtiene una COPIA de las metricas que aporta un servicio (vacio si no esta)."""
+        with self._lock:
+            aporte = self._aportes.get(id_servicio)
+            return dict(aporte.valores) if aporte is not None else {}
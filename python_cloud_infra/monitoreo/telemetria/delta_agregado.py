@@ -0,0 +1,64 @@
+"""
+Modulo del evento DeltaAgregado.
+
+Cambios de los agregados de telemetria de la flota, publicados por
+AgregadosFlota a sus observadores (ej. dashboards).
+"""
+from enum import Enum
+
+
+class NivelAgregado(Enum):
+    """
+    Enumera los niveles de la jerarquia de agregados.
+    """
+    RACK = "rack"
+    DATACENTER = "datacenter"
+    CLIENTE = "cliente"
+    FLOTA = "flota"
+
+
+class DeltaAgregado:
+    """
+    Cambio de una metrica en un agregado: que nivel y clave (ej.
+    DATACENTER 7), que metrica, cuanto cambio y el total resultante.
+    """
+
+    __slots__ = ("_nivel", "_clave", "_metrica", "_delta", "_total")
+
+    def __init__(self, nivel: NivelAgregado, clave: object, metrica: str, delta: float, total: float):
+        """
+        Inicializa el delta.
+
+        Args:
+            nivel (NivelAgregado): El nivel del agregado.
+            clave (object): La clave en ese nivel (rack, ID de DataCenter,
+                            cliente, o None para la flota).
+            metrica (str): La metrica (ej. C.ATRIBUTO_POTENCIA).
+            delta (float): El cambio aplicado.
+            total (float): El valor del agregado luego del cambio.
+        """
+        self._nivel: NivelAgregado = nivel
+        self._clave: object = clave
+        self._metrica: str = metrica
+        self._delta: float = delta
+        self._total: float = total
+
+    def get_nivel(self) -> NivelAgregado:
+        """Obtiene el nivel del agregado."""
+        return self._nivel
+
+    def get_clave(self) -> object:
+        """Obtiene la clave del agregado en su nivel."""
+        return self._clave
+
+    def get_metrica(self) -> str:
+        """Obtiene la metrica modificada."""
+        return self._metrica
+
+    def get_delta(self) -> float:
+        """Obtiene el cambio aplicado."""
+        return self._delta
+
+    def get_total(self) -> float:
+        """Obtiene el valor del agregado luego del cambio."""
+        return self._total
@@ -1,8 +1,11 @@
 """
 Modulo de la implementacion del Patron Factory Method.
 """
+from typing import Callable, Dict, List, Tuple
 from typing_extensions import override
 
+from python_cloud_infra import constantes as C
+
 # Imports de Entidades (las 4 clases que crea esta factory)
 from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
 from python_cloud_infra.entidades.aplicaciones.servicio_database import ServicioDatabase
@@ -48,6 +51,26 @@ class ServicioFactory:
         # US-007: Valores por defecto
         return ServicioCache(in_memoria=True)
 
+    # Diccionario de factories (Rubrica 1.2), armado una sola vez.
+    # NO USAR LAMBDAS (Rubrica 3.4)
+    _FACTORIES: Dict[str, Callable[[], Servicio]] = {
+        "Database": _crear_database,
+        "Batch": _crear_batch,
+        "WebApp": _crear_webapp,
+        "Cache": _crear_cache
+    }
+
+    # Huella de cada tipo (U, MW base), leida sin instanciar (US-004 a US-007)
+    _METADATA: Dict[str, Tuple[int, float]] = {
+        "Database": (C.ESPACIO_U_DATABASE, C.POTENCIA_BASE_DATABASE),
+        "Batch": (C.ESPACIO_U_BATCH, C.POTENCIA_BASE_BATCH),
+        "WebApp": (C.ESPACIO_U_WEBAPP, C.POTENCIA_BASE_WEBAPP),
+        "Cache": (C.ESPACIO_U_CACHE, C.POTENCIA_BASE_CACHE)
+    }
+
+    # Prototipos por tipo para la creacion masiva (Patron Prototype)
+    _prototipos: Dict[str, Servicio] = {}
+
     @staticmethod
     def crear_servicio(tipo_servicio: str) -> Servicio:
         """
@@ -65,20 +88,83 @@ class ServicioFactory:
         Returns:
             Servicio: Una instancia de una subclase de Servicio.
         """
-        # El diccionario de factories exigido por la rubrica.
-        # NO USAR LAMBDAS (Rubrica 3.4)
-        factories = {
-            "Database": ServicioFactory._crear_database,
-            "Batch": ServicioFactory._crear_batch,
-            "WebApp": ServicioFactory._crear_webapp,
-            "Cache": ServicioFactory._crear_cache
-        }
-
-        if tipo_servicio not in factories:
-            raise ValueError(f"Tipo de servicio desconocido: {tipo_servicio}")
-
         # Llama al metodo factory privado correspondiente
-        creador_servicio = factories[tipo_servicio]
+        creador_servicio = ServicioFactory._get_creador(tipo_servicio)
         servicio_creado = creador_servicio()
         
-        return servicio_creado
\ No newline at end of file
+        return servicio_creado
+
+    @staticmethod
+    def crear_servicios(tipo_servicio: str, cantidad: int) -> List[Servicio]:
+        """
+        Crea N servicios del mismo tipo de una vez.
+
+        Resuelve el factory una sola vez, reserva los N IDs en un solo
+        paso y clona un prototipo del tipo (Patron Prototype) en lugar de
+        ejecutar el constructor N veces. Los clones son equivalentes a
+        los creados con crear_servicio.
+
+        Args:
+            tipo_servicio (str): El tipo de servicio a crear (ej. "Database").
+            cantidad (int): Cuantos servicios crear.
+
+        Raises:
+            ValueError: Si el tipo es desconocido o la cantidad es negativa.
+
+        Returns:
+            List[Servicio]: Los servicios creados, con IDs consecutivos.
+        """
+        if cantidad < 0:
+            raise ValueError("La cantidad de servicios no puede ser negativa")
+        prototipo = ServicioFactory._get_prototipo(tipo_servicio)
+        if cantidad == 0:
+            return []
+        return prototipo.clonar(Servicio.reservar_ids(cantidad), cantidad)
+
+    @staticmethod
+    def get_tipos() -> List[str]:
+        """Obtiene los tipos de servicio que crea el factory."""
+        return list(ServicioFactory._FACTORIES)
+
+    @staticmethod
+    def get_espacio_u(tipo_servicio: str) -> int:
+        """
+        Obtiene las U que ocupa un servicio del tipo, sin instanciarlo.
+
+        Raises:
+            ValueError: Si el tipo de servicio es desconocido.
+        """
+        return ServicioFactory._get_metadata(tipo_servicio)[0]
+
+    @staticmethod
+    def get_potencia_base(tipo_servicio: str) -> float:
+        """
+        Obtiene la potencia base (MW) de un servicio del tipo, sin instanciarlo.
+
+        Raises:
+            ValueError: Si el tipo de servicio es desconocido.
+        """
+        return ServicioFactory._get_metadata(tipo_servicio)[1]
+
+    @staticmethod
+    def _get_creador(tipo_servicio: str) -> Callable[[], Servicio]:
+        """Obtiene el metodo factory privado del tipo."""
+        if tipo_servicio not in ServicioFactory._FACTORIES:
+            raise ValueError(f"Tipo de servicio desconocido: {tipo_servicio}")
+        return ServicioFactory._FACTORIES[tipo_servicio]
+
+    @staticmethod
+    def _get_metadata(tipo_servicio: str) -> Tuple[int, float]:
+        """Obtiene (U, MW base) del tipo."""
+        if tipo_servicio not in ServicioFactory._METADATA:
+            raise ValueError(f"Tipo de servicio desconocido: {tipo_servicio}")
+        return ServicioFactory._METADATA[tipo_servicio]
+
+    @staticmethod
+    def _get_prototipo(tipo_servicio: str) -> Servicio:
+        """Obtiene (y crea la primera vez) el prototipo del tipo."""
+        prototipo = ServicioFactory._prototipos.get(tipo_servicio)
+        if prototipo is None:
+            prototipo = ServicioFactory._get_creador(tipo_servicio)()
+            ServicioFactory._prototipos[tipo_servicio] = prototipo
+        return prototipo
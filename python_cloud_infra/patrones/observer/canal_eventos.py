@@ -0,0 +1,90 @@
+"""
+Modulo del Observable compartido CanalEventos.
+
+Canal de eventos con nombre (publish/subscribe) basado en Observable:
+las entidades publican en el canal sin guardar referencias a sus
+observadores, por lo que siguen siendo serializables con Pickle.
+"""
+from threading import Lock
+from typing import ClassVar, Dict, List
+from weakref import WeakSet
+
+from .observable import Observable
+from .observer import Observer, T
+
+
+class CanalEventos(Observable[T]):
+    """
+    Observable compartido e identificado por nombre.
+
+    - Los canales se obtienen con CanalEventos.get_canal(nombre)
+      (una instancia unica por nombre, como un Singleton por clave).
+    - Los observadores se guardan con referencias debiles: un observador
+      que ya no se usa deja de recibir eventos sin tener que eliminarlo.
+    - 'tiene_observadores' permite a quien publica no construir el
+      evento cuando nadie escucha.
+
+    Referencia: US-TECH-003, Rubrica 1.3
+    """
+
+    _canales: ClassVar[Dict[str, 'CanalEventos']] = {}
+    _lock_canales: ClassVar[Lock] = Lock()
+
+    def __init__(self, nombre: str):
+        """
+        Inicializa un canal sin observadores.
+        (Usar CanalEventos.get_canal para obtener el canal compartido).
+
+        Args:
+            nombre (str): El nombre del canal.
+        """
+        super().__init__()
+        self._nombre: str = nombre
+        self._observadores_debiles: 'WeakSet[Observer[T]]' = WeakSet()
+
+    @classmethod
+    def get_canal(cls, nombre: str) -> 'CanalEventos':
+        """
+        Obtiene el canal con ese nombre, creandolo si no existe.
+
+        Args:
+            nombre (str): El nombre del canal.
+
+        Returns:
+            CanalEventos: El canal compartido.
+        """
+        canal = cls._canales.get(nombre)
+        if canal is None:
+            with cls._lock_canales:
+                canal = cls._canales.get(nombre)
+                if canal is None:
+                    canal = cls(nombre)
+                    cls._canales[nombre] = canal
+        return canal
+
+    def get_nombre(self) -> str:
+        """Obtiene el nombre del canal."""
+        return self._nombre
+
+    def agregar_observador(self, observador: Observer[T]) -> None:
+        """Suscribe un observador (referencia debil)."""
+        self._observadores_debiles.add(observador)
+
+    def eliminar_observador(self, observador: Observer[T]) -> None:
+        """Desuscribe un observador, si estaba suscripto."""
+        self._observadores_debiles.discard(observador)
+
+    def tiene_observadores(self) -> bool:
+        """Indica si hay al menos un observador suscripto."""
+        return len(self._observadores_debiles) > 0
+
+    def notificar_observadores(self, evento: T) -> None:
+        """
+        Notifica el evento a todos los observadores vivos.
+
+        Args:
+            evento (T): El evento a publicar.
+        """
+        observadores: List[Observer[T]] = list(self._observadores_debiles)
+        for observador in observadores:
+            observador.actualizar(evento)
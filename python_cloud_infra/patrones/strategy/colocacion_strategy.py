@@ -0,0 +1,134 @@
+"""
+Modulo de la interfaz abstracta (Strategy) ColocacionStrategy.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from math import floor
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# Margen para comparar MW (sumas de float)
+_TOLERANCIA: float = 1e-9
+
+
+class RackPlanificado:
+    """
+    Vista de un ServerRack durante la planificacion de una colocacion:
+    lleva la capacidad libre (U y MW) y la cantidad de instancias por tipo
+    que quedarian en el rack, sin modificar el rack real.
+
+    Expone los mismos getters de capacidad que ServerRack, por lo que
+    puede indexarse en un IndiceCapacidadRacks.
+
+    Referencia: US-002, US-004
+    """
+
+    def __init__(self, rack: 'ServerRack', orden: int):
+        """
+        Toma una foto de la capacidad libre y los tipos del rack.
+
+        Args:
+            rack (ServerRack): El rack real.
+            orden (int): Posicion del rack en la lista a planificar.
+        """
+        self._rack: 'ServerRack' = rack
+        self._orden: int = orden
+        self._espacio_libre_u: int = rack.get_espacio_disponible_u()
+        self._potencia_libre_mw: float = rack.get_potencia_libre_mw()
+        self._instancias_por_tipo: Dict[str, int] = {}
+        for servicio in rack.get_servicios_desplegados():
+            tipo = servicio.get_tipo()
+            self._instancias_por_tipo[tipo] = self._instancias_por_tipo.get(tipo, 0) + 1
+
+    def get_rack(self) -> 'ServerRack':
+        """Obtiene el rack real."""
+        return self._rack
+
+    def get_orden(self) -> int:
+        """Obtiene la posicion del rack en la lista a planificar."""
+        return self._orden
+
+    def get_espacio_disponible_u(self) -> int:
+        """Obtiene las U libres que quedan en el plan."""
+        return self._espacio_libre_u
+
+    def get_potencia_libre_mw(self) -> float:
+        """Obtiene los MW libres que quedan en el plan."""
+        return self._potencia_libre_mw
+
+    def get_instancias(self, tipo: str) -> int:
+        """Obtiene cuantas instancias del tipo quedarian en el rack."""
+        return self._instancias_por_tipo.get(tipo, 0)
+
+    def capacidad_para(self, tipo: str, espacio_u: int, potencia_mw: float,
+                       max_por_rack: int | None) -> int:
+        """
+        Calcula cuantas instancias mas del tipo entran en el rack,
+        por U, por MW y por anti-afinidad.
+
+        Args:
+            tipo (str): Tipo de servicio.
+            espacio_u (int): U de cada instancia.
+            potencia_mw (float): MW base de cada instancia.
+            max_por_rack (int | None): Maximo de instancias del tipo por
+                rack (anti-afinidad), o None si no hay limite.
+
+        Returns:
+            int: Cantidad de instancias que entran (>= 0).
+        """
+        capacidad = self._espacio_libre_u // espacio_u if espacio_u > 0 else None
+        if potencia_mw > 0:
+            por_potencia = floor(self._potencia_libre_mw / potencia_mw + _TOLERANCIA)
+            capacidad = por_potencia if capacidad is None else min(capacidad, por_potencia)
+        if max_por_rack is not None:
+            cupo = max_por_rack - self.get_instancias(tipo)
+            capacidad = cupo if capacidad is None else min(capacidad, cupo)
+        if capacidad is None:
+            raise ValueError("Una instancia sin U, MW ni anti-afinidad no tiene limite por rack")
+        return max(capacidad, 0)
+
+    def reservar(self, tipo: str, espacio_u: int, potencia_mw: float, cantidad: int) -> None:
+        """Descuenta del plan la capacidad de 'cantidad' instancias del tipo."""
+        self._espacio_libre_u -= espacio_u * cantidad
+        self._potencia_libre_mw = max(0.0, self._potencia_libre_mw - potencia_mw * cantidad)
+        self._instancias_por_tipo[tipo] = self.get_instancias(tipo) + cantidad
+
+
+class ColocacionStrategy(ABC):
+    """
+    Interfaz (Strategy) para definir heuristicas intercambiables de
+    colocacion (bin-packing) de instancias en racks, sobre U y MW.
+
+    El motor de colocacion llama a la estrategia una vez por grupo de
+    instancias identicas (mismo tipo), de mayor a menor tamanio.
+
+    Referencia: US-004, US-TECH-004
+    """
+
+    @abstractmethod
+    def colocar(self,
+                racks: List[RackPlanificado],
+                tipo: str,
+                espacio_u: int,
+                potencia_mw: float,
+                cantidad: int,
+                max_por_rack: int | None) -> List[Tuple[RackPlanificado, int]]:
+        """
+        Coloca hasta 'cantidad' instancias identicas en los racks,
+        reservando en cada RackPlanificado lo que se le asigna.
+
+        Args:
+            racks (List[RackPlanificado]): Los racks, en el orden del pedido.
+            tipo (str): Tipo de servicio.
+            espacio_u (int): U de cada instancia.
+            potencia_mw (float): MW base de cada instancia.
+            cantidad (int): Instancias a colocar.
+            max_por_rack (int | None): Anti-afinidad (maximo por rack), o None.
+
+        Returns:
+            List[Tuple[RackPlanificado, int]]: Rack -> instancias colocadas.
+                Si no entran todas, la suma es menor que 'cantidad'.
+        """
+        pass
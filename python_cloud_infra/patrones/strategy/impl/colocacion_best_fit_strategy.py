@@ -0,0 +1,68 @@
+"""
+Modulo de la implementacion "Best-Fit" del Strategy de colocacion.
+"""
+from typing import List, Tuple
+from typing_extensions import override
+
+# Imports de la interfaz Strategy
+from python_cloud_infra.patrones.strategy.colocacion_strategy import (
+    ColocacionStrategy, RackPlanificado)
+
+# Imports de Entidades
+from python_cloud_infra.entidades.infra.indice_capacidad_racks import IndiceCapacidadRacks
+
+
+class ColocacionBestFitStrategy(ColocacionStrategy):
+    """
+    Heuristica Best-Fit.
+
+    Cada instancia va al rack donde queda menos espacio libre (U, y a
+    igual U menos MW). Los racks se indexan en un IndiceCapacidadRacks,
+    que responde el rack mas ajustado en tiempo logaritmico; como las
+    instancias de un grupo son identicas, el rack elegido sigue siendo el
+    mas ajustado hasta llenarse, asi que se lo llena de una vez y sale
+    del indice del grupo.
+
+    Referencia: US-004, US-TECH-004
+    """
+
+    @override
+    def colocar(self,
+                racks: List[RackPlanificado],
+                tipo: str,
+                espacio_u: int,
+                potencia_mw: float,
+                cantidad: int,
+                max_por_rack: int | None) -> List[Tuple[RackPlanificado, int]]:
+        """
+        Llena primero los racks mas ajustados que todavia admiten el tipo.
+
+        Args:
+            racks (List[RackPlanificado]): Los racks, en el orden del pedido.
+            tipo (str): Tipo de servicio.
+            espacio_u (int): U de cada instancia.
+            potencia_mw (float): MW base de cada instancia.
+            cantidad (int): Instancias a colocar.
+            max_por_rack (int | None): Anti-afinidad (maximo por rack), o None.
+
+        Returns:
+            List[Tuple[RackPlanificado, int]]: Rack -> instancias colocadas.
+        """
+        indice = IndiceCapacidadRacks()
+        for rack in racks:
+            if rack.capacidad_para(tipo, espacio_u, potencia_mw, max_por_rack) > 0:
+                indice.agregar_rack(rack)
+
+        colocaciones: List[Tuple[RackPlanificado, int]] = []
+        restantes = cantidad
+        while restantes > 0:
+            rack = indice.buscar_rack(espacio_u, potencia_mw)
+            if rack is None:
+                break
+            indice.quitar_rack(rack)
+            colocadas = min(restantes, rack.capacidad_para(tipo, espacio_u, potencia_mw, max_por_rack))
+            if colocadas > 0:
+                rack.reservar(tipo, espacio_u, potencia_mw, colocadas)
+                colocaciones.append((rack, colocadas))
+                restantes -= colocadas
+        return colocaciones
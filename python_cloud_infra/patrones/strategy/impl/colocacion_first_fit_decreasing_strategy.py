@@ -0,0 +1,57 @@
+"""
+Modulo de la implementacion "First-Fit Decreasing" del Strategy de colocacion.
+"""
+from typing import List, Tuple
+from typing_extensions import override
+
+# Imports de la interfaz Strategy
+from python_cloud_infra.patrones.strategy.colocacion_strategy import (
+    ColocacionStrategy, RackPlanificado)
+
+
+class ColocacionFirstFitDecreasingStrategy(ColocacionStrategy):
+    """
+    Heuristica First-Fit Decreasing.
+
+    El motor entrega los grupos de mayor a menor tamanio; cada instancia
+    va al primer rack (en el orden del pedido) donde entra. Como las
+    instancias de un grupo son identicas, un rack donde ya no entra una
+    tampoco recibe las siguientes: alcanza con llenar los racks en orden,
+    O(racks) por grupo.
+
+    Referencia: US-004, US-TECH-004
+    """
+
+    @override
+    def colocar(self,
+                racks: List[RackPlanificado],
+                tipo: str,
+                espacio_u: int,
+                potencia_mw: float,
+                cantidad: int,
+                max_por_rack: int | None) -> List[Tuple[RackPlanificado, int]]:
+        """
+        Llena los racks en orden hasta colocar todas las instancias.
+
+        Args:
+            racks (List[RackPlanificado]): Los racks, en el orden del pedido.
+            tipo (str): Tipo de servicio.
+            espacio_u (int): U de cada instancia.
+            potencia_mw (float): MW base de cada instancia.
+            cantidad (int): Instancias a colocar.
+            max_por_rack (int | None): Anti-afinidad (maximo por rack), o None.
+
+        Returns:
+            List[Tuple[RackPlanificado, int]]: Rack -> instancias colocadas.
+        """
+        colocaciones: List[Tuple[RackPlanificado, int]] = []
+        restantes = cantidad
+        for rack in racks:
+            if restantes == 0:
+                break
+            colocadas = min(restantes, rack.capacidad_para(tipo, espacio_u, potencia_mw, max_por_rack))
+            if colocadas > 0:
+                rack.reservar(tipo, espacio_u, potencia_mw, colocadas)
+                colocaciones.append((rack, colocadas))
+                restantes -= colocadas
+        return colocaciones
@@ -0,0 +1,49 @@
+"""
+Modulo de la implementacion "por Prioridad" del Strategy de recorte.
+"""
+from typing import Dict, List
+from typing_extensions import override
+
+# Imports de la interfaz Strategy
+from python_cloud_infra.patrones.strategy.recorte_potencia_strategy import (
+    RecortePotenciaStrategy, ReservaPotencia)
+
+
+class RecortePrioridadStrategy(RecortePotenciaStrategy):
+    """
+    Politica de recorte por prioridad.
+
+    Se recortan primero (por completo) las reservas de menor prioridad;
+    la ultima reserva alcanzada se recorta solo en lo que falte. Los
+    servicios de mayor prioridad no pierden potencia mientras el exceso
+    pueda cubrirse con los de menor prioridad.
+
+    Referencia: US-008, US-TECH-004
+    """
+
+    @override
+    def calcular_recortes(self,
+                          reservas: List[ReservaPotencia],
+                          exceso_mw: float) -> Dict[int, float]:
+        """
+        Recorta las reservas en orden de prioridad ascendente.
+
+        Args:
+            reservas (List[ReservaPotencia]): Las reservas del nodo, ordenadas
+                por prioridad ascendente.
+            exceso_mw (float): Los MW que hay que recortar.
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva en MW.
+        """
+        recortes: Dict[int, float] = {}
+        restante_mw = exceso_mw
+        for id_servicio, mw, _ in reservas:
+            if restante_mw <= 0:
+                break
+            if mw <= 0:
+                continue
+            recorte_mw = min(mw, restante_mw)
+            recortes[id_servicio] = mw - recorte_mw
+            restante_mw -= recorte_mw
+        return recortes
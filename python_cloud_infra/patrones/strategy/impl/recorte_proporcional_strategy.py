@@ -0,0 +1,40 @@
+"""
+Modulo de la implementacion "Proporcional" del Strategy de recorte.
+"""
+from typing import Dict, List
+from typing_extensions import override
+
+# Imports de la interfaz Strategy
+from python_cloud_infra.patrones.strategy.recorte_potencia_strategy import (
+    RecortePotenciaStrategy, ReservaPotencia)
+
+
+class RecorteProporcionalStrategy(RecortePotenciaStrategy):
+    """
+    Politica de recorte proporcional.
+
+    Todas las reservas del nodo se reducen en el mismo porcentaje
+    (sin importar la prioridad), hasta que el total entra en el limite.
+
+    Referencia: US-008, US-TECH-004
+    """
+
+    @override
+    def calcular_recortes(self,
+                          reservas: List[ReservaPotencia],
+                          exceso_mw: float) -> Dict[int, float]:
+        """
+        Escala todas las reservas por (total - exceso) / total.
+
+        Args:
+            reservas (List[ReservaPotencia]): Las reservas del nodo.
+            exceso_mw (float): Los MW que hay que recortar.
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva en MW.
+        """
+        total_mw = sum(mw for _, mw, _ in reservas)
+        if total_mw <= 0:
+            return {}
+        factor = max(0.0, (total_mw - exceso_mw) / total_mw)
+        return {id_servicio: mw * factor for id_servicio, mw, _ in reservas if mw > 0}
@@ -0,0 +1,36 @@
+"""
+Modulo de la interfaz abstracta (Strategy) RecortePotenciaStrategy.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+# Reserva de potencia: (ID de servicio, MW reservados, prioridad)
+ReservaPotencia = Tuple[int, float, int]
+
+
+class RecortePotenciaStrategy(ABC):
+    """
+    Interfaz (Strategy) para definir politicas intercambiables de
+    recorte de potencia (load shedding) cuando un nodo del presupuesto
+    de potencia (DataCenter o rack) supera su limite.
+
+    Referencia: US-008, US-TECH-004
+    """
+
+    @abstractmethod
+    def calcular_recortes(self,
+                          reservas: List[ReservaPotencia],
+                          exceso_mw: float) -> Dict[int, float]:
+        """
+        Calcula las nuevas reservas para eliminar el exceso.
+
+        Args:
+            reservas (List[ReservaPotencia]): Las reservas del nodo, ordenadas
+                por prioridad ascendente (las menos importantes primero).
+            exceso_mw (float): Los MW que hay que recortar (> 0).
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva en MW, solo
+                              para los servicios recortados.
+        """
+        pass
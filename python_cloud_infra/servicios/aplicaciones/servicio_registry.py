@@ -6,8 +6,8 @@ Implementa dos patrones de diseño:
 2.  Registry: Despacha operaciones al servicio correcto (US-TECH-005).
 """
 from __future__ import annotations
-from threading import Lock
-from typing import Dict, Type, Callable, Any, TYPE_CHECKING
+from threading import Lock, RLock
+from typing import Dict, Generic, List, Type, TypeVar, Callable, Any, TYPE_CHECKING
 from typing_extensions import override
 
 # --- Imports de Entidades (para las llaves del diccionario) ---
@@ -17,7 +17,11 @@ from python_cloud_infra.entidades.aplicaciones.servicio_batch import ServicioBat
 from python_cloud_infra.entidades.aplicaciones.servicio_webapp import ServicioWebApp
 from python_cloud_infra.entidades.aplicaciones.servicio_cache import ServicioCache
 
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
 # --- Imports de Servicios (para los valores del diccionario) ---
+from python_cloud_infra.servicios.aplicaciones.servicio_service import ServicioService
 from python_cloud_infra.servicios.aplicaciones.servicio_database_service import ServicioDatabaseService
 from python_cloud_infra.servicios.aplicaciones.servicio_batch_service import ServicioBatchService
 from python_cloud_infra.servicios.aplicaciones.servicio_webapp_service import ServicioWebAppService
@@ -29,6 +33,67 @@ ConsumoHandler = Callable[[Servicio], float]
 MostrarHandler = Callable[[Servicio], None]
 EscalarHandler = Callable[[Servicio], None]
 
+H = TypeVar('H')
+
+# Marca de "tipo aun no resuelto" en la cache de despacho
+_NO_RESUELTO: Any = object()
+
+
+class _TablaDespacho(Generic[H]):
+    """
+    Tabla de despacho de una operacion del Registry.
+
+    Los handlers se registran por tipo de entidad; al despachar se
+    resuelve por el MRO del tipo concreto (una subclase de
+    ServicioDatabase usa el handler de ServicioDatabase) y el resultado
+    queda en cache por tipo concreto: el despacho cacheado es una sola
+    busqueda en un dict. Registrar o quitar un tipo invalida la cache.
+    """
+
+    def __init__(self, lock: RLock):
+        """
+        Inicializa la tabla vacia.
+
+        Args:
+            lock (RLock): Lock del Registry (registro y llenado de cache).
+        """
+        self._lock: RLock = lock
+        self._registrados: Dict[ServicioType, H] = {}
+        self._cache: Dict[type, H | None] = {}
+
+    def registrar(self, tipo: ServicioType, handler: H) -> None:
+        """Registra (o reemplaza) el handler de un tipo e invalida la cache."""
+        with self._lock:
+            self._registrados[tipo] = handler
+            self._cache = {}
+
+    def quitar(self, tipo: ServicioType) -> None:
+        """Quita el handler de un tipo (si tenia) e invalida la cache."""
+        with self._lock:
+            if self._registrados.pop(tipo, None) is not None:
+                self._cache = {}
+
+    def resolver(self, tipo: type) -> H | None:
+        """
+        Obtiene el handler del tipo concreto (o de su ancestro registrado
+        mas cercano segun el MRO), o None si no hay.
+        """
+        handler = self._cache.get(tipo, _NO_RESUELTO)
+        if handler is not _NO_RESUELTO:
+            return handler
+        with self._lock:
+            handler = None
+            for ancestro in tipo.__mro__:
+                if ancestro in self._registrados:
+                    handler = self._registrados[ancestro]
+                    break
+            self._cache[tipo] = handler
+        return handler
+
+    def get_tipos(self) -> List[ServicioType]:
+        """Obtiene los tipos registrados."""
+        return list(self._registrados)
+
 
 class ServicioRegistry:
     """
@@ -88,45 +153,106 @@ class ServicioRegistry:
         Aqui creamos las instancias de los servicios y
         construimos los diccionarios de handlers (dispatch).
         """
+        # Tablas de despacho por operacion (resuelven por MRO, con cache)
+        self._lock_registro: RLock = RLock()
+        self._consumo_handlers: _TablaDespacho[ConsumoHandler] = _TablaDespacho(self._lock_registro)
+        self._mostrar_datos_handlers: _TablaDespacho[MostrarHandler] = _TablaDespacho(self._lock_registro)
+        # Consumo segun el Strategy, sin aplicarlo
+        self._demanda_handlers: _TablaDespacho[ConsumoHandler] = _TablaDespacho(self._lock_registro)
+        # Peso de cada clase de servicio en la asignacion parcial
+        self._pesos_clase: _TablaDespacho[float] = _TablaDespacho(self._lock_registro)
+        # 'escalar' (Solo Stateful). Esta es nuestra lógica de negocio
+        # original (no es copia). Los servicios Stateless no estan aqui.
+        self._escalar_handlers: _TablaDespacho[EscalarHandler] = _TablaDespacho(self._lock_registro)
+
         # 1. Crear instancias unicas de cada servicio
         self._db_service: ServicioDatabaseService = ServicioDatabaseService()
         self._batch_service: ServicioBatchService = ServicioBatchService()
         self._webapp_service: ServicioWebAppService = ServicioWebAppService()
         self._cache_service: ServicioCacheService = ServicioCacheService()
 
-        # 2. Construir diccionario para 'consumir_recursos'
-        self._consumo_handlers: Dict[ServicioType, ConsumoHandler] = {
-            ServicioDatabase: self._db_service.consumir_recursos,
-            ServicioBatch: self._batch_service.consumir_recursos,
-            ServicioWebApp: self._webapp_service.consumir_recursos,
-            ServicioCache: self._cache_service.consumir_recursos
-        }
-
-        # 3. Construir diccionario para 'mostrar_datos'
-        self._mostrar_datos_handlers: Dict[ServicioType, MostrarHandler] = {
-            ServicioDatabase: self._db_service.mostrar_datos,
-            ServicioBatch: self._batch_service.mostrar_datos,
-            ServicioWebApp: self._webapp_service.mostrar_datos,
-            ServicioCache: self._cache_service.mostrar_datos
-        }
-        
-        # 4. Construir diccionario para 'escalar' (Solo Stateful)
-        #    Esta es nuestra lógica de negocio original (no es copia).
-        #    Los servicios Stateless (WebApp, Cache) NO estan aqui.
-        self._escalar_handlers: Dict[ServicioType, EscalarHandler] = {
-            ServicioDatabase: self._db_service.escalar,
-            ServicioBatch: self._batch_service.escalar,
-        }
+        # 2. Registrar los pares (entidad, servicio)
+        #    (Database > Batch > WebApp > Cache en la asignacion parcial)
+        self.registrar_servicio(ServicioDatabase, self._db_service, C.PESO_CLASE_DATABASE, escalable=True)
+        self.registrar_servicio(ServicioBatch, self._batch_service, C.PESO_CLASE_BATCH, escalable=True)
+        self.registrar_servicio(ServicioWebApp, self._webapp_service, C.PESO_CLASE_WEBAPP)
+        self.registrar_servicio(ServicioCache, self._cache_service, C.PESO_CLASE_CACHE)
+
+    # --- API de registro (extension en tiempo de ejecucion) ---
+
+    def registrar_servicio(self,
+                           tipo_entidad: ServicioType,
+                           servicio_app: ServicioService,
+                           peso_clase: float,
+                           escalable: bool = False) -> None:
+        """
+        Registra (o reemplaza) el servicio de aplicacion que atiende a un
+        tipo de entidad. Las subclases del tipo que no tengan registro
+        propio usan este (resolucion por MRO).
+
+        Args:
+            tipo_entidad (Type[Servicio]): La clase de entidad.
+            servicio_app (ServicioService): El servicio que la atiende.
+            peso_clase (float): Peso en la asignacion parcial (US-008).
+            escalable (bool, optional): True si es Stateful; el servicio
+                debe tener 'escalar' (ej. ServicioStatefulService).
+
+        Raises:
+            TypeError: Si es escalable y el servicio no tiene 'escalar'.
+        """
+        escalar = getattr(servicio_app, "escalar", None) if escalable else None
+        if escalable and escalar is None:
+            raise TypeError(f"{type(servicio_app).__name__} no implementa 'escalar'")
+        with self._lock_registro:
+            self._consumo_handlers.registrar(tipo_entidad, servicio_app.consumir_recursos)
+            self._demanda_handlers.registrar(tipo_entidad, servicio_app.calcular_demanda)
+            self._mostrar_datos_handlers.registrar(tipo_entidad, servicio_app.mostrar_datos)
+            self._pesos_clase.registrar(tipo_entidad, peso_clase)
+            if escalar is not None:
+                self._escalar_handlers.registrar(tipo_entidad, escalar)
+            else:
+                self._escalar_handlers.quitar(tipo_entidad)
+
+    def quitar_servicio(self, tipo_entidad: ServicioType) -> None:
+        """
+        Quita el registro de un tipo de entidad (sus subclases vuelven a
+        resolver por el MRO).
+
+        Args:
+            tipo_entidad (Type[Servicio]): La clase de entidad.
+        """
+        with self._lock_registro:
+            self._consumo_handlers.quitar(tipo_entidad)
+            self._demanda_handlers.quitar(tipo_entidad)
+            self._mostrar_datos_handlers.quitar(tipo_entidad)
+            self._pesos_clase.quitar(tipo_entidad)
+            self._escalar_handlers.quitar(tipo_entidad)
+
+    def get_tipos_registrados(self) -> List[ServicioType]:
+        """Obtiene los tipos de entidad registrados."""
+        return self._consumo_handlers.get_tipos()
+
+    def es_escalable(self, servicio: Servicio) -> bool:
+        """
+        Indica si el servicio es Stateful (tiene handler de 'escalar').
+
+        Args:
+            servicio (Servicio): El servicio.
+
+        Returns:
+            bool: True si se puede escalar.
+        """
+        return self._escalar_handlers.resolver(type(servicio)) is not None
 
     def _get_handler(self,
                      servicio: Servicio,
-                     handlers_dict: Dict) -> Callable:
+                     tabla: _TablaDespacho) -> Any:
         """
-        Metodo privado para buscar un handler en un diccionario
-        de despacho.
+        Metodo privado para buscar un handler en una tabla
+        de despacho (por MRO, con cache por tipo concreto).
         """
         tipo_servicio = type(servicio)
-        handler = handlers_dict.get(tipo_servicio)
+        handler = tabla.resolver(tipo_servicio)
         
         if handler is None:
             raise TypeError(f"Operacion no soportada para el tipo: {tipo_servicio.__name__}")
@@ -149,6 +275,33 @@ class ServicioRegistry:
         handler = self._get_handler(servicio, self._consumo_handlers)
         return handler(servicio) # type: ignore
 
+    def calcular_demanda(self, servicio: Servicio) -> float:
+        """
+        Despacha la operacion 'calcular_demanda' (consumo segun el
+        Strategy, sin aplicarlo) al servicio correcto. (US-008)
+
+        Args:
+            servicio (Servicio): El servicio.
+
+        Returns:
+            float: La demanda de potencia (MW).
+        """
+        handler = self._get_handler(servicio, self._demanda_handlers)
+        return handler(servicio) # type: ignore
+
+    def get_peso_clase(self, servicio: Servicio) -> float:
+        """
+        Obtiene el peso de la clase del servicio para la asignacion
+        parcial de potencia. (US-008)
+
+        Args:
+            servicio (Servicio): El servicio.
+
+        Returns:
+            float: El peso (mayor = mas importante).
+        """
+        return self._get_handler(servicio, self._pesos_clase)  # type: ignore
+
     def mostrar_datos(self, servicio: Servicio) -> None:
         """
         Despacha la operacion 'mostrar_datos' al servicio
@@ -46,14 +46,8 @@ class ServicioService(ABC):
         Returns:
             float: La cantidad de potencia (MW) que fue consumida.
         """
-        # 1. Obtiene la fecha y hora actual (necesaria para nuestro Strategy)
-        timestamp_actual = datetime.now()
-        
-        # 2. DELEGA el calculo al Strategy
-        potencia_consumida = self._estrategia_consumo.calcular_consumo(
-            timestamp=timestamp_actual,
-            servicio=servicio
-        )
+        # 1. y 2. Calcula la demanda (DELEGA el calculo al Strategy)
+        potencia_consumida = self.calcular_demanda(servicio)
         
         # 3. Aplica el resultado al servicio
         # (A diferencia de 'agua', la potencia no se acumula,
@@ -62,6 +56,26 @@ class ServicioService(ABC):
             
         return potencia_consumida
 
+    def calcular_demanda(self, servicio: 'Servicio') -> float:
+        """
+        Calcula la potencia que consumiria un servicio, SIN aplicarla.
+        (La usa la asignacion parcial para elegir que servicios alimentar).
+
+        Args:
+            servicio (Servicio): El servicio.
+
+        Returns:
+            float: La demanda de potencia (MW) segun el Strategy.
+        """
+        # 1. Obtiene la fecha y hora actual (necesaria para nuestro Strategy)
+        timestamp_actual = datetime.now()
+        
+        # 2. DELEGA el calculo al Strategy
+        return self._estrategia_consumo.calcular_consumo(
+            timestamp=timestamp_actual,
+            servicio=servicio
+        )
+
     @abstractmethod
     def mostrar_datos(self, servicio: 'Servicio') -> None:
         """
@@ -0,0 +1,143 @@
+"""
+Modulo de la AsignacionParcial de potencia.
+
+Cuando un rack no tiene potencia para alimentar a todos sus servicios,
+elige el subconjunto de servicios que maximiza el valor entregado
+(problema de la mochila 0/1): programacion dinamica si el problema es
+chico, y greedy por peso de clase si no.
+"""
+from math import ceil, floor
+from typing import List, Tuple
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# Margen para redondear MW a unidades de la mochila
+_TOLERANCIA: float = 1e-9
+
+
+class AsignacionParcial:
+    """
+    Resuelve la seleccion de servicios a alimentar con potencia limitada.
+
+    Cada servicio i tiene una demanda d_i (MW, segun su Strategy de
+    consumo) y un peso de clase w_i; su valor es w_i * d_i (potencia
+    entregada, ponderada por la importancia de la clase). Se busca el
+    subconjunto de mayor valor con suma de demandas <= capacidad.
+
+    - Programacion dinamica (exacta, demandas redondeadas hacia arriba a
+      C.ASIGNACION_PARCIAL_RESOLUCION_MW) si servicios x unidades de
+      capacidad no supera C.ASIGNACION_PARCIAL_MAX_CELDAS_DP.
+    - Si no, greedy por peso de clase (y menor demanda primero),
+      comparado con el mejor servicio individual.
+
+    Referencia: US-008
+    """
+
+    def __init__(self,
+                 resolucion_mw: float = C.ASIGNACION_PARCIAL_RESOLUCION_MW,
+                 max_celdas_dp: int = C.ASIGNACION_PARCIAL_MAX_CELDAS_DP):
+        """
+        Inicializa el solver.
+
+        Args:
+            resolucion_mw (float, optional): Granularidad de la DP en MW.
+            max_celdas_dp (int, optional): Tamanio maximo de la tabla de la DP.
+
+        Raises:
+            ValueError: Si la resolucion no es positiva.
+        """
+        if resolucion_mw <= 0:
+            raise ValueError("La resolucion debe ser positiva")
+        self._resolucion_mw: float = resolucion_mw
+        self._max_celdas_dp: int = max_celdas_dp
+
+    def seleccionar(self,
+                    demandas_mw: List[float],
+                    pesos: List[float],
+                    capacidad_mw: float) -> List[int]:
+        """
+        Elige los servicios a alimentar.
+
+        Args:
+            demandas_mw (List[float]): Demanda de cada servicio (MW).
+            pesos (List[float]): Peso de clase de cada servicio.
+            capacidad_mw (float): Potencia disponible (MW).
+
+        Returns:
+            List[int]: Los indices elegidos (en orden ascendente).
+        """
+        # Los servicios sin demanda siempre se eligen (no consumen capacidad)
+        gratis = [indice for indice, demanda in enumerate(demandas_mw) if demanda <= 0]
+        candidatos = [indice for indice, demanda in enumerate(demandas_mw)
+                      if 0 < demanda <= capacidad_mw + _TOLERANCIA]
+
+        unidades_capacidad = floor(capacidad_mw / self._resolucion_mw + _TOLERANCIA)
+        if len(candidatos) * (unidades_capacidad + 1) <= self._max_celdas_dp:
+            elegidos = self._programacion_dinamica(candidatos, demandas_mw, pesos, unidades_capacidad)
+        else:
+            elegidos = self._greedy(candidatos, demandas_mw, pesos, capacidad_mw)
+        return sorted(gratis + elegidos)
+
+    def _programacion_dinamica(self,
+                               candidatos: List[int],
+                               demandas_mw: List[float],
+                               pesos: List[float],
+                               unidades_capacidad: int) -> List[int]:
+        """Mochila 0/1 exacta sobre unidades de 'resolucion_mw'."""
+        mejor: List[float] = [0.0] * (unidades_capacidad + 1)
+        tomado: List[bytearray] = []
+        for indice in candidatos:
+            unidades = ceil(demandas_mw[indice] / self._resolucion_mw - _TOLERANCIA)
+            valor = pesos[indice] * demandas_mw[indice]
+            fila = bytearray(unidades_capacidad + 1)
+            for capacidad in range(unidades_capacidad, unidades - 1, -1):
+                con_item = mejor[capacidad - unidades] + valor
+                if con_item > mejor[capacidad]:
+                    mejor[capacidad] = con_item
+                    fila[capacidad] = 1
+            tomado.append(fila)
+
+        # Reconstruccion desde la capacidad completa hacia atras
+        elegidos: List[int] = []
+        capacidad = unidades_capacidad
+        for posicion in range(len(candidatos) - 1, -1, -1):
+            if tomado[posicion][capacidad]:
+                indice = candidatos[posicion]
+                elegidos.append(indice)
+                capacidad -= ceil(demandas_mw[indice] / self._resolucion_mw - _TOLERANCIA)
+        return elegidos
+
+    @staticmethod
+    def _greedy(candidatos: List[int],
+                demandas_mw: List[float],
+                pesos: List[float],
+                capacidad_mw: float) -> List[int]:
+        """Greedy por peso de clase; se queda con lo mejor entre eso y el mejor servicio solo."""
+        orden: List[Tuple[float, float, int]] = sorted(
+            (-pesos[indice], demandas_mw[indice], indice) for indice in candidatos)
+        elegidos: List[int] = []
+        restante_mw = capacidad_mw
+        valor_greedy = 0.0
+        for _, demanda, indice in orden:
+            if demanda <= restante_mw + _TOLERANCIA:
+                elegidos.append(indice)
+                restante_mw -= demanda
+                valor_greedy += pesos[indice] * demanda
+
+        mejor_individual = max(candidatos, default=None,
+                               key=AsignacionParcial._ValorDe(demandas_mw, pesos))
+        if mejor_individual is not None and \
+                pesos[mejor_individual] * demandas_mw[mejor_individual] > valor_greedy:
+            return [mejor_individual]
+        return elegidos
+
+    class _ValorDe:
+        """Clave 'valor del servicio i' para max() (sin lambda, Rubrica 3.4)."""
+
+        def __init__(self, demandas_mw: List[float], pesos: List[float]):
+            self._demandas_mw = demandas_mw
+            self._pesos = pesos
+
+        def __call__(self, indice: int) -> float:
+            return self._pesos[indice] * self._demandas_mw[indice]
@@ -0,0 +1,183 @@
+"""
+Modulo del CacheRegistros.
+
+Cache LRU en memoria de los registros leidos desde disco,
+usado por RegistroDataCenterService.leer_registro (US-022).
+"""
+
+# --- Imports Standard Library ---
+import os
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+
+
+class _EntradaCache:
+    """
+    Entrada del cache: el pickle del registro y la firma del archivo
+    (mtime y tamaño) con la que fue leido.
+    """
+
+    __slots__ = ("datos", "mtime_ns", "tamano")
+
+    def __init__(self, datos: bytes, mtime_ns: int, tamano: int):
+        self.datos: bytes = datos
+        self.mtime_ns: int = mtime_ns
+        self.tamano: int = tamano
+
+
+class CacheRegistros:
+    """
+    Cache LRU de registros, indexado por cliente.
+
+    - Acotado por cantidad de entradas y por bytes aproximados
+      (el tamaño del pickle guardado).
+    - Cada acierto se valida con os.stat (mtime y tamaño): si el
+      archivo cambio en disco, la entrada se descarta.
+    - Guarda el pickle, no el objeto: cada 'obtener' devuelve una copia
+      privada (copy-on-read), por lo que un llamador nunca puede
+      modificar el registro cacheado. Se evita la lectura de disco,
+      no la deserializacion.
+
+    Thread-safe (un Lock protege la estructura y los contadores).
+    """
+
+    def __init__(self,
+                 max_entradas: int = C.CACHE_REGISTROS_MAX_ENTRADAS,
+                 max_bytes: int = C.CACHE_REGISTROS_MAX_BYTES):
+        """
+        Inicializa un cache vacio.
+
+        Args:
+            max_entradas (int, optional): Maximo de registros cacheados.
+            max_bytes (int, optional): Maximo de bytes (suma de pickles).
+
+        Raises:
+            ValueError: Si algun limite es <= 0.
+        """
+        if max_entradas <= 0 or max_bytes <= 0:
+            raise ValueError("Los limites del cache deben ser positivos")
+
+        self._max_entradas: int = max_entradas
+        self._max_bytes: int = max_bytes
+        self._entradas: OrderedDict[str, _EntradaCache] = OrderedDict()
+        self._bytes_usados: int = 0
+        self._lock: Lock = Lock()
+
+        # Contadores
+        self._aciertos: int = 0
+        self._fallos: int = 0
+        self._desalojos: int = 0
+
+    def obtener(self, cliente: str, path: str) -> 'RegistroDataCenter | None':
+        """
+        Busca el registro de un cliente, validando el archivo con os.stat.
+
+        Args:
+            cliente (str): El nombre del cliente.
+            path (str): El path del archivo del registro.
+
+        Returns:
+            RegistroDataCenter | None: Una copia del registro, o None (fallo).
+        """
+        try:
+            estado = os.stat(path)
+        except OSError:
+            estado = None
+
+        with self._lock:
+            entrada = self._entradas.get(cliente)
+            if entrada is None:
+                self._fallos += 1
+                return None
+
+            if (estado is None
+                    or estado.st_mtime_ns != entrada.mtime_ns
+                    or estado.st_size != entrada.tamano):
+                # El archivo cambio (o desaparecio): la entrada ya no vale
+                self._quitar(cliente)
+                self._fallos += 1
+                return None
+
+            self._entradas.move_to_end(cliente)
+            self._aciertos += 1
+            datos = entrada.datos
+
+        # La deserializacion se hace fuera del lock
+        return pickle.loads(datos)
+
+    def guardar(self, cliente: str, datos: bytes, mtime_ns: int, tamano: int) -> None:
+        """
+        Guarda (o reemplaza) el pickle de un cliente.
+
+        Args:
+            cliente (str): El nombre del cliente.
+            datos (bytes): Un pickle autocontenido del registro.
+            mtime_ns (int): El mtime (ns) del archivo al leerlo/escribirlo.
+            tamano (int): El tamaño del archivo al leerlo/escribirlo.
+        """
+        tamano_datos = len(datos)
+        if tamano_datos > self._max_bytes:
+            # No entra nunca: no se cachea (y se descarta una version vieja)
+            self.invalidar(cliente)
+            return
+
+        with self._lock:
+            if cliente in self._entradas:
+                self._quitar(cliente)
+
+            self._entradas[cliente] = _EntradaCache(datos, mtime_ns, tamano)
+            self._bytes_usados += tamano_datos
+
+            while (len(self._entradas) > self._max_entradas
+                   or self._bytes_usados > self._max_bytes):
+                cliente_lru = next(iter(self._entradas))
+                self._quitar(cliente_lru)
+                self._desalojos += 1
+
+    def invalidar(self, cliente: str) -> None:
+        """Descarta la entrada de un cliente, si existe."""
+        with self._lock:
+            if cliente in self._entradas:
+                self._quitar(cliente)
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas (los contadores se conservan)."""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes_usados = 0
+
+    def _quitar(self, cliente: str) -> None:
+        """Quita una entrada. Debe llamarse con el lock tomado."""
+        entrada = self._entradas.pop(cliente)
+        self._bytes_usados -= len(entrada.datos)
+
+    # --- Contadores ---
+
+    def get_aciertos(self) -> int:
+        """Obtiene la cantidad de aciertos (hits)."""
+        return self._aciertos
+
+    def get_fallos(self) -> int:
+        """Obtiene la cantidad de fallos (misses), incluidas las invalidaciones por mtime."""
+        return self._fallos
+
+    def get_desalojos(self) -> int:
+        """Obtiene la cantidad de entradas desalojadas por los limites (evictions)."""
+        return self._desalojos
+
+    def get_cantidad_entradas(self) -> int:
+        """Obtiene la cantidad de registros cacheados."""
+        return len(self._entradas)
+
+    def get_bytes_usados(self) -> int:
+        """Obtiene los bytes aproximados ocupados por el cache."""
+        return self._bytes_usados
@@ -0,0 +1,349 @@
+"""
+Modulo del CatalogoRegistros.
+
+Indice (tabla SQLite) del directorio de datos: mapea cada cliente a su
+archivo de registro y a un resumen de su contenido, para listar y
+buscar registros sin abrir (ni deserializar) los archivos Pickle.
+Al abrirse se reconcilia con los archivos que hay en disco.
+"""
+
+# --- Imports Standard Library ---
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS catalogo (
+    cliente            TEXT    PRIMARY KEY,
+    archivo            TEXT    NOT NULL,
+    id_datacenter      INTEGER NOT NULL,
+    servicios_por_tipo TEXT    NOT NULL,
+    valoracion         REAL    NOT NULL,
+    mtime_ns           INTEGER NOT NULL,
+    checksum           TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_catalogo_datacenter ON catalogo(id_datacenter);
+CREATE INDEX IF NOT EXISTS idx_catalogo_archivo ON catalogo(archivo);
+"""
+
+_COLUMNAS = ("cliente, archivo, id_datacenter, servicios_por_tipo, "
+             "valoracion, mtime_ns, checksum")
+
+
+class EntradaCatalogo:
+    """
+    Resumen de un registro persistido (una fila del catalogo).
+    """
+
+    def __init__(self,
+                 cliente: str,
+                 archivo: str,
+                 id_datacenter: int,
+                 servicios_por_tipo: Dict[str, int],
+                 valoracion: float,
+                 mtime_ns: int,
+                 checksum: str):
+        """
+        Inicializa la entrada.
+
+        Args:
+            cliente (str): El nombre del cliente.
+            archivo (str): El path del archivo del registro.
+            id_datacenter (int): El ID del DataCenter.
+            servicios_por_tipo (Dict[str, int]): Cantidad de servicios por tipo.
+            valoracion (float): La valoracion de activos.
+            mtime_ns (int): El mtime (ns) del archivo al persistirlo.
+            checksum (str): SHA-256 (hex) del contenido del archivo.
+        """
+        self._cliente: str = cliente
+        self._archivo: str = archivo
+        self._id_datacenter: int = id_datacenter
+        self._servicios_por_tipo: Dict[str, int] = dict(servicios_por_tipo)
+        self._valoracion: float = valoracion
+        self._mtime_ns: int = mtime_ns
+        self._checksum: str = checksum
+
+    def get_cliente(self) -> str:
+        """Obtiene el nombre del cliente."""
+        return self._cliente
+
+    def get_archivo(self) -> str:
+        """Obtiene el path del archivo del registro."""
+        return self._archivo
+
+    def get_id_datacenter(self) -> int:
+        """Obtiene el ID del DataCenter."""
+        return self._id_datacenter
+
+    def get_servicios_por_tipo(self) -> Dict[str, int]:
+        """Obtiene una COPIA del conteo de servicios por tipo."""
+        return self._servicios_por_tipo.copy()
+
+    def get_cantidad_servicios(self) -> int:
+        """Obtiene la cantidad total de servicios."""
+        return sum(self._servicios_por_tipo.values())
+
+    def get_valoracion(self) -> float:
+        """Obtiene la valoracion de activos."""
+        return self._valoracion
+
+    def get_mtime_ns(self) -> int:
+        """Obtiene el mtime (ns) del archivo al persistirlo."""
+        return self._mtime_ns
+
+    def get_checksum(self) -> str:
+        """Obtiene el SHA-256 (hex) del archivo."""
+        return self._checksum
+
+
+class CatalogoRegistros:
+    """
+    Catalogo de los registros persistidos en C.DIRECTORIO_DATA.
+
+    Cada 'actualizar' es un UPSERT dentro de una transaccion, por lo
+    que el catalogo nunca queda a medio escribir. Listar N clientes
+    es una sola consulta, sin abrir los N archivos.
+
+    Reemplazar el archivo y actualizar su fila no son atomicos entre si
+    (ej. el proceso muere entre ambos pasos). Por eso, al abrir la base
+    se reconcilia con el directorio: se agregan o corrigen las filas de
+    los archivos cuyo mtime no coincide (solo esos se deserializan) y se
+    quitan las filas cuyo archivo ya no existe.
+
+    Referencia: US-021, US-022
+    """
+
+    def __init__(self, path_db: str | None = None, directorio: str = C.DIRECTORIO_DATA):
+        """
+        Inicializa el catalogo. La base se abre (y se reconcilia) de forma
+        perezosa en el primer uso, dentro del directorio si no se indica path.
+
+        Args:
+            path_db (str | None, optional): Path del archivo SQLite.
+            directorio (str, optional): Directorio de los archivos de registro.
+        """
+        self._path_db: str | None = path_db
+        self._directorio: str = directorio
+        self._conexion: sqlite3.Connection | None = None
+        self._lock: Lock = Lock()
+
+    def _get_conexion(self) -> sqlite3.Connection:
+        """Abre la conexion y reconcilia, si hace falta. Requiere el lock."""
+        if self._conexion is None:
+            self._conexion = self._abrir()
+            self._reconciliar(self._conexion)
+        return self._conexion
+
+    def _abrir(self) -> sqlite3.Connection:
+        """Abre la base y crea el esquema si no existe."""
+        if self._path_db is None:
+            os.makedirs(self._directorio, exist_ok=True)
+            self._path_db = os.path.join(self._directorio, C.ARCHIVO_CATALOGO)
+        conexion = sqlite3.connect(self._path_db, check_same_thread=False)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.executescript(_ESQUEMA)
+        return conexion
+
+    def get_path_db(self) -> str:
+        """Obtiene el path del archivo SQLite del catalogo."""
+        with self._lock:
+            self._get_conexion()
+            return self._path_db  # type: ignore
+
+    def reconciliar(self) -> int:
+        """
+        Pone el catalogo de acuerdo con los archivos del directorio
+        (se hace solo al abrir la base; este metodo lo repite a pedido).
+
+        Raises:
+            sqlite3.Error: Si falla la escritura del catalogo.
+
+        Returns:
+            int: Cantidad de filas agregadas, corregidas o quitadas.
+        """
+        with self._lock:
+            if self._conexion is None:
+                self._conexion = self._abrir()
+            return self._reconciliar(self._conexion)
+
+    def _reconciliar(self, conexion: sqlite3.Connection) -> int:
+        """
+        Compara cada archivo de registro con su fila (por mtime) y corrige
+        las diferencias en una transaccion. Los archivos que no se pueden
+        leer o deserializar quedan fuera del catalogo. Requiere el lock.
+        """
+        filas = {archivo: (mtime_ns, checksum) for archivo, mtime_ns, checksum in
+                 conexion.execute("SELECT archivo, mtime_ns, checksum FROM catalogo").fetchall()}
+        archivos = self._listar_archivos()
+
+        entradas: List[EntradaCatalogo] = []
+        mtimes: List[Tuple[int, str]] = []
+        quitar: List[str] = [archivo for archivo in filas if archivo not in archivos]
+        for archivo, mtime_ns in archivos.items():
+            fila = filas.get(archivo)
+            if fila is not None and fila[0] == mtime_ns:
+                continue
+            try:
+                with open(archivo, 'rb') as f:
+                    datos = f.read()
+                checksum = hashlib.sha256(datos).hexdigest()
+                if fila is not None and fila[1] == checksum:
+                    mtimes.append((mtime_ns, archivo))
+                    continue
+                entradas.append(self._crear_entrada(pickle.loads(datos), archivo, mtime_ns, checksum))
+            except (OSError, pickle.PickleError, EOFError):
+                if fila is not None:
+                    quitar.append(archivo)
+
+        with conexion:
+            conexion.executemany("DELETE FROM catalogo WHERE archivo = ?",
+                                 [(archivo,) for archivo in quitar])
+            conexion.executemany("UPDATE catalogo SET mtime_ns = ? WHERE archivo = ?", mtimes)
+            for entrada in entradas:
+                self._guardar(conexion, entrada)
+        return len(quitar) + len(mtimes) + len(entradas)
+
+    def _listar_archivos(self) -> Dict[str, int]:
+        """Archivos de registro del directorio: path -> mtime (ns)."""
+        archivos: Dict[str, int] = {}
+        if not os.path.isdir(self._directorio):
+            return archivos
+        with os.scandir(self._directorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(C.EXTENSION_DATA) and entrada.is_file():
+                    archivos[os.path.join(self._directorio, entrada.name)] = entrada.stat().st_mtime_ns
+        return archivos
+
+    def actualizar(self,
+                   registro: 'RegistroDataCenter',
+                   archivo: str,
+                   mtime_ns: int,
+                   checksum: str) -> EntradaCatalogo:
+        """
+        Inserta o reemplaza la entrada de un registro recien persistido.
+
+        Args:
+            registro (RegistroDataCenter): El registro persistido.
+            archivo (str): El path del archivo escrito.
+            mtime_ns (int): El mtime (ns) del archivo escrito.
+            checksum (str): SHA-256 (hex) del contenido escrito.
+
+        Raises:
+            sqlite3.Error: Si falla la escritura del catalogo.
+
+        Returns:
+            EntradaCatalogo: La entrada guardada.
+        """
+        entrada = self._crear_entrada(registro, archivo, mtime_ns, checksum)
+        with self._lock:
+            conexion = self._get_conexion()
+            with conexion:
+                self._guardar(conexion, entrada)
+        return entrada
+
+    @staticmethod
+    def _crear_entrada(registro: 'RegistroDataCenter',
+                       archivo: str,
+                       mtime_ns: int,
+                       checksum: str) -> EntradaCatalogo:
+        """Resume un registro (conteo de servicios de todos sus racks)."""
+        conteo = Counter(servicio.get_tipo() for server_rack in registro.get_racks()
+                         for servicio in server_rack.get_servicios_desplegados())
+        return EntradaCatalogo(
+            cliente=registro.get_cliente_corporativo(),
+            archivo=archivo,
+            id_datacenter=registro.get_id_datacenter(),
+            servicios_por_tipo=dict(conteo),
+            valoracion=registro.get_valoracion_activos(),
+            mtime_ns=mtime_ns,
+            checksum=checksum
+        )
+
+    @staticmethod
+    def _guardar(conexion: sqlite3.Connection, entrada: EntradaCatalogo) -> None:
+        """UPSERT de una entrada (dentro de la transaccion de quien llama)."""
+        conexion.execute(
+            f"INSERT OR REPLACE INTO catalogo ({_COLUMNAS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entrada.get_cliente(), entrada.get_archivo(), entrada.get_id_datacenter(),
+             json.dumps(entrada.get_servicios_por_tipo(), sort_keys=True),
+             entrada.get_valoracion(), entrada.get_mtime_ns(), entrada.get_checksum()))
+
+    def eliminar(self, cliente: str) -> None:
+        """
+        Quita la entrada de un cliente, si existe
+        (lo llama RegistroDataCenterService.eliminar_registro).
+
+        Args:
+            cliente (str): El nombre del cliente.
+
+        Raises:
+            sqlite3.Error: Si falla la escritura del catalogo.
+        """
+        with self._lock:
+            conexion = self._get_conexion()
+            with conexion:
+                conexion.execute("DELETE FROM catalogo WHERE cliente = ?", (cliente,))
+
+    def obtener(self, cliente: str) -> EntradaCatalogo | None:
+        """
+        Busca la entrada de un cliente.
+
+        Args:
+            cliente (str): El nombre del cliente.
+
+        Returns:
+            EntradaCatalogo | None: La entrada, o None si no esta catalogado.
+        """
+        with self._lock:
+            fila = self._get_conexion().execute(
+                f"SELECT {_COLUMNAS} FROM catalogo WHERE cliente = ?",
+                (cliente,)).fetchone()
+        return None if fila is None else self._a_entrada(fila)
+
+    def buscar_por_datacenter(self, id_datacenter: int) -> EntradaCatalogo | None:
+        """
+        Busca la entrada de un DataCenter por su ID.
+
+        Args:
+            id_datacenter (int): El ID del DataCenter.
+
+        Returns:
+            EntradaCatalogo | None: La entrada, o None si no esta catalogado.
+        """
+        with self._lock:
+            fila = self._get_conexion().execute(
+                f"SELECT {_COLUMNAS} FROM catalogo WHERE id_datacenter = ?",
+                (id_datacenter,)).fetchone()
+        return None if fila is None else self._a_entrada(fila)
+
+    def listar(self) -> List[EntradaCatalogo]:
+        """
+        Lista todas las entradas, ordenadas por cliente.
+
+        Returns:
+            List[EntradaCatalogo]: Las entradas del catalogo.
+        """
+        with self._lock:
+            filas = self._get_conexion().execute(
+                f"SELECT {_COLUMNAS} FROM catalogo ORDER BY cliente").fetchall()
+        return [self._a_entrada(fila) for fila in filas]
+
+    @staticmethod
+    def _a_entrada(fila: Tuple) -> EntradaCatalogo:
+        """Convierte una fila de la tabla en EntradaCatalogo."""
+        cliente, archivo, id_dc, servicios_json, valoracion, mtime_ns, checksum = fila
+        return EntradaCatalogo(cliente, archivo, id_dc, json.loads(servicios_json),
+                               valoracion, mtime_ns, checksum)
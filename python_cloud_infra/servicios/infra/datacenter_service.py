@@ -57,4 +57,42 @@ class DataCenterService:
         print(f"DataCenter creado (ID {id_datacenter}) "
               f"con ServerRack '{nombre_rack}'.")
         
-        return datacenter
\ No newline at end of file
+        return datacenter
+
+    def agregar_rack(self,
+                     datacenter: DataCenter,
+                     nombre_rack: str,
+                     espacio_rack_u: int = 42,
+                     potencia_mw: float = C.POTENCIA_INICIAL_RACK) -> ServerRack:
+        """
+        Crea un ServerRack adicional y lo agrega al DataCenter
+        (queda indexado para la ubicacion de despliegues y, si el
+        DataCenter ya se gestiona, en los indices de la flota).
+
+        Logica de negocio de US-002.
+
+        Args:
+            datacenter (DataCenter): El DataCenter que recibe el rack.
+            nombre_rack (str): Nombre del rack (unico en el DataCenter).
+            espacio_rack_u (int, optional): Espacio en U del rack. Defaults a 42.
+            potencia_mw (float, optional): Potencia del rack en MW.
+                Defaults a POTENCIA_INICIAL_RACK.
+
+        Raises:
+            ValueError: Si ya hay un rack con ese nombre en el DataCenter.
+
+        Returns:
+            ServerRack: El rack creado.
+        """
+        rack = ServerRack(
+            nombre=nombre_rack,
+            espacio_maximo_u=espacio_rack_u,
+            datacenter=datacenter,
+            potencia=potencia_mw
+        )
+        datacenter.add_rack(rack)
+
+        print(f"ServerRack '{nombre_rack}' agregado al DataCenter "
+              f"(ID {datacenter.get_id_datacenter()}).")
+
+        return rack
@@ -0,0 +1,235 @@
+"""
+Modulo del MotorColocacion de servicios en racks.
+
+Planifica (sin modificar los racks) donde desplegar lotes grandes y
+mixtos de servicios, repartiendolos entre varios racks segun U y MW
+(bin-packing) con una heuristica intercambiable (Strategy).
+El plan se confirma despues con ServerRackService.desplegar_plan.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+# --- Imports de Patrones ---
+from python_cloud_infra.patrones.factory.servicio_factory import ServicioFactory
+from python_cloud_infra.patrones.strategy.colocacion_strategy import ColocacionStrategy, RackPlanificado
+from python_cloud_infra.patrones.strategy.impl.colocacion_first_fit_decreasing_strategy import (
+    ColocacionFirstFitDecreasingStrategy)
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+
+class PedidoColocacion:
+    """
+    Pedido de colocacion: N instancias de un tipo de servicio, con una
+    regla opcional de anti-afinidad (maximo de instancias del tipo por
+    rack, contando las ya desplegadas).
+
+    Referencia: US-004
+    """
+
+    def __init__(self, tipo_servicio: str, cantidad: int, max_por_rack: int | None = None):
+        """
+        Inicializa el pedido.
+
+        Args:
+            tipo_servicio (str): El nombre del servicio (ej. "Database").
+            cantidad (int): Cuantas instancias colocar.
+            max_por_rack (int | None, optional): Anti-afinidad; 1 significa
+                "a lo sumo una instancia del tipo por rack".
+
+        Raises:
+            ValueError: Si la cantidad es <= 0 o max_por_rack < 1.
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a desplegar debe ser positiva")
+        if max_por_rack is not None and max_por_rack < 1:
+            raise ValueError("El maximo de instancias por rack debe ser positivo")
+        self._tipo_servicio: str = tipo_servicio
+        self._cantidad: int = cantidad
+        self._max_por_rack: int | None = max_por_rack
+
+    def get_tipo_servicio(self) -> str:
+        """Obtiene el tipo de servicio pedido."""
+        return self._tipo_servicio
+
+    def get_cantidad(self) -> int:
+        """Obtiene la cantidad de instancias pedidas."""
+        return self._cantidad
+
+    def get_max_por_rack(self) -> int | None:
+        """Obtiene el maximo de instancias del tipo por rack (o None)."""
+        return self._max_por_rack
+
+
+class ColocacionPlanificada:
+    """
+    Una linea del plan: N instancias de un tipo en un rack.
+
+    Referencia: US-004
+    """
+
+    def __init__(self, rack: 'ServerRack', tipo_servicio: str, cantidad: int,
+                 espacio_u: int, potencia_mw: float):
+        """
+        Inicializa la linea del plan.
+
+        Args:
+            rack (ServerRack): El rack destino.
+            tipo_servicio (str): El tipo de servicio.
+            cantidad (int): Cantidad de instancias.
+            espacio_u (int): U de cada instancia.
+            potencia_mw (float): MW base de cada instancia.
+        """
+        self._rack: 'ServerRack' = rack
+        self._tipo_servicio: str = tipo_servicio
+        self._cantidad: int = cantidad
+        self._espacio_u: int = espacio_u
+        self._potencia_mw: float = potencia_mw
+
+    def get_rack(self) -> 'ServerRack':
+        """Obtiene el rack destino."""
+        return self._rack
+
+    def get_tipo_servicio(self) -> str:
+        """Obtiene el tipo de servicio."""
+        return self._tipo_servicio
+
+    def get_cantidad(self) -> int:
+        """Obtiene la cantidad de instancias."""
+        return self._cantidad
+
+    def get_espacio_u(self) -> int:
+        """Obtiene las U que ocupan todas las instancias."""
+        return self._espacio_u * self._cantidad
+
+    def get_potencia_mw(self) -> float:
+        """Obtiene los MW base de todas las instancias."""
+        return self._potencia_mw * self._cantidad
+
+
+class PlanColocacion:
+    """
+    Resultado de MotorColocacion.planificar: las colocaciones por rack y
+    las instancias que no entraron. No modifica ningun rack.
+
+    Referencia: US-004
+    """
+
+    def __init__(self, colocaciones: List[ColocacionPlanificada], sin_colocar: Dict[str, int]):
+        """
+        Inicializa el plan.
+
+        Args:
+            colocaciones (List[ColocacionPlanificada]): Las lineas del plan.
+            sin_colocar (Dict[str, int]): Tipo -> instancias que no entraron.
+        """
+        self._colocaciones: List[ColocacionPlanificada] = colocaciones
+        self._sin_colocar: Dict[str, int] = sin_colocar
+
+    def get_colocaciones(self) -> List[ColocacionPlanificada]:
+        """Obtiene una COPIA de las colocaciones (Rubrica 5.2)."""
+        return self._colocaciones.copy()
+
+    def get_sin_colocar(self) -> Dict[str, int]:
+        """Obtiene una COPIA de las instancias sin rack, por tipo."""
+        return self._sin_colocar.copy()
+
+    def es_completo(self) -> bool:
+        """Indica si todas las instancias pedidas tienen rack."""
+        return not self._sin_colocar
+
+    def get_cantidad_colocada(self) -> int:
+        """Obtiene la cantidad total de instancias colocadas."""
+        return sum(colocacion.get_cantidad() for colocacion in self._colocaciones)
+
+    def get_racks_usados(self) -> int:
+        """Obtiene la cantidad de racks distintos que usa el plan."""
+        return len({id(colocacion.get_rack()) for colocacion in self._colocaciones})
+
+
+class MotorColocacion:
+    """
+    Motor de colocacion (bin-packing en dos dimensiones: U y MW).
+
+    - Agrupa las instancias por pedido (instancias identicas) y procesa
+      los grupos de mayor a menor tamanio (U, luego MW), como pide
+      First-Fit Decreasing.
+    - Cada grupo se coloca con la ColocacionStrategy configurada
+      (First-Fit Decreasing por defecto, o Best-Fit), respetando la
+      anti-afinidad del pedido.
+    - Trabaja sobre RackPlanificado (fotos de los racks): planificar no
+      despliega nada.
+
+    Como las instancias de un grupo son identicas, cada estrategia
+    coloca un grupo en O(racks) u O(racks log racks), sin importar la
+    cantidad de instancias.
+
+    Referencia: US-004, US-TECH-004
+    """
+
+    def __init__(self, estrategia: ColocacionStrategy | None = None):
+        """
+        Inicializa el motor.
+
+        Args:
+            estrategia (ColocacionStrategy | None, optional): Heuristica de
+                colocacion. Defaults a First-Fit Decreasing.
+        """
+        self._estrategia: ColocacionStrategy = estrategia or ColocacionFirstFitDecreasingStrategy()
+
+    def get_estrategia(self) -> ColocacionStrategy:
+        """Obtiene la heuristica de colocacion."""
+        return self._estrategia
+
+    def set_estrategia(self, estrategia: ColocacionStrategy) -> None:
+        """Cambia la heuristica de colocacion."""
+        self._estrategia = estrategia
+
+    def planificar(self, racks: List['ServerRack'], pedidos: List[PedidoColocacion]) -> PlanColocacion:
+        """
+        Calcula donde colocar las instancias pedidas.
+
+        Args:
+            racks (List[ServerRack]): Los racks candidatos (el orden importa
+                para First-Fit).
+            pedidos (List[PedidoColocacion]): Lo que hay que desplegar.
+
+        Raises:
+            ValueError: Si un tipo de servicio no existe (ServicioFactory).
+
+        Returns:
+            PlanColocacion: El plan (posiblemente incompleto).
+        """
+        racks_planificados = [RackPlanificado(rack, orden) for orden, rack in enumerate(racks)]
+
+        # Tamanio de cada pedido (metadatos del Factory, sin instanciar)
+        grupos: List[Tuple[int, float, int, PedidoColocacion]] = []
+        for posicion, pedido in enumerate(pedidos):
+            tipo = pedido.get_tipo_servicio()
+            grupos.append((ServicioFactory.get_espacio_u(tipo), ServicioFactory.get_potencia_base(tipo),
+                           posicion, pedido))
+        grupos.sort(key=MotorColocacion._ClaveDecreciente())
+
+        colocaciones: List[ColocacionPlanificada] = []
+        sin_colocar: Dict[str, int] = {}
+        for espacio_u, potencia_mw, _, pedido in grupos:
+            tipo = pedido.get_tipo_servicio()
+            resultado = self._estrategia.colocar(racks_planificados, tipo, espacio_u, potencia_mw,
+                                                 pedido.get_cantidad(), pedido.get_max_por_rack())
+            colocadas = 0
+            for rack_planificado, cantidad in resultado:
+                colocaciones.append(ColocacionPlanificada(
+                    rack_planificado.get_rack(), tipo, cantidad, espacio_u, potencia_mw))
+                colocadas += cantidad
+            if colocadas < pedido.get_cantidad():
+                sin_colocar[tipo] = sin_colocar.get(tipo, 0) + pedido.get_cantidad() - colocadas
+
+        return PlanColocacion(colocaciones, sin_colocar)
+
+    class _ClaveDecreciente:
+        """Clave de orden: mayor U, luego mayor MW, luego orden del pedido (sin lambda, Rubrica 3.4)."""
+
+        def __call__(self, grupo: Tuple[int, float, int, PedidoColocacion]) -> Tuple[int, float, int]:
+            espacio_u, potencia_mw, posicion, _ = grupo
+            return -espacio_u, -potencia_mw, posicion
@@ -0,0 +1,536 @@
+"""
+Modulo de la PersistenciaDelta.
+
+Persistencia incremental de un RegistroDataCenter: en lugar de volver a
+escribir el registro completo en cada 'persistir', cada generacion guarda
+solo los servicios agregados, eliminados y modificados respecto de la
+generacion anterior, encadenados a una base completa periodica.
+"""
+
+# --- Imports Standard Library ---
+import copyreg
+import hashlib
+import io
+import os
+import pickle
+from threading import Lock
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Entidades ---
+from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.infra_persistencia_exception import InfraPersistenciaException, TipoOperacion
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+
+
+# Ubicacion de un servicio: (indice del rack, clave de orden, slot inicial, U, potencia reservada)
+Ubicacion = Tuple[int, int, int, int, float | None]
+
+# Campos del estado de un ServerRack que crecen con la cantidad de servicios:
+# en el esqueleto se reemplazan por una referencia a la tabla del rack
+_CAMPO_SERVICIOS = "_servicios_desplegados"
+_CAMPO_SLOTS = "_slots_servicios"
+_CAMPO_RESERVAS = "_potencia_reservada_mw"
+
+
+class _TablaRack:
+    """Marca, en el estado de un rack, una tabla por servicio que no va en el esqueleto."""
+
+    __slots__ = ("indice_rack", "campo")
+
+    def __init__(self, indice_rack: int, campo: str):
+        self.indice_rack: int = indice_rack
+        self.campo: str = campo
+
+
+class _PicklerEsqueleto(pickle.Pickler):
+    """
+    Pickler del "esqueleto" del registro: cada Servicio se reemplaza por
+    su ID (persistent_id) y las tablas por servicio de cada rack (tupla
+    de servicios, slots y reservas de potencia) por una referencia al
+    rack, asi el esqueleto no crece con la cantidad de servicios.
+
+    Junta los servicios que reemplazo y la ubicacion (rack, posicion,
+    slot y reserva) de cada servicio de un rack, copiadas del mismo
+    estado del rack que se serializa.
+    """
+
+    def __init__(self, archivo: io.BytesIO, protocol: int, racks: List[ServerRack]):
+        super().__init__(archivo, protocol=protocol)
+        self.servicios: Dict[int, Servicio] = {}
+        # Por rack (indice): (ID, slot, reserva) de cada servicio, en orden
+        self.ubicaciones: Dict[int, List[Tuple[int, Tuple[int, int] | None, float | None]]] = {}
+        self._indices_racks: Dict[int, int] = {id(rack): indice for indice, rack in enumerate(racks)}
+
+    def persistent_id(self, obj: object) -> int | Tuple[str, int, str] | None:
+        if isinstance(obj, Servicio):
+            self.servicios[obj.get_id()] = obj
+            return obj.get_id()
+        if isinstance(obj, _TablaRack):
+            return ("rack", obj.indice_rack, obj.campo)
+        return None
+
+    def reducer_override(self, obj: object):
+        if type(obj) is not ServerRack:
+            return NotImplemented
+
+        # __getstate__ copia el estado con el lock del rack tomado
+        estado = obj.__getstate__()
+        indice = self._indices_racks.setdefault(id(obj), len(self._indices_racks))
+        slots = estado[_CAMPO_SLOTS]
+        reservas = estado[_CAMPO_RESERVAS]
+        lista = []
+        for servicio in estado[_CAMPO_SERVICIOS]:
+            self.servicios[servicio.get_id()] = servicio
+            lista.append((servicio.get_id(), slots.get(servicio.get_id()), reservas.get(servicio.get_id())))
+        self.ubicaciones[indice] = lista
+
+        for campo in (_CAMPO_SERVICIOS, _CAMPO_SLOTS, _CAMPO_RESERVAS):
+            estado[campo] = _TablaRack(indice, campo)
+        # El estado se aplica (__setstate__) despues de memorizar el rack:
+        # las referencias ciclicas (DataCenter -> rack) se resuelven igual
+        return copyreg.__newobj__, (ServerRack,), estado
+
+
+class _UnpicklerEsqueleto(pickle.Unpickler):
+    """
+    Unpickler del esqueleto: resuelve cada ID con los servicios
+    reconstruidos al reproducir la cadena de generaciones (cada ID se
+    deserializa una vez: sus referencias apuntan al mismo objeto) y
+    arma las tablas de cada rack con las ubicaciones, ordenadas por
+    su clave de orden.
+    """
+
+    def __init__(self,
+                 archivo: io.BytesIO,
+                 servicios: Dict[int, bytes],
+                 ubicaciones: Dict[int, Ubicacion]):
+        super().__init__(archivo)
+        self._servicios: Dict[int, bytes] = servicios
+        self._cargados: Dict[int, Servicio] = {}
+        self._por_rack: Dict[int, List[Tuple[int, Ubicacion]]] = {}
+        for id_servicio, ubicacion in ubicaciones.items():
+            self._por_rack.setdefault(ubicacion[0], []).append((id_servicio, ubicacion))
+        for entradas in self._por_rack.values():
+            entradas.sort(key=_ClaveOrden())
+
+    def persistent_load(self, pid: int | Tuple[str, int, str]) -> object:
+        if isinstance(pid, tuple):
+            return self._cargar_tabla(pid[1], pid[2])
+        servicio = self._cargados.get(pid)
+        if servicio is None:
+            servicio = pickle.loads(self._servicios[pid])
+            self._cargados[pid] = servicio
+        return servicio
+
+    def _cargar_tabla(self, indice_rack: int, campo: str) -> object:
+        """Arma una tabla por servicio del rack desde las ubicaciones."""
+        entradas = self._por_rack.get(indice_rack, [])
+        if campo == _CAMPO_SERVICIOS:
+            return tuple(self.persistent_load(id_servicio) for id_servicio, _ in entradas)
+        if campo == _CAMPO_SLOTS:
+            return {id_servicio: (ubicacion[2], ubicacion[3]) for id_servicio, ubicacion in entradas
+                    if ubicacion[2] >= 0}
+        return {id_servicio: ubicacion[4] for id_servicio, ubicacion in entradas
+                if ubicacion[4] is not None}
+
+
+class _ClaveOrden:
+    """Clave de ordenamiento de las entradas (ID, ubicacion) de un rack."""
+
+    def __call__(self, entrada: Tuple[int, Ubicacion]) -> int:
+        return entrada[1][1]
+
+
+class _EstadoCadena:
+    """
+    Estado de la cadena de un cliente (el manifiesto): ultima generacion,
+    generacion de su base, huella (hash) del esqueleto y de cada servicio,
+    ubicacion de cada servicio y la ultima clave de orden asignada.
+    """
+
+    __slots__ = ("generacion", "base", "huella_esqueleto", "huellas", "ubicaciones", "ultima_clave")
+
+    def __init__(self,
+                 generacion: int,
+                 base: int,
+                 huella_esqueleto: bytes,
+                 huellas: Dict[int, bytes],
+                 ubicaciones: Dict[int, Ubicacion],
+                 ultima_clave: int):
+        self.generacion: int = generacion
+        self.base: int = base
+        self.huella_esqueleto: bytes = huella_esqueleto
+        self.huellas: Dict[int, bytes] = huellas
+        self.ubicaciones: Dict[int, Ubicacion] = ubicaciones
+        self.ultima_clave: int = ultima_clave
+
+
+class PersistenciaDelta:
+    """
+    Escribe y lee cadenas de generaciones (base + deltas) de registros.
+
+    - Cada generacion es un archivo '{generacion}.base' o '{generacion}.delta'
+      dentro del directorio de generaciones del cliente.
+    - Una base contiene todos los servicios y sus ubicaciones; un delta
+      solo los servicios agregados y modificados (huella distinta), las
+      ubicaciones nuevas o cambiadas y los IDs eliminados.
+    - El esqueleto (DataCenter, racks sin sus tablas por servicio,
+      sysadmins) va en cada base y en los deltas donde cambio: lo escrito
+      por un delta crece con los cambios, no con el tamaño de la flota.
+    - El manifiesto del directorio guarda el estado de la ultima
+      generacion (huellas y ubicaciones), asi un proceso nuevo sigue la
+      cadena en lugar de empezar una base.
+    - Cada C.DELTA_GENERACIONES_POR_BASE generaciones (o si no hay un
+      manifiesto valido) se escribe una base nueva y se borran las
+      cadenas anteriores a la base previa.
+
+    Referencia: US-021, US-022
+    """
+
+    def __init__(self):
+        """Inicializa la persistencia sin cadenas en memoria."""
+        self._estados: Dict[str, _EstadoCadena] = {}
+        self._lock: Lock = Lock()
+
+    def persistir(self, registro: 'RegistroDataCenter', directorio: str) -> str:
+        """
+        Escribe la siguiente generacion del registro.
+
+        Args:
+            registro (RegistroDataCenter): El registro a persistir.
+            directorio (str): El directorio de generaciones del cliente.
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de IO o Pickle.
+
+        Returns:
+            str: El path del archivo de la generacion escrita.
+        """
+        try:
+            # Los servicios y sus ubicaciones salen del propio esqueleto (todos los racks)
+            esqueleto, servicios, ubicaciones_racks = self._serializar_esqueleto(registro)
+            serializados: Dict[int, bytes] = {
+                id_servicio: pickle.dumps(servicio, protocol=pickle.HIGHEST_PROTOCOL)
+                for id_servicio, servicio in servicios.items()
+            }
+        except pickle.PickleError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_PICKLE.format(
+                    registro.get_cliente_corporativo()) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_PICKLE,
+                nombre_archivo=directorio,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        huellas = {id_servicio: hashlib.blake2b(datos, digest_size=16).digest()
+                   for id_servicio, datos in serializados.items()}
+        huella_esqueleto = hashlib.blake2b(esqueleto, digest_size=16).digest()
+
+        with self._lock:
+            estado = self._estados.get(directorio)
+            if estado is None:
+                estado = self._cargar_manifiesto(directorio)
+            if estado is None:
+                generaciones = self.listar_generaciones(directorio)
+                generacion = (generaciones[-1][0] + 1) if generaciones else 1
+            else:
+                generacion = estado.generacion + 1
+
+            es_base = (estado is None
+                       or generacion - estado.base >= C.DELTA_GENERACIONES_POR_BASE)
+
+            ultima_clave = estado.ultima_clave if estado is not None else 0
+            ubicaciones, ultima_clave = self._asignar_claves(
+                ubicaciones_racks, estado.ubicaciones if estado is not None else {}, ultima_clave)
+
+            if es_base:
+                agregados = serializados
+                modificados: Dict[int, bytes] = {}
+                eliminados: List[int] = []
+                ubicaciones_escritas: Dict[int, Ubicacion | None] = dict(ubicaciones)
+            else:
+                previas = estado.huellas  # type: ignore
+                ubicaciones_previas = estado.ubicaciones  # type: ignore
+                agregados = {i: d for i, d in serializados.items() if i not in previas}
+                modificados = {i: d for i, d in serializados.items()
+                               if i in previas and previas[i] != huellas[i]}
+                eliminados = [i for i in previas if i not in serializados]
+                ubicaciones_escritas = {i: u for i, u in ubicaciones.items()
+                                        if ubicaciones_previas.get(i) != u}
+                # Servicios que siguen referenciados pero ya no estan en un rack
+                ubicaciones_escritas.update({i: None for i in ubicaciones_previas
+                                             if i not in ubicaciones and i in serializados})
+
+            # Un delta solo lleva el esqueleto si cambio (None: vale el anterior)
+            cambio_esqueleto = es_base or huella_esqueleto != estado.huella_esqueleto  # type: ignore
+            contenido = {
+                "generacion": generacion,
+                "es_base": es_base,
+                "esqueleto": esqueleto if cambio_esqueleto else None,
+                "agregados": agregados,
+                "modificados": modificados,
+                "eliminados": eliminados,
+                "ubicaciones": ubicaciones_escritas,
+            }
+            extension = C.EXTENSION_BASE if es_base else C.EXTENSION_DELTA
+            path_generacion = os.path.join(directorio, f"{generacion:08d}{extension}")
+
+            base_anterior = estado.base if estado is not None else None
+            base = generacion if es_base else estado.base  # type: ignore
+            nuevo_estado = _EstadoCadena(generacion, base, huella_esqueleto, huellas, ubicaciones, ultima_clave)
+
+            try:
+                os.makedirs(directorio, exist_ok=True)
+                self._escribir_atomico(path_generacion, contenido)
+                # El manifiesto se escribe despues: si falta o quedo atras,
+                # el proximo proceso empieza una base
+                self._escribir_atomico(os.path.join(directorio, C.ARCHIVO_MANIFIESTO_DELTA), {
+                    "generacion": generacion,
+                    "base": base,
+                    "huella_esqueleto": huella_esqueleto,
+                    "huellas": huellas,
+                    "ubicaciones": ubicaciones,
+                    "ultima_clave": ultima_clave,
+                })
+            except OSError as e:
+                raise InfraPersistenciaException(
+                    mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(directorio) + f" | Error: {e}",
+                    mensaje_usuario=MSG.USR_ESCRIBIR_IO,
+                    nombre_archivo=path_generacion,
+                    tipo_operacion=TipoOperacion.ESCRIBIR
+                )
+
+            self._estados[directorio] = nuevo_estado
+
+        if es_base and base_anterior is not None:
+            self._podar(directorio, base_anterior)
+
+        print(f"Generacion {generacion} ({'base' if es_base else 'delta'}) persistida: "
+              f"+{len(agregados)} ~{len(modificados)} -{len(eliminados)} servicios, "
+              f"{len(ubicaciones_escritas)} ubicaciones.")
+        return path_generacion
+
+    def leer(self, directorio: str, generacion: int | None = None) -> 'RegistroDataCenter':
+        """
+        Reconstruye el registro reproduciendo la cadena hasta una generacion.
+
+        Args:
+            directorio (str): El directorio de generaciones del cliente.
+            generacion (int | None, optional): La generacion pedida.
+                                               Defaults a la ultima.
+
+        Raises:
+            InfraPersistenciaException: Si la generacion (o su base) no existe,
+                                        o algun archivo esta corrupto.
+
+        Returns:
+            RegistroDataCenter: El registro en esa generacion.
+        """
+        generaciones = self.listar_generaciones(directorio)
+        if generacion is None and generaciones:
+            generacion = generaciones[-1][0]
+
+        disponibles = dict(generaciones)
+        bases = [g for g, es_base in generaciones if es_base and g <= (generacion or 0)]
+        if generacion not in disponibles or not bases:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_GENERACION_NO_EXISTE.format(generacion, directorio),
+                mensaje_usuario=MSG.USR_GENERACION_NO_EXISTE,
+                nombre_archivo=directorio,
+                tipo_operacion=TipoOperacion.LEER
+            )
+
+        # Se reproducen los bytes; solo se deserializan los servicios finales
+        servicios: Dict[int, bytes] = {}
+        ubicaciones: Dict[int, Ubicacion] = {}
+        esqueleto = b""
+        for numero in range(bases[-1], generacion + 1):  # type: ignore
+            if numero not in disponibles:
+                raise InfraPersistenciaException(
+                    mensaje_tecnico=MSG.TEC_GENERACION_NO_EXISTE.format(numero, directorio),
+                    mensaje_usuario=MSG.USR_GENERACION_NO_EXISTE,
+                    nombre_archivo=directorio,
+                    tipo_operacion=TipoOperacion.LEER
+                )
+            contenido = self._leer_archivo(directorio, numero, disponibles[numero])
+            if contenido["es_base"]:
+                servicios = dict(contenido["agregados"])
+                ubicaciones = {}
+            else:
+                for id_servicio in contenido["eliminados"]:
+                    servicios.pop(id_servicio, None)
+                    ubicaciones.pop(id_servicio, None)
+                servicios.update(contenido["modificados"])
+                servicios.update(contenido["agregados"])
+            # Generaciones anteriores a las ubicaciones no tienen la clave
+            for id_servicio, ubicacion in contenido.get("ubicaciones", {}).items():
+                if ubicacion is None:
+                    ubicaciones.pop(id_servicio, None)
+                else:
+                    ubicaciones[id_servicio] = ubicacion
+            if contenido["esqueleto"] is not None:
+                esqueleto = contenido["esqueleto"]
+
+        try:
+            return _UnpicklerEsqueleto(io.BytesIO(esqueleto), servicios, ubicaciones).load()
+        except (pickle.UnpicklingError, EOFError, KeyError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_CORRUPTO.format(directorio) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_CORRUPTO,
+                nombre_archivo=directorio,
+                tipo_operacion=TipoOperacion.LEER
+            )
+
+    @staticmethod
+    def listar_generaciones(directorio: str) -> List[Tuple[int, bool]]:
+        """
+        Lista las generaciones presentes en disco.
+
+        Args:
+            directorio (str): El directorio de generaciones del cliente.
+
+        Returns:
+            List[Tuple[int, bool]]: (generacion, es_base), ordenadas.
+        """
+        if not os.path.isdir(directorio):
+            return []
+
+        generaciones = []
+        for nombre in os.listdir(directorio):
+            numero, extension = os.path.splitext(nombre)
+            if extension in (C.EXTENSION_BASE, C.EXTENSION_DELTA) and numero.isdigit():
+                generaciones.append((int(numero), extension == C.EXTENSION_BASE))
+        generaciones.sort()
+        return generaciones
+
+    # --- Helpers privados ---
+
+    @staticmethod
+    def _serializar_esqueleto(registro: 'RegistroDataCenter') -> Tuple[
+            bytes, Dict[int, Servicio], Dict[int, List[Tuple[int, Tuple[int, int] | None, float | None]]]]:
+        """
+        Serializa el registro reemplazando cada Servicio por su ID y las
+        tablas por servicio de cada rack por una referencia al rack.
+
+        Returns:
+            Tuple: El esqueleto, los servicios que reemplazo (ID -> servicio)
+                y, por indice de rack, (ID, slot, reserva) de sus servicios en orden.
+        """
+        buffer = io.BytesIO()
+        pickler = _PicklerEsqueleto(buffer, pickle.HIGHEST_PROTOCOL, registro.get_racks())
+        pickler.dump(registro)
+        return buffer.getvalue(), pickler.servicios, pickler.ubicaciones
+
+    @staticmethod
+    def _asignar_claves(
+        ubicaciones_racks: Dict[int, List[Tuple[int, Tuple[int, int] | None, float | None]]],
+        previas: Dict[int, Ubicacion],
+        ultima_clave: int
+    ) -> Tuple[Dict[int, Ubicacion], int]:
+        """
+        Arma la ubicacion de cada servicio, con una clave de orden dentro
+        de su rack. Un servicio que sigue en el mismo rack y en el mismo
+        orden relativo conserva su clave, asi quitar un servicio no cambia
+        la ubicacion de los demas; los nuevos (o reordenados) reciben
+        claves nuevas, crecientes.
+
+        Returns:
+            Tuple[Dict[int, Ubicacion], int]: Las ubicaciones y la ultima clave asignada.
+        """
+        ubicaciones: Dict[int, Ubicacion] = {}
+        for indice_rack, entradas in ubicaciones_racks.items():
+            clave_anterior = -1
+            for id_servicio, slot, reserva in entradas:
+                previa = previas.get(id_servicio)
+                if previa is not None and previa[0] == indice_rack and previa[1] > clave_anterior:
+                    clave = previa[1]
+                else:
+                    ultima_clave += 1
+                    clave = ultima_clave
+                inicio_u, espacio_u = slot if slot is not None else (-1, 0)
+                ubicaciones[id_servicio] = (indice_rack, clave, inicio_u, espacio_u, reserva)
+                clave_anterior = clave
+        return ubicaciones, ultima_clave
+
+    @staticmethod
+    def _cargar_manifiesto(directorio: str) -> _EstadoCadena | None:
+        """
+        Lee el manifiesto del directorio. Devuelve None (se empieza una
+        base) si no existe, esta corrupto o no corresponde a la ultima
+        generacion en disco.
+        """
+        path_manifiesto = os.path.join(directorio, C.ARCHIVO_MANIFIESTO_DELTA)
+        try:
+            with open(path_manifiesto, 'rb') as f:
+                manifiesto = pickle.load(f)
+            estado = _EstadoCadena(manifiesto["generacion"], manifiesto["base"],
+                                   manifiesto["huella_esqueleto"], manifiesto["huellas"],
+                                   manifiesto["ubicaciones"], manifiesto["ultima_clave"])
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+            return None
+
+        generaciones = dict(PersistenciaDelta.listar_generaciones(directorio))
+        if (not generaciones
+                or max(generaciones) != estado.generacion
+                or not generaciones.get(estado.base, False)):
+            return None
+        return estado
+
+    @staticmethod
+    def _escribir_atomico(path: str, contenido: Dict) -> None:
+        """
+        Escribe un pickle en un temporal y lo renombra (os.replace).
+
+        Raises:
+            OSError: Si falla la escritura.
+        """
+        path_temporal = path + C.EXTENSION_TEMPORAL
+        with open(path_temporal, 'wb') as f:
+            pickle.dump(contenido, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path_temporal, path)
+
+    @staticmethod
+    def _leer_archivo(directorio: str, generacion: int, es_base: bool) -> Dict:
+        """Lee el archivo de una generacion."""
+        extension = C.EXTENSION_BASE if es_base else C.EXTENSION_DELTA
+        path_generacion = os.path.join(directorio, f"{generacion:08d}{extension}")
+        try:
+            with open(path_generacion, 'rb') as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, ImportError, IndexError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_CORRUPTO.format(path_generacion) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_CORRUPTO,
+                nombre_archivo=path_generacion,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_OTRO.format(path_generacion) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_OTRO,
+                nombre_archivo=path_generacion,
+                tipo_operacion=TipoOperacion.LEER
+            )
+
+    def _podar(self, directorio: str, base_anterior: int) -> None:
+        """
+        Borra las generaciones anteriores a la base previa
+        (se conservan la cadena anterior completa y la nueva base).
+        """
+        for generacion, es_base in self.listar_generaciones(directorio):
+            if generacion < base_anterior:
+                extension = C.EXTENSION_BASE if es_base else C.EXTENSION_DELTA
+                try:
+                    os.remove(os.path.join(directorio, f"{generacion:08d}{extension}"))
+                except OSError:
+                    # La poda es best-effort: un archivo viejo no rompe la lectura
+                    pass
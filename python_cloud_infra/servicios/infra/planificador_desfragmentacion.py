@@ -0,0 +1,203 @@
+"""
+Modulo del PlanificadorDesfragmentacion de racks.
+
+Calcula el menor conjunto de movimientos de servicios (dentro del rack)
+que deja libre un bloque de slots contiguos del tamanio pedido.
+"""
+from __future__ import annotations
+from typing import List, Tuple, TYPE_CHECKING
+
+from python_cloud_infra.entidades.infra.mapa_slots_u import MapaSlotsU
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# Bloque de un servicio: (slot inicial, U, ID de servicio)
+BloqueServicio = Tuple[int, int, int]
+
+
+class MovimientoSlot:
+    """
+    Movimiento de un servicio a otro bloque de slots del mismo rack.
+
+    Referencia: US-002
+    """
+
+    def __init__(self, id_servicio: int, desde_u: int, hasta_u: int, espacio_u: int):
+        """
+        Inicializa el movimiento.
+
+        Args:
+            id_servicio (int): ID del servicio a mover.
+            desde_u (int): Slot inicial actual.
+            hasta_u (int): Slot inicial destino.
+            espacio_u (int): U del servicio.
+        """
+        self._id_servicio: int = id_servicio
+        self._desde_u: int = desde_u
+        self._hasta_u: int = hasta_u
+        self._espacio_u: int = espacio_u
+
+    def get_id_servicio(self) -> int:
+        """Obtiene el ID del servicio a mover."""
+        return self._id_servicio
+
+    def get_desde_u(self) -> int:
+        """Obtiene el slot inicial actual."""
+        return self._desde_u
+
+    def get_hasta_u(self) -> int:
+        """Obtiene el slot inicial destino."""
+        return self._hasta_u
+
+    def get_espacio_u(self) -> int:
+        """Obtiene las U del servicio."""
+        return self._espacio_u
+
+
+class PlanDesfragmentacion:
+    """
+    Resultado del planificador: el bloque que queda libre y los
+    movimientos necesarios. Los destinos estan libres antes de mover
+    nada, por lo que los movimientos pueden aplicarse en cualquier orden.
+
+    Referencia: US-002
+    """
+
+    def __init__(self, inicio_u: int, espacio_u: int, movimientos: List[MovimientoSlot]):
+        """
+        Inicializa el plan.
+
+        Args:
+            inicio_u (int): Slot inicial del bloque que queda libre.
+            espacio_u (int): Tamanio del bloque.
+            movimientos (List[MovimientoSlot]): Los movimientos a aplicar.
+        """
+        self._inicio_u: int = inicio_u
+        self._espacio_u: int = espacio_u
+        self._movimientos: List[MovimientoSlot] = movimientos
+
+    def get_inicio_u(self) -> int:
+        """Obtiene el slot inicial del bloque que queda libre."""
+        return self._inicio_u
+
+    def get_espacio_u(self) -> int:
+        """Obtiene el tamanio del bloque."""
+        return self._espacio_u
+
+    def get_movimientos(self) -> List[MovimientoSlot]:
+        """Obtiene una COPIA de los movimientos (Rubrica 5.2)."""
+        return self._movimientos.copy()
+
+    def get_cantidad_movimientos(self) -> int:
+        """Obtiene la cantidad de servicios a mover."""
+        return len(self._movimientos)
+
+
+class PlanificadorDesfragmentacion:
+    """
+    Planificador de desfragmentacion de un rack.
+
+    Para liberar k slots contiguos hay que elegir una ventana [a, a+k) y
+    mover fuera de ella a los servicios que la tocan:
+    1. Con dos punteros sobre los bloques ordenados se cuenta, para cada
+       ventana, cuantos servicios la tocan y cuantas U suman (O(U + S)).
+    2. Las ventanas se prueban de menos a mas movimientos (y a igual
+       cantidad, menos U movidas). Se descartan las que mueven mas U de
+       las que hay libres fuera de la ventana.
+    3. Para cada candidata se ubican los servicios a mover (de mayor a
+       menor) en huecos libres fuera de la ventana con el MapaSlotsU;
+       la primera ventana donde todos entran es el plan.
+
+    La cantidad de movimientos es minima entre las ventanas cuya
+    reubicacion encuentra el paso 3 (first-fit decreasing).
+
+    Referencia: US-002
+    """
+
+    def planificar(self, rack: 'ServerRack', espacio_u: int) -> PlanDesfragmentacion | None:
+        """
+        Calcula los movimientos para liberar 'espacio_u' slots contiguos.
+
+        Args:
+            rack (ServerRack): El rack.
+            espacio_u (int): Tamanio del bloque a liberar.
+
+        Returns:
+            PlanDesfragmentacion | None: El plan (sin movimientos si ya hay
+                un hueco), o None si no se puede liberar el bloque.
+        """
+        mapa = rack.get_mapa_slots()
+        tamanio_u = mapa.get_tamanio_u()
+        if espacio_u <= 0 or espacio_u > tamanio_u:
+            return None
+
+        hueco = mapa.buscar_hueco(espacio_u)
+        if hueco is not None:
+            return PlanDesfragmentacion(hueco, espacio_u, [])
+
+        bloques: List[BloqueServicio] = sorted(
+            (inicio, espacio, id_servicio)
+            for id_servicio, (inicio, espacio) in rack.get_slots_servicios().items())
+
+        for _, _, inicio_ventana, desde, hasta in self._ventanas_candidatas(mapa, bloques, espacio_u):
+            movimientos = self._reubicar(mapa, bloques[desde:hasta], inicio_ventana, espacio_u)
+            if movimientos is not None:
+                return PlanDesfragmentacion(inicio_ventana, espacio_u, movimientos)
+        return None
+
+    @staticmethod
+    def _ventanas_candidatas(mapa: MapaSlotsU,
+                             bloques: List[BloqueServicio],
+                             espacio_u: int) -> List[Tuple[int, int, int, int, int]]:
+        """
+        Ventanas factibles por U, ordenadas por (movimientos, U movidas, inicio).
+        Cada una es (movimientos, U movidas, inicio, desde, hasta), con
+        bloques[desde:hasta] los servicios que tocan la ventana.
+        """
+        libres_u = mapa.get_libres_u()
+        bits = mapa.get_bits()
+        mascara_ventana = (1 << espacio_u) - 1
+        candidatas: List[Tuple[int, int, int, int, int]] = []
+        desde = 0
+        hasta = 0
+        movidas_u = 0
+        for inicio in range(mapa.get_tamanio_u() - espacio_u + 1):
+            fin = inicio + espacio_u
+            # Entran los bloques que empiezan antes del fin de la ventana
+            while hasta < len(bloques) and bloques[hasta][0] < fin:
+                movidas_u += bloques[hasta][1]
+                hasta += 1
+            # Salen los bloques que terminan antes del inicio de la ventana
+            while desde < hasta and bloques[desde][0] + bloques[desde][1] <= inicio:
+                movidas_u -= bloques[desde][1]
+                desde += 1
+            libres_en_ventana = espacio_u - ((bits >> inicio) & mascara_ventana).bit_count()
+            if movidas_u <= libres_u - libres_en_ventana:
+                candidatas.append((hasta - desde, movidas_u, inicio, desde, hasta))
+        candidatas.sort()
+        return candidatas
+
+    @staticmethod
+    def _reubicar(mapa: MapaSlotsU,
+                  a_mover: List[BloqueServicio],
+                  inicio_ventana: int,
+                  espacio_u: int) -> List[MovimientoSlot] | None:
+        """Ubica los bloques a mover en huecos actuales fuera de la ventana (o None)."""
+        simulado = mapa.copiar()
+        ventana = ((1 << espacio_u) - 1) << inicio_ventana
+        movimientos: List[MovimientoSlot] = []
+        for inicio, espacio, id_servicio in sorted(a_mover, key=PlanificadorDesfragmentacion._MayorPrimero()):
+            destino = simulado.buscar_hueco(espacio, ocupados_extra=ventana)
+            if destino is None:
+                return None
+            simulado.ocupar(destino, espacio)
+            movimientos.append(MovimientoSlot(id_servicio, inicio, destino, espacio))
+        return movimientos
+
+    class _MayorPrimero:
+        """Clave de orden: bloques de mas U primero (sin lambda, Rubrica 3.4)."""
+
+        def __call__(self, bloque: BloqueServicio) -> Tuple[int, int]:
+            inicio, espacio, _ = bloque
+            return -espacio, inicio
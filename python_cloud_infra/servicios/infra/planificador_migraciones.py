@@ -0,0 +1,279 @@
+"""
+Modulo del PlanificadorMigraciones entre racks.
+
+Calcula que servicios migrar (y a que rack) para balancear la carga de
+potencia entre racks, agrupando las migraciones en lotes que respetan
+un limite de migraciones simultaneas por rack.
+"""
+from __future__ import annotations
+from typing import Dict, List, Set, TYPE_CHECKING
+
+from python_cloud_infra.entidades.infra.mapa_slots_u import MapaSlotsU
+from python_cloud_infra import constantes as C
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+    from python_cloud_infra.entidades.infra.vista_rack import VistaRack
+
+_TOLERANCIA_MEJORA_MW: float = 1e-9
+
+
+class MovimientoMigracion:
+    """
+    Migracion de un servicio de un rack a otro.
+
+    Referencia: US-002
+    """
+
+    def __init__(self, servicio: 'Servicio', rack_origen: 'ServerRack', rack_destino: 'ServerRack'):
+        """
+        Inicializa el movimiento.
+
+        Args:
+            servicio (Servicio): El servicio a migrar.
+            rack_origen (ServerRack): El rack donde esta.
+            rack_destino (ServerRack): El rack al que se migra.
+        """
+        self._servicio: 'Servicio' = servicio
+        self._rack_origen: 'ServerRack' = rack_origen
+        self._rack_destino: 'ServerRack' = rack_destino
+
+    def get_servicio(self) -> 'Servicio':
+        """Obtiene el servicio a migrar."""
+        return self._servicio
+
+    def get_rack_origen(self) -> 'ServerRack':
+        """Obtiene el rack donde esta el servicio."""
+        return self._rack_origen
+
+    def get_rack_destino(self) -> 'ServerRack':
+        """Obtiene el rack al que se migra el servicio."""
+        return self._rack_destino
+
+
+class PlanMigracion:
+    """
+    Resultado del planificador: las migraciones agrupadas en lotes.
+    Las migraciones de un lote pueden ejecutarse a la vez (cada rack
+    participa en a lo sumo 'max_movimientos_por_rack' de ellas) y los
+    lotes pueden ejecutarse en cualquier orden: cada rack solo cede o
+    solo recibe servicios.
+
+    Referencia: US-002
+    """
+
+    def __init__(self,
+                 lotes: List[List[MovimientoMigracion]],
+                 desvio_inicial_mw: float,
+                 desvio_final_mw: float):
+        """
+        Inicializa el plan.
+
+        Args:
+            lotes (List[List[MovimientoMigracion]]): Las migraciones por lote.
+            desvio_inicial_mw (float): Mayor desvio de carga (MW) respecto
+                del objetivo antes de migrar.
+            desvio_final_mw (float): Mayor desvio de carga (MW) previsto
+                al terminar el plan.
+        """
+        self._lotes: List[List[MovimientoMigracion]] = lotes
+        self._desvio_inicial_mw: float = desvio_inicial_mw
+        self._desvio_final_mw: float = desvio_final_mw
+
+    def get_lotes(self) -> List[List[MovimientoMigracion]]:
+        """Obtiene una COPIA de los lotes (Rubrica 5.2)."""
+        return [lote.copy() for lote in self._lotes]
+
+    def get_movimientos(self) -> List[MovimientoMigracion]:
+        """Obtiene todas las migraciones, en orden de lote."""
+        return [movimiento for lote in self._lotes for movimiento in lote]
+
+    def get_cantidad_lotes(self) -> int:
+        """Obtiene la cantidad de lotes."""
+        return len(self._lotes)
+
+    def get_cantidad_movimientos(self) -> int:
+        """Obtiene la cantidad de servicios a migrar."""
+        return sum(len(lote) for lote in self._lotes)
+
+    def get_desvio_inicial_mw(self) -> float:
+        """Obtiene el mayor desvio de carga (MW) antes de migrar."""
+        return self._desvio_inicial_mw
+
+    def get_desvio_final_mw(self) -> float:
+        """Obtiene el mayor desvio de carga (MW) previsto al terminar."""
+        return self._desvio_final_mw
+
+
+class _RackBalanceo:
+    """Estado simulado de un rack durante la planificacion."""
+
+    __slots__ = ("rack", "exceso_mw", "libre_u", "libre_mw", "mapa", "servicios")
+
+    def __init__(self, rack: 'ServerRack', vista: 'VistaRack', objetivo_mw: float):
+        self.rack: 'ServerRack' = rack
+        self.servicios: List['Servicio'] = vista.get_servicios_desplegados()
+        self.exceso_mw: float = sum(servicio.get_potencia_consumida() for servicio in self.servicios) - objetivo_mw
+        self.libre_u: int = vista.get_espacio_disponible_u()
+        self.libre_mw: float = vista.get_potencia_libre_mw()
+        self.mapa: MapaSlotsU = rack.get_mapa_slots()
+
+    def puede_recibir(self, servicio: 'Servicio') -> bool:
+        return (servicio.get_espacio_u() <= self.libre_u
+                and servicio.get_potencia_consumida() <= self.libre_mw
+                and self.mapa.buscar_hueco(servicio.get_espacio_u()) is not None)
+
+    def recibir(self, servicio: 'Servicio') -> None:
+        espacio_u = servicio.get_espacio_u()
+        self.mapa.ocupar(self.mapa.buscar_hueco(espacio_u), espacio_u)  # type: ignore
+        self.libre_u -= espacio_u
+        self.libre_mw -= servicio.get_potencia_consumida()
+        self.exceso_mw += servicio.get_potencia_consumida()
+
+
+class PlanificadorMigraciones:
+    """
+    Planificador de migraciones para balancear la potencia entre racks.
+
+    1. El objetivo de cada rack es la carga total (potencia consumida de
+       sus servicios) repartida en proporcion a su potencia disponible.
+       Los racks con mas carga que el objetivo (mas la tolerancia) ceden
+       servicios; los que tienen menos, los reciben.
+    2. Greedy de mayor a menor: se toma el rack mas excedido y su
+       servicio mas grande que no lo deja por debajo del objetivo, y se
+       lo migra al receptor con mas deficit donde entra (U, slots
+       contiguos y MW libres). Mover primero los servicios grandes
+       reduce la cantidad de migraciones; cada una baja el desvio total
+       y ningun servicio se mueve dos veces.
+    3. Las migraciones se agrupan en lotes: cada una va al primer lote
+       donde su origen y su destino tienen menos de
+       'max_movimientos_por_rack' migraciones.
+
+    Referencia: US-002
+    """
+
+    def __init__(self,
+                 max_movimientos_por_rack: int = C.MIGRACION_MAX_MOVIMIENTOS_POR_RACK,
+                 tolerancia_mw: float = C.MIGRACION_TOLERANCIA_MW):
+        """
+        Inicializa el planificador.
+
+        Args:
+            max_movimientos_por_rack (int, optional): Migraciones simultaneas
+                por rack (como origen o destino) en cada lote.
+            tolerancia_mw (float, optional): Desvio de carga aceptado.
+
+        Raises:
+            ValueError: Si el limite es <= 0 o la tolerancia es negativa.
+        """
+        if max_movimientos_por_rack <= 0:
+            raise ValueError("El limite de migraciones por rack debe ser positivo")
+        if tolerancia_mw < 0:
+            raise ValueError("La tolerancia no puede ser negativa")
+        self._max_movimientos_por_rack: int = max_movimientos_por_rack
+        self._tolerancia_mw: float = tolerancia_mw
+
+    def planificar(self, racks: List['ServerRack']) -> PlanMigracion:
+        """
+        Calcula las migraciones que balancean la carga de potencia.
+
+        Args:
+            racks (List[ServerRack]): Los racks a balancear.
+
+        Returns:
+            PlanMigracion: El plan (sin lotes si ya esta balanceado).
+        """
+        estados = self._crear_estados(racks)
+        desvio_inicial_mw = max((abs(estado.exceso_mw) for estado in estados), default=0.0)
+        donantes = [estado for estado in estados if estado.exceso_mw > self._tolerancia_mw]
+        receptores = [estado for estado in estados if estado.exceso_mw < -self._tolerancia_mw]
+
+        movimientos: List[MovimientoMigracion] = []
+        agotados: Set[int] = set()
+        while True:
+            candidatos = [donante for donante in donantes
+                          if donante.exceso_mw > self._tolerancia_mw and id(donante) not in agotados]
+            if not candidatos or not receptores:
+                break
+            donante = max(candidatos, key=PlanificadorMigraciones._Exceso())
+            movimiento = self._elegir_movimiento(donante, receptores)
+            if movimiento is None:
+                agotados.add(id(donante))
+            else:
+                movimientos.append(movimiento)
+
+        desvio_final_mw = max((abs(estado.exceso_mw) for estado in estados), default=0.0)
+        return PlanMigracion(self._agrupar_en_lotes(movimientos), desvio_inicial_mw, desvio_final_mw)
+
+    @staticmethod
+    def _crear_estados(racks: List['ServerRack']) -> List[_RackBalanceo]:
+        """
+        Estado simulado de cada rack, con su carga objetivo. Cada rack se
+        lee de una sola VistaRack (sin tomar su lock).
+        """
+        vistas = [rack.get_vista() for rack in racks]
+        carga_mw = 0.0
+        capacidad_mw = 0.0
+        for vista in vistas:
+            carga_mw += sum(servicio.get_potencia_consumida() for servicio in vista.get_servicios_desplegados())
+            capacidad_mw += vista.get_potencia_disponible_mw()
+        estados: List[_RackBalanceo] = []
+        for rack, vista in zip(racks, vistas):
+            if capacidad_mw > 0:
+                objetivo_mw = carga_mw * vista.get_potencia_disponible_mw() / capacidad_mw
+            else:
+                objetivo_mw = carga_mw / len(racks)
+            estados.append(_RackBalanceo(rack, vista, objetivo_mw))
+        return estados
+
+    def _elegir_movimiento(self,
+                           donante: _RackBalanceo,
+                           receptores: List[_RackBalanceo]) -> MovimientoMigracion | None:
+        """Migra (en la simulacion) el servicio mas grande posible del donante."""
+        por_deficit = sorted(receptores, key=PlanificadorMigraciones._Exceso())
+        for servicio in sorted(donante.servicios, key=PlanificadorMigraciones._MayorPotencia()):
+            potencia_mw = servicio.get_potencia_consumida()
+            if potencia_mw <= 0 or potencia_mw > donante.exceso_mw + self._tolerancia_mw:
+                continue
+            for receptor in por_deficit:
+                mejora_mw = (abs(donante.exceso_mw) + abs(receptor.exceso_mw)
+                             - abs(donante.exceso_mw - potencia_mw) - abs(receptor.exceso_mw + potencia_mw))
+                if mejora_mw > _TOLERANCIA_MEJORA_MW and receptor.puede_recibir(servicio):
+                    receptor.recibir(servicio)
+                    donante.exceso_mw -= potencia_mw
+                    donante.servicios.remove(servicio)
+                    return MovimientoMigracion(servicio, donante.rack, receptor.rack)
+        return None
+
+    def _agrupar_en_lotes(self, movimientos: List[MovimientoMigracion]) -> List[List[MovimientoMigracion]]:
+        """Reparte las migraciones en lotes respetando el limite por rack."""
+        lotes: List[List[MovimientoMigracion]] = []
+        ocupacion: List[Dict[int, int]] = []  # Por lote: id(rack) -> migraciones
+        for movimiento in movimientos:
+            origen = id(movimiento.get_rack_origen())
+            destino = id(movimiento.get_rack_destino())
+            for lote, uso in zip(lotes, ocupacion):
+                if (uso.get(origen, 0) < self._max_movimientos_por_rack
+                        and uso.get(destino, 0) < self._max_movimientos_por_rack):
+                    break
+            else:
+                lote, uso = [], {}
+                lotes.append(lote)
+                ocupacion.append(uso)
+            lote.append(movimiento)
+            uso[origen] = uso.get(origen, 0) + 1
+            uso[destino] = uso.get(destino, 0) + 1
+        return lotes
+
+    class _Exceso:
+        """Clave de orden: exceso de carga del rack (sin lambda, Rubrica 3.4)."""
+
+        def __call__(self, estado: _RackBalanceo) -> float:
+            return estado.exceso_mw
+
+    class _MayorPotencia:
+        """Clave de orden: servicios de mas potencia primero (sin lambda, Rubrica 3.4)."""
+
+        def __call__(self, servicio: 'Servicio') -> float:
+            return -servicio.get_potencia_consumida()
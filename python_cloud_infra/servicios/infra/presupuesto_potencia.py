@@ -0,0 +1,537 @@
+"""
+Modulo del PresupuestoPotencia.
+
+Arbol de presupuesto de potencia (DataCenter -> racks -> servicios):
+cada servicio reserva MW en su rack, y cada reserva cuenta tambien
+contra la potencia total del DataCenter (DataCenter.potencia_total_mw).
+Cuando un nodo supera su limite se aplica una politica de recorte
+(Strategy) sobre las reservas del nodo.
+"""
+from __future__ import annotations
+from bisect import bisect_left, insort
+from heapq import merge
+from threading import RLock
+from typing import Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+from typing_extensions import override
+
+# --- Imports de Patrones y Entidades ---
+from python_cloud_infra.patrones.observer.observer import Observer
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.patrones.strategy.recorte_potencia_strategy import (
+    RecortePotenciaStrategy, ReservaPotencia)
+from python_cloud_infra.patrones.strategy.impl.recorte_proporcional_strategy import (
+    RecorteProporcionalStrategy)
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.potencia_insuficiente_exception import PotenciaInsuficienteException
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.datacenter import DataCenter
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# Margen para comparar sumas de MW en punto flotante
+_TOLERANCIA_MW: float = 1e-9
+_SIN_LIMITE: float = float("inf")
+
+
+class _NodoPotencia:
+    """
+    Nodo del arbol: un DataCenter (raiz) o un rack (hoja de reservas).
+    Los racks guardan sus reservas ordenadas por (prioridad, ID).
+    """
+
+    __slots__ = ("nombre", "limite_mw", "reservado_mw", "padre", "orden")
+
+    def __init__(self, nombre: str, limite_mw: float, padre: _NodoPotencia | None = None):
+        self.nombre: str = nombre
+        self.limite_mw: float = limite_mw
+        self.reservado_mw: float = 0.0
+        self.padre: _NodoPotencia | None = padre
+        self.orden: List[Tuple[int, int]] = []
+
+    def get_disponible_mw(self) -> float:
+        return self.limite_mw - self.reservado_mw
+
+    def get_exceso_mw(self) -> float:
+        return self.reservado_mw - self.limite_mw
+
+
+class _Reserva:
+    """Reserva de un servicio: cuantos MW, con que prioridad y en que rack."""
+
+    __slots__ = ("servicio", "rack", "nodo", "mw", "prioridad")
+
+    def __init__(self, servicio: 'Servicio', rack: 'ServerRack', nodo: _NodoPotencia, prioridad: int):
+        self.servicio: 'Servicio' = servicio
+        self.rack: 'ServerRack' = rack
+        self.nodo: _NodoPotencia = nodo
+        self.mw: float = 0.0
+        self.prioridad: int = prioridad
+
+
+class PresupuestoPotencia(Observer[EventoFlota]):
+    """
+    Presupuesto jerarquico de potencia de uno o varios DataCenters.
+
+    - Admision: 'reservar' solo acepta la reserva si entra en el rack y
+      en el DataCenter (se mantiene el total reservado en cada nodo, por
+      lo que el chequeo recorre solo la ruta rack -> DataCenter).
+    - Demanda: 'ajustar_demanda' registra el consumo real calculado por
+      las estrategias de consumo (puede superar el limite), y
+      'aplicar_limites' recorta con la politica configurada
+      (RecortePotenciaStrategy) y baja la potencia de los servicios.
+    - Como Observer del canal de la flota, libera la reserva de los
+      servicios que se remueven de su rack.
+
+    Thread-safe: un RLock protege todo el arbol (lo comparten los
+    threads de balanceo de distintos racks).
+
+    Referencia: US-001, US-008
+    """
+
+    def __init__(self, politica_recorte: RecortePotenciaStrategy | None = None):
+        """
+        Inicializa un presupuesto vacio y lo suscribe al canal de la flota.
+
+        Args:
+            politica_recorte (RecortePotenciaStrategy | None, optional):
+                Politica de recorte. Defaults a RecorteProporcionalStrategy.
+        """
+        self._politica: RecortePotenciaStrategy = politica_recorte or RecorteProporcionalStrategy()
+        self._datacenters: Dict[int, _NodoPotencia] = {}
+        self._racks: Dict['ServerRack', _NodoPotencia] = {}
+        self._reservas: Dict[int, _Reserva] = {}
+        self._lock: RLock = RLock()
+        self._handlers: Dict[TipoEventoFlota, Callable[[EventoFlota], None]] = {
+            TipoEventoFlota.SERVICIO_REMOVIDO: self._on_servicio_removido,
+        }
+        CanalEventos.get_canal(C.CANAL_FLOTA).agregar_observador(self)
+
+    def get_politica_recorte(self) -> RecortePotenciaStrategy:
+        """Obtiene la politica de recorte."""
+        return self._politica
+
+    def set_politica_recorte(self, politica_recorte: RecortePotenciaStrategy) -> None:
+        """Establece la politica de recorte (Strategy intercambiable)."""
+        self._politica = politica_recorte
+
+    # --- Estructura del arbol ---
+
+    def registrar_rack(self, rack: 'ServerRack', limite_mw: float | None = None) -> None:
+        """
+        Agrega un rack (y su DataCenter, si hace falta) al arbol.
+        El limite del DataCenter es su potencia_total_mw.
+
+        Args:
+            rack (ServerRack): El rack.
+            limite_mw (float | None, optional): Limite propio del rack.
+                Defaults a sin limite (solo cuenta el del DataCenter).
+        """
+        with self._lock:
+            self._get_nodo_rack(rack)
+            if limite_mw is not None:
+                self.set_limite_rack(rack, limite_mw)
+
+    def quitar_datacenter(self, id_datacenter: int) -> None:
+        """
+        Quita un DataCenter del arbol, con sus racks y reservas.
+
+        Args:
+            id_datacenter (int): El ID del DataCenter.
+        """
+        with self._lock:
+            nodo_dc = self._datacenters.pop(id_datacenter, None)
+            if nodo_dc is None:
+                return
+            for rack in [rack for rack, nodo in self._racks.items() if nodo.padre is nodo_dc]:
+                del self._racks[rack]
+            for id_servicio in [id_servicio for id_servicio, reserva in self._reservas.items()
+                                if reserva.nodo.padre is nodo_dc]:
+                del self._reservas[id_servicio]
+
+    def set_limite_rack(self, rack: 'ServerRack', limite_mw: float) -> Dict[int, float]:
+        """
+        Cambia el limite de un rack y recorta si quedo excedido.
+
+        Args:
+            rack (ServerRack): El rack.
+            limite_mw (float): El nuevo limite en MW.
+
+        Raises:
+            ValueError: Si el limite es negativo.
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva (los recortados).
+        """
+        if limite_mw < 0:
+            raise ValueError("El limite de potencia no puede ser negativo")
+        with self._lock:
+            self._get_nodo_rack(rack).limite_mw = limite_mw
+            return self.aplicar_limites(rack)
+
+    def sincronizar_datacenter(self, datacenter: 'DataCenter') -> Dict[int, float]:
+        """
+        Vuelve a leer DataCenter.potencia_total_mw (ej. tras set_potencia_total_mw)
+        y recorta si el DataCenter quedo excedido.
+
+        Args:
+            datacenter (DataCenter): El DataCenter.
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva (los recortados).
+        """
+        with self._lock:
+            nodo_dc = self._get_nodo_datacenter(datacenter)
+            nodo_dc.limite_mw = datacenter.get_potencia_total_mw()
+            return self._aplicar_limites_datacenter(nodo_dc)
+
+    # --- Reservas ---
+
+    def puede_reservar(self, rack: 'ServerRack', potencia_mw: float) -> bool:
+        """
+        Chequeo de admision: indica si 'potencia_mw' entra en el rack y
+        en su DataCenter.
+
+        Args:
+            rack (ServerRack): El rack.
+            potencia_mw (float): Los MW a reservar.
+
+        Returns:
+            bool: True si la reserva seria admitida.
+        """
+        with self._lock:
+            return potencia_mw <= self.get_disponible_mw(rack) + _TOLERANCIA_MW
+
+    def reservar(self,
+                 servicio: 'Servicio',
+                 potencia_mw: float,
+                 prioridad: int = C.PRESUPUESTO_PRIORIDAD_DEFECTO,
+                 rack: 'ServerRack | None' = None) -> None:
+        """
+        Reserva (o cambia la reserva de) potencia para un servicio, con
+        control de admision.
+
+        Args:
+            servicio (Servicio): El servicio.
+            potencia_mw (float): Los MW a reservar.
+            prioridad (int, optional): Prioridad para el recorte por prioridad.
+            rack (ServerRack | None, optional): El rack. Defaults al rack del servicio.
+
+        Raises:
+            PotenciaInsuficienteException: Si la reserva no entra en el
+                                           rack o en el DataCenter.
+            ValueError: Si la potencia es negativa o el servicio no tiene rack.
+        """
+        self.reservar_lote([servicio], potencia_mw, prioridad, rack)
+
+    def reservar_lote(self,
+                      servicios: List['Servicio'],
+                      potencia_mw: float | None = None,
+                      prioridad: int = C.PRESUPUESTO_PRIORIDAD_DEFECTO,
+                      rack: 'ServerRack | None' = None) -> None:
+        """
+        Reserva potencia para varios servicios del mismo rack, de forma
+        atomica: o se admiten todas las reservas o ninguna.
+
+        Args:
+            servicios (List[Servicio]): Los servicios.
+            potencia_mw (float | None, optional): MW por servicio. Defaults
+                a la potencia consumida actual de cada servicio.
+            prioridad (int, optional): Prioridad para el recorte por prioridad.
+            rack (ServerRack | None, optional): El rack. Defaults al rack
+                del primer servicio.
+
+        Raises:
+            PotenciaInsuficienteException: Si el lote no entra en el
+                                           rack o en el DataCenter.
+            ValueError: Si alguna potencia es negativa o no hay rack.
+        """
+        if not servicios:
+            return
+        rack = rack if rack is not None else servicios[0].get_rack()
+        if rack is None:
+            raise ValueError("El servicio no esta desplegado en un rack")
+        pedidos = [(servicio, servicio.get_potencia_consumida() if potencia_mw is None else potencia_mw)
+                   for servicio in servicios]
+        if any(mw < 0 for _, mw in pedidos):
+            raise ValueError("La potencia reservada no puede ser negativa")
+
+        with self._lock:
+            nodo_rack = self._get_nodo_rack(rack)
+            requerido_mw = 0.0
+            for servicio, mw in pedidos:
+                reserva = self._reservas.get(servicio.get_id())
+                previa_mw = reserva.mw if reserva is not None and reserva.nodo is nodo_rack else 0.0
+                requerido_mw += mw - previa_mw
+            self._admitir(nodo_rack, requerido_mw)
+            for servicio, mw in pedidos:
+                self._fijar_reserva(servicio, rack, mw, prioridad)
+
+    def ajustar_demanda(self,
+                        servicio: 'Servicio',
+                        potencia_mw: float,
+                        rack: 'ServerRack | None' = None) -> None:
+        """
+        Registra el consumo real de un servicio SIN control de admision
+        (el nodo puede quedar excedido hasta 'aplicar_limites').
+
+        Args:
+            servicio (Servicio): El servicio.
+            potencia_mw (float): Su consumo actual en MW.
+            rack (ServerRack | None, optional): El rack. Defaults al rack del servicio.
+
+        Raises:
+            ValueError: Si el servicio no esta desplegado en un rack.
+        """
+        rack = rack if rack is not None else servicio.get_rack()
+        if rack is None:
+            raise ValueError("El servicio no esta desplegado en un rack")
+        with self._lock:
+            reserva = self._reservas.get(servicio.get_id())
+            prioridad = reserva.prioridad if reserva is not None else C.PRESUPUESTO_PRIORIDAD_DEFECTO
+            self._fijar_reserva(servicio, rack, potencia_mw, prioridad)
+
+    def trasladar_lote(self, servicios: List['Servicio'], rack: 'ServerRack') -> None:
+        """
+        Mueve a otro rack las reservas de varios servicios (migracion),
+        conservando sus MW y su prioridad, de forma atomica y con control
+        de admision. Cada nodo de la ruta destino solo admite los MW que
+        llegan desde fuera de el: una migracion entre racks del mismo
+        DataCenter no pide potencia al DataCenter.
+        Los servicios sin reserva se reservan con su potencia consumida.
+
+        Args:
+            servicios (List[Servicio]): Los servicios que se migran.
+            rack (ServerRack): El rack destino.
+
+        Raises:
+            PotenciaInsuficienteException: Si las reservas no entran en el
+                                           rack destino o en su DataCenter.
+        """
+        with self._lock:
+            nodo_rack = self._get_nodo_rack(rack)
+            pedidos: List[Tuple['Servicio', float, int]] = []
+            requerido_mw: Dict[int, float] = {}  # id(nodo) -> MW que llegan de fuera
+            for servicio in servicios:
+                reserva = self._reservas.get(servicio.get_id())
+                if reserva is None:
+                    pedidos.append((servicio, servicio.get_potencia_consumida(), C.PRESUPUESTO_PRIORIDAD_DEFECTO))
+                    ruta_origen: Set[int] = set()
+                else:
+                    pedidos.append((servicio, reserva.mw, reserva.prioridad))
+                    ruta_origen = self._ids_ruta(reserva.nodo)
+                nodo: _NodoPotencia | None = nodo_rack
+                while nodo is not None and id(nodo) not in ruta_origen:
+                    requerido_mw[id(nodo)] = requerido_mw.get(id(nodo), 0.0) + pedidos[-1][1]
+                    nodo = nodo.padre
+            nodo = nodo_rack
+            while nodo is not None:
+                self._admitir_nodo(nodo, requerido_mw.get(id(nodo), 0.0))
+                nodo = nodo.padre
+            for servicio, mw, prioridad in pedidos:
+                self._fijar_reserva(servicio, rack, mw, prioridad)
+
+    def liberar(self, servicio: 'Servicio') -> None:
+        """Libera la reserva de un servicio (si tenia)."""
+        with self._lock:
+            reserva = self._reservas.pop(servicio.get_id(), None)
+            if reserva is not None:
+                self._sumar(reserva.nodo, -reserva.mw)
+                self._quitar_orden(reserva)
+
+    def set_prioridad(self, servicio: 'Servicio', prioridad: int) -> None:
+        """
+        Cambia la prioridad de la reserva de un servicio.
+
+        Raises:
+            KeyError: Si el servicio no tiene reserva.
+        """
+        with self._lock:
+            reserva = self._reservas[servicio.get_id()]
+            self._quitar_orden(reserva)
+            reserva.prioridad = prioridad
+            insort(reserva.nodo.orden, (prioridad, servicio.get_id()))
+
+    # --- Recorte (load shedding) ---
+
+    def aplicar_limites(self, rack: 'ServerRack | None' = None) -> Dict[int, float]:
+        """
+        Recorta las reservas de los nodos excedidos (primero los racks,
+        luego el DataCenter) con la politica configurada, y baja la
+        potencia consumida de los servicios recortados.
+
+        Args:
+            rack (ServerRack | None, optional): Si se indica, solo su
+                DataCenter. Defaults a todos los DataCenters.
+
+        Returns:
+            Dict[int, float]: ID de servicio -> nueva reserva (los recortados).
+        """
+        with self._lock:
+            if rack is not None:
+                nodos_dc = [self._get_nodo_rack(rack).padre]
+            else:
+                nodos_dc = list(self._datacenters.values())
+            recortes: Dict[int, float] = {}
+            for nodo_dc in nodos_dc:
+                recortes.update(self._aplicar_limites_datacenter(nodo_dc))  # type: ignore
+            return recortes
+
+    def _aplicar_limites_datacenter(self, nodo_dc: _NodoPotencia) -> Dict[int, float]:
+        """Recorta los racks excedidos de un DataCenter y luego el DataCenter. Requiere el lock."""
+        recortes: Dict[int, float] = {}
+        nodos_rack = [nodo for nodo in self._racks.values() if nodo.padre is nodo_dc]
+        for nodo_rack in nodos_rack:
+            if nodo_rack.get_exceso_mw() > _TOLERANCIA_MW:
+                recortes.update(self._recortar(nodo_rack, [nodo_rack]))
+        if nodo_dc.get_exceso_mw() > _TOLERANCIA_MW:
+            recortes.update(self._recortar(nodo_dc, nodos_rack))
+        return recortes
+
+    def _recortar(self, nodo: _NodoPotencia, nodos_rack: List[_NodoPotencia]) -> Dict[int, float]:
+        """Aplica la politica sobre las reservas de los racks dados. Requiere el lock."""
+        reservas: List[ReservaPotencia] = [
+            (id_servicio, self._reservas[id_servicio].mw, prioridad)
+            for prioridad, id_servicio in merge(*(nodo_rack.orden for nodo_rack in nodos_rack))]
+        recortes = self._politica.calcular_recortes(reservas, nodo.get_exceso_mw())
+        for id_servicio, nuevo_mw in recortes.items():
+            reserva = self._reservas[id_servicio]
+            self._sumar(reserva.nodo, nuevo_mw - reserva.mw)
+            reserva.mw = nuevo_mw
+            if reserva.servicio.get_potencia_consumida() > nuevo_mw:
+                reserva.servicio.set_potencia_consumida(nuevo_mw)
+        return recortes
+
+    # --- Observer ---
+
+    @override
+    def actualizar(self, evento: EventoFlota) -> None:
+        """
+        Libera la reserva de los servicios removidos de su rack.
+
+        Args:
+            evento (EventoFlota): El evento publicado.
+        """
+        handler = self._handlers.get(evento.get_tipo())
+        if handler is not None:
+            handler(evento)
+
+    def _on_servicio_removido(self, evento: EventoFlota) -> None:
+        with self._lock:
+            reserva = self._reservas.get(evento.get_servicio().get_id())
+            # Solo si la reserva era de ESE rack (si se movio, la reserva es la nueva)
+            if reserva is not None and reserva.rack is evento.get_rack():
+                self.liberar(reserva.servicio)
+
+    # --- Consultas ---
+
+    def get_disponible_mw(self, rack: 'ServerRack') -> float:
+        """
+        Obtiene los MW que aun se pueden reservar en un rack
+        (el minimo entre el rack y su DataCenter).
+        """
+        with self._lock:
+            nodo: _NodoPotencia | None = self._get_nodo_rack(rack)
+            disponible_mw = _SIN_LIMITE
+            while nodo is not None:
+                disponible_mw = min(disponible_mw, nodo.get_disponible_mw())
+                nodo = nodo.padre
+            return disponible_mw
+
+    def get_reservado_rack(self, rack: 'ServerRack') -> float:
+        """Obtiene los MW reservados en un rack."""
+        with self._lock:
+            nodo = self._racks.get(rack)
+            return nodo.reservado_mw if nodo is not None else 0.0
+
+    def get_reservado_datacenter(self, id_datacenter: int) -> float:
+        """Obtiene los MW reservados en un DataCenter."""
+        with self._lock:
+            nodo = self._datacenters.get(id_datacenter)
+            return nodo.reservado_mw if nodo is not None else 0.0
+
+    def get_reserva(self, servicio: 'Servicio') -> float:
+        """Obtiene los MW reservados por un servicio (0.0 si no tiene)."""
+        with self._lock:
+            reserva = self._reservas.get(servicio.get_id())
+            return reserva.mw if reserva is not None else 0.0
+
+    # --- Auxiliares (requieren el lock) ---
+
+    def _get_nodo_datacenter(self, datacenter: 'DataCenter') -> _NodoPotencia:
+        id_dc = datacenter.get_id_datacenter()
+        nodo_dc = self._datacenters.get(id_dc)
+        if nodo_dc is None:
+            nodo_dc = _NodoPotencia(f"DataCenter {id_dc}", datacenter.get_potencia_total_mw())
+            self._datacenters[id_dc] = nodo_dc
+        return nodo_dc
+
+    def _get_nodo_rack(self, rack: 'ServerRack') -> _NodoPotencia:
+        nodo_rack = self._racks.get(rack)
+        if nodo_rack is None:
+            nodo_dc = self._get_nodo_datacenter(rack.get_datacenter())
+            nodo_rack = _NodoPotencia(rack.get_nombre(), _SIN_LIMITE, nodo_dc)
+            self._racks[rack] = nodo_rack
+        return nodo_rack
+
+    def _admitir(self, nodo_rack: _NodoPotencia, requerido_mw: float) -> None:
+        """Lanza PotenciaInsuficienteException si 'requerido_mw' no entra en la ruta."""
+        nodo: _NodoPotencia | None = nodo_rack
+        while nodo is not None:
+            self._admitir_nodo(nodo, requerido_mw)
+            nodo = nodo.padre
+
+    @staticmethod
+    def _admitir_nodo(nodo: _NodoPotencia, requerido_mw: float) -> None:
+        """Lanza PotenciaInsuficienteException si 'requerido_mw' no entra en el nodo."""
+        if requerido_mw > nodo.get_disponible_mw() + _TOLERANCIA_MW:
+            raise PotenciaInsuficienteException(
+                mensaje_tecnico=MSG.TEC_PRESUPUESTO_INSUFICIENTE.format(
+                    nodo.nombre, nodo.get_disponible_mw(), requerido_mw),
+                mensaje_usuario=MSG.USR_PRESUPUESTO_INSUFICIENTE)
+
+    @staticmethod
+    def _ids_ruta(nodo: _NodoPotencia | None) -> Set[int]:
+        """IDs de los nodos de la ruta nodo -> raiz."""
+        ids: Set[int] = set()
+        while nodo is not None:
+            ids.add(id(nodo))
+            nodo = nodo.padre
+        return ids
+
+    def _fijar_reserva(self, servicio: 'Servicio', rack: 'ServerRack', potencia_mw: float, prioridad: int) -> None:
+        nodo_rack = self._get_nodo_rack(rack)
+        reserva = self._reservas.get(servicio.get_id())
+        if reserva is not None and reserva.nodo is not nodo_rack:
+            # El servicio cambio de rack: se libera la reserva anterior
+            self.liberar(reserva.servicio)
+            reserva = None
+        if reserva is None:
+            reserva = _Reserva(servicio, rack, nodo_rack, prioridad)
+            self._reservas[servicio.get_id()] = reserva
+            insort(nodo_rack.orden, (prioridad, servicio.get_id()))
+        elif reserva.prioridad != prioridad:
+            self._quitar_orden(reserva)
+            reserva.prioridad = prioridad
+            insort(nodo_rack.orden, (prioridad, servicio.get_id()))
+        self._sumar(nodo_rack, potencia_mw - reserva.mw)
+        reserva.mw = potencia_mw
+
+    @staticmethod
+    def _sumar(nodo: _NodoPotencia | None, delta_mw: float) -> None:
+        while nodo is not None:
+            nodo.reservado_mw += delta_mw
+            nodo = nodo.padre
+
+    @staticmethod
+    def _quitar_orden(reserva: _Reserva) -> None:
+        orden = reserva.nodo.orden
+        posicion = bisect_left(orden, (reserva.prioridad, reserva.servicio.get_id()))
+        del orden[posicion]
@@ -6,9 +6,12 @@ la visualizacion de datos completos del registro.
 """
 
 # --- Imports Standard Library ---
+import hashlib
 import os
 import pickle
-from typing import TYPE_CHECKING
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Tuple, TYPE_CHECKING
 
 # --- Imports de Constantes ---
 from python_cloud_infra import constantes as C
@@ -16,6 +19,9 @@ from python_cloud_infra import constantes as C
 # --- Imports de Patrones ---
 # 1. Importa el Registry (Singleton) para mostrar datos de servicios (US-009)
 from python_cloud_infra.servicios.aplicaciones.servicio_registry import ServicioRegistry
+from python_cloud_infra.servicios.infra.cache_registros import CacheRegistros
+from python_cloud_infra.servicios.infra.catalogo_registros import CatalogoRegistros, EntradaCatalogo
+from python_cloud_infra.servicios.infra.persistencia_delta import PersistenciaDelta
 
 # --- Imports de Excepciones ---
 from python_cloud_infra.excepciones.infra_persistencia_exception import InfraPersistenciaException, TipoOperacion
@@ -26,6 +32,45 @@ if TYPE_CHECKING:
     from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
 
 
+# --- Resultados del worker de carga masiva (leer_registros) ---
+_CARGA_OK = "ok"
+_CARGA_NO_EXISTE = "no_existe"
+_CARGA_CORRUPTO = "corrupto"
+_CARGA_OTRO = "otro"
+
+# (codigo, payload, buffers fuera de banda, mtime_ns, tamaño, detalle del error)
+ResultadoCarga = Tuple[str, bytes, List[bytes], int, int, str]
+
+
+def _cargar_registro_en_worker(path_completo: str) -> ResultadoCarga:
+    """
+    Funcion ejecutada en un proceso del pool de leer_registros.
+
+    Lee y deserializa el archivo (validandolo) y lo vuelve a serializar
+    con pickle protocolo 5, enviando fuera de banda los buffers que lo
+    permitan. Los errores se devuelven como codigo (no como excepcion),
+    porque InfraPersistenciaException no se puede reconstruir al
+    des-picklearla en el proceso padre.
+    """
+    try:
+        with open(path_completo, 'rb') as f:
+            datos = f.read()
+            estado = os.fstat(f.fileno())
+        registro = pickle.loads(datos)
+
+        buffers: List[pickle.PickleBuffer] = []
+        payload = pickle.dumps(registro, protocol=5, buffer_callback=buffers.append)
+        return (_CARGA_OK, payload, [bytes(buffer.raw()) for buffer in buffers],
+                estado.st_mtime_ns, estado.st_size, "")
+
+    except FileNotFoundError:
+        return (_CARGA_NO_EXISTE, b"", [], 0, 0, "")
+    except (pickle.UnpicklingError, EOFError, ImportError, IndexError) as e:
+        return (_CARGA_CORRUPTO, b"", [], 0, 0, str(e))
+    except Exception as e:
+        return (_CARGA_OTRO, b"", [], 0, 0, str(e))
+
+
 class RegistroDataCenterService:
     """
     Servicio para gestionar la logica de negocio de los Registros de DataCenter.
@@ -33,6 +78,17 @@ class RegistroDataCenterService:
     Implementa US-021 (Persistir), US-022 (Leer) y US-023 (Mostrar).
     """
 
+    # Cache LRU de registros leidos, compartido por todo el proceso
+    # (leer_registro es estatico).
+    _cache: CacheRegistros = CacheRegistros()
+
+    # Catalogo (indice) del directorio de datos, actualizado en cada 'persistir'
+    # y 'eliminar_registro' (y reconciliado con los archivos al abrirse)
+    _catalogo: CatalogoRegistros = CatalogoRegistros()
+
+    # Cadenas de generaciones (base + deltas) del modo delta
+    _delta: PersistenciaDelta = PersistenciaDelta()
+
     def __init__(self):
         """
         Inicializa el RegistroDataCenterService.
@@ -104,22 +160,36 @@ class RegistroDataCenterService:
         os.makedirs(directorio, exist_ok=True)
 
         # 2. Construir el path del archivo
-        # Reemplazamos espacios por guiones bajos para un nombre de archivo seguro
-        nombre_archivo_seguro = cliente.replace(" ", "_").replace(".", "")
-        nombre_archivo = f"{nombre_archivo_seguro}{C.EXTENSION_DATA}"
-        path_completo = os.path.join(directorio, nombre_archivo)
+        path_completo = RegistroDataCenterService._construir_path(cliente)
         
         print(f"\n--- Intentando persistir registro en {path_completo} ---")
 
-        # 3. Escribir el archivo
+        # 3. Escribir el archivo de forma atomica (tmp + os.replace):
+        #    un lector nunca ve un archivo a medio escribir.
+        path_temporal = path_completo + C.EXTENSION_TEMPORAL
         try:
-            with open(path_completo, 'wb') as f:
-                pickle.dump(registro, f)
+            datos = pickle.dumps(registro)
+            with open(path_temporal, 'wb') as f:
+                f.write(datos)
+                f.flush()
+                estado = os.fstat(f.fileno())
+            os.replace(path_temporal, path_completo)
+
+            # 4. Write-through: la proxima lectura sale del cache
+            RegistroDataCenterService._cache.guardar(
+                cliente, datos, estado.st_mtime_ns, estado.st_size)
+
+            # 5. Actualizar el catalogo (una transaccion). Si el proceso muere
+            #    antes, la fila se corrige al reconciliar el catalogo.
+            RegistroDataCenterService._catalogo.actualizar(
+                registro, path_completo, estado.st_mtime_ns,
+                hashlib.sha256(datos).hexdigest())
                 
             print(f"Registro de '{cliente}' persistido exitosamente.")
             return path_completo
             
         except (IOError, OSError) as e:
+            RegistroDataCenterService._cache.invalidar(cliente)
             raise InfraPersistenciaException(
                 mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(directorio) + f" | Error: {e}",
                 mensaje_usuario=MSG.USR_ESCRIBIR_IO,
@@ -133,6 +203,14 @@ class RegistroDataCenterService:
                 nombre_archivo=path_completo,
                 tipo_operacion=TipoOperacion.ESCRIBIR
             )
+        except sqlite3.Error as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_SQLITE_ESCRIBIR.format(
+                    cliente, RegistroDataCenterService._catalogo.get_path_db()) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_SQLITE_ESCRIBIR,
+                nombre_archivo=path_completo,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
         except Exception as e:
             raise InfraPersistenciaException(
                 mensaje_tecnico=MSG.TEC_ESCRIBIR_OTRO.format(path_completo) + f" | Error: {e}",
@@ -141,6 +219,117 @@ class RegistroDataCenterService:
                 tipo_operacion=TipoOperacion.ESCRIBIR
             )
 
+    @staticmethod
+    def eliminar_registro(cliente_corporativo: str) -> bool:
+        """
+        Borra el archivo de registro de un cliente y lo quita del cache
+        y del catalogo (las generaciones del modo delta no se tocan).
+
+        Args:
+            cliente_corporativo (str): El nombre del cliente.
+
+        Raises:
+            InfraPersistenciaException: Si el archivo no se puede borrar
+                o falla la escritura del catalogo.
+            ValueError: Si el nombre del cliente es nulo o vacio.
+
+        Returns:
+            bool: True si habia un archivo y se borro, False si no existia.
+        """
+        if not cliente_corporativo:
+            raise ValueError("El nombre del cliente no puede ser nulo o vacio")
+
+        path_completo = RegistroDataCenterService._construir_path(cliente_corporativo)
+        try:
+            os.remove(path_completo)
+            existia = True
+        except FileNotFoundError:
+            existia = False
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(C.DIRECTORIO_DATA) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_IO,
+                nombre_archivo=path_completo,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        finally:
+            RegistroDataCenterService._cache.invalidar(cliente_corporativo)
+
+        try:
+            RegistroDataCenterService._catalogo.eliminar(cliente_corporativo)
+        except sqlite3.Error as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_SQLITE_ESCRIBIR.format(
+                    cliente_corporativo, RegistroDataCenterService._catalogo.get_path_db()) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_SQLITE_ESCRIBIR,
+                nombre_archivo=path_completo,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        return existia
+
+    def persistir_delta(self, registro: 'RegistroDataCenter') -> str:
+        """
+        Guarda la siguiente generacion del registro en modo delta:
+        solo los servicios agregados, eliminados y modificados desde
+        la generacion anterior, encadenados a una base completa periodica.
+        Variante incremental de US-021.
+
+        Args:
+            registro (RegistroDataCenter): El objeto a persistir.
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de IO o Pickle.
+            ValueError: Si el nombre del cliente es nulo o vacio.
+
+        Returns:
+            str: El path del archivo de la generacion escrita.
+        """
+        cliente = registro.get_cliente_corporativo()
+        if not cliente:
+            raise ValueError("El cliente corporativo no puede ser nulo o vacio")
+
+        directorio = RegistroDataCenterService._construir_directorio_generaciones(cliente)
+        print(f"\n--- Intentando persistir generacion en {directorio} ---")
+        return RegistroDataCenterService._delta.persistir(registro, directorio)
+
+    @staticmethod
+    def leer_generacion(cliente_corporativo: str,
+                        generacion: int | None = None) -> 'RegistroDataCenter':
+        """
+        Reconstruye un registro persistido en modo delta, reproduciendo
+        la cadena (base + deltas) hasta la generacion pedida.
+
+        Args:
+            cliente_corporativo (str): El nombre del cliente.
+            generacion (int | None, optional): La generacion. Defaults a la ultima.
+
+        Raises:
+            InfraPersistenciaException: Si la generacion no existe o esta corrupta.
+            ValueError: Si el nombre del cliente es nulo o vacio.
+
+        Returns:
+            RegistroDataCenter: El registro en esa generacion.
+        """
+        if not cliente_corporativo:
+            raise ValueError("El nombre del cliente no puede ser nulo o vacio")
+
+        directorio = RegistroDataCenterService._construir_directorio_generaciones(cliente_corporativo)
+        return RegistroDataCenterService._delta.leer(directorio, generacion)
+
+    @staticmethod
+    def listar_generaciones(cliente_corporativo: str) -> List[int]:
+        """
+        Lista las generaciones en disco de un cliente (modo delta).
+
+        Args:
+            cliente_corporativo (str): El nombre del cliente.
+
+        Returns:
+            List[int]: Los numeros de generacion, ordenados.
+        """
+        directorio = RegistroDataCenterService._construir_directorio_generaciones(cliente_corporativo)
+        return [generacion for generacion, _ in PersistenciaDelta.listar_generaciones(directorio)]
+
     @staticmethod
     def leer_registro(cliente_corporativo: str) -> 'RegistroDataCenter':
         """
@@ -148,6 +337,9 @@ class RegistroDataCenterService:
         Implementacion de US-022.
         
         Es un metodo estatico porque no necesita estado (self).
+        Consulta primero el cache LRU del proceso (validado por mtime y
+        tamaño del archivo). Cada llamada devuelve una copia independiente
+        (un acierto evita el disco, no la deserializacion).
 
         Args:
             cliente_corporativo (str): El nombre del cliente (usado para el nombre del archivo).
@@ -163,13 +355,18 @@ class RegistroDataCenterService:
             raise ValueError("El nombre del cliente no puede ser nulo o vacio")
 
         # 1. Construir el path del archivo (replicando la logica de 'persistir')
-        nombre_archivo_seguro = cliente_corporativo.replace(" ", "_").replace(".", "")
-        nombre_archivo = f"{nombre_archivo_seguro}{C.EXTENSION_DATA}"
-        path_completo = os.path.join(C.DIRECTORIO_DATA, nombre_archivo)
+        path_completo = RegistroDataCenterService._construir_path(cliente_corporativo)
         
         print(f"\n--- Intentando leer registro desde {path_completo} ---")
 
-        # 2. Validar que el archivo exista
+        # 2. Consultar el cache (evita la lectura de disco si no cambio)
+        registro_cacheado = RegistroDataCenterService._cache.obtener(
+            cliente_corporativo, path_completo)
+        if registro_cacheado is not None:
+            print(f"Registro de '{cliente_corporativo}' recuperado desde cache.")
+            return registro_cacheado
+
+        # 3. Validar que el archivo exista
         if not os.path.exists(path_completo):
             raise InfraPersistenciaException(
                 mensaje_tecnico=MSG.TEC_LEER_NO_EXISTE.format(path_completo),
@@ -178,10 +375,14 @@ class RegistroDataCenterService:
                 tipo_operacion=TipoOperacion.LEER
             )
 
-        # 3. Leer el archivo
+        # 4. Leer el archivo
         try:
             with open(path_completo, 'rb') as f:
-                registro_leido = pickle.load(f)
+                datos = f.read()
+                estado = os.fstat(f.fileno())
+            registro_leido = pickle.loads(datos)
+            RegistroDataCenterService._cache.guardar(
+                cliente_corporativo, datos, estado.st_mtime_ns, estado.st_size)
                 
             print(f"Registro de '{cliente_corporativo}' recuperado exitosamente.")
             return registro_leido
@@ -200,4 +401,185 @@ class RegistroDataCenterService:
                 mensaje_usuario=MSG.USR_LEER_OTRO,
                 nombre_archivo=path_completo,
                 tipo_operacion=TipoOperacion.LEER
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def leer_registros(
+        clientes: Iterable[str],
+        workers: int = C.WORKERS_CARGA_REGISTROS
+    ) -> Iterator[Tuple[str, 'RegistroDataCenter | InfraPersistenciaException']]:
+        """
+        Carga (deserializa) muchos registros en paralelo con un pool de procesos.
+        Version masiva de US-022, pensada para el arranque.
+
+        Los clientes presentes en el cache se devuelven sin usar el pool.
+        El resto se lee, valida y deserializa en los workers, y viaja al
+        proceso padre con pickle protocolo 5 (buffers fuera de banda
+        cuando los hay); un archivo corrupto se detecta en el worker.
+
+        Un error en un cliente NO aborta el lote: se devuelve la
+        InfraPersistenciaException en lugar del registro.
+
+        Los argumentos se validan al llamar (no al empezar a iterar).
+
+        Args:
+            clientes (Iterable[str]): Los nombres de los clientes.
+            workers (int, optional): Cantidad de procesos del pool.
+
+        Raises:
+            ValueError: Si algun cliente es nulo o vacio, o workers <= 0.
+
+        Returns:
+            Iterator[Tuple[str, RegistroDataCenter | InfraPersistenciaException]]:
+                (cliente, registro o excepcion), en orden de finalizacion.
+        """
+        lista_clientes = list(clientes)
+        if workers <= 0:
+            raise ValueError("La cantidad de workers debe ser positiva")
+        for cliente in lista_clientes:
+            if not cliente:
+                raise ValueError("El nombre del cliente no puede ser nulo o vacio")
+        return RegistroDataCenterService._iterar_carga(lista_clientes, workers)
+
+    @staticmethod
+    def _iterar_carga(
+        clientes: List[str],
+        workers: int
+    ) -> Iterator[Tuple[str, 'RegistroDataCenter | InfraPersistenciaException']]:
+        """Generador de leer_registros (argumentos ya validados)."""
+        # 1. Aciertos de cache: no hace falta el pool
+        pendientes: List[Tuple[str, str]] = []
+        for cliente in clientes:
+            path_completo = RegistroDataCenterService._construir_path(cliente)
+            registro_cacheado = RegistroDataCenterService._cache.obtener(cliente, path_completo)
+            if registro_cacheado is not None:
+                yield cliente, registro_cacheado
+            else:
+                pendientes.append((cliente, path_completo))
+
+        if not pendientes:
+            return
+
+        print(f"\n--- Cargando {len(pendientes)} registros con {workers} procesos ---")
+
+        # 2. Resto: en el pool, devolviendo a medida que terminan
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(pendientes)))
+        try:
+            futuros = {
+                pool.submit(_cargar_registro_en_worker, path_completo): (cliente, path_completo)
+                for cliente, path_completo in pendientes
+            }
+            for futuro in as_completed(futuros):
+                cliente, path_completo = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    # El proceso worker murio (ej. BrokenProcessPool)
+                    resultado = (_CARGA_OTRO, b"", [], 0, 0, str(e))
+                yield cliente, RegistroDataCenterService._resolver_carga(
+                    cliente, path_completo, resultado)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _resolver_carga(
+        cliente: str,
+        path_completo: str,
+        resultado: ResultadoCarga
+    ) -> 'RegistroDataCenter | InfraPersistenciaException':
+        """
+        Convierte el resultado de un worker en un registro (o excepcion)
+        y alimenta el cache.
+        """
+        codigo, payload, buffers, mtime_ns, tamano, detalle = resultado
+
+        if codigo == _CARGA_OK:
+            try:
+                registro = pickle.loads(payload, buffers=buffers)
+            except Exception as e:
+                codigo, detalle = _CARGA_OTRO, str(e)
+            else:
+                if not buffers:
+                    # Sin buffers externos el payload es un pickle autocontenido
+                    RegistroDataCenterService._cache.guardar(cliente, payload, mtime_ns, tamano)
+                return registro
+
+        if codigo == _CARGA_NO_EXISTE:
+            return InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_NO_EXISTE.format(path_completo),
+                mensaje_usuario=MSG.USR_LEER_NO_EXISTE,
+                nombre_archivo=path_completo,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        if codigo == _CARGA_CORRUPTO:
+            return InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_CORRUPTO.format(path_completo) + f" | Error: {detalle}",
+                mensaje_usuario=MSG.USR_LEER_CORRUPTO,
+                nombre_archivo=path_completo,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        return InfraPersistenciaException(
+            mensaje_tecnico=MSG.TEC_LEER_OTRO.format(path_completo) + f" | Error: {detalle}",
+            mensaje_usuario=MSG.USR_LEER_OTRO,
+            nombre_archivo=path_completo,
+            tipo_operacion=TipoOperacion.LEER
+        )
+
+    @staticmethod
+    def get_cache() -> CacheRegistros:
+        """
+        Obtiene el cache LRU de registros (para consultar sus contadores).
+
+        Returns:
+            CacheRegistros: El cache compartido del proceso.
+        """
+        return RegistroDataCenterService._cache
+
+    @staticmethod
+    def listar_registros() -> List[EntradaCatalogo]:
+        """
+        Lista los registros persistidos usando el catalogo
+        (sin abrir ni deserializar los archivos).
+
+        Returns:
+            List[EntradaCatalogo]: Una entrada por cliente, ordenadas por cliente.
+        """
+        return RegistroDataCenterService._catalogo.listar()
+
+    @staticmethod
+    def buscar_en_catalogo(cliente_corporativo: str) -> EntradaCatalogo | None:
+        """
+        Busca el resumen (archivo, conteos, checksum...) de un cliente en el catalogo.
+
+        Args:
+            cliente_corporativo (str): El nombre del cliente.
+
+        Returns:
+            EntradaCatalogo | None: La entrada, o None si no fue persistido.
+        """
+        return RegistroDataCenterService._catalogo.obtener(cliente_corporativo)
+
+    @staticmethod
+    def get_catalogo() -> CatalogoRegistros:
+        """Obtiene el catalogo del directorio de datos."""
+        return RegistroDataCenterService._catalogo
+
+    @staticmethod
+    def _construir_path(cliente_corporativo: str) -> str:
+        """
+        Construye el path del archivo de un cliente.
+        Reemplaza espacios por guiones bajos y quita los puntos
+        para obtener un nombre de archivo seguro.
+        """
+        nombre_archivo_seguro = cliente_corporativo.replace(" ", "_").replace(".", "")
+        nombre_archivo = f"{nombre_archivo_seguro}{C.EXTENSION_DATA}"
+        return os.path.join(C.DIRECTORIO_DATA, nombre_archivo)
+
+    @staticmethod
+    def _construir_directorio_generaciones(cliente_corporativo: str) -> str:
+        """
+        Construye el directorio de generaciones (modo delta) de un cliente,
+        junto al archivo de 'persistir' (ej. 'data/TechCorp_Inc.gen').
+        """
+        path_archivo = RegistroDataCenterService._construir_path(cliente_corporativo)
+        return os.path.splitext(path_archivo)[0] + C.EXTENSION_DIRECTORIO_GENERACIONES
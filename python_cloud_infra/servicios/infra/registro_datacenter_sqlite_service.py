@@ -0,0 +1,492 @@
+"""
+Modulo del servicio RegistroDataCenterSqliteService.
+
+Backend de persistencia alternativo a los archivos Pickle por cliente:
+guarda los registros en una base SQLite (modo WAL) con tablas
+normalizadas para datacenters, racks, servicios y sysadmins.
+Permite responder consultas (ej. "clientes con mas de N bases de datos")
+sin deserializar todos los registros.
+"""
+
+# --- Imports Standard Library ---
+import os
+import pickle
+import sqlite3
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+from typing_extensions import override
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Servicios ---
+from python_cloud_infra.servicios.infra.registro_datacenter_service import RegistroDataCenterService
+
+# --- Imports de Entidades ---
+from python_cloud_infra.entidades.infra.datacenter import DataCenter
+from python_cloud_infra.entidades.infra.server_rack import ServerRack
+from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.infra_persistencia_exception import InfraPersistenciaException, TipoOperacion
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+
+
+# --- Esquema normalizado ---
+# Los servicios y sysadmins se guardan como BLOB individual (pickle por fila)
+# junto a las columnas consultables, para poder reconstruir solo lo pedido.
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS datacenters (
+    id_datacenter     INTEGER PRIMARY KEY,
+    cliente           TEXT    NOT NULL,
+    ubicacion         TEXT    NOT NULL,
+    potencia_total_mw REAL    NOT NULL,
+    valoracion        REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS racks (
+    id_rack                INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_datacenter          INTEGER NOT NULL
+                           REFERENCES datacenters(id_datacenter) ON DELETE CASCADE,
+    nombre                 TEXT    NOT NULL,
+    espacio_maximo_u       INTEGER NOT NULL,
+    espacio_ocupado_u      INTEGER NOT NULL,
+    potencia_disponible_mw REAL    NOT NULL,
+    principal              INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS servicios (
+    id_fila       INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_rack       INTEGER NOT NULL REFERENCES racks(id_rack) ON DELETE CASCADE,
+    id_datacenter INTEGER NOT NULL,
+    cliente       TEXT    NOT NULL,
+    id_servicio   INTEGER NOT NULL,
+    tipo          TEXT    NOT NULL,
+    espacio_u     INTEGER NOT NULL,
+    potencia_mw   REAL    NOT NULL,
+    orden         INTEGER NOT NULL,
+    inicio_u      INTEGER,
+    datos         BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sysadmins (
+    id_fila     INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_rack     INTEGER NOT NULL REFERENCES racks(id_rack) ON DELETE CASCADE,
+    id_empleado INTEGER NOT NULL,
+    nombre      TEXT    NOT NULL,
+    orden       INTEGER NOT NULL,
+    datos       BLOB    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_datacenters_cliente ON datacenters(cliente);
+CREATE INDEX IF NOT EXISTS idx_racks_datacenter ON racks(id_datacenter);
+CREATE INDEX IF NOT EXISTS idx_servicios_tipo ON servicios(tipo);
+CREATE INDEX IF NOT EXISTS idx_servicios_cliente_tipo ON servicios(cliente, tipo);
+CREATE INDEX IF NOT EXISTS idx_servicios_rack ON servicios(id_rack, orden);
+CREATE INDEX IF NOT EXISTS idx_sysadmins_rack ON sysadmins(id_rack, orden);
+"""
+
+# Columnas agregadas despues de la primera version del esquema (tabla -> columna, tipo)
+_COLUMNAS_AGREGADAS: Tuple[Tuple[str, str, str], ...] = (
+    ("servicios", "inicio_u", "INTEGER"),
+)
+
+# Filas de un rack listas para insertar: (fila de 'racks', filas de 'servicios', filas de 'sysadmins')
+FilasRack = Tuple[Tuple, List[Tuple], List[Tuple]]
+
+
+class RegistroDataCenterSqliteService(RegistroDataCenterService):
+    """
+    Backend SQLite del RegistroDataCenterService.
+
+    - Escrituras: una transaccion por registro (todos sus racks, con el
+      slot inicial de cada servicio), con 'executemany' para servicios
+      y sysadmins.
+    - Lecturas: permite reconstruir un registro completo (con todos sus
+      racks y los servicios en sus mismos slots), solo el rack principal,
+      o recorrer servicios por tipo (stream) sin deserializar el resto.
+    - La conexion es compartida: lecturas y escrituras toman el mismo lock.
+
+    Referencia: US-021, US-022
+    """
+
+    def __init__(self, path_db: str | None = None):
+        """
+        Inicializa el backend y crea el esquema si no existe.
+
+        Args:
+            path_db (str | None, optional): Path del archivo SQLite.
+                Defaults a C.DIRECTORIO_DATA/C.ARCHIVO_SQLITE.
+
+        Raises:
+            InfraPersistenciaException: Si no se puede abrir la base.
+        """
+        super().__init__()
+
+        if path_db is None:
+            os.makedirs(C.DIRECTORIO_DATA, exist_ok=True)
+            path_db = os.path.join(C.DIRECTORIO_DATA, C.ARCHIVO_SQLITE)
+        self._path_db: str = path_db
+
+        # Serializa las lecturas y escrituras de varios threads sobre la misma conexion
+        self._lock: Lock = Lock()
+
+        try:
+            self._conexion = sqlite3.connect(path_db, check_same_thread=False)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute("PRAGMA foreign_keys=ON")
+            self._conexion.executescript(_ESQUEMA)
+            self._agregar_columnas_faltantes()
+        except sqlite3.Error as e:
+            raise self._error_lectura(e)
+
+    def _agregar_columnas_faltantes(self) -> None:
+        """Actualiza una base creada con una version anterior del esquema."""
+        for tabla, columna, tipo in _COLUMNAS_AGREGADAS:
+            columnas = {fila[1] for fila in self._conexion.execute(f"PRAGMA table_info({tabla})")}
+            if columna not in columnas:
+                self._conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+
+    def get_path_db(self) -> str:
+        """Obtiene el path del archivo SQLite."""
+        return self._path_db
+
+    def cerrar(self) -> None:
+        """Cierra la conexion con la base de datos."""
+        with self._lock:
+            self._conexion.close()
+
+    # --- Escritura ---
+
+    def persistir(self, registro: RegistroDataCenter) -> str:
+        """
+        Guarda un RegistroDataCenter en la base SQLite.
+        Reemplaza cualquier registro previo del mismo cliente o ID.
+
+        Args:
+            registro (RegistroDataCenter): El objeto a persistir.
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de SQLite o Pickle.
+            ValueError: Si el nombre del cliente es nulo o vacio.
+
+        Returns:
+            str: El path de la base de datos.
+        """
+        cliente = registro.get_cliente_corporativo()
+        if not cliente:
+            raise ValueError("El cliente corporativo no puede ser nulo o vacio")
+
+        datacenter = registro.get_datacenter()
+        principal = registro.get_server_rack()
+        id_dc = registro.get_id_datacenter()
+
+        print(f"\n--- Intentando persistir registro en {self._path_db} ---")
+
+        try:
+            # Se serializa fuera de la transaccion para no retener el lock
+            filas_racks = [self._filas_rack(server_rack, server_rack is principal, id_dc, cliente)
+                           for server_rack in registro.get_racks()]
+
+            with self._lock, self._conexion:
+                self._conexion.execute(
+                    "DELETE FROM datacenters WHERE cliente = ? OR id_datacenter = ?",
+                    (cliente, id_dc))
+                self._conexion.execute(
+                    "INSERT INTO datacenters VALUES (?, ?, ?, ?, ?)",
+                    (id_dc, cliente, datacenter.get_ubicacion_geografica(),
+                     datacenter.get_potencia_total_mw(),
+                     registro.get_valoracion_activos()))
+                for fila_rack, filas_servicios, filas_sysadmins in filas_racks:
+                    cursor = self._conexion.execute(
+                        "INSERT INTO racks (id_datacenter, nombre, espacio_maximo_u, "
+                        "espacio_ocupado_u, potencia_disponible_mw, principal) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (id_dc,) + fila_rack)
+                    id_rack = cursor.lastrowid
+
+                    self._conexion.executemany(
+                        "INSERT INTO servicios (id_rack, id_datacenter, cliente, id_servicio, "
+                        "tipo, espacio_u, potencia_mw, orden, inicio_u, datos) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(id_rack,) + fila for fila in filas_servicios])
+                    self._conexion.executemany(
+                        "INSERT INTO sysadmins (id_rack, id_empleado, nombre, orden, datos) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(id_rack,) + fila for fila in filas_sysadmins])
+
+            print(f"Registro de '{cliente}' persistido exitosamente.")
+            return self._path_db
+
+        except sqlite3.Error as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_SQLITE_ESCRIBIR.format(cliente, self._path_db) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_SQLITE_ESCRIBIR,
+                nombre_archivo=self._path_db,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        except pickle.PickleError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_PICKLE.format(cliente) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_PICKLE,
+                nombre_archivo=self._path_db,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+
+    @staticmethod
+    def _filas_rack(rack: ServerRack,
+                    principal: bool,
+                    id_datacenter: int,
+                    cliente: str) -> FilasRack:
+        """
+        Construye las filas de un rack (sin id_datacenter en la del rack
+        ni id_rack en las de servicios y sysadmins). El estado del rack se
+        lee con su lock tomado, para que servicios y slots sean de la
+        misma version; el pickle se hace despues de soltarlo.
+        """
+        with rack.get_lock():
+            fila_rack = (rack.get_nombre(), rack.get_espacio_maximo_u(),
+                         rack.get_espacio_ocupado_u(), rack.get_potencia_disponible_mw(),
+                         1 if principal else 0)
+            servicios = rack.get_servicios_desplegados()
+            slots = rack.get_slots_servicios()
+            sysadmins = rack.get_sysadmins_asignados()
+
+        filas_servicios = []
+        for orden, servicio in enumerate(servicios):
+            bloque = slots.get(servicio.get_id())
+            filas_servicios.append((
+                id_datacenter,
+                cliente,
+                servicio.get_id(),
+                servicio.get_tipo(),
+                servicio.get_espacio_u(),
+                servicio.get_potencia_consumida(),
+                orden,
+                None if bloque is None else bloque[0],
+                pickle.dumps(servicio, protocol=pickle.HIGHEST_PROTOCOL)
+            ))
+        filas_sysadmins = [
+            (sysadmin.get_id_empleado(), sysadmin.get_nombre(), orden,
+             pickle.dumps(sysadmin, protocol=pickle.HIGHEST_PROTOCOL))
+            for orden, sysadmin in enumerate(sysadmins)
+        ]
+        return fila_rack, filas_servicios, filas_sysadmins
+
+    # --- Lectura ---
+
+    @override
+    def leer_registro(self, cliente_corporativo: str) -> RegistroDataCenter:
+        """
+        Reconstruye el RegistroDataCenter completo de un cliente desde la
+        base: todos sus racks, con cada servicio en su slot original.
+        Cada lectura devuelve objetos nuevos.
+
+        Args:
+            cliente_corporativo (str): El nombre del cliente.
+
+        Raises:
+            InfraPersistenciaException: Si el cliente no existe o falla la lectura.
+            ValueError: Si el nombre del cliente es nulo o vacio.
+
+        Returns:
+            RegistroDataCenter: El registro reconstruido.
+        """
+        if not cliente_corporativo:
+            raise ValueError("El nombre del cliente no puede ser nulo o vacio")
+
+        try:
+            with self._lock:
+                fila_dc = self._conexion.execute(
+                    "SELECT id_datacenter, ubicacion, potencia_total_mw, valoracion "
+                    "FROM datacenters WHERE cliente = ?",
+                    (cliente_corporativo,)).fetchone()
+                if fila_dc is None:
+                    raise self._error_no_existe(cliente_corporativo)
+
+                id_dc, ubicacion, potencia_total, valoracion = fila_dc
+                datacenter = DataCenter(id_dc, potencia_total, ubicacion)
+                rack = self._construir_racks(datacenter)
+
+            return RegistroDataCenter(
+                id_datacenter=id_dc,
+                datacenter=datacenter,
+                server_rack=rack,
+                cliente_corporativo=cliente_corporativo,
+                valoracion_activos=valoracion
+            )
+        except sqlite3.Error as e:
+            raise self._error_lectura(e)
+
+    def leer_rack(self, id_datacenter: int) -> ServerRack:
+        """
+        Reconstruye solo el rack principal de un DataCenter
+        (con sus servicios y sysadmins), sin leer el resto de la base.
+
+        Args:
+            id_datacenter (int): El ID del DataCenter.
+
+        Raises:
+            InfraPersistenciaException: Si el DataCenter no existe o falla la lectura.
+
+        Returns:
+            ServerRack: El rack reconstruido.
+        """
+        try:
+            with self._lock:
+                fila_dc = self._conexion.execute(
+                    "SELECT cliente, ubicacion, potencia_total_mw "
+                    "FROM datacenters WHERE id_datacenter = ?",
+                    (id_datacenter,)).fetchone()
+                if fila_dc is None:
+                    raise self._error_no_existe(str(id_datacenter))
+
+                cliente, ubicacion, potencia_total = fila_dc
+                datacenter = DataCenter(id_datacenter, potencia_total, ubicacion)
+                return self._construir_racks(datacenter, solo_principal=True)
+        except sqlite3.Error as e:
+            raise self._error_lectura(e)
+
+    def iterar_servicios_por_tipo(self,
+                                  tipo_servicio: str,
+                                  cliente: str | None = None) -> Iterator['Servicio']:
+        """
+        Recorre (stream) los servicios de un tipo usando el indice por tipo.
+
+        Solo se deserializan las filas del tipo pedido, en lotes
+        de C.SQLITE_TAMANO_LOTE. Cada lote es una consulta propia
+        (paginada por id_fila) tomada con el lock, por lo que el lock
+        no queda retenido mientras quien itera procesa los servicios.
+
+        Args:
+            tipo_servicio (str): El tipo (ej. "Database").
+            cliente (str | None, optional): Restringe a un cliente.
+
+        Raises:
+            InfraPersistenciaException: Si falla la lectura.
+
+        Yields:
+            Servicio: Cada servicio del tipo pedido.
+        """
+        ultimo_id = 0
+        while True:
+            try:
+                with self._lock:
+                    if cliente is None:
+                        filas = self._conexion.execute(
+                            "SELECT id_fila, datos FROM servicios "
+                            "WHERE tipo = ? AND id_fila > ? ORDER BY id_fila LIMIT ?",
+                            (tipo_servicio, ultimo_id, C.SQLITE_TAMANO_LOTE)).fetchall()
+                    else:
+                        filas = self._conexion.execute(
+                            "SELECT id_fila, datos FROM servicios "
+                            "WHERE cliente = ? AND tipo = ? AND id_fila > ? ORDER BY id_fila LIMIT ?",
+                            (cliente, tipo_servicio, ultimo_id, C.SQLITE_TAMANO_LOTE)).fetchall()
+            except sqlite3.Error as e:
+                raise self._error_lectura(e)
+            if not filas:
+                break
+            ultimo_id = filas[-1][0]
+            for _, datos in filas:
+                yield pickle.loads(datos)
+
+    def contar_servicios_por_tipo(self, cliente: str) -> Dict[str, int]:
+        """
+        Cuenta los servicios de un cliente agrupados por tipo.
+
+        Args:
+            cliente (str): El nombre del cliente.
+
+        Returns:
+            Dict[str, int]: Tipo -> cantidad de servicios.
+        """
+        try:
+            with self._lock:
+                filas = self._conexion.execute(
+                    "SELECT tipo, COUNT(*) FROM servicios WHERE cliente = ? GROUP BY tipo",
+                    (cliente,)).fetchall()
+        except sqlite3.Error as e:
+            raise self._error_lectura(e)
+        return dict(filas)
+
+    def clientes_con_mas_de(self, tipo_servicio: str, cantidad: int) -> List[str]:
+        """
+        Lista los clientes con mas de N servicios de un tipo
+        (ej. "que clientes tienen mas de 10 bases de datos").
+
+        Args:
+            tipo_servicio (str): El tipo (ej. "Database").
+            cantidad (int): El umbral (estrictamente mayor).
+
+        Returns:
+            List[str]: Los clientes, ordenados por nombre.
+        """
+        try:
+            with self._lock:
+                filas = self._conexion.execute(
+                    "SELECT cliente FROM servicios WHERE tipo = ? "
+                    "GROUP BY cliente HAVING COUNT(*) > ? ORDER BY cliente",
+                    (tipo_servicio, cantidad)).fetchall()
+        except sqlite3.Error as e:
+            raise self._error_lectura(e)
+        return [cliente for (cliente,) in filas]
+
+    # --- Helpers privados ---
+
+    def _construir_racks(self, datacenter: DataCenter, solo_principal: bool = False) -> ServerRack:
+        """
+        Reconstruye los racks de un DataCenter (el principal primero, y
+        el resto en el orden en que se guardaron) y los vincula.
+        Se llama con el lock tomado.
+
+        Returns:
+            ServerRack: El rack principal.
+        """
+        filtro = " AND principal = 1" if solo_principal else ""
+        filas_racks = self._conexion.execute(
+            "SELECT id_rack, nombre, espacio_maximo_u, espacio_ocupado_u, "
+            "potencia_disponible_mw, principal FROM racks "
+            f"WHERE id_datacenter = ?{filtro} ORDER BY principal DESC, id_rack",
+            (datacenter.get_id_datacenter(),)).fetchall()
+        if not filas_racks or not filas_racks[0][5]:
+            raise self._error_no_existe(str(datacenter.get_id_datacenter()))
+
+        for id_rack, nombre, espacio_maximo, espacio_ocupado, potencia, principal in filas_racks:
+            rack = ServerRack(nombre, espacio_maximo, datacenter, potencia)
+            rack.set_espacio_ocupado_u(espacio_ocupado)
+            if principal:
+                datacenter.set_rack_principal(rack)
+            else:
+                datacenter.add_rack(rack)
+
+            filas_servicios = self._conexion.execute(
+                "SELECT inicio_u, datos FROM servicios WHERE id_rack = ? ORDER BY orden",
+                (id_rack,)).fetchall()
+            for inicio_u, datos in filas_servicios:
+                rack.add_servicio(pickle.loads(datos), inicio_u)
+
+            filas_sysadmins = self._conexion.execute(
+                "SELECT datos FROM sysadmins WHERE id_rack = ? ORDER BY orden",
+                (id_rack,)).fetchall()
+            rack.set_sysadmins_asignados([pickle.loads(datos) for (datos,) in filas_sysadmins])
+
+        return datacenter.get_rack_principal()  # type: ignore
+
+    def _error_lectura(self, error: Exception) -> InfraPersistenciaException:
+        """Construye la excepcion de lectura para un error de SQLite."""
+        return InfraPersistenciaException(
+            mensaje_tecnico=MSG.TEC_SQLITE_LEER.format(self._path_db) + f" | Error: {error}",
+            mensaje_usuario=MSG.USR_SQLITE_LEER,
+            nombre_archivo=self._path_db,
+            tipo_operacion=TipoOperacion.LEER
+        )
+
+    def _error_no_existe(self, clave: str) -> InfraPersistenciaException:
+        """Construye la excepcion para un cliente/DataCenter inexistente."""
+        return InfraPersistenciaException(
+            mensaje_tecnico=MSG.TEC_SQLITE_NO_EXISTE.format(clave, self._path_db),
+            mensaje_usuario=MSG.USR_LEER_NO_EXISTE,
+            nombre_archivo=self._path_db,
+            tipo_operacion=TipoOperacion.LEER
+        )
@@ -3,7 +3,9 @@ Modulo del servicio ServerRackService.
 
 Este es un servicio central que orquesta la logica de despliegue
 """
-from typing import TYPE_CHECKING, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 # --- Imports de Patrones ---
 # 1. Importa el Factory para crear servicios (US-TECH-002)
@@ -12,6 +14,14 @@ from python_cloud_infra.patrones.factory.servicio_factory import ServicioFactory
 # 2. Importa el Registry (Singleton) para operar sobre servicios (US-TECH-005)
 from python_cloud_infra.servicios.aplicaciones.servicio_registry import ServicioRegistry
 
+# --- Imports de Servicios ---
+from python_cloud_infra.servicios.infra.asignacion_parcial import AsignacionParcial
+from python_cloud_infra.servicios.infra.transaccion_despliegue import TransaccionDespliegue
+from python_cloud_infra.servicios.infra.planificador_desfragmentacion import (
+    PlanDesfragmentacion, PlanificadorDesfragmentacion)
+from python_cloud_infra.servicios.infra.planificador_migraciones import (
+    PlanMigracion, PlanificadorMigraciones)
+
 # --- Imports de Entidades ---
 from python_cloud_infra.entidades.infra.server_rack import ServerRack
 from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
@@ -26,6 +36,9 @@ from python_cloud_infra import constantes as C
 
 # --- Imports para Type Hints ---
 if TYPE_CHECKING:
+    from python_cloud_infra.servicios.infra.presupuesto_potencia import PresupuestoPotencia
+    from python_cloud_infra.entidades.infra.datacenter import DataCenter
+    from python_cloud_infra.servicios.infra.motor_colocacion import PlanColocacion
     from python_cloud_infra.entidades.aplicaciones.servicio_database import ServicioDatabase
     from python_cloud_infra.entidades.aplicaciones.servicio_batch import ServicioBatch
     # TypeAlias para Stateful
@@ -40,14 +53,28 @@ class ServerRackService:
     y la asignación de recursos (usando Registry/Strategy).
     """
 
-    def __init__(self):
+    def __init__(self, presupuesto: 'PresupuestoPotencia | None' = None):
         """
         Inicializa el ServerRackService.
         
         Obtiene la instancia unica (Singleton) del Registry.
+
+        Args:
+            presupuesto (PresupuestoPotencia | None, optional): Presupuesto
+                jerarquico de potencia. Si se indica, los despliegues pasan
+                por su control de admision y 'asignar_recursos' aplica sus
+                limites (DataCenter.potencia_total_mw).
         """
         # Obtiene la instancia unica del Registry (Singleton)
         self._registry = ServicioRegistry.get_instance()
+        self._presupuesto: 'PresupuestoPotencia | None' = presupuesto
+        self._asignacion_parcial: AsignacionParcial = AsignacionParcial()
+        self._planificador_desfragmentacion: PlanificadorDesfragmentacion = PlanificadorDesfragmentacion()
+        self._planificador_migraciones: PlanificadorMigraciones = PlanificadorMigraciones()
+
+    def get_presupuesto(self) -> 'PresupuestoPotencia | None':
+        """Obtiene el presupuesto de potencia (o None si no se usa)."""
+        return self._presupuesto
 
     def desplegar_servicio(self,
                            rack: ServerRack,
@@ -65,7 +92,10 @@ class ServerRackService:
             cantidad (int): Cuantos servicios desplegar.
 
         Raises:
-            EspacioInsuficienteException: Si no hay espacio en U.
+            EspacioInsuficienteException: Si no hay espacio en U, o no hay
+                slots contiguos para cada servicio (ver desfragmentar).
+            PotenciaInsuficienteException: Si la potencia base de los servicios
+                supera los MW libres del rack o no entra en el presupuesto.
             ValueError: Si la cantidad es <= 0.
 
         Returns:
@@ -75,41 +105,354 @@ class ServerRackService:
             raise ValueError("La cantidad a desplegar debe ser positiva")
 
         print(f"\n--- Intentando desplegar {cantidad} x {tipo_servicio} ---")
-        
-        # 1. Usa el Factory para crear un "prototipo" y ver su espacio en U
-        prototipo = ServicioFactory.crear_servicio(tipo_servicio)
-        espacio_requerido_u = prototipo.get_espacio_u() * cantidad
-        
-        # 2. Validacion de espacio (US-004)
-        espacio_disponible_u = rack.get_espacio_disponible_u()
-        
-        if espacio_disponible_u < espacio_requerido_u:
-            raise EspacioInsuficienteException(
-                mensaje_tecnico=MSG.TEC_ESPACIO_INSUFICIENTE.format(
-                    espacio_disponible_u, espacio_requerido_u),
-                mensaje_usuario=MSG.USR_ESPACIO_INSUFICIENTE
-            )
 
-        # 3. Creacion y adicion
-        servicios_desplegados = []
-        for _ in range(cantidad):
-            # Usa el Factory para crear la instancia real
-            nuevo_servicio = ServicioFactory.crear_servicio(tipo_servicio)
-            rack.add_servicio(nuevo_servicio)
-            servicios_desplegados.append(nuevo_servicio)
-            
-        # 4. Actualizar espacio ocupado en el rack
-        espacio_ocupado_u = rack.get_espacio_ocupado_u()
-        rack.set_espacio_ocupado_u(
-            espacio_ocupado_u + espacio_requerido_u
-        )
-        
+        # Validacion (U y slots contiguos), creacion con el Factory y
+        # adicion al rack en una sola transaccion (US-004)
+        return self.desplegar_lote(rack, [(tipo_servicio, cantidad)])
+
+    def desplegar_lote(self,
+                       rack: ServerRack,
+                       pedidos: List[Tuple[str, int]]) -> List[Servicio]:
+        """
+        Despliega varios tipos de servicio en el rack en una sola
+        transaccion (TransaccionDespliegue): se despliegan todos o ninguno.
+
+        Args:
+            rack (ServerRack): El rack donde se desplegara.
+            pedidos (List[Tuple[str, int]]): (tipo de servicio, cantidad).
+
+        Raises:
+            EspacioInsuficienteException: Si no hay espacio en U, o no hay
+                slots contiguos para cada servicio (ver desfragmentar).
+            PotenciaInsuficienteException: Si la potencia base del lote supera
+                los MW libres del rack o no entra en el presupuesto.
+            ValueError: Si alguna cantidad es <= 0.
+
+        Returns:
+            List[Servicio]: La lista de servicios que fueron creados y desplegados.
+        """
+        transaccion = TransaccionDespliegue(rack, self._presupuesto)
+        for tipo_servicio, cantidad in pedidos:
+            transaccion.agregar(tipo_servicio, cantidad)
+        servicios_desplegados = transaccion.ejecutar()
+
         print(f"Despliegue exitoso. Espacio restante: "
               f"{rack.get_espacio_disponible_u()} U")
-        
+
         return servicios_desplegados
 
-    def asignar_recursos(self, rack: ServerRack) -> None:
+    def desplegar_servicio_en_datacenter(self,
+                                         datacenter: 'DataCenter',
+                                         tipo_servicio: str,
+                                         cantidad: int) -> List[Servicio]:
+        """
+        Despliega N servicios en el rack del DataCenter que mejor los
+        contiene, sin que el llamador elija el rack.
+
+        Usa el indice de capacidad del DataCenter: elige, en tiempo
+        logaritmico, el rack con menos U libres que igual tenga el espacio
+        y la potencia base (MW libres) del lote completo.
+
+        Args:
+            datacenter (DataCenter): El DataCenter donde se desplegara.
+            tipo_servicio (str): El nombre del servicio (ej. "Database").
+            cantidad (int): Cuantos servicios desplegar.
+
+        Raises:
+            EspacioInsuficienteException: Si ningun rack tiene el espacio
+                (U) y la potencia (MW) libres para el lote.
+            PotenciaInsuficienteException: Si la potencia base de los servicios
+                supera los MW libres del rack o no entra en el presupuesto.
+            ValueError: Si la cantidad es <= 0.
+
+        Returns:
+            List[Servicio]: La lista de servicios que fueron creados y desplegados.
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a desplegar debe ser positiva")
+
+        espacio_requerido_u = ServicioFactory.get_espacio_u(tipo_servicio) * cantidad
+        potencia_requerida_mw = ServicioFactory.get_potencia_base(tipo_servicio) * cantidad
+
+        rack = datacenter.get_indice_capacidad().buscar_rack(espacio_requerido_u, potencia_requerida_mw)
+        if rack is None:
+            raise EspacioInsuficienteException(
+                mensaje_tecnico=MSG.TEC_SIN_RACK_DISPONIBLE.format(
+                    datacenter.get_id_datacenter(), espacio_requerido_u, potencia_requerida_mw),
+                mensaje_usuario=MSG.USR_SIN_RACK_DISPONIBLE
+            )
+
+        print(f"\nRack elegido para {cantidad} x {tipo_servicio}: '{rack.get_nombre()}'")
+        return self.desplegar_servicio(rack, tipo_servicio, cantidad)
+
+    def desplegar_plan(self, plan: 'PlanColocacion') -> List[Servicio]:
+        """
+        Confirma un plan de MotorColocacion: se despliegan todas sus
+        lineas o ninguna.
+
+        1. Reserva: cada rack valida, con su lock, la capacidad planificada
+           contra su estado actual (U y MW libres, y slots contiguos) y la
+           reserva (una TransaccionDespliegue por rack con todas sus lineas).
+        2. Se crean los servicios de todos los racks.
+        3. Recien entonces se confirman todas las transacciones.
+        Si algo falla antes de confirmar, se revierten las reservas de
+        TODOS los racks: ningun rack queda con el plan a medias.
+
+        Args:
+            plan (PlanColocacion): El plan a confirmar.
+
+        Raises:
+            EspacioInsuficienteException: Si el plan no es completo o algun
+                rack ya no tiene la capacidad planificada.
+            PotenciaInsuficienteException: Si hay presupuesto de potencia
+                y un lote no entra en el.
+
+        Returns:
+            List[Servicio]: Todos los servicios desplegados.
+        """
+        if not plan.es_completo():
+            raise EspacioInsuficienteException(
+                mensaje_tecnico=MSG.TEC_PLAN_INCOMPLETO.format(plan.get_sin_colocar()),
+                mensaje_usuario=MSG.USR_PLAN_INCOMPLETO
+            )
+
+        # Una transaccion por rack (en el orden del plan) y su capacidad planificada
+        transacciones: Dict[int, Tuple[ServerRack, TransaccionDespliegue, int, float]] = {}
+        for colocacion in plan.get_colocaciones():
+            rack = colocacion.get_rack()
+            _, transaccion, espacio_u, potencia_mw = transacciones.get(
+                id(rack), (rack, TransaccionDespliegue(rack, self._presupuesto), 0, 0.0))
+            transaccion.agregar(colocacion.get_tipo_servicio(), colocacion.get_cantidad())
+            transacciones[id(rack)] = (rack, transaccion,
+                                       espacio_u + colocacion.get_espacio_u(),
+                                       potencia_mw + colocacion.get_potencia_mw())
+
+        try:
+            # 1. Reserva en todos los racks
+            for rack, transaccion, espacio_u, potencia_mw in transacciones.values():
+                with rack.get_lock():
+                    if rack.get_espacio_disponible_u() < espacio_u or \
+                            rack.get_potencia_libre_mw() + C.TOLERANCIA_POTENCIA_MW < potencia_mw:
+                        raise EspacioInsuficienteException(
+                            mensaje_tecnico=MSG.TEC_PLAN_DESACTUALIZADO.format(
+                                rack.get_nombre(), rack.get_espacio_disponible_u(),
+                                rack.get_potencia_libre_mw(), espacio_u, potencia_mw),
+                            mensaje_usuario=MSG.USR_PLAN_DESACTUALIZADO
+                        )
+                    transaccion.reservar()
+            # 2. Creacion de los servicios (y reserva en el presupuesto)
+            for _, transaccion, _, _ in transacciones.values():
+                transaccion.construir()
+        except BaseException:
+            for _, transaccion, _, _ in transacciones.values():
+                transaccion.revertir()
+            raise
+
+        # 3. Confirmacion: cada rack agrega sus servicios en un solo paso
+        servicios_desplegados: List[Servicio] = []
+        for _, transaccion, _, _ in transacciones.values():
+            transaccion.confirmar()
+            servicios_desplegados.extend(transaccion.get_servicios())
+        return servicios_desplegados
+
+    def desfragmentar(self, rack: ServerRack, espacio_u: int) -> PlanDesfragmentacion:
+        """
+        Libera un bloque de 'espacio_u' slots contiguos en el rack moviendo
+        la menor cantidad de servicios posible (ver PlanificadorDesfragmentacion).
+
+        Args:
+            rack (ServerRack): El rack a desfragmentar.
+            espacio_u (int): Tamanio del bloque a liberar.
+
+        Raises:
+            EspacioInsuficienteException: Si no hay forma de liberar el bloque.
+
+        Returns:
+            PlanDesfragmentacion: El plan aplicado.
+        """
+        with rack.get_lock():
+            plan = self._planificador_desfragmentacion.planificar(rack, espacio_u)
+            if plan is None:
+                raise EspacioInsuficienteException(
+                    mensaje_tecnico=MSG.TEC_DESFRAGMENTACION_IMPOSIBLE.format(
+                        rack.get_nombre(), espacio_u, rack.get_espacio_disponible_u()),
+                    mensaje_usuario=MSG.USR_DESFRAGMENTACION_IMPOSIBLE
+                )
+
+            servicios_por_id = {servicio.get_id(): servicio for servicio in rack.get_servicios_desplegados()}
+            for movimiento in plan.get_movimientos():
+                rack.mover_servicio(servicios_por_id[movimiento.get_id_servicio()], movimiento.get_hasta_u())
+
+            print(f"Rack '{rack.get_nombre()}' desfragmentado: {plan.get_cantidad_movimientos()} "
+                  f"servicio(s) movido(s), {espacio_u} U libres desde el slot {plan.get_inicio_u()}.")
+            return plan
+
+    def migrar_servicio(self, servicio: Servicio, rack_destino: ServerRack) -> None:
+        """
+        Migra un servicio desplegado a otro rack (ver migrar_servicios).
+
+        Args:
+            servicio (Servicio): El servicio a migrar.
+            rack_destino (ServerRack): El rack destino.
+        """
+        self.migrar_servicios([servicio], rack_destino)
+
+    def migrar_servicios(self, servicios: List[Servicio], rack_destino: ServerRack) -> List[Servicio]:
+        """
+        Migra servicios desplegados (de uno o varios racks) a otro rack,
+        sin decomisionarlos: conservan su ID, su estado (IOPS, workers,
+        parches) y su reserva de potencia.
+
+        La migracion es atomica: con los locks de todos los racks
+        involucrados (tomados en un orden fijo, sin deadlocks) se reserva
+        la capacidad del destino, se traslada la reserva del presupuesto,
+        se agregan los servicios al destino y recien despues se remueven
+        de su origen (U, slots, MW reservados e indices se actualizan en
+        cada rack). Si algo falla, ningun rack cambia.
+
+        Args:
+            servicios (List[Servicio]): Los servicios a migrar.
+            rack_destino (ServerRack): El rack destino.
+
+        Raises:
+            EspacioInsuficienteException: Si el destino no tiene U o slots
+                contiguos para los servicios.
+            PotenciaInsuficienteException: Si el destino (o el presupuesto)
+                no tiene la potencia de los servicios.
+            ValueError: Si algun servicio no esta desplegado o cambia de
+                rack durante la migracion.
+
+        Returns:
+            List[Servicio]: Los servicios migrados (sin los que ya estaban
+                en el destino).
+        """
+        origenes: Dict[int, Tuple[ServerRack, List[Servicio]]] = {}
+        a_migrar: List[Servicio] = []
+        for servicio in dict.fromkeys(servicios):
+            origen = servicio.get_rack()
+            if origen is None:
+                raise ValueError(f"El servicio {servicio.get_id()} no esta desplegado en un rack")
+            if origen is rack_destino:
+                continue
+            origenes.setdefault(id(origen), (origen, []))[1].append(servicio)
+            a_migrar.append(servicio)
+        if not a_migrar:
+            return []
+
+        racks = [rack_destino] + [origen for origen, _ in origenes.values()]
+        with self._bloquear_racks(racks):
+            for origen, servicios_origen in origenes.values():
+                for servicio in servicios_origen:
+                    if servicio.get_rack() is not origen:
+                        raise ValueError(f"El servicio {servicio.get_id()} cambio de rack durante la migracion")
+
+            tamanios_u = [servicio.get_espacio_u() for servicio in a_migrar]
+            potencia_mw = sum(servicio.get_potencia_consumida() for servicio in a_migrar)
+            mensaje_tecnico = MSG.TEC_MIGRACION_SIN_CAPACIDAD.format(
+                rack_destino.get_nombre(), len(a_migrar), sum(tamanios_u), potencia_mw,
+                rack_destino.get_espacio_disponible_u(), rack_destino.get_potencia_libre_mw())
+            if potencia_mw > rack_destino.get_potencia_libre_mw():
+                raise PotenciaInsuficienteException(
+                    mensaje_tecnico=mensaje_tecnico,
+                    mensaje_usuario=MSG.USR_MIGRACION_SIN_CAPACIDAD
+                )
+            inicios_u = rack_destino.reservar_capacidad(tamanios_u, potencia_mw)
+            if inicios_u is None:
+                raise EspacioInsuficienteException(
+                    mensaje_tecnico=mensaje_tecnico,
+                    mensaje_usuario=MSG.USR_MIGRACION_SIN_CAPACIDAD
+                )
+            if self._presupuesto is not None:
+                try:
+                    self._presupuesto.trasladar_lote(a_migrar, rack_destino)
+                except BaseException:
+                    rack_destino.liberar_capacidad(inicios_u, tamanios_u, potencia_mw)
+                    raise
+
+            # Primero se agregan al destino: el servicio nunca queda sin rack
+            rack_destino.confirmar_servicios(a_migrar, inicios_u, potencia_mw)
+            for origen, servicios_origen in origenes.values():
+                origen.remover_servicios(servicios_origen, liberar_espacio=True)
+
+        print(f"Migracion exitosa: {len(a_migrar)} servicio(s) a '{rack_destino.get_nombre()}'. "
+              f"Espacio restante: {rack_destino.get_espacio_disponible_u()} U")
+        return a_migrar
+
+    def planificar_migraciones(self, racks: List[ServerRack]) -> PlanMigracion:
+        """
+        Calcula las migraciones que balancean la potencia entre racks
+        (ver PlanificadorMigraciones), sin ejecutarlas.
+
+        Args:
+            racks (List[ServerRack]): Los racks a balancear.
+
+        Returns:
+            PlanMigracion: El plan, agrupado en lotes.
+        """
+        return self._planificador_migraciones.planificar(racks)
+
+    def ejecutar_plan_migracion(self,
+                                plan: PlanMigracion,
+                                workers: int = C.MIGRACION_WORKERS) -> int:
+        """
+        Ejecuta un plan de migraciones lote por lote. Las migraciones de
+        un lote corren en un pool de threads (el plan ya limita cuantas
+        toca cada rack); cada una es atomica, por lo que si una falla
+        (ej. el destino se lleno desde que se planifico) las anteriores
+        quedan hechas y el error se propaga al terminar el lote.
+
+        Args:
+            plan (PlanMigracion): El plan (ver planificar_migraciones).
+            workers (int, optional): Threads por lote.
+
+        Returns:
+            int: La cantidad de servicios migrados.
+        """
+        migrados = 0
+        for lote in plan.get_lotes():
+            grupos: Dict[Tuple[int, int], Tuple[List[Servicio], ServerRack]] = {}
+            for movimiento in lote:
+                clave = (id(movimiento.get_rack_origen()), id(movimiento.get_rack_destino()))
+                grupos.setdefault(clave, ([], movimiento.get_rack_destino()))[0].append(movimiento.get_servicio())
+            servicios_grupos = [servicios_grupo for servicios_grupo, _ in grupos.values()]
+            destinos = [destino for _, destino in grupos.values()]
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="MigracionThread") as pool:
+                resultados = list(pool.map(self.migrar_servicios, servicios_grupos, destinos))
+            migrados += sum(len(resultado) for resultado in resultados)
+        return migrados
+
+    def balancear_potencia(self, racks: List[ServerRack]) -> PlanMigracion:
+        """
+        Balancea la carga de potencia entre racks migrando servicios:
+        planifica y ejecuta el plan.
+
+        Args:
+            racks (List[ServerRack]): Los racks a balancear.
+
+        Returns:
+            PlanMigracion: El plan ejecutado.
+        """
+        plan = self.planificar_migraciones(racks)
+        migrados = self.ejecutar_plan_migracion(plan)
+        print(f"Balanceo de potencia: {migrados} servicio(s) migrado(s) en "
+              f"{plan.get_cantidad_lotes()} lote(s). Desvio maximo: "
+              f"{plan.get_desvio_inicial_mw():.1f} -> {plan.get_desvio_final_mw():.1f} MW")
+        return plan
+
+    @staticmethod
+    def _bloquear_racks(racks: List[ServerRack]) -> ExitStack:
+        """
+        Toma los locks de escritura de varios racks, siempre en el mismo
+        orden (por id) para que dos migraciones cruzadas no se bloqueen.
+        """
+        pila = ExitStack()
+        unicos = {id(rack): rack for rack in racks}
+        for clave in sorted(unicos):
+            pila.enter_context(unicos[clave].get_lock())
+        return pila
+
+    def asignar_recursos(self, rack: ServerRack, parcial: bool = False) -> None:
         """
         Asigna recursos (potencia) a todos los servicios del rack.
         (Análogo a 'regar')
@@ -119,43 +462,95 @@ class ServerRackService:
 
         Args:
             rack (ServerRack): El rack que asignará recursos.
+            parcial (bool, optional): Si es True y el rack no tiene la
+                potencia de una asignacion completa, en lugar de fallar
+                alimenta al mejor subconjunto de servicios que entra en
+                la potencia disponible (ver AsignacionParcial).
             
         Raises:
-            PotenciaInsuficienteException: Si no hay potencia (MW) para asignar.
+            PotenciaInsuficienteException: Si no hay potencia (MW) para
+                asignar y no se pidio asignacion parcial.
         """
         
-        # 1. Validar y consumir potencia del rack (US-008)
-        potencia_necesaria_mw = C.POTENCIA_POR_ASIGNACION
-        potencia_disponible_mw = rack.get_potencia_disponible_mw()
+        # El balanceador escribe el rack mientras otros hilos despliegan o
+        # decomisionan: toda la asignacion es una sola escritura
+        with rack.get_lock():
+            # 1. Validar y consumir potencia del rack (US-008)
+            potencia_necesaria_mw = C.POTENCIA_POR_ASIGNACION
+            potencia_disponible_mw = rack.get_potencia_disponible_mw()
         
-        if potencia_disponible_mw < potencia_necesaria_mw:
-            raise PotenciaInsuficienteException(
-                mensaje_tecnico=MSG.TEC_POTENCIA_INSUFICIENTE.format(
-                    potencia_disponible_mw, potencia_necesaria_mw),
-                mensaje_usuario=MSG.USR_POTENCIA_INSUFICIENTE
-            )
+            if potencia_disponible_mw < potencia_necesaria_mw:
+                if parcial:
+                    self._asignar_recursos_parcial(rack, potencia_disponible_mw)
+                    return
+                raise PotenciaInsuficienteException(
+                    mensaje_tecnico=MSG.TEC_POTENCIA_INSUFICIENTE.format(
+                        potencia_disponible_mw, potencia_necesaria_mw),
+                    mensaje_usuario=MSG.USR_POTENCIA_INSUFICIENTE
+                )
             
-        rack.set_potencia_disponible_mw(potencia_disponible_mw - potencia_necesaria_mw)
+            rack.set_potencia_disponible_mw(potencia_disponible_mw - potencia_necesaria_mw)
         
-        print(f"\nAsignando recursos. Consumiendo {potencia_necesaria_mw} MW del rack...")
+            print(f"\nAsignando recursos. Consumiendo {potencia_necesaria_mw} MW del rack...")
 
-        # 2. Distribuir recursos a cada servicio
-        for servicio in rack.get_servicios_desplegados():
-            
-            # 3. Llama al Registry (que llama al Strategy) para
-            #    calcular y actualizar el consumo de potencia.
-            potencia_consumida = self._registry.consumir_recursos(servicio)
+            # 2. Distribuir recursos a cada servicio
+            for servicio in rack.get_servicios_desplegados():
             
-            # 4. *** NUESTRA LÓGICA ORIGINAL ***
-            #    Llama al Registry para 'escalar' (solo si es Stateful)
-            #    (Usamos 'from .servicio_database import ServicioDatabase'
-            #    para evitar 'isinstance' y cumplir la rúbrica).
-            from python_cloud_infra.entidades.aplicaciones.servicio_database import ServicioDatabase
-            from python_cloud_infra.entidades.aplicaciones.servicio_batch import ServicioBatch
-            
-            if type(servicio) in (ServicioDatabase, ServicioBatch):
-                # Es un servicio Stateful, llamamos a escalar
-                self._registry.escalar_servicio_stateful(servicio)
+                # 3. Llama al Registry (que llama al Strategy) para
+                #    calcular y actualizar el consumo de potencia.
+                potencia_consumida = self._registry.consumir_recursos(servicio)
+
+                # 4. Presupuesto y escalado (Stateful)
+                self._post_consumo(rack, servicio, potencia_consumida)
                 
+            # 5. Aplicar los limites del presupuesto (recorte segun la politica)
+            self._aplicar_limites_presupuesto(rack)
+
+            print(f"Asignación de recursos completada. Potencia restante en rack: "
+                  f"{rack.get_potencia_disponible_mw():.1f} MW")
+
+    def _asignar_recursos_parcial(self, rack: ServerRack, potencia_disponible_mw: float) -> None:
+        """
+        Asignacion parcial (US-008): elige con AsignacionParcial el
+        subconjunto de servicios de mayor valor (peso de clase x demanda)
+        cuya demanda total entra en la potencia disponible, y solo
+        alimenta (y escala) a esos servicios.
+        """
+        servicios = rack.get_servicios_desplegados()
+        demandas_mw = [self._registry.calcular_demanda(servicio) for servicio in servicios]
+        pesos = [self._registry.get_peso_clase(servicio) for servicio in servicios]
+        elegidos = self._asignacion_parcial.seleccionar(demandas_mw, pesos, potencia_disponible_mw)
+
+        consumo_mw = sum(demandas_mw[indice] for indice in elegidos)
+        rack.set_potencia_disponible_mw(max(0.0, potencia_disponible_mw - consumo_mw))
+        print(f"\nAsignacion PARCIAL de recursos ({potencia_disponible_mw:.1f} MW disponibles): "
+              f"{len(elegidos)}/{len(servicios)} servicios, {consumo_mw:.1f} MW.")
+
+        for indice in elegidos:
+            servicio = servicios[indice]
+            servicio.set_potencia_consumida(demandas_mw[indice])
+            self._post_consumo(rack, servicio, demandas_mw[indice])
+
+        self._aplicar_limites_presupuesto(rack)
         print(f"Asignación de recursos completada. Potencia restante en rack: "
-              f"{rack.get_potencia_disponible_mw():.1f} MW")
\ No newline at end of file
+              f"{rack.get_potencia_disponible_mw():.1f} MW")
+
+    def _post_consumo(self, rack: ServerRack, servicio: Servicio, potencia_consumida: float) -> None:
+        """Registra la demanda en el presupuesto y escala los servicios Stateful."""
+        if self._presupuesto is not None:
+            self._presupuesto.ajustar_demanda(servicio, potencia_consumida, rack)
+        
+        # *** NUESTRA LÓGICA ORIGINAL ***
+        # Llama al Registry para 'escalar' (solo si es Stateful).
+        # El Registry resuelve por tipo (MRO), sin 'isinstance' (rubrica).
+        if self._registry.es_escalable(servicio):
+            # Es un servicio Stateful, llamamos a escalar
+            self._registry.escalar_servicio_stateful(servicio)
+
+    def _aplicar_limites_presupuesto(self, rack: ServerRack) -> None:
+        """Aplica los limites del presupuesto de potencia (si hay) al DataCenter del rack."""
+        if self._presupuesto is not None:
+            recortes = self._presupuesto.aplicar_limites(rack)
+            if recortes:
+                print(f"Limite de potencia excedido: {len(recortes)} servicio(s) recortado(s) "
+                      f"({self._presupuesto.get_reservado_rack(rack):.1f} MW reservados en el rack).")
@@ -0,0 +1,194 @@
+"""
+Modulo de la TransaccionDespliegue.
+
+Despliegue de uno o varios tipos de servicio en un rack como una sola
+transaccion: o quedan todos los servicios desplegados o ninguno.
+"""
+from __future__ import annotations
+from enum import Enum
+from typing import List, Tuple, TYPE_CHECKING
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Patrones ---
+from python_cloud_infra.patrones.factory.servicio_factory import ServicioFactory
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.espacio_insuficiente_exception import EspacioInsuficienteException
+from python_cloud_infra.excepciones.potencia_insuficiente_exception import PotenciaInsuficienteException
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+    from python_cloud_infra.servicios.infra.presupuesto_potencia import PresupuestoPotencia
+
+
+class EstadoTransaccion(Enum):
+    """Estados de una TransaccionDespliegue."""
+    ABIERTA = "abierta"
+    RESERVADA = "reservada"
+    CONFIRMADA = "confirmada"
+    REVERTIDA = "revertida"
+
+
+class TransaccionDespliegue:
+    """
+    Transaccion de despliegue sobre un ServerRack.
+
+    1. reservar(): con el lock del rack, valida y reserva U (bloques de
+       slots contiguos) y MW de todo el lote (contra los MW libres del rack).
+    2. construir(): sin el lock, crea las instancias en lote (Factory)
+       y, si hay presupuesto, reserva su potencia (atomico por lote).
+    3. confirmar(): con el lock, agrega todos los servicios al rack y
+       actualiza el espacio ocupado en un solo paso.
+    Si algo falla, revertir() devuelve la capacidad reservada y la
+    potencia del presupuesto: el rack queda como estaba.
+
+    El lock del rack solo se toma para reservar y para confirmar, no
+    mientras se crean las instancias.
+
+    Referencia: US-004, US-005, US-006, US-007
+    """
+
+    def __init__(self, rack: 'ServerRack', presupuesto: 'PresupuestoPotencia | None' = None):
+        """
+        Abre la transaccion.
+
+        Args:
+            rack (ServerRack): El rack donde se desplegara.
+            presupuesto (PresupuestoPotencia | None, optional): Presupuesto
+                de potencia para el control de admision.
+        """
+        self._rack: 'ServerRack' = rack
+        self._presupuesto: 'PresupuestoPotencia | None' = presupuesto
+        self._pedidos: List[Tuple[str, int]] = []
+        self._tamanios_u: List[int] = []
+        self._potencia_mw: float = 0.0
+        self._inicios_u: List[int] = []
+        self._servicios: List['Servicio'] = []
+        self._estado: EstadoTransaccion = EstadoTransaccion.ABIERTA
+
+    def get_estado(self) -> EstadoTransaccion:
+        """Obtiene el estado de la transaccion."""
+        return self._estado
+
+    def get_servicios(self) -> List['Servicio']:
+        """Obtiene una COPIA de los servicios creados (Rubrica 5.2)."""
+        return self._servicios.copy()
+
+    def agregar(self, tipo_servicio: str, cantidad: int) -> None:
+        """
+        Agrega un tipo de servicio al lote.
+
+        Args:
+            tipo_servicio (str): El nombre del servicio (ej. "Database").
+            cantidad (int): Cuantos servicios desplegar.
+
+        Raises:
+            ValueError: Si la cantidad es <= 0, el tipo no existe o la
+                transaccion ya fue reservada.
+        """
+        self._validar_estado(EstadoTransaccion.ABIERTA)
+        if cantidad <= 0:
+            raise ValueError("La cantidad a desplegar debe ser positiva")
+        espacio_u = ServicioFactory.get_espacio_u(tipo_servicio)
+        self._pedidos.append((tipo_servicio, cantidad))
+        self._tamanios_u.extend([espacio_u] * cantidad)
+        self._potencia_mw += ServicioFactory.get_potencia_base(tipo_servicio) * cantidad
+
+    def ejecutar(self) -> List['Servicio']:
+        """
+        Reserva, construye y confirma; ante cualquier error revierte.
+
+        Raises:
+            EspacioInsuficienteException: Si no hay U o slots contiguos.
+            PotenciaInsuficienteException: Si el lote no entra en los MW
+                libres del rack o en el presupuesto.
+
+        Returns:
+            List[Servicio]: Los servicios desplegados.
+        """
+        self.reservar()
+        try:
+            self.construir()
+            self.confirmar()
+        except BaseException:
+            self.revertir()
+            raise
+        return self.get_servicios()
+
+    def reservar(self) -> None:
+        """
+        Valida y reserva en el rack la capacidad de todo el lote.
+
+        Raises:
+            EspacioInsuficienteException: Si no hay U o slots contiguos.
+            PotenciaInsuficienteException: Si los MW del lote superan los
+                MW libres del rack.
+        """
+        self._validar_estado(EstadoTransaccion.ABIERTA)
+        rack = self._rack
+        espacio_requerido_u = sum(self._tamanios_u)
+        with rack.get_lock():
+            espacio_disponible_u = rack.get_espacio_disponible_u()
+            if espacio_disponible_u < espacio_requerido_u:
+                raise EspacioInsuficienteException(
+                    mensaje_tecnico=MSG.TEC_ESPACIO_INSUFICIENTE.format(
+                        espacio_disponible_u, espacio_requerido_u),
+                    mensaje_usuario=MSG.USR_ESPACIO_INSUFICIENTE
+                )
+            if self._potencia_mw > rack.get_potencia_libre_mw() + C.TOLERANCIA_POTENCIA_MW:
+                raise PotenciaInsuficienteException(
+                    mensaje_tecnico=MSG.TEC_POTENCIA_INSUFICIENTE.format(
+                        rack.get_potencia_libre_mw(), self._potencia_mw),
+                    mensaje_usuario=MSG.USR_POTENCIA_INSUFICIENTE
+                )
+            inicios_u = rack.reservar_capacidad(self._tamanios_u, self._potencia_mw)
+            if inicios_u is None:
+                raise EspacioInsuficienteException(
+                    mensaje_tecnico=MSG.TEC_ESPACIO_FRAGMENTADO.format(
+                        rack.get_nombre(), len(self._tamanios_u),
+                        max(self._tamanios_u, default=0), rack.get_mayor_hueco_u()),
+                    mensaje_usuario=MSG.USR_ESPACIO_FRAGMENTADO
+                )
+        self._inicios_u = inicios_u
+        self._estado = EstadoTransaccion.RESERVADA
+
+    def construir(self) -> None:
+        """
+        Crea las instancias del lote (sin el lock del rack) y reserva su
+        potencia en el presupuesto.
+
+        Raises:
+            PotenciaInsuficienteException: Si el lote no entra en el presupuesto.
+        """
+        self._validar_estado(EstadoTransaccion.RESERVADA)
+        self._servicios = []
+        for tipo_servicio, cantidad in self._pedidos:
+            self._servicios.extend(ServicioFactory.crear_servicios(tipo_servicio, cantidad))
+        if self._presupuesto is not None:
+            self._presupuesto.reservar_lote(self._servicios, rack=self._rack)
+
+    def confirmar(self) -> None:
+        """Agrega todos los servicios al rack en un solo paso."""
+        self._validar_estado(EstadoTransaccion.RESERVADA)
+        self._rack.confirmar_servicios(self._servicios, self._inicios_u, self._potencia_mw)
+        self._estado = EstadoTransaccion.CONFIRMADA
+
+    def revertir(self) -> None:
+        """Devuelve la capacidad reservada y la potencia del presupuesto."""
+        if self._estado != EstadoTransaccion.RESERVADA:
+            return
+        if self._presupuesto is not None:
+            for servicio in self._servicios:
+                self._presupuesto.liberar(servicio)
+        self._rack.liberar_capacidad(self._inicios_u, self._tamanios_u, self._potencia_mw)
+        self._servicios = []
+        self._estado = EstadoTransaccion.REVERTIDA
+
+    def _validar_estado(self, esperado: EstadoTransaccion) -> None:
+        """Verifica que la transaccion este en el estado esperado."""
+        if self._estado != esperado:
+            raise ValueError(f"La transaccion esta {self._estado.value} (se esperaba {esperado.value})")
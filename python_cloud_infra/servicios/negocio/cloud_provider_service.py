@@ -5,18 +5,43 @@ Modulo del servicio CloudProviderService.
 Maneja la logica de negocio de alto nivel que
 involucra a multiples DataCenters (registros).
 """
-from typing import Dict, List, Type, TypeVar, cast
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, Iterator, List, Tuple, Type, TypeVar, cast
 
 # --- Imports de Entidades y Servicios de Negocio ---
 from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+from python_cloud_infra.entidades.infra.server_rack import ServerRack
 from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
 from python_cloud_infra.servicios.negocio.snapshot import Snapshot
+from python_cloud_infra.servicios.negocio.snapshot_en_disco import SnapshotEnDisco
+from python_cloud_infra.servicios.negocio.rollout_parche import RolloutParche
+from python_cloud_infra.servicios.negocio.indice_cobertura_parches import IndiceCoberturaParches
+from python_cloud_infra.servicios.negocio.consulta_flota import ConsultaFlota, IndiceFlota
+from python_cloud_infra.servicios.negocio.directorio_servicios import DirectorioServicios
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.monitoreo.telemetria.agregados_flota import AgregadosFlota
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
 
 # --- Imports para Type Hints ---
 # T es el TypeVar para la cosecha generica
 T = TypeVar('T', bound=Servicio)
 
 
+class _EsDeTipo:
+    """
+    Predicado "el servicio es de este tipo" (sin lambda, Rubrica 3.4).
+    """
+
+    def __init__(self, tipo_servicio: Type[Servicio]):
+        self._tipo_servicio: Type[Servicio] = tipo_servicio
+
+    def __call__(self, servicio: Servicio) -> bool:
+        return isinstance(servicio, self._tipo_servicio)
+
+
 class CloudProviderService:
     """
     Servicio para gestionar operaciones de alto nivel
@@ -35,6 +60,19 @@ class CloudProviderService:
         Referencia: US-018
         """
         self._datacenters_gestionados: Dict[int, RegistroDataCenter] = {}
+        # Rollouts de parches ejecutados (nombre de parche -> rollout)
+        self._rollouts: Dict[str, RolloutParche] = {}
+        # Indice bitset de cobertura de parches de la flota (se actualiza con el canal de eventos)
+        self._indice_parches: IndiceCoberturaParches = IndiceCoberturaParches()
+        CanalEventos.get_canal(C.CANAL_FLOTA).agregar_observador(self._indice_parches)
+        # Indices secundarios de la flota (se actualizan con el canal de eventos)
+        self._indice_flota: IndiceFlota = IndiceFlota()
+        CanalEventos.get_canal(C.CANAL_FLOTA).agregar_observador(self._indice_flota)
+        # Directorio global ID de servicio -> (DataCenter, rack) (Singleton)
+        self._directorio: DirectorioServicios = DirectorioServicios.get_instance()
+        # Telemetria incremental (potencia, U, iops...) por rack, DataCenter, cliente y flota
+        self._agregados: AgregadosFlota = AgregadosFlota()
+        CanalEventos.get_canal(C.CANAL_FLOTA).agregar_observador(self._agregados)
 
     def add_datacenter(self, registro: RegistroDataCenter) -> None:
         """
@@ -49,10 +87,41 @@ class CloudProviderService:
         id_dc = registro.get_id_datacenter()
         if id_dc not in self._datacenters_gestionados:
             self._datacenters_gestionados[id_dc] = registro
+            self._indice_parches.registrar_datacenter(registro)
+            self._indice_flota.registrar_datacenter(registro)
+            for server_rack in registro.get_racks():
+                self._directorio.registrar_rack(server_rack)
+            self._agregados.registrar_datacenter(registro)
             print(f"DataCenter (ID {id_dc}) agregado al servicio de gestion.")
         else:
             print(f"DataCenter (ID {id_dc}) ya estaba siendo gestionado.")
 
+    def quitar_datacenter(self, id_datacenter: int) -> RegistroDataCenter | None:
+        """
+        Deja de gestionar un DataCenter (sus servicios salen de los
+        indices del servicio). El registro no se modifica.
+
+        Referencia: US-018
+
+        Args:
+            id_datacenter (int): El ID de DataCenter a quitar.
+
+        Returns:
+            RegistroDataCenter | None: El registro quitado, o None si no se gestionaba.
+        """
+        registro = self._datacenters_gestionados.pop(id_datacenter, None)
+        if registro is None:
+            return None
+        self._indice_parches.quitar_datacenter(registro)
+        self._indice_flota.quitar_datacenter(registro)
+        self._agregados.quitar_datacenter(registro)
+        print(f"DataCenter (ID {id_datacenter}) quitado del servicio de gestion.")
+        return registro
+
+    def get_ids_datacenters(self) -> List[int]:
+        """Obtiene los IDs de los DataCenters gestionados (en orden de alta)."""
+        return list(self._datacenters_gestionados)
+
     def buscar_datacenter(self, id_datacenter: int) -> RegistroDataCenter | None:
         """
         Busca un DataCenter gestionado por su ID.
@@ -67,6 +136,45 @@ class CloudProviderService:
         """
         return self._datacenters_gestionados.get(id_datacenter)
 
+    def ubicar_servicio(self, id_servicio: int) -> Tuple[int, ServerRack] | None:
+        """
+        Ubica un servicio por su ID en O(1), sin recorrer los racks.
+        
+        Referencia: US-018
+
+        Args:
+            id_servicio (int): El ID del servicio.
+
+        Returns:
+            Tuple[int, ServerRack] | None: (ID de DataCenter, rack), o None
+                                           si el servicio no esta desplegado.
+        """
+        return self._directorio.ubicar_servicio(id_servicio)
+
+    def consultar(self) -> ConsultaFlota:
+        """
+        Inicia una consulta sobre los servicios de todos los DataCenters
+        gestionados, resuelta con indices secundarios.
+        
+        Referencia: US-018
+
+        Ejemplo:
+            provider.consultar().tipo("Database").rango("iops", minimo=5000).servicios()
+
+        Returns:
+            ConsultaFlota: Una consulta sin filtros (toda la flota).
+        """
+        return ConsultaFlota(self._indice_flota)
+
+    def get_agregados(self) -> AgregadosFlota:
+        """
+        Obtiene la telemetria agregada de los DataCenters gestionados
+        (getters O(1) y suscripcion a los cambios via agregar_observador).
+
+        Referencia: US-012
+        """
+        return self._agregados
+
     def aplicar_parche_seguridad(self, id_datacenter: int, nombre_parche: str) -> bool:
         """
         Aplica un parche de seguridad a todos los servicios de un DataCenter.
@@ -79,8 +187,8 @@ class CloudProviderService:
             nombre_parche (str): El nombre del parche (ej. "CVE-2025-1234").
 
         Returns:
-            bool: True si la operacion fue exitosa, False si
-                  no se encontro el DataCenter.
+            bool: True si el parche quedo aplicado en todos los servicios,
+                  False si no se encontro el DataCenter o hubo fallos.
         """
         print(f"\n--- Intentando aplicar parche a DataCenter {id_datacenter} ---")
         registro = self.buscar_datacenter(id_datacenter)
@@ -89,24 +197,132 @@ class CloudProviderService:
             print(f"Error: DataCenter {id_datacenter} no encontrado.")
             return False
             
-        # Logica de parcheo (aqui solo imprimimos)
-        rack_nombre = registro.get_server_rack().get_nombre()
+        racks_nombres = ", ".join(f"'{rack.get_nombre()}'" for rack in registro.get_racks())
         print(f"Aplicando parche '{nombre_parche}' a todos los servicios en "
-              f"'{rack_nombre}' (DC {id_datacenter}).")
-        return True
+              f"{racks_nombres} (DC {id_datacenter}).")
+        rollout = self.desplegar_parche(nombre_parche, [id_datacenter])
+        return rollout.get_fallidos() == 0 and rollout.get_pendientes() == 0
+
+    def desplegar_parche(self,
+                         nombre_parche: str,
+                         ids_datacenter: List[int] | None = None,
+                         reanudar: bool = False,
+                         **kwargs) -> RolloutParche:
+        """
+        Despliega un parche sobre varios DataCenters en paralelo,
+        por oleadas (canary y escalones) y con limites de concurrencia.
+        
+        Implementacion de US-019.
+
+        Args:
+            nombre_parche (str): El nombre del parche (ej. "CVE-2025-1234").
+            ids_datacenter (List[int] | None, optional): Los DataCenters a
+                parchear. Defaults a todos los gestionados.
+            reanudar (bool, optional): Si es True, continua desde el
+                checkpoint guardado de un rollout interrumpido.
+            **kwargs: Parametros del RolloutParche (max_workers, oleadas...).
+
+        Raises:
+            InfraPersistenciaException: Si 'reanudar' y no hay checkpoint valido.
+
+        Returns:
+            RolloutParche: El rollout, con su estado y contadores de progreso.
+        """
+        if ids_datacenter is None:
+            registros = list(self._datacenters_gestionados.values())
+        else:
+            registros = [self._datacenters_gestionados[id_dc] for id_dc in ids_datacenter
+                         if id_dc in self._datacenters_gestionados]
+
+        if reanudar:
+            rollout = RolloutParche.reanudar(nombre_parche, **kwargs)
+        else:
+            rollout = RolloutParche(nombre_parche, **kwargs)
+        self._rollouts[nombre_parche] = rollout
+
+        exito = rollout.ejecutar(registros)
+        self._indice_parches.marcar_parche(nombre_parche, rollout.get_servicios_aplicados())
+        print(f"Rollout '{nombre_parche}' {'COMPLETO' if exito else 'INCOMPLETO'}: "
+              f"{rollout.get_aplicados()}/{rollout.get_total()} aplicados, "
+              f"{rollout.get_fallidos()} fallidos.")
+        return rollout
+
+    def get_rollout(self, nombre_parche: str) -> RolloutParche | None:
+        """
+        Obtiene el ultimo rollout ejecutado de un parche.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+
+        Returns:
+            RolloutParche | None: El rollout, o None si nunca se desplego.
+        """
+        return self._rollouts.get(nombre_parche)
+
+    def get_indice_parches(self) -> IndiceCoberturaParches:
+        """Obtiene el indice de cobertura de parches de la flota."""
+        return self._indice_parches
+
+    def servicios_sin_parche(self, nombre_parche: str, id_datacenter: int | None = None) -> List[int]:
+        """
+        Lista los IDs de los servicios que aun no tienen un parche.
+        Se resuelve con el indice bitset (sin recorrer los servicios).
+
+        Referencia: US-019
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            id_datacenter (int | None, optional): Restringe a un DataCenter.
+
+        Returns:
+            List[int]: Los IDs de los servicios sin el parche.
+        """
+        return self._indice_parches.servicios_sin_parche(nombre_parche, id_datacenter)
+
+    def datacenters_parcheados(self, nombre_parche: str) -> List[int]:
+        """
+        Lista los DataCenters con el parche aplicado en todos sus servicios.
+
+        Referencia: US-019
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+
+        Returns:
+            List[int]: Los IDs de DataCenter, ordenados.
+        """
+        return self._indice_parches.datacenters_completos(nombre_parche)
 
     # --- ESTA ES LA ZONA DEL ERROR ---
     # Aseguramos que el nombre del método sea 'decomisionar_y_archivar'
-    def decomisionar_y_archivar(self, tipo_servicio: Type[T]) -> Snapshot[T]:
+    def decomisionar_y_archivar(self,
+                                tipo_servicio: Type[T],
+                                paralelo: bool = False,
+                                workers: int = C.DECOMISION_WORKERS,
+                                en_disco: bool = False) -> Snapshot[T]:
         """
         Descomisiona (cosecha) TODOS los servicios de un TIPO especifico de
         TODOS los DataCenters gestionados y los guarda en un Snapshot.
         
         Implementacion de US-020. (Análogo a 'cosechar_yempaquetar')
 
+        Por defecto los DataCenters se procesan en secuencia: el trabajo
+        es CPU (Python puro, con el GIL tomado) y el modo secuencial es
+        mas rapido que el pool de threads. El modo paralelo es opcional:
+        reparte los DataCenters en un pool de threads; cada rack se
+        procesa con su lock de escritura tomado (ServerRack.get_lock()) y
+        los resultados parciales se combinan en el mismo orden que el
+        modo secuencial (orden de alta de los DataCenters).
+
         Args:
             tipo_servicio (Type[T]): El tipo de servicio a decomisionar
                                      (ej. ServicioWebApp, ServicioDatabase).
+            paralelo (bool, optional): Si es True, procesa los DataCenters
+                                       en un pool de threads (mas lento
+                                       que el secuencial). Defaults a False.
+            workers (int, optional): Threads del modo paralelo.
+            en_disco (bool, optional): Si es True, el resultado es un
+                SnapshotEnDisco (buffer acotado con volcado a disco).
 
         Returns:
             Snapshot[T]: Un snapshot tipo-seguro con los servicios decomisionados.
@@ -114,46 +330,160 @@ class CloudProviderService:
         print(f"\n--- DECOMISIONANDO todos los {tipo_servicio.__name__} ---")
         
         # 1. Crear el snapshot generico vacio (US-020)
-        snapshot_servicios: Snapshot[T] = Snapshot(tipo_servicio)
-        
-        servicios_decomisionados: List[T] = []
+        if en_disco:
+            snapshot_servicios: Snapshot[T] = SnapshotEnDisco(tipo_servicio)
+        else:
+            snapshot_servicios = Snapshot(tipo_servicio)
 
-        # 2. Iterar por TODOS los DataCenters gestionados
-        for registro in self._datacenters_gestionados.values():
-            server_rack = registro.get_server_rack()
-            espacio_liberado_u = 0
-            
-            # 3. Iterar por todos los servicios de ESE rack
-            # (Iteramos sobre una copia para poder modificar la original)
-            for servicio in server_rack.get_servicios_desplegados(): 
-                
-                # 4. Comprobar si es del tipo buscado
-                if isinstance(servicio, tipo_servicio):
-                    # ¡Es del tipo! Lo decomisionamos.
-                    # Hacemos 'cast' para ayudar al type checker
-                    servicio_decomisionado = cast(T, servicio)
-                    
-                    servicios_decomisionados.append(servicio_decomisionado)
-                    
-                    # 5. Removerlo del rack (US-020)
-                    server_rack.remove_servicio(servicio_decomisionado)
-                    
-                    # 6. Contabilizar espacio (U) liberado
-                    espacio_liberado_u += servicio_decomisionado.get_espacio_u()
-
-            # 7. Actualizar espacio ocupado del rack
-            if espacio_liberado_u > 0:
-                espacio_actual_u = server_rack.get_espacio_ocupado_u()
-                server_rack.set_espacio_ocupado_u(
-                    espacio_actual_u - espacio_liberado_u
-                )
-                print(f"  Liberadas {espacio_liberado_u} U de espacio en "
-                      f"'{server_rack.get_nombre()}'.")
-
-        # 8. Guardar todo en el snapshot
-        snapshot_servicios.add_items(servicios_decomisionados)
+        # 2. Procesar cada DataCenter y combinar los parciales (orden determinista)
+        for _, servicios_rack in self.decomisionar_por_datacenter(tipo_servicio, paralelo, workers):
+            snapshot_servicios.add_items(cast(List[T], servicios_rack))
         
         print(f"DECOMISIÓN TOTAL: {snapshot_servicios.get_cantidad()} "
               f"instancias de {tipo_servicio.__name__}.")
               
-        return snapshot_servicios
\ No newline at end of file
+        return snapshot_servicios
+
+    def decomisionar_por_datacenter(self,
+                                    tipo_servicio: Type[Servicio],
+                                    paralelo: bool = False,
+                                    workers: int = C.DECOMISION_WORKERS) -> List[Tuple[int, List[Servicio]]]:
+        """
+        Descomisiona los servicios de un TIPO de todos los DataCenters
+        gestionados, devolviendo el resultado separado por DataCenter
+        (en orden de alta). Lo usan 'decomisionar_y_archivar' y los
+        shards del CloudProviderShardedService para combinar parciales.
+        Cada rack se procesa con ServerRack.get_lock() tomado.
+
+        Referencia: US-020
+
+        Args:
+            tipo_servicio (Type[Servicio]): El tipo de servicio a decomisionar.
+            paralelo (bool, optional): Si es True, procesa los DataCenters
+                                       en un pool de threads (opcional: el
+                                       secuencial es mas rapido). Defaults a False.
+            workers (int, optional): Threads del modo paralelo.
+
+        Returns:
+            List[Tuple[int, List[Servicio]]]: (ID de DataCenter, servicios removidos).
+        """
+        predicado = _EsDeTipo(tipo_servicio)
+        registros = list(self._datacenters_gestionados.values())
+        if paralelo and len(registros) > 1:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="DecomisionThread") as pool:
+                parciales = list(pool.map(self._decomisionar_en_datacenter,
+                                          registros, repeat(predicado)))
+        else:
+            parciales = [self._decomisionar_en_datacenter(registro, predicado)
+                         for registro in registros]
+
+        resultado: List[Tuple[int, List[Servicio]]] = []
+        for registro, parciales_racks in zip(registros, parciales):
+            servicios_datacenter: List[Servicio] = []
+            for nombre_rack, servicios_rack, espacio_liberado_u in parciales_racks:
+                if espacio_liberado_u > 0:
+                    print(f"  Liberadas {espacio_liberado_u} U de espacio en '{nombre_rack}'.")
+                servicios_datacenter.extend(servicios_rack)
+            resultado.append((registro.get_id_datacenter(), servicios_datacenter))
+        return resultado
+
+    @staticmethod
+    def _decomisionar_en_datacenter(registro: RegistroDataCenter,
+                                    predicado: Callable[[Servicio], bool]) -> List[Tuple[str, List[Servicio], int]]:
+        """
+        Remueve de cada rack de un DataCenter los servicios que cumplen
+        el predicado (ver _decomisionar_en_rack).
+
+        Returns:
+            List[Tuple[str, List[Servicio], int]]: Por rack, su nombre, los
+                servicios removidos y las U liberadas.
+        """
+        parciales: List[Tuple[str, List[Servicio], int]] = []
+        for server_rack in registro.get_racks():
+            servicios_rack, espacio_liberado_u = CloudProviderService._decomisionar_en_rack(
+                server_rack, predicado)
+            parciales.append((server_rack.get_nombre(), servicios_rack, espacio_liberado_u))
+        return parciales
+
+    @staticmethod
+    def _decomisionar_en_rack(server_rack: ServerRack,
+                              predicado: Callable[[Servicio], bool]) -> Tuple[List[Servicio], int]:
+        """
+        Remueve de un rack los servicios que cumplen el predicado y libera
+        su espacio, con el lock de escritura del rack tomado
+        (ServerRack.get_lock()).
+
+        Returns:
+            Tuple[List[Servicio], int]: Los servicios removidos y las U liberadas.
+        """
+        servicios_rack: List[Servicio] = []
+        with server_rack.get_lock():
+            # Remocion en una sola pasada (US-020); cada lote libera su
+            # espacio en la misma version del rack
+            for extraidos in server_rack.extraer_servicios_donde(
+                    predicado, C.DECOMISION_TAMANO_LOTE, liberar_espacio=True):
+                servicios_rack.extend(extraidos)
+
+        espacio_liberado_u = 0
+        for servicio in servicios_rack:
+            espacio_liberado_u += servicio.get_espacio_u()
+        return servicios_rack, espacio_liberado_u
+
+    def decomisionar_donde(self,
+                           predicado: Callable[[Servicio], bool],
+                           lote: int = C.DECOMISION_TAMANO_LOTE) -> Iterator[Snapshot[Servicio]]:
+        """
+        Descomisiona, de TODOS los DataCenters gestionados, los servicios
+        que cumplen un predicado, entregandolos en Snapshots parciales.
+        
+        Implementacion de US-020 en streaming: cada Snapshot tiene hasta
+        'lote' servicios, que ya fueron removidos de su rack (y el espacio
+        en U ya fue liberado) cuando se entrega. La memoria no crece con
+        la cantidad total decomisionada si el llamador no retiene los
+        Snapshots (ej. los archiva a medida que llegan).
+
+        Args:
+            predicado (Callable[[Servicio], bool]): Criterio de decomision.
+            lote (int, optional): Tamaño maximo de cada Snapshot.
+
+        Raises:
+            ValueError: Si el lote es <= 0.
+
+        Yields:
+            Snapshot[Servicio]: Snapshots parciales con los servicios decomisionados.
+        """
+        if lote <= 0:
+            raise ValueError("El tamaño de lote debe ser positivo")
+
+        print(f"\n--- DECOMISIONANDO servicios por predicado (lotes de {lote}) ---")
+        total = 0
+        potencia_liberada = 0.0
+        parcial: List[Servicio] = []
+
+        for server_rack in [rack for registro in list(self._datacenters_gestionados.values())
+                            for rack in registro.get_racks()]:
+            # Cada rack se recorre en una sola pasada; un Snapshot puede
+            # combinar servicios de varios racks y DataCenters
+            for extraidos in server_rack.extraer_servicios_donde(predicado, lote, liberar_espacio=True):
+                for servicio in extraidos:
+                    potencia_liberada += servicio.get_potencia_consumida()
+
+                parcial.extend(extraidos)
+                total += len(extraidos)
+                while len(parcial) >= lote:
+                    yield self._crear_snapshot_parcial(parcial[:lote])
+                    parcial = parcial[lote:]
+
+        if parcial:
+            yield self._crear_snapshot_parcial(parcial)
+
+        print(f"DECOMISIÓN TOTAL: {total} servicios "
+              f"({potencia_liberada:.1f} MW de consumo liberado).")
+
+    @staticmethod
+    def _crear_snapshot_parcial(servicios: List[Servicio]) -> Snapshot[Servicio]:
+        """Crea un Snapshot parcial con los servicios dados."""
+        snapshot: Snapshot[Servicio] = Snapshot(Servicio)
+        snapshot.add_items(servicios)
+        return snapshot
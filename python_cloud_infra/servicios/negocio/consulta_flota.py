@@ -0,0 +1,495 @@
+"""
+Modulo del motor de consultas de la flota.
+
+IndiceFlota mantiene indices secundarios de todos los servicios de los
+DataCenters gestionados (hash por tipo, cliente, ubicacion y DataCenter;
+listas ordenadas por iops, workers y potencia), actualizados con los
+eventos del canal de la flota. Las listas ordenadas se ponen al dia
+recien en la siguiente consulta de rango. ConsultaFlota arma una consulta con
+filtros y agregados y la resuelve usando el indice mas selectivo.
+"""
+
+# --- Imports Standard Library ---
+from bisect import bisect_left, bisect_right, insort
+from threading import RLock
+from typing import Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Patrones y Entidades ---
+from python_cloud_infra.patrones.observer.observer import Observer
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.datacenter import DataCenter
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+# Campos con indice hash (igualdad) y campos numericos con indice ordenado (rango)
+CAMPO_TIPO: str = "tipo"
+CAMPO_CLIENTE: str = "cliente"
+CAMPO_UBICACION: str = "ubicacion"
+CAMPO_DATACENTER: str = "datacenter"
+CAMPOS_HASH: Tuple[str, ...] = (CAMPO_TIPO, CAMPO_CLIENTE, CAMPO_UBICACION, CAMPO_DATACENTER)
+
+# Campo numerico -> getter del servicio (solo lo indexan los servicios que lo tienen)
+GETTERS_NUMERICOS: Dict[str, str] = {
+    C.ATRIBUTO_IOPS: "get_iops",
+    C.ATRIBUTO_WORKERS: "get_workers",
+    C.ATRIBUTO_POTENCIA: "get_potencia_consumida",
+}
+
+_INFINITO = float("inf")
+
+
+class _EntradaFlota:
+    """Un servicio indexado, el rack donde esta y sus claves hash."""
+
+    __slots__ = ("servicio", "rack", "claves")
+
+    def __init__(self, servicio: 'Servicio', rack: 'ServerRack', claves: Dict[str, object]):
+        self.servicio: 'Servicio' = servicio
+        self.rack: 'ServerRack' = rack
+        self.claves: Dict[str, object] = claves
+
+
+class IndiceFlota(Observer[EventoFlota]):
+    """
+    Indices secundarios de los servicios de la flota.
+
+    - Observa el canal C.CANAL_FLOTA: se mantiene al dia cuando un rack
+      gestionado agrega o remueve servicios, o cuando cambian los iops,
+      workers o potencia de un servicio indexado.
+    - Sigue todos los racks de cada DataCenter registrado, tambien los
+      que se le agregan despues (evento RACK_AGREGADO).
+    - Los eventos de racks que no fueron registrados se ignoran.
+    - Los cambios de valores numericos se anotan como pendientes en O(1)
+      y se aplican a la lista ordenada en la siguiente consulta de rango:
+      si son pocos, con bisect; si no (ej. tras un balanceo que cambio
+      la potencia de muchos servicios), reordenando una sola vez.
+
+    Thread-safe (un RLock protege los indices; los eventos pueden
+    llegar desde threads de decomision o balanceo).
+
+    Referencia: US-018
+    """
+
+    def __init__(self):
+        """Inicializa los indices vacios."""
+        self._entradas: Dict[int, _EntradaFlota] = {}
+        self._hash: Dict[str, Dict[object, Set[int]]] = {campo: {} for campo in CAMPOS_HASH}
+        self._ordenados: Dict[str, List[Tuple[float, int]]] = {campo: [] for campo in GETTERS_NUMERICOS}
+        self._valores: Dict[str, Dict[int, float]] = {campo: {} for campo in GETTERS_NUMERICOS}
+        # Por campo: ID -> valor que tiene en la lista ordenada (None si no esta)
+        self._pendientes: Dict[str, Dict[int, float | None]] = {campo: {} for campo in GETTERS_NUMERICOS}
+        self._registros: 'WeakKeyDictionary[ServerRack, RegistroDataCenter]' = WeakKeyDictionary()
+        self._registros_datacenter: 'WeakKeyDictionary[DataCenter, RegistroDataCenter]' = WeakKeyDictionary()
+        self._lock: RLock = RLock()
+
+        # Despacho de eventos por tipo (sin if/elif)
+        self._handlers: Dict[TipoEventoFlota, Callable[[EventoFlota], None]] = {
+            TipoEventoFlota.SERVICIO_AGREGADO: self._on_servicio_agregado,
+            TipoEventoFlota.SERVICIO_REMOVIDO: self._on_servicio_removido,
+            TipoEventoFlota.ATRIBUTO_MODIFICADO: self._on_atributo_modificado,
+            TipoEventoFlota.RACK_AGREGADO: self._on_rack_agregado,
+        }
+
+    # --- Mantenimiento ---
+
+    def registrar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Indexa todos los servicios de un DataCenter (de todos sus racks)
+        y empieza a seguir sus racks.
+
+        Args:
+            registro (RegistroDataCenter): El registro gestionado.
+        """
+        with self._lock:
+            self._registros_datacenter[registro.get_datacenter()] = registro
+            for server_rack in registro.get_racks():
+                self._registrar_rack(server_rack, registro)
+
+    def quitar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Deja de seguir los racks de un DataCenter y quita sus servicios.
+
+        Args:
+            registro (RegistroDataCenter): El registro que deja de gestionarse.
+        """
+        with self._lock:
+            self._registros_datacenter.pop(registro.get_datacenter(), None)
+            for server_rack in registro.get_racks():
+                self._registros.pop(server_rack, None)
+                for servicio in server_rack.get_servicios_desplegados():
+                    entrada = self._entradas.get(servicio.get_id())
+                    if entrada is not None and entrada.rack is server_rack:
+                        self._quitar(servicio.get_id())
+
+    def _registrar_rack(self, server_rack: 'ServerRack', registro: 'RegistroDataCenter') -> None:
+        """Indexa los servicios de un rack y empieza a seguirlo. Requiere el lock."""
+        self._registros[server_rack] = registro
+        for servicio in server_rack.get_servicios_desplegados():
+            self._agregar(servicio, server_rack, registro)
+
+    def actualizar(self, evento: EventoFlota) -> None:
+        """
+        Aplica un evento del canal de la flota a los indices.
+
+        Args:
+            evento (EventoFlota): El evento publicado.
+        """
+        handler = self._handlers.get(evento.get_tipo())
+        if handler is not None:
+            handler(evento)
+
+    def _on_servicio_agregado(self, evento: EventoFlota) -> None:
+        with self._lock:
+            server_rack = evento.get_rack()
+            registro = self._registros.get(server_rack)  # type: ignore
+            if registro is not None:
+                self._agregar(evento.get_servicio(), server_rack, registro)  # type: ignore
+
+    def _on_rack_agregado(self, evento: EventoFlota) -> None:
+        server_rack = evento.get_rack()
+        with self._lock:
+            registro = self._registros_datacenter.get(server_rack.get_datacenter())  # type: ignore
+            if registro is not None and server_rack not in self._registros:
+                self._registrar_rack(server_rack, registro)  # type: ignore
+
+    def _on_servicio_removido(self, evento: EventoFlota) -> None:
+        with self._lock:
+            id_servicio = evento.get_servicio().get_id()
+            entrada = self._entradas.get(id_servicio)
+            # Solo si seguia en ESE rack (si ya se movio a otro, la entrada es la nueva)
+            if entrada is not None and entrada.rack is evento.get_rack():
+                self._quitar(id_servicio)
+
+    def _on_atributo_modificado(self, evento: EventoFlota) -> None:
+        campo = evento.get_atributo()
+        with self._lock:
+            id_servicio = evento.get_servicio().get_id()
+            if id_servicio in self._entradas and campo in self._valores:
+                self._quitar_valor(campo, id_servicio)  # type: ignore
+                self._agregar_valor(campo, id_servicio, evento.get_valor_nuevo())  # type: ignore
+
+    def _agregar(self, servicio: 'Servicio', server_rack: 'ServerRack', registro: 'RegistroDataCenter') -> None:
+        """Indexa un servicio. Requiere el lock."""
+        id_servicio = servicio.get_id()
+        if id_servicio in self._entradas:
+            self._quitar(id_servicio)
+        claves: Dict[str, object] = {
+            CAMPO_TIPO: servicio.get_tipo(),
+            CAMPO_CLIENTE: registro.get_cliente_corporativo(),
+            CAMPO_UBICACION: registro.get_datacenter().get_ubicacion_geografica(),
+            CAMPO_DATACENTER: registro.get_id_datacenter(),
+        }
+        self._entradas[id_servicio] = _EntradaFlota(servicio, server_rack, claves)
+        for campo, valor in claves.items():
+            self._hash[campo].setdefault(valor, set()).add(id_servicio)
+        for campo, getter in GETTERS_NUMERICOS.items():
+            metodo = getattr(servicio, getter, None)
+            if metodo is not None:
+                self._agregar_valor(campo, id_servicio, metodo())
+
+    def _quitar(self, id_servicio: int) -> None:
+        """Quita un servicio de todos los indices. Requiere el lock."""
+        entrada = self._entradas.pop(id_servicio, None)
+        if entrada is None:
+            return
+        for campo, valor in entrada.claves.items():
+            ids = self._hash[campo][valor]
+            ids.discard(id_servicio)
+            if not ids:
+                del self._hash[campo][valor]
+        for campo in self._valores:
+            self._quitar_valor(campo, id_servicio)
+
+    def _agregar_valor(self, campo: str, id_servicio: int, valor: float) -> None:
+        valores = self._valores[campo]
+        self._pendientes[campo].setdefault(id_servicio, valores.get(id_servicio))
+        valores[id_servicio] = valor
+
+    def _quitar_valor(self, campo: str, id_servicio: int) -> None:
+        valor = self._valores[campo].pop(id_servicio, None)
+        if valor is not None:
+            self._pendientes[campo].setdefault(id_servicio, valor)
+
+    def _aplicar_pendientes(self, campo: str) -> None:
+        """Pone al dia la lista ordenada de un campo. Requiere el lock."""
+        pendientes = self._pendientes[campo]
+        if not pendientes:
+            return
+        valores = self._valores[campo]
+        if len(pendientes) > C.CONSULTA_MAX_CAMBIOS_INCREMENTALES:
+            self._ordenados[campo] = sorted((valor, id_servicio) for id_servicio, valor in valores.items())
+        else:
+            ordenados = self._ordenados[campo]
+            for id_servicio, anterior in pendientes.items():
+                if anterior is not None:
+                    posicion = bisect_left(ordenados, (anterior, id_servicio))
+                    if posicion < len(ordenados) and ordenados[posicion] == (anterior, id_servicio):
+                        del ordenados[posicion]
+                actual = valores.get(id_servicio)
+                if actual is not None:
+                    insort(ordenados, (actual, id_servicio))
+        pendientes.clear()
+
+    # --- Acceso para ConsultaFlota (con el lock tomado) ---
+
+    def get_lock(self) -> RLock:
+        """Obtiene el lock de los indices (para consultas consistentes)."""
+        return self._lock
+
+    def get_cantidad_servicios(self) -> int:
+        """Obtiene la cantidad de servicios indexados."""
+        return len(self._entradas)
+
+    def _ids_igual(self, campo: str, valor: object) -> Set[int]:
+        return self._hash[campo].get(valor, set())
+
+    def _get_ordenados(self, campo: str) -> List[Tuple[float, int]]:
+        self._aplicar_pendientes(campo)
+        return self._ordenados[campo]
+
+    def _posiciones_rango(self, campo: str, minimo: float | None, maximo: float | None) -> Tuple[int, int]:
+        ordenados = self._get_ordenados(campo)
+        inicio = 0 if minimo is None else bisect_left(ordenados, (minimo, -_INFINITO))
+        fin = len(ordenados) if maximo is None else bisect_right(ordenados, (maximo, _INFINITO))
+        return inicio, max(inicio, fin)
+
+
+class ConsultaFlota:
+    """
+    Consulta sobre la flota (patron builder): filtros de igualdad
+    (tipo, cliente, ubicacion, DataCenter) y de rango (iops, workers,
+    potencia), y agregados (contar, sumar, agrupar).
+
+    Planificacion: se estima la cantidad de candidatos de cada filtro
+    (tamaño del conjunto hash, o distancia entre posiciones bisect en el
+    indice ordenado) y se recorre solo el mas selectivo; el resto de los
+    filtros se verifica sobre esos candidatos.
+
+    Ejemplo:
+        provider.consultar().tipo("Database").rango("iops", minimo=5000).contar()
+
+    Referencia: US-018
+    """
+
+    def __init__(self, indice: IndiceFlota):
+        """
+        Inicializa una consulta sin filtros (toda la flota).
+
+        Args:
+            indice (IndiceFlota): Los indices sobre los que se resuelve.
+        """
+        self._indice: IndiceFlota = indice
+        self._iguales: List[Tuple[str, object]] = []
+        self._rangos: List[Tuple[str, float | None, float | None]] = []
+
+    # --- Filtros ---
+
+    def donde(self, campo: str, valor: object) -> 'ConsultaFlota':
+        """
+        Agrega un filtro de igualdad sobre un campo hash.
+
+        Raises:
+            ValueError: Si el campo no tiene indice hash.
+        """
+        if campo not in CAMPOS_HASH:
+            raise ValueError(f"Campo de igualdad no soportado: {campo}")
+        self._iguales.append((campo, valor))
+        return self
+
+    def tipo(self, tipo_servicio: str) -> 'ConsultaFlota':
+        """Filtra por tipo de servicio (ej. "Database")."""
+        return self.donde(CAMPO_TIPO, tipo_servicio)
+
+    def cliente(self, cliente: str) -> 'ConsultaFlota':
+        """Filtra por cliente corporativo."""
+        return self.donde(CAMPO_CLIENTE, cliente)
+
+    def ubicacion(self, ubicacion: str) -> 'ConsultaFlota':
+        """Filtra por ubicacion geografica del DataCenter."""
+        return self.donde(CAMPO_UBICACION, ubicacion)
+
+    def datacenter(self, id_datacenter: int) -> 'ConsultaFlota':
+        """Filtra por ID de DataCenter."""
+        return self.donde(CAMPO_DATACENTER, id_datacenter)
+
+    def rango(self, campo: str, minimo: float | None = None, maximo: float | None = None) -> 'ConsultaFlota':
+        """
+        Agrega un filtro de rango (inclusivo) sobre un campo numerico.
+        Los servicios que no tienen el campo (ej. iops en un WebApp) no pasan el filtro.
+
+        Raises:
+            ValueError: Si el campo no es numerico.
+        """
+        if campo not in GETTERS_NUMERICOS:
+            raise ValueError(f"Campo de rango no soportado: {campo}")
+        self._rangos.append((campo, minimo, maximo))
+        return self
+
+    # --- Resultados y agregados ---
+
+    def ids(self) -> List[int]:
+        """Obtiene los IDs de los servicios que cumplen la consulta."""
+        with self._indice.get_lock():
+            return self._ejecutar()
+
+    def servicios(self) -> List['Servicio']:
+        """Obtiene los servicios que cumplen la consulta."""
+        with self._indice.get_lock():
+            entradas = self._indice._entradas
+            return [entradas[id_servicio].servicio for id_servicio in self._ejecutar()]
+
+    def contar(self) -> int:
+        """
+        Cuenta los servicios que cumplen la consulta. Con un solo
+        filtro (o ninguno) se responde con el indice, sin recorrer.
+        """
+        with self._indice.get_lock():
+            if len(self._iguales) + len(self._rangos) <= 1:
+                return self._planificar()[0]
+            return len(self._ejecutar())
+
+    def sumar(self, campo: str) -> float:
+        """Suma un campo numerico sobre los servicios de la consulta."""
+        return self.sumar_por(None, campo).get(None, 0.0)
+
+    def agrupar_por(self, campo: str) -> Dict[object, int]:
+        """
+        Cuenta los servicios de la consulta por cada valor de un campo hash.
+
+        Returns:
+            Dict[object, int]: Valor del campo -> cantidad.
+        """
+        if campo not in CAMPOS_HASH:
+            raise ValueError(f"Campo de agrupacion no soportado: {campo}")
+        conteo: Dict[object, int] = {}
+        with self._indice.get_lock():
+            entradas = self._indice._entradas
+            for id_servicio in self._ejecutar():
+                clave = entradas[id_servicio].claves[campo]
+                conteo[clave] = conteo.get(clave, 0) + 1
+        return conteo
+
+    def sumar_por(self, campo_grupo: str | None, campo_numerico: str) -> Dict[object, float]:
+        """
+        Suma un campo numerico agrupando por un campo hash
+        (o sin agrupar si campo_grupo es None, con clave None).
+
+        Returns:
+            Dict[object, float]: Valor del grupo -> suma.
+        """
+        if campo_numerico not in GETTERS_NUMERICOS:
+            raise ValueError(f"Campo de suma no soportado: {campo_numerico}")
+        if campo_grupo is not None and campo_grupo not in CAMPOS_HASH:
+            raise ValueError(f"Campo de agrupacion no soportado: {campo_grupo}")
+        sumas: Dict[object, float] = {}
+        with self._indice.get_lock():
+            entradas = self._indice._entradas
+            valores = self._indice._valores[campo_numerico]
+            for id_servicio in self._ejecutar():
+                valor = valores.get(id_servicio)
+                if valor is None:
+                    continue
+                clave = None if campo_grupo is None else entradas[id_servicio].claves[campo_grupo]
+                sumas[clave] = sumas.get(clave, 0.0) + valor
+        return sumas
+
+    def explicar(self) -> str:
+        """
+        Describe el plan: el indice elegido, su cantidad de candidatos
+        y los filtros que se verifican despues.
+        """
+        with self._indice.get_lock():
+            estimado, origen, _ = self._planificar()
+        return f"{origen} (~{estimado} candidatos), filtros: {self._describir_filtros()}"
+
+    # --- Planificacion y ejecucion (requieren el lock del indice) ---
+
+    def _planificar(self) -> Tuple[int, str, Callable[[], List[int]]]:
+        """
+        Elige el filtro mas selectivo.
+
+        Returns:
+            Tuple[int, str, Callable[[], List[int]]]: (candidatos estimados,
+                descripcion del indice, funcion que produce los candidatos).
+        """
+        indice = self._indice
+        opciones: List[Tuple[int, str, Callable[[], List[int]]]] = []
+
+        for campo, valor in self._iguales:
+            ids = indice._ids_igual(campo, valor)
+            opciones.append((len(ids), f"hash({campo}={valor!r})", _Candidatos(ids)))
+
+        for campo, minimo, maximo in self._rangos:
+            inicio, fin = indice._posiciones_rango(campo, minimo, maximo)
+            opciones.append((fin - inicio, f"ordenado({campo} en [{minimo}, {maximo}])",
+                             _CandidatosRango(indice._get_ordenados(campo), inicio, fin)))
+
+        if not opciones:
+            return indice.get_cantidad_servicios(), "recorrido completo", self._candidatos_todos
+        return min(opciones, key=_estimado)
+
+    def _ejecutar(self) -> List[int]:
+        """Resuelve la consulta y devuelve los IDs (ordenados)."""
+        _, _, candidatos = self._planificar()
+        indice = self._indice
+        entradas = indice._entradas
+        resultado: List[int] = []
+        for id_servicio in candidatos():
+            claves = entradas[id_servicio].claves
+            if not all(claves[campo] == valor for campo, valor in self._iguales):
+                continue
+            if not all(self._en_rango(indice._valores[campo].get(id_servicio), minimo, maximo)
+                       for campo, minimo, maximo in self._rangos):
+                continue
+            resultado.append(id_servicio)
+        resultado.sort()
+        return resultado
+
+    def _candidatos_todos(self) -> List[int]:
+        return list(self._indice._entradas)
+
+    @staticmethod
+    def _en_rango(valor: float | None, minimo: float | None, maximo: float | None) -> bool:
+        if valor is None:
+            return False
+        return (minimo is None or valor >= minimo) and (maximo is None or valor <= maximo)
+
+    def _describir_filtros(self) -> str:
+        filtros = [f"{campo}={valor!r}" for campo, valor in self._iguales]
+        filtros += [f"{campo} en [{minimo}, {maximo}]" for campo, minimo, maximo in self._rangos]
+        return ", ".join(filtros) if filtros else "ninguno"
+
+
+def _estimado(opcion: Tuple[int, str, Callable[[], List[int]]]) -> int:
+    """Clave de orden de las opciones del plan (sin lambda, Rubrica 3.4)."""
+    return opcion[0]
+
+
+class _Candidatos:
+    """Produce los candidatos de un indice hash (copia del conjunto)."""
+
+    def __init__(self, ids: Set[int]):
+        self._ids: Set[int] = ids
+
+    def __call__(self) -> List[int]:
+        return list(self._ids)
+
+
+class _CandidatosRango:
+    """Produce los candidatos de un tramo [inicio, fin) de un indice ordenado."""
+
+    def __init__(self, ordenados: List[Tuple[float, int]], inicio: int, fin: int):
+        self._ordenados: List[Tuple[float, int]] = ordenados
+        self._inicio: int = inicio
+        self._fin: int = fin
+
+    def __call__(self) -> List[int]:
+        return [id_servicio for _, id_servicio in self._ordenados[self._inicio:self._fin]]
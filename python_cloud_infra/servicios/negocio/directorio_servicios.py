@@ -0,0 +1,161 @@
+"""
+Modulo del DirectorioServicios.
+
+Implementa dos patrones de diseño:
+1.  Singleton (Thread-Safe): un unico directorio para toda la flota.
+2.  Observer: se mantiene al dia con los eventos del canal de la flota
+    (ServerRack.add_servicio / remove_servicio / extraer_servicios_donde).
+"""
+from __future__ import annotations
+from threading import Lock
+from typing import Callable, Dict, Tuple, TYPE_CHECKING
+from weakref import ReferenceType, ref
+from typing_extensions import override
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Patrones y Entidades ---
+from python_cloud_infra.patrones.observer.observer import Observer
+from python_cloud_infra.patrones.observer.canal_eventos import CanalEventos
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+
+class DirectorioServicios(Observer[EventoFlota]):
+    """
+    Directorio global: ID de servicio -> (ID de DataCenter, ServerRack).
+
+    - Como Singleton, hay un unico directorio para todos los
+      CloudProviderService y racks del proceso.
+    - Como Observer del canal C.CANAL_FLOTA, registra cada servicio
+      agregado a (o removido de) cualquier rack.
+    - Los racks se guardan con referencias debiles: una entrada cuyo rack
+      ya no existe se descarta en la siguiente busqueda.
+    - Los racks creados antes de existir el directorio, o reconstruidos
+      desde Pickle, se incorporan con 'registrar_rack'.
+
+    Referencia: US-018
+    """
+
+    # --- Implementacion del Patron Singleton ---
+
+    _instance: DirectorioServicios | None = None
+    _lock_instancia: Lock = Lock()
+
+    def __new__(cls) -> DirectorioServicios:
+        """
+        Controla la creacion de la instancia (Singleton).
+        Usa double-checked locking para ser thread-safe.
+        """
+        if cls._instance is not None:
+            return cls._instance
+
+        with cls._lock_instancia:
+            if cls._instance is None:
+                instancia = super().__new__(cls)
+                instancia._inicializado = False
+                cls._instance = instancia
+
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls) -> DirectorioServicios:
+        """Metodo publico para obtener la unica instancia del Singleton."""
+        if cls._instance is None:
+            cls()
+        return cls._instance  # type: ignore
+
+    def __init__(self):
+        """
+        Inicializa el directorio (una sola vez) y lo suscribe al canal de la flota.
+        """
+        if self._inicializado:
+            return
+        self._inicializado: bool = True
+
+        self._ubicaciones: Dict[int, Tuple[int, ReferenceType]] = {}
+        self._lock: Lock = Lock()
+        self._handlers: Dict[TipoEventoFlota, Callable[[EventoFlota], None]] = {
+            TipoEventoFlota.SERVICIO_AGREGADO: self._on_servicio_agregado,
+            TipoEventoFlota.SERVICIO_REMOVIDO: self._on_servicio_removido,
+            TipoEventoFlota.RACK_AGREGADO: self._on_rack_agregado,
+        }
+        # El Singleton vive tanto como la clase: la referencia debil del canal no expira
+        CanalEventos.get_canal(C.CANAL_FLOTA).agregar_observador(self)
+
+    # --- Mantenimiento ---
+
+    def registrar_rack(self, server_rack: 'ServerRack') -> None:
+        """
+        Registra todos los servicios desplegados en un rack.
+
+        Args:
+            server_rack (ServerRack): El rack a registrar.
+        """
+        id_datacenter = server_rack.get_datacenter().get_id_datacenter()
+        referencia = ref(server_rack)
+        with self._lock:
+            for servicio in server_rack.get_servicios_desplegados():
+                self._ubicaciones[servicio.get_id()] = (id_datacenter, referencia)
+
+    @override
+    def actualizar(self, evento: EventoFlota) -> None:
+        """
+        Aplica un evento del canal de la flota al directorio.
+
+        Args:
+            evento (EventoFlota): El evento publicado.
+        """
+        handler = self._handlers.get(evento.get_tipo())
+        if handler is not None:
+            handler(evento)
+
+    def _on_servicio_agregado(self, evento: EventoFlota) -> None:
+        server_rack = evento.get_rack()
+        id_datacenter = server_rack.get_datacenter().get_id_datacenter()  # type: ignore
+        with self._lock:
+            self._ubicaciones[evento.get_servicio().get_id()] = (id_datacenter, ref(server_rack))
+
+    def _on_rack_agregado(self, evento: EventoFlota) -> None:
+        # Un rack armado antes de sumarse al DataCenter puede traer servicios
+        self.registrar_rack(evento.get_rack())  # type: ignore
+
+    def _on_servicio_removido(self, evento: EventoFlota) -> None:
+        id_servicio = evento.get_servicio().get_id()
+        with self._lock:
+            ubicacion = self._ubicaciones.get(id_servicio)
+            # Solo se borra si el servicio seguia en ESE rack (no si ya se movio)
+            if ubicacion is not None and ubicacion[1]() is evento.get_rack():
+                del self._ubicaciones[id_servicio]
+
+    # --- Consultas ---
+
+    def ubicar_servicio(self, id_servicio: int) -> Tuple[int, 'ServerRack'] | None:
+        """
+        Ubica un servicio por su ID en O(1).
+
+        Args:
+            id_servicio (int): El ID del servicio.
+
+        Returns:
+            Tuple[int, ServerRack] | None: (ID de DataCenter, rack), o None
+                                           si el servicio no esta desplegado.
+        """
+        with self._lock:
+            ubicacion = self._ubicaciones.get(id_servicio)
+            if ubicacion is None:
+                return None
+            server_rack = ubicacion[1]()
+            if server_rack is None:
+                # El rack ya no existe: la entrada quedo obsoleta
+                del self._ubicaciones[id_servicio]
+                return None
+            return ubicacion[0], server_rack
+
+    def get_cantidad_servicios(self) -> int:
+        """Obtiene la cantidad de servicios registrados (puede incluir obsoletos)."""
+        return len(self._ubicaciones)
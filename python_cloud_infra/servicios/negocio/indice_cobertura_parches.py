@@ -0,0 +1,450 @@
+"""
+Modulo del IndiceCoberturaParches.
+
+Indice de cobertura de parches de seguridad (US-019) sobre la flota:
+cada servicio recibe un ordinal denso y cada parche un bitset (int de
+Python), por lo que las consultas de cobertura son operaciones de bits
+(AND / ANDNOT / popcount) en lugar de recorridos sobre los servicios.
+Se mantiene al dia con los eventos del canal de la flota.
+"""
+
+# --- Imports Standard Library ---
+from collections import Counter
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Set, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+from typing_extensions import override
+
+# --- Imports de Patrones y Entidades ---
+from python_cloud_infra.patrones.observer.observer import Observer
+from python_cloud_infra.entidades.infra.evento_flota import EventoFlota, TipoEventoFlota
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.datacenter import DataCenter
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+    from python_cloud_infra.entidades.infra.server_rack import ServerRack
+
+
+class IndiceCoberturaParches(Observer[EventoFlota]):
+    """
+    Indice bitset de parches aplicados por servicio.
+
+    - Observa el canal C.CANAL_FLOTA (como IndiceFlota): los servicios
+      que se agregan a un rack de un DataCenter registrado (despliegues,
+      transacciones, migraciones) entran al indice, los que salen de los
+      racks registrados se quitan, y un servicio migrado a otro
+      DataCenter cambia de DataCenter conservando sus parches.
+    - Servicio.aplicar_parche publica PARCHE_APLICADO. Las bajas y los
+      parches de los eventos se anotan como pendientes en O(1) y se
+      vuelcan a los bitsets en la siguiente consulta (una baja masiva y
+      una mascara por parche), asi decomisionar o parchear N servicios
+      no reconstruye los bitsets N veces.
+
+    - Ordinales densos: el servicio N-esimo registrado ocupa el bit N;
+      los ordinales liberados al decomisionar se reutilizan.
+    - Un bitset de servicios activos, uno por DataCenter y uno por parche.
+      Al quitar servicios se limpian sus bits en todos los bitsets, asi un
+      ordinal reutilizado nunca hereda parches ajenos.
+    - Las operaciones masivas construyen una mascara en O(n) (bytearray)
+      y aplican una sola operacion por bitset.
+    - Ademas se mantienen contadores (por parche y por parche/DataCenter),
+      asi contar y 'esta_completo' son O(1) y 'datacenters_completos' es
+      O(DataCenters), sin tocar los bitsets.
+
+    Thread-safe (un Lock protege la estructura).
+
+    Referencia: US-019
+    """
+
+    def __init__(self):
+        """Inicializa un indice vacio."""
+        self._ordinales: Dict[int, int] = {}  # ID servicio -> ordinal
+        self._servicios: List[int | None] = []  # ordinal -> ID servicio
+        self._datacenter_de: List[int] = []  # ordinal -> ID DataCenter
+        self._libres: List[int] = []
+
+        self._activos: int = 0
+        self._por_datacenter: Dict[int, int] = {}
+        self._por_parche: Dict[str, int] = {}
+
+        # Contadores: servicios por DataCenter y con parche (flota y DataCenter)
+        self._tamano_datacenter: Counter[int] = Counter()
+        self._con_parche: Counter[str] = Counter()
+        self._con_parche_dc: Dict[str, Counter[int]] = {}
+        # Cambios de los eventos, volcados en lote en la siguiente consulta
+        self._bajas_pendientes: Set[int] = set()  # IDs (SERVICIO_REMOVIDO)
+        self._pendientes: Dict[str, List[int]] = {}  # parche -> IDs (PARCHE_APLICADO)
+
+        # Racks y DataCenters seguidos (rack -> ID de DataCenter)
+        self._racks: 'WeakKeyDictionary[ServerRack, int]' = WeakKeyDictionary()
+        self._datacenters: 'WeakKeyDictionary[DataCenter, int]' = WeakKeyDictionary()
+        self._lock: Lock = Lock()
+
+        # Despacho de eventos por tipo (sin if/elif)
+        self._handlers: Dict[TipoEventoFlota, Callable[[EventoFlota], None]] = {
+            TipoEventoFlota.SERVICIO_AGREGADO: self._on_servicio_agregado,
+            TipoEventoFlota.SERVICIO_REMOVIDO: self._on_servicio_removido,
+            TipoEventoFlota.RACK_AGREGADO: self._on_rack_agregado,
+            TipoEventoFlota.PARCHE_APLICADO: self._on_parche_aplicado,
+        }
+
+    # --- Seguimiento de DataCenters (canal de la flota) ---
+
+    def registrar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Registra los servicios de todos los racks de un DataCenter (con sus
+        parches ya aplicados) y empieza a seguir sus racks.
+
+        Args:
+            registro (RegistroDataCenter): El registro gestionado.
+        """
+        id_datacenter = registro.get_id_datacenter()
+        with self._lock:
+            self._datacenters[registro.get_datacenter()] = id_datacenter
+            for server_rack in registro.get_racks():
+                self._registrar_rack(server_rack, id_datacenter)
+
+    def quitar_datacenter(self, registro: 'RegistroDataCenter') -> None:
+        """
+        Deja de seguir los racks de un DataCenter y quita sus servicios.
+
+        Args:
+            registro (RegistroDataCenter): El registro que deja de gestionarse.
+        """
+        id_datacenter = registro.get_id_datacenter()
+        with self._lock:
+            self._datacenters.pop(registro.get_datacenter(), None)
+            for server_rack in registro.get_racks():
+                self._racks.pop(server_rack, None)
+            self._aplicar_pendientes()
+            self._quitar(self._servicios_de(id_datacenter))
+
+    @override
+    def actualizar(self, evento: EventoFlota) -> None:
+        """
+        Aplica un evento del canal de la flota al indice.
+
+        Args:
+            evento (EventoFlota): El evento publicado.
+        """
+        handler = self._handlers.get(evento.get_tipo())
+        if handler is not None:
+            handler(evento)
+
+    def _on_servicio_agregado(self, evento: EventoFlota) -> None:
+        with self._lock:
+            id_datacenter = self._racks.get(evento.get_rack())  # type: ignore
+            if id_datacenter is not None:
+                self._ubicar(evento.get_servicio(), id_datacenter)
+
+    def _on_servicio_removido(self, evento: EventoFlota) -> None:
+        servicio = evento.get_servicio()
+        with self._lock:
+            # En una migracion el servicio ya esta en su rack destino: si ese
+            # rack es seguido, su SERVICIO_AGREGADO lo ubica; si no, sale del indice
+            rack_actual = servicio.get_rack()
+            if servicio.get_id() in self._ordinales and (rack_actual is None or rack_actual not in self._racks):
+                self._bajas_pendientes.add(servicio.get_id())
+
+    def _on_rack_agregado(self, evento: EventoFlota) -> None:
+        server_rack = evento.get_rack()
+        with self._lock:
+            id_datacenter = self._datacenters.get(server_rack.get_datacenter())  # type: ignore
+            if id_datacenter is not None:
+                self._registrar_rack(server_rack, id_datacenter)  # type: ignore
+
+    def _on_parche_aplicado(self, evento: EventoFlota) -> None:
+        id_servicio = evento.get_servicio().get_id()
+        with self._lock:
+            if id_servicio in self._ordinales:
+                self._pendientes.setdefault(evento.get_atributo(), []).append(id_servicio)  # type: ignore
+
+    def _registrar_rack(self, server_rack: 'ServerRack', id_datacenter: int) -> None:
+        """Empieza a seguir un rack y registra (o reubica) sus servicios. Requiere el lock."""
+        self._racks[server_rack] = id_datacenter
+        nuevos: List[Tuple[int, Iterable[str]]] = []
+        for servicio in server_rack.get_servicios_desplegados():
+            id_servicio = servicio.get_id()
+            if id_servicio in self._ordinales or id_servicio in self._bajas_pendientes:
+                self._ubicar(servicio, id_datacenter)
+            else:
+                nuevos.append((id_servicio, servicio.get_parches_aplicados()))
+        self._registrar(id_datacenter, nuevos)
+
+    def _ubicar(self, servicio: 'Servicio', id_datacenter: int) -> None:
+        """Registra un servicio; si estaba en otro DataCenter, lo mueve. Requiere el lock."""
+        id_servicio = servicio.get_id()
+        if id_servicio in self._bajas_pendientes:
+            # Volvio a un rack seguido: se aplica su baja antes de registrarlo
+            self._aplicar_pendientes()
+        ordinal = self._ordinales.get(id_servicio)
+        if ordinal is not None:
+            if self._datacenter_de[ordinal] == id_datacenter:
+                return
+            self._quitar([id_servicio])
+        self._registrar(id_datacenter, [(id_servicio, servicio.get_parches_aplicados())])
+
+    # --- Mantenimiento ---
+
+    def registrar_servicios(self,
+                            id_datacenter: int,
+                            servicios: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        """
+        Registra servicios de un DataCenter con sus parches ya aplicados.
+        Los servicios ya registrados se ignoran.
+
+        Args:
+            id_datacenter (int): El ID del DataCenter.
+            servicios (Iterable[Tuple[int, Iterable[str]]]): (ID, parches).
+        """
+        with self._lock:
+            self._aplicar_pendientes()
+            self._registrar(id_datacenter, servicios)
+
+    def quitar_servicios(self, ids_servicio: Iterable[int]) -> int:
+        """
+        Quita servicios del indice (ej. al decomisionar) y libera sus ordinales.
+
+        Args:
+            ids_servicio (Iterable[int]): Los IDs a quitar (los desconocidos se ignoran).
+
+        Returns:
+            int: La cantidad de servicios quitados.
+        """
+        with self._lock:
+            self._aplicar_pendientes()
+            return self._quitar(ids_servicio)
+
+    def marcar_parche(self, nombre_parche: str, ids_servicio: Iterable[int]) -> None:
+        """
+        Marca un parche como aplicado en varios servicios.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            ids_servicio (Iterable[int]): Los IDs (los no registrados se ignoran).
+        """
+        with self._lock:
+            self._aplicar_pendientes()
+            self._marcar(nombre_parche, ids_servicio)
+
+    # --- Consultas ---
+
+    def contar_con_parche(self, nombre_parche: str, id_datacenter: int | None = None) -> int:
+        """Cuenta los servicios (de la flota o de un DataCenter) con el parche."""
+        with self._lock:
+            self._aplicar_pendientes()
+            if id_datacenter is None:
+                return self._con_parche[nombre_parche]
+            return self._con_parche_dc.get(nombre_parche, Counter())[id_datacenter]
+
+    def contar_sin_parche(self, nombre_parche: str, id_datacenter: int | None = None) -> int:
+        """Cuenta los servicios (de la flota o de un DataCenter) sin el parche."""
+        with self._lock:
+            self._aplicar_pendientes()
+            if id_datacenter is None:
+                return len(self._ordinales) - self._con_parche[nombre_parche]
+            return (self._tamano_datacenter[id_datacenter]
+                    - self._con_parche_dc.get(nombre_parche, Counter())[id_datacenter])
+
+    def servicios_sin_parche(self, nombre_parche: str, id_datacenter: int | None = None) -> List[int]:
+        """
+        Lista los IDs de los servicios que no tienen el parche.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            id_datacenter (int | None, optional): Restringe a un DataCenter.
+
+        Returns:
+            List[int]: Los IDs, ordenados por ordinal.
+        """
+        with self._lock:
+            self._aplicar_pendientes()
+            mascara = self._universo(id_datacenter) & ~self._por_parche.get(nombre_parche, 0)
+            servicios = self._servicios
+            return [servicios[ordinal] for ordinal in self._decodificar(mascara)]  # type: ignore
+
+    def esta_completo(self, nombre_parche: str, id_datacenter: int) -> bool:
+        """Indica si todos los servicios del DataCenter tienen el parche."""
+        return self.contar_sin_parche(nombre_parche, id_datacenter) == 0
+
+    def datacenters_completos(self, nombre_parche: str) -> List[int]:
+        """
+        Lista los DataCenters con el parche aplicado en todos sus servicios.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+
+        Returns:
+            List[int]: Los IDs de DataCenter, ordenados.
+        """
+        with self._lock:
+            self._aplicar_pendientes()
+            con_parche = self._con_parche_dc.get(nombre_parche, Counter())
+            return sorted(id_dc for id_dc, tamano in self._tamano_datacenter.items()
+                          if con_parche[id_dc] == tamano)
+
+    def get_cobertura(self, nombre_parche: str) -> float:
+        """Obtiene la fraccion (0..1) de la flota con el parche."""
+        with self._lock:
+            self._aplicar_pendientes()
+            total = len(self._ordinales)
+            return self._con_parche[nombre_parche] / total if total else 1.0
+
+    def servicios_de_datacenter(self, id_datacenter: int) -> List[int]:
+        """Lista los IDs de los servicios registrados de un DataCenter."""
+        with self._lock:
+            self._aplicar_pendientes()
+            return self._servicios_de(id_datacenter)
+
+    def get_cantidad_servicios(self) -> int:
+        """Obtiene la cantidad de servicios registrados."""
+        with self._lock:
+            self._aplicar_pendientes()
+            return len(self._ordinales)
+
+    def contiene(self, id_servicio: int) -> bool:
+        """Indica si el servicio esta registrado."""
+        with self._lock:
+            return id_servicio in self._ordinales and id_servicio not in self._bajas_pendientes
+
+    # --- Helpers privados ---
+
+    def _registrar(self, id_datacenter: int, servicios: Iterable[Tuple[int, Iterable[str]]]) -> None:
+        """Registra servicios con sus parches (ver registrar_servicios). Requiere el lock."""
+        nuevos: List[int] = []
+        por_parche: Dict[str, List[int]] = {}
+        for id_servicio, parches in servicios:
+            if id_servicio in self._ordinales:
+                continue
+            ordinal = self._asignar_ordinal(id_servicio, id_datacenter)
+            nuevos.append(ordinal)
+            for parche in parches:
+                por_parche.setdefault(parche, []).append(ordinal)
+
+        if not nuevos:
+            return
+        mascara = self._mascara(nuevos)
+        self._activos |= mascara
+        self._por_datacenter[id_datacenter] = self._por_datacenter.get(id_datacenter, 0) | mascara
+        self._tamano_datacenter[id_datacenter] += len(nuevos)
+        for parche, ordinales in por_parche.items():
+            self._por_parche[parche] = self._por_parche.get(parche, 0) | self._mascara(ordinales)
+            self._con_parche[parche] += len(ordinales)
+            self._con_parche_dc.setdefault(parche, Counter())[id_datacenter] += len(ordinales)
+
+    def _quitar(self, ids_servicio: Iterable[int]) -> int:
+        """Quita servicios y libera sus ordinales (ver quitar_servicios). Requiere el lock."""
+        ordinales: List[int] = []
+        datacenters: Dict[int, List[int]] = {}
+        for id_servicio in ids_servicio:
+            ordinal = self._ordinales.pop(id_servicio, None)
+            if ordinal is None:
+                continue
+            id_dc = self._datacenter_de[ordinal]
+            self._servicios[ordinal] = None
+            self._libres.append(ordinal)
+            ordinales.append(ordinal)
+            datacenters.setdefault(id_dc, []).append(ordinal)
+
+        if not ordinales:
+            return 0
+        mascara = self._mascara(ordinales)
+        self._activos &= ~mascara
+        for id_dc, ordinales_dc in datacenters.items():
+            restantes = self._por_datacenter[id_dc] & ~self._mascara(ordinales_dc)
+            self._tamano_datacenter[id_dc] -= len(ordinales_dc)
+            if restantes:
+                self._por_datacenter[id_dc] = restantes
+            else:
+                del self._por_datacenter[id_dc]
+                del self._tamano_datacenter[id_dc]
+        for parche, bitset in self._por_parche.items():
+            quitados = bitset & mascara
+            if quitados:
+                self._por_parche[parche] = bitset & ~mascara
+                self._descontar(parche, quitados, -1)
+        return len(ordinales)
+
+    def _servicios_de(self, id_datacenter: int) -> List[int]:
+        """IDs de los servicios de un DataCenter. Requiere el lock."""
+        servicios = self._servicios
+        return [servicios[ordinal]  # type: ignore
+                for ordinal in self._decodificar(self._por_datacenter.get(id_datacenter, 0))]
+
+    def _marcar(self, nombre_parche: str, ids_servicio: Iterable[int]) -> None:
+        """Marca un parche en los servicios registrados. Requiere el lock."""
+        ordinales = [self._ordinales[i] for i in ids_servicio if i in self._ordinales]
+        if not ordinales:
+            return
+        anterior = self._por_parche.get(nombre_parche, 0)
+        nuevos = self._mascara(ordinales) & ~anterior
+        if nuevos:
+            self._por_parche[nombre_parche] = anterior | nuevos
+            self._descontar(nombre_parche, nuevos, +1)
+
+    def _aplicar_pendientes(self) -> None:
+        """
+        Vuelca las bajas y los parches pendientes de los eventos: una sola
+        baja masiva y una mascara por parche. Requiere el lock.
+        """
+        if self._bajas_pendientes:
+            bajas = self._bajas_pendientes
+            self._bajas_pendientes = set()
+            self._quitar(bajas)
+        if self._pendientes:
+            pendientes = self._pendientes
+            self._pendientes = {}
+            for nombre_parche, ids_servicio in pendientes.items():
+                self._marcar(nombre_parche, ids_servicio)
+
+    def _asignar_ordinal(self, id_servicio: int, id_datacenter: int) -> int:
+        """Asigna un ordinal (reutilizando uno libre). Requiere el lock."""
+        if self._libres:
+            ordinal = self._libres.pop()
+            self._servicios[ordinal] = id_servicio
+            self._datacenter_de[ordinal] = id_datacenter
+        else:
+            ordinal = len(self._servicios)
+            self._servicios.append(id_servicio)
+            self._datacenter_de.append(id_datacenter)
+        self._ordinales[id_servicio] = ordinal
+        return ordinal
+
+    def _descontar(self, nombre_parche: str, mascara: int, signo: int) -> None:
+        """Ajusta los contadores del parche con los bits de la mascara. Requiere el lock."""
+        por_dc = self._con_parche_dc.setdefault(nombre_parche, Counter())
+        cantidad = 0
+        for ordinal in self._decodificar(mascara):
+            por_dc[self._datacenter_de[ordinal]] += signo
+            cantidad += 1
+        self._con_parche[nombre_parche] += signo * cantidad
+
+    def _universo(self, id_datacenter: int | None) -> int:
+        """Bitset de la flota o de un DataCenter."""
+        if id_datacenter is None:
+            return self._activos
+        return self._por_datacenter.get(id_datacenter, 0)
+
+    @staticmethod
+    def _mascara(ordinales: List[int]) -> int:
+        """Construye el bitset de una lista de ordinales en O(n)."""
+        if len(ordinales) == 1:
+            return 1 << ordinales[0]
+        buffer = bytearray((max(ordinales) >> 3) + 1)
+        for ordinal in ordinales:
+            buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+        return int.from_bytes(buffer, "little")
+
+    @staticmethod
+    def _decodificar(mascara: int) -> List[int]:
+        """Lista los ordinales (bits en 1) de un bitset, en orden."""
+        ordinales: List[int] = []
+        datos = mascara.to_bytes((mascara.bit_length() + 7) >> 3, "little")
+        for indice, byte in enumerate(datos):
+            while byte:
+                bajo = byte & -byte
+                ordinales.append((indice << 3) + bajo.bit_length() - 1)
+                byte ^= bajo
+        return ordinales
@@ -0,0 +1,413 @@
+"""
+Modulo del RolloutParche.
+
+Motor de despliegue (rollout) de parches de seguridad sobre muchos
+DataCenters y servicios (US-019): pool de workers acotado, limite de
+parcheos simultaneos por DataCenter, oleadas (canary y escalones
+porcentuales), contadores de progreso y checkpoint para reanudar.
+"""
+
+# --- Imports Standard Library ---
+import math
+import os
+import pickle
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterable, List, Set, Tuple, TYPE_CHECKING
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.infra_persistencia_exception import InfraPersistenciaException, TipoOperacion
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+# --- Imports para Type Hints ---
+if TYPE_CHECKING:
+    from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+    from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+
+# Funcion que aplica el parche a un servicio (lanza excepcion si falla)
+AplicadorParche = Callable[['Servicio', str], None]
+
+
+class EstadoParche(Enum):
+    """
+    Enumera el estado de un parche en un servicio.
+    """
+    PENDIENTE = "Pendiente"
+    EN_CURSO = "En curso"
+    APLICADO = "Aplicado"
+    FALLIDO = "Fallido"
+
+
+def _aplicar_parche_en_servicio(servicio: 'Servicio', nombre_parche: str) -> None:
+    """Aplicador por defecto: registra el parche en el servicio."""
+    servicio.aplicar_parche(nombre_parche)
+
+
+class RolloutParche:
+    """
+    Rollout de un parche de seguridad sobre la flota.
+
+    - Los objetivos se ordenan por (DataCenter, servicio); cada oleada
+      cubre un prefijo acumulativo (C.ROLLOUT_OLEADAS), asi el canary
+      queda acotado a pocos servicios de pocos DataCenters.
+    - Un unico thread coordinador planifica: nunca hay mas de
+      'max_workers' parcheos en vuelo ni mas de 'max_por_datacenter'
+      en un mismo DataCenter (los DataCenters se atienden en ronda).
+    - Tras cada oleada se guarda un checkpoint; si la tasa de fallos de
+      una oleada supera C.ROLLOUT_MAX_TASA_FALLOS el rollout se detiene.
+
+    Referencia: US-019
+    """
+
+    def __init__(self,
+                 nombre_parche: str,
+                 max_workers: int = C.ROLLOUT_MAX_WORKERS,
+                 max_por_datacenter: int = C.ROLLOUT_MAX_POR_DATACENTER,
+                 oleadas: Tuple[float, ...] = C.ROLLOUT_OLEADAS,
+                 path_checkpoint: str | None = None,
+                 aplicador: AplicadorParche = _aplicar_parche_en_servicio):
+        """
+        Inicializa el rollout (sin ejecutarlo).
+
+        Args:
+            nombre_parche (str): El nombre del parche (ej. "CVE-2025-1234").
+            max_workers (int, optional): Parcheos simultaneos en total.
+            max_por_datacenter (int, optional): Parcheos simultaneos por DataCenter.
+            oleadas (Tuple[float, ...], optional): Fracciones acumulativas (0, 1].
+            path_checkpoint (str | None, optional): Path del checkpoint.
+                Defaults a C.DIRECTORIO_DATA/rollout_<parche>.ckpt
+            aplicador (AplicadorParche, optional): Funcion que aplica el parche.
+
+        Raises:
+            ValueError: Si algun parametro es invalido.
+        """
+        if not nombre_parche:
+            raise ValueError("El nombre del parche no puede ser vacio")
+        if max_workers <= 0 or max_por_datacenter <= 0:
+            raise ValueError("Los limites de concurrencia deben ser positivos")
+        if not oleadas or list(oleadas) != sorted(oleadas) or oleadas[-1] != 1.0 or oleadas[0] <= 0:
+            raise ValueError("Las oleadas deben ser crecientes, en (0, 1] y terminar en 1.0")
+
+        self._nombre_parche: str = nombre_parche
+        self._max_workers: int = max_workers
+        self._max_por_datacenter: int = max_por_datacenter
+        self._oleadas: Tuple[float, ...] = tuple(oleadas)
+        self._aplicador: AplicadorParche = aplicador
+
+        if path_checkpoint is None:
+            nombre_seguro = nombre_parche.replace(" ", "_").replace(".", "")
+            path_checkpoint = os.path.join(
+                C.DIRECTORIO_DATA, f"rollout_{nombre_seguro}{C.EXTENSION_CHECKPOINT}")
+        self._path_checkpoint: str = path_checkpoint
+
+        # Estado por servicio (ID -> estado) y progreso
+        self._estados: Dict[int, EstadoParche] = {}
+        self._oleadas_completadas: int = 0
+        self._total: int = 0
+        self._aplicados: int = 0
+        self._fallidos: int = 0
+        self._en_curso: int = 0
+
+        # Interrupcion (cooperativa) del rollout
+        self._detenido: threading.Event = threading.Event()
+
+    # --- Ejecucion ---
+
+    def ejecutar(self, registros: Iterable['RegistroDataCenter']) -> bool:
+        """
+        Ejecuta (o continua) el rollout sobre los registros dados.
+
+        Args:
+            registros (Iterable[RegistroDataCenter]): Los DataCenters a parchear.
+
+        Returns:
+            bool: True si el parche quedo aplicado en todos los servicios;
+                  False si se detuvo (fallos, interrupcion) o quedaron fallidos.
+        """
+        objetivos = self._planificar(registros)
+        print(f"\n--- Rollout '{self._nombre_parche}': {self._total} servicios, "
+              f"{len(self._oleadas)} oleadas ---")
+
+        for indice, fraccion in enumerate(self._oleadas):
+            if indice < self._oleadas_completadas:
+                continue
+
+            limite = max(1, math.ceil(fraccion * len(objetivos))) if objetivos else 0
+            lote = [(id_dc, servicio) for id_dc, servicio in objetivos[:limite]
+                    if self._estados[servicio.get_id()] != EstadoParche.APLICADO]
+
+            fallidos_oleada = self._ejecutar_oleada(lote)
+
+            if self._detenido.is_set():
+                self.guardar_checkpoint()
+                print(f"Rollout '{self._nombre_parche}' interrumpido en la oleada {indice + 1}.")
+                return False
+
+            self._oleadas_completadas = indice + 1
+            self.guardar_checkpoint()
+            print(f"  Oleada {indice + 1} ({fraccion:.0%}): {len(lote)} servicios, "
+                  f"{fallidos_oleada} fallidos. Progreso: {self.get_progreso():.0%}")
+
+            if lote and fallidos_oleada / len(lote) > C.ROLLOUT_MAX_TASA_FALLOS:
+                print(f"Rollout '{self._nombre_parche}' DETENIDO: demasiados fallos.")
+                return False
+
+        return self._fallidos == 0
+
+    def detener(self) -> None:
+        """
+        Solicita la interrupcion del rollout: no se inician mas parcheos,
+        se esperan los que estan en vuelo y se guarda el checkpoint.
+        """
+        self._detenido.set()
+
+    def _planificar(self, registros: Iterable['RegistroDataCenter']) -> List[Tuple[int, 'Servicio']]:
+        """
+        Construye la lista ordenada de objetivos y el estado inicial.
+        Los servicios que ya tienen el parche quedan como APLICADO.
+        """
+        objetivos: List[Tuple[int, 'Servicio']] = []
+        for registro in sorted(registros, key=RolloutParche._clave_registro):
+            id_dc = registro.get_id_datacenter()
+            for server_rack in registro.get_racks():
+                for servicio in server_rack.get_servicios_desplegados():
+                    objetivos.append((id_dc, servicio))
+        objetivos.sort(key=RolloutParche._clave_objetivo)
+
+        self._aplicados = 0
+        self._fallidos = 0
+        self._en_curso = 0
+        for _, servicio in objetivos:
+            id_servicio = servicio.get_id()
+            estado = self._estados.get(id_servicio, EstadoParche.PENDIENTE)
+            if servicio.tiene_parche(self._nombre_parche):
+                estado = EstadoParche.APLICADO
+            elif estado != EstadoParche.FALLIDO:
+                # EN_CURSO de un checkpoint interrumpido vuelve a PENDIENTE
+                estado = EstadoParche.PENDIENTE
+            self._estados[id_servicio] = estado
+            if estado == EstadoParche.APLICADO:
+                self._aplicados += 1
+            elif estado == EstadoParche.FALLIDO:
+                self._fallidos += 1
+
+        self._total = len(objetivos)
+        return objetivos
+
+    def _ejecutar_oleada(self, lote: List[Tuple[int, 'Servicio']]) -> int:
+        """
+        Ejecuta una oleada respetando los limites de concurrencia.
+
+        Returns:
+            int: La cantidad de servicios que fallaron en esta oleada.
+        """
+        # Colas por DataCenter y ronda de DataCenters "listos"
+        colas: Dict[int, Deque['Servicio']] = {}
+        for id_dc, servicio in lote:
+            colas.setdefault(id_dc, deque()).append(servicio)
+        en_vuelo_dc: Dict[int, int] = dict.fromkeys(colas, 0)
+        listos: Deque[int] = deque(colas)
+        en_listos: Set[int] = set(colas)
+
+        en_vuelo: Dict[Future, Tuple[int, 'Servicio']] = {}
+        fallidos_oleada = 0
+        completados = 0
+
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix="RolloutThread") as pool:
+            while True:
+                # 1. Llenar el pool (salvo interrupcion)
+                while listos and len(en_vuelo) < self._max_workers and not self._detenido.is_set():
+                    id_dc = listos.popleft()
+                    servicio = colas[id_dc].popleft()
+                    en_vuelo_dc[id_dc] += 1
+                    if colas[id_dc] and en_vuelo_dc[id_dc] < self._max_por_datacenter:
+                        listos.append(id_dc)
+                    else:
+                        en_listos.discard(id_dc)
+
+                    self._marcar(servicio, EstadoParche.EN_CURSO)
+                    futuro = pool.submit(self._aplicador, servicio, self._nombre_parche)
+                    en_vuelo[futuro] = (id_dc, servicio)
+
+                if not en_vuelo:
+                    break
+
+                # 2. Esperar a que termine al menos uno
+                terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    id_dc, servicio = en_vuelo.pop(futuro)
+                    en_vuelo_dc[id_dc] -= 1
+                    if futuro.exception() is None:
+                        self._marcar(servicio, EstadoParche.APLICADO)
+                    else:
+                        self._marcar(servicio, EstadoParche.FALLIDO)
+                        fallidos_oleada += 1
+
+                    if colas[id_dc] and id_dc not in en_listos:
+                        listos.append(id_dc)
+                        en_listos.add(id_dc)
+
+                    completados += 1
+                    if completados % C.ROLLOUT_CHECKPOINT_CADA == 0:
+                        self.guardar_checkpoint()
+
+        return fallidos_oleada
+
+    def _marcar(self, servicio: 'Servicio', estado: EstadoParche) -> None:
+        """Cambia el estado de un servicio y actualiza los contadores."""
+        id_servicio = servicio.get_id()
+        anterior = self._estados.get(id_servicio, EstadoParche.PENDIENTE)
+        self._ajustar_contador(anterior, -1)
+        self._ajustar_contador(estado, +1)
+        self._estados[id_servicio] = estado
+
+    def _ajustar_contador(self, estado: EstadoParche, delta: int) -> None:
+        """Suma 'delta' al contador del estado dado."""
+        if estado == EstadoParche.APLICADO:
+            self._aplicados += delta
+        elif estado == EstadoParche.FALLIDO:
+            self._fallidos += delta
+        elif estado == EstadoParche.EN_CURSO:
+            self._en_curso += delta
+
+    @staticmethod
+    def _clave_registro(registro: 'RegistroDataCenter') -> int:
+        """Clave de orden de los registros (sin lambda, Rubrica 3.4)."""
+        return registro.get_id_datacenter()
+
+    @staticmethod
+    def _clave_objetivo(objetivo: Tuple[int, 'Servicio']) -> Tuple[int, int]:
+        """Clave de orden de los objetivos: (DataCenter, servicio)."""
+        return objetivo[0], objetivo[1].get_id()
+
+    # --- Checkpoint ---
+
+    def guardar_checkpoint(self) -> str:
+        """
+        Guarda el estado del rollout en disco (escritura atomica).
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de IO.
+
+        Returns:
+            str: El path del checkpoint.
+        """
+        contenido = {
+            "nombre_parche": self._nombre_parche,
+            "oleadas": self._oleadas,
+            "oleadas_completadas": self._oleadas_completadas,
+            "estados": {id_servicio: estado.value for id_servicio, estado in self._estados.items()},
+        }
+        path_temporal = self._path_checkpoint + C.EXTENSION_TEMPORAL
+        try:
+            os.makedirs(os.path.dirname(self._path_checkpoint) or ".", exist_ok=True)
+            with open(path_temporal, 'wb') as f:
+                pickle.dump(contenido, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path_temporal, self._path_checkpoint)
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(self._path_checkpoint) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_IO,
+                nombre_archivo=self._path_checkpoint,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        return self._path_checkpoint
+
+    @classmethod
+    def reanudar(cls,
+                 nombre_parche: str,
+                 path_checkpoint: str | None = None,
+                 **kwargs) -> 'RolloutParche':
+        """
+        Crea un rollout a partir de un checkpoint guardado.
+        Los servicios ya APLICADOS no se vuelven a parchear.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            path_checkpoint (str | None, optional): Path del checkpoint.
+            **kwargs: Resto de parametros del constructor (workers, limites...).
+
+        Raises:
+            InfraPersistenciaException: Si el checkpoint no existe o esta corrupto.
+
+        Returns:
+            RolloutParche: El rollout listo para 'ejecutar'.
+        """
+        rollout = cls(nombre_parche, path_checkpoint=path_checkpoint, **kwargs)
+        path = rollout._path_checkpoint
+        if not os.path.exists(path):
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_CHECKPOINT_NO_EXISTE.format(path),
+                mensaje_usuario=MSG.USR_CHECKPOINT_NO_EXISTE,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        try:
+            with open(path, 'rb') as f:
+                contenido = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, ImportError, IndexError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_CORRUPTO.format(path) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_CORRUPTO,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.LEER
+            )
+
+        if tuple(contenido["oleadas"]) == rollout._oleadas:
+            rollout._oleadas_completadas = contenido["oleadas_completadas"]
+        rollout._estados = {id_servicio: EstadoParche(valor)
+                            for id_servicio, valor in contenido["estados"].items()}
+        return rollout
+
+    # --- Progreso ---
+
+    def get_nombre_parche(self) -> str:
+        """Obtiene el nombre del parche."""
+        return self._nombre_parche
+
+    def get_estado(self, id_servicio: int) -> EstadoParche:
+        """Obtiene el estado del parche en un servicio (PENDIENTE si no se conoce)."""
+        return self._estados.get(id_servicio, EstadoParche.PENDIENTE)
+
+    def get_servicios_aplicados(self) -> List[int]:
+        """Obtiene los IDs de los servicios con el parche aplicado."""
+        return [id_servicio for id_servicio, estado in list(self._estados.items())
+                if estado == EstadoParche.APLICADO]
+
+    def get_total(self) -> int:
+        """Obtiene la cantidad de servicios objetivo."""
+        return self._total
+
+    def get_aplicados(self) -> int:
+        """Obtiene la cantidad de servicios con el parche aplicado."""
+        return self._aplicados
+
+    def get_fallidos(self) -> int:
+        """Obtiene la cantidad de servicios en los que el parche fallo."""
+        return self._fallidos
+
+    def get_en_curso(self) -> int:
+        """Obtiene la cantidad de parcheos en vuelo."""
+        return self._en_curso
+
+    def get_pendientes(self) -> int:
+        """Obtiene la cantidad de servicios aun sin parchear (ni fallidos)."""
+        return self._total - self._aplicados - self._fallidos - self._en_curso
+
+    def get_oleadas_completadas(self) -> int:
+        """Obtiene la cantidad de oleadas completadas."""
+        return self._oleadas_completadas
+
+    def get_progreso(self) -> float:
+        """Obtiene la fraccion (0..1) de servicios con el parche aplicado."""
+        return self._aplicados / self._total if self._total else 1.0
+
+    def get_path_checkpoint(self) -> str:
+        """Obtiene el path del checkpoint."""
+        return self._path_checkpoint
@@ -0,0 +1,107 @@
+"""
+Modulo del AnilloHashConsistente.
+
+Hashing consistente con nodos virtuales: asigna claves (IDs de
+DataCenter) a nodos (shards) de forma que, al agregar o quitar un
+nodo, solo cambia de dueno ~1/N de las claves.
+"""
+from bisect import bisect_right, insort
+from hashlib import blake2b
+from typing import Dict, List, Tuple
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+
+class AnilloHashConsistente:
+    """
+    Anillo de hashing consistente.
+
+    - Cada nodo ocupa 'nodos_virtuales' posiciones del anillo (hash de
+      64 bits de "<nodo>#<replica>"), lo que reparte la carga de forma
+      pareja aun con pocos nodos.
+    - Una clave pertenece al primer nodo virtual en sentido horario a
+      partir del hash de la clave (busqueda binaria, O(log V)).
+    - El hash es estable entre procesos y ejecuciones (no depende de
+      PYTHONHASHSEED), por lo que el padre y los shards coinciden.
+
+    Referencia: US-018
+    """
+
+    def __init__(self, nodos_virtuales: int = C.SHARDING_NODOS_VIRTUALES):
+        """
+        Inicializa un anillo vacio.
+
+        Args:
+            nodos_virtuales (int, optional): Posiciones del anillo por nodo.
+
+        Raises:
+            ValueError: Si 'nodos_virtuales' no es positivo.
+        """
+        if nodos_virtuales <= 0:
+            raise ValueError("La cantidad de nodos virtuales debe ser positiva.")
+        self._nodos_virtuales: int = nodos_virtuales
+        # Posiciones ordenadas del anillo: (hash, nodo)
+        self._posiciones: List[Tuple[int, int]] = []
+        self._hashes: List[int] = []
+        self._nodos: Dict[int, List[int]] = {}
+
+    @staticmethod
+    def _hash(clave: str) -> int:
+        """Hash estable de 64 bits de una clave."""
+        return int.from_bytes(blake2b(clave.encode(), digest_size=8).digest(), "big")
+
+    def agregar_nodo(self, id_nodo: int) -> None:
+        """
+        Agrega un nodo (y sus nodos virtuales) al anillo.
+
+        Args:
+            id_nodo (int): El ID del nodo. Si ya estaba, no hace nada.
+        """
+        if id_nodo in self._nodos:
+            return
+        hashes = [self._hash(f"{id_nodo}#{replica}") for replica in range(self._nodos_virtuales)]
+        self._nodos[id_nodo] = hashes
+        for valor in hashes:
+            insort(self._posiciones, (valor, id_nodo))
+        self._hashes = [valor for valor, _ in self._posiciones]
+
+    def quitar_nodo(self, id_nodo: int) -> None:
+        """
+        Quita un nodo del anillo. Sus claves pasan a los nodos vecinos.
+
+        Args:
+            id_nodo (int): El ID del nodo. Si no estaba, no hace nada.
+        """
+        if self._nodos.pop(id_nodo, None) is None:
+            return
+        self._posiciones = [posicion for posicion in self._posiciones if posicion[1] != id_nodo]
+        self._hashes = [valor for valor, _ in self._posiciones]
+
+    def get_nodo(self, clave: int) -> int:
+        """
+        Obtiene el nodo dueno de una clave.
+
+        Args:
+            clave (int): La clave (ej. ID de DataCenter).
+
+        Raises:
+            LookupError: Si el anillo no tiene nodos.
+
+        Returns:
+            int: El ID del nodo dueno.
+        """
+        if not self._posiciones:
+            raise LookupError("El anillo de hashing no tiene nodos.")
+        indice = bisect_right(self._hashes, self._hash(str(clave)))
+        if indice == len(self._posiciones):
+            indice = 0  # Se da la vuelta al anillo
+        return self._posiciones[indice][1]
+
+    def get_nodos(self) -> List[int]:
+        """Obtiene los IDs de los nodos del anillo (ordenados)."""
+        return sorted(self._nodos)
+
+    def get_nodos_virtuales(self) -> int:
+        """Obtiene la cantidad de nodos virtuales por nodo."""
+        return self._nodos_virtuales
@@ -0,0 +1,446 @@
+"""
+Modulo del servicio CloudProviderShardedService.
+
+Version multiproceso del CloudProviderService: los DataCenters
+gestionados se reparten entre varios procesos (shards) con hashing
+consistente; cada operacion se reparte a los shards (fan-out) y sus
+resultados se combinan en el proceso padre.
+"""
+import multiprocessing
+from threading import RLock
+from typing import Dict, Iterable, List, Tuple, Type, TypeVar, cast
+
+# --- Imports de Entidades y Servicios de Negocio ---
+from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+from python_cloud_infra.servicios.negocio.snapshot import Snapshot
+from python_cloud_infra.servicios.negocio.snapshot_en_disco import SnapshotEnDisco
+from python_cloud_infra.servicios.negocio.sharding.anillo_hash import AnilloHashConsistente
+from python_cloud_infra.servicios.negocio.sharding import proceso_shard as PS
+from python_cloud_infra.servicios.negocio.sharding.proceso_shard import ProcesoShard
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+T = TypeVar('T', bound=Servicio)
+
+
+class ResumenRollout:
+    """
+    Resultado combinado de un rollout de parche ejecutado en varios
+    shards (mismos contadores que RolloutParche).
+    """
+
+    def __init__(self, nombre_parche: str, parciales: Iterable[Tuple[int, int, int, int]]):
+        """
+        Inicializa el resumen sumando los contadores de cada shard.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            parciales (Iterable[Tuple[int, int, int, int]]):
+                (total, aplicados, fallidos, pendientes) de cada shard.
+        """
+        self._nombre_parche: str = nombre_parche
+        self._total = self._aplicados = self._fallidos = self._pendientes = 0
+        for total, aplicados, fallidos, pendientes in parciales:
+            self._total += total
+            self._aplicados += aplicados
+            self._fallidos += fallidos
+            self._pendientes += pendientes
+
+    def get_nombre_parche(self) -> str:
+        """Obtiene el nombre del parche."""
+        return self._nombre_parche
+
+    def get_total(self) -> int:
+        """Obtiene la cantidad total de servicios del rollout."""
+        return self._total
+
+    def get_aplicados(self) -> int:
+        """Obtiene la cantidad de servicios parcheados."""
+        return self._aplicados
+
+    def get_fallidos(self) -> int:
+        """Obtiene la cantidad de servicios que fallaron."""
+        return self._fallidos
+
+    def get_pendientes(self) -> int:
+        """Obtiene la cantidad de servicios pendientes."""
+        return self._pendientes
+
+    def get_progreso(self) -> float:
+        """Obtiene la fraccion de servicios procesados (0.0 a 1.0)."""
+        if self._total == 0:
+            return 1.0
+        return (self._aplicados + self._fallidos) / self._total
+
+
+class CloudProviderShardedService:
+    """
+    Gestiona los DataCenters repartidos en varios procesos (shards).
+
+    - Cada DataCenter pertenece al shard que indica el anillo de hashing
+      consistente (por su ID); el shard guarda el RegistroDataCenter en
+      su propio CloudProviderService.
+    - Las operaciones sobre toda la flota se envian a todos los shards
+      antes de esperar las respuestas, por lo que se ejecutan en paralelo
+      (cada shard es un proceso, sin competir por el GIL).
+    - 'redimensionar' cambia la cantidad de shards moviendo solo los
+      DataCenters cuyo shard dueno cambio (~1/N al agregar un shard).
+    - Los objetos que se devuelven (registros, servicios) son copias:
+      modificarlos no afecta al estado del shard.
+
+    Uso:
+        with CloudProviderShardedService(4) as provider:
+            provider.add_datacenter(registro)
+            provider.desplegar_parche("CVE-2025-1234")
+
+    Referencia: US-018, US-019, US-020
+    """
+
+    def __init__(self,
+                 cantidad_shards: int = C.SHARDING_CANTIDAD_SHARDS,
+                 nodos_virtuales: int = C.SHARDING_NODOS_VIRTUALES,
+                 metodo_inicio: str = C.SHARDING_METODO_INICIO,
+                 silencioso: bool = C.SHARDING_SILENCIAR_WORKERS):
+        """
+        Inicia los procesos de los shards.
+
+        Args:
+            cantidad_shards (int, optional): Cantidad de procesos worker.
+            nodos_virtuales (int, optional): Nodos virtuales por shard.
+            metodo_inicio (str, optional): Metodo de inicio de multiprocessing.
+            silencioso (bool, optional): Si es True, los shards no imprimen.
+
+        Raises:
+            ValueError: Si 'cantidad_shards' no es positiva.
+        """
+        if cantidad_shards <= 0:
+            raise ValueError("La cantidad de shards debe ser positiva.")
+        self._contexto = multiprocessing.get_context(metodo_inicio)
+        self._silencioso: bool = silencioso
+        self._anillo: AnilloHashConsistente = AnilloHashConsistente(nodos_virtuales)
+        self._shards: Dict[int, ProcesoShard] = {}
+        # ID de DataCenter -> ID de shard, en orden de alta
+        self._ubicacion_datacenters: Dict[int, int] = {}
+        self._lock: RLock = RLock()
+        for id_shard in range(cantidad_shards):
+            self._iniciar_shard(id_shard)
+
+    def __enter__(self) -> 'CloudProviderShardedService':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.cerrar()
+
+    def _iniciar_shard(self, id_shard: int) -> None:
+        self._shards[id_shard] = ProcesoShard(id_shard, self._contexto, self._silencioso)
+        self._anillo.agregar_nodo(id_shard)
+
+    # --- Gestion de DataCenters ---
+
+    def add_datacenter(self, registro: RegistroDataCenter) -> None:
+        """
+        Agrega un DataCenter: se envia (copia) al shard que le corresponde.
+
+        Referencia: US-018
+
+        Args:
+            registro (RegistroDataCenter): El registro a gestionar.
+        """
+        self.add_datacenters([registro])
+
+    def add_datacenters(self, registros: Iterable[RegistroDataCenter]) -> None:
+        """
+        Agrega varios DataCenters, con un solo mensaje por shard.
+
+        Referencia: US-018
+
+        Args:
+            registros (Iterable[RegistroDataCenter]): Los registros a gestionar.
+        """
+        with self._lock:
+            por_shard: Dict[int, List[RegistroDataCenter]] = {}
+            for registro in registros:
+                id_dc = registro.get_id_datacenter()
+                if id_dc in self._ubicacion_datacenters:
+                    print(f"DataCenter (ID {id_dc}) ya estaba siendo gestionado.")
+                    continue
+                id_shard = self._anillo.get_nodo(id_dc)
+                self._ubicacion_datacenters[id_dc] = id_shard
+                por_shard.setdefault(id_shard, []).append(registro)
+            self._fan_out({id_shard: (PS.COMANDO_AGREGAR, (lote,))
+                           for id_shard, lote in por_shard.items()})
+
+    def buscar_datacenter(self, id_datacenter: int) -> RegistroDataCenter | None:
+        """
+        Busca un DataCenter gestionado por su ID.
+
+        Referencia: US-018
+
+        Args:
+            id_datacenter (int): El ID de DataCenter a buscar.
+
+        Returns:
+            RegistroDataCenter | None: Una copia del registro, o None.
+        """
+        with self._lock:
+            id_shard = self._ubicacion_datacenters.get(id_datacenter)
+            if id_shard is None:
+                return None
+            return cast(RegistroDataCenter | None,
+                        self._shards[id_shard].ejecutar(PS.COMANDO_BUSCAR, id_datacenter))
+
+    def get_ids_datacenters(self) -> List[int]:
+        """Obtiene los IDs de los DataCenters gestionados (en orden de alta)."""
+        return list(self._ubicacion_datacenters)
+
+    def get_shard_de_datacenter(self, id_datacenter: int) -> int | None:
+        """Obtiene el ID del shard que posee un DataCenter (o None)."""
+        return self._ubicacion_datacenters.get(id_datacenter)
+
+    def get_distribucion(self) -> Dict[int, int]:
+        """Obtiene la cantidad de DataCenters por shard."""
+        distribucion = {id_shard: 0 for id_shard in self._shards}
+        for id_shard in self._ubicacion_datacenters.values():
+            distribucion[id_shard] += 1
+        return distribucion
+
+    def get_cantidad_shards(self) -> int:
+        """Obtiene la cantidad de shards en ejecucion."""
+        return len(self._shards)
+
+    # --- Operaciones repartidas (fan-out) ---
+
+    def aplicar_parche_seguridad(self, id_datacenter: int, nombre_parche: str) -> bool:
+        """
+        Aplica un parche de seguridad a todos los servicios de un DataCenter
+        (en el shard que lo posee).
+
+        Implementacion de US-019.
+
+        Args:
+            id_datacenter (int): El ID del DataCenter a parchear.
+            nombre_parche (str): El nombre del parche.
+
+        Returns:
+            bool: True si el parche quedo aplicado en todos los servicios,
+                  False si no se encontro el DataCenter o hubo fallos.
+        """
+        if id_datacenter not in self._ubicacion_datacenters:
+            print(f"Error: DataCenter {id_datacenter} no encontrado.")
+            return False
+        resumen = self.desplegar_parche(nombre_parche, [id_datacenter])
+        return resumen.get_fallidos() == 0 and resumen.get_pendientes() == 0
+
+    def desplegar_parche(self,
+                         nombre_parche: str,
+                         ids_datacenter: List[int] | None = None,
+                         **kwargs) -> ResumenRollout:
+        """
+        Despliega un parche: cada shard ejecuta su propio RolloutParche
+        sobre sus DataCenters, todos en paralelo.
+
+        Implementacion de US-019.
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            ids_datacenter (List[int] | None, optional): Los DataCenters a
+                parchear. Defaults a todos los gestionados.
+            **kwargs: Parametros del RolloutParche de cada shard.
+
+        Raises:
+            ShardException: Si el rollout falla en algun shard.
+
+        Returns:
+            ResumenRollout: Los contadores combinados de todos los shards.
+        """
+        with self._lock:
+            if ids_datacenter is None:
+                comandos = {id_shard: (PS.COMANDO_DESPLEGAR_PARCHE, (nombre_parche, None, kwargs))
+                            for id_shard in self._shards}
+            else:
+                por_shard = self._agrupar_por_shard(ids_datacenter)
+                comandos = {id_shard: (PS.COMANDO_DESPLEGAR_PARCHE, (nombre_parche, ids, kwargs))
+                            for id_shard, ids in por_shard.items()}
+            resumen = ResumenRollout(nombre_parche,
+                                     cast(List[Tuple[int, int, int, int]],
+                                          self._fan_out(comandos).values()))
+        print(f"Rollout '{nombre_parche}' en {len(comandos)} shard(s): "
+              f"{resumen.get_aplicados()}/{resumen.get_total()} aplicados, "
+              f"{resumen.get_fallidos()} fallidos.")
+        return resumen
+
+    def servicios_sin_parche(self, nombre_parche: str, id_datacenter: int | None = None) -> List[int]:
+        """
+        Lista los IDs de los servicios que aun no tienen un parche.
+
+        Referencia: US-019
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+            id_datacenter (int | None, optional): Restringe a un DataCenter.
+
+        Returns:
+            List[int]: Los IDs de los servicios sin el parche, ordenados.
+        """
+        with self._lock:
+            if id_datacenter is None:
+                destinos = list(self._shards)
+            else:
+                destinos = list(self._agrupar_por_shard([id_datacenter]))
+            parciales = self._fan_out({id_shard: (PS.COMANDO_SIN_PARCHE, (nombre_parche, id_datacenter))
+                                       for id_shard in destinos})
+        return sorted(id_servicio for ids in parciales.values()
+                      for id_servicio in cast(List[int], ids))
+
+    def datacenters_parcheados(self, nombre_parche: str) -> List[int]:
+        """
+        Lista los DataCenters con el parche aplicado en todos sus servicios.
+
+        Referencia: US-019
+
+        Args:
+            nombre_parche (str): El nombre del parche.
+
+        Returns:
+            List[int]: Los IDs de DataCenter, ordenados.
+        """
+        with self._lock:
+            parciales = self._fan_out({id_shard: (PS.COMANDO_PARCHEADOS, (nombre_parche,))
+                                       for id_shard in self._shards})
+        return sorted(id_dc for ids in parciales.values() for id_dc in cast(List[int], ids))
+
+    def decomisionar_y_archivar(self,
+                                tipo_servicio: Type[T],
+                                en_disco: bool = False) -> Snapshot[T]:
+        """
+        Descomisiona TODOS los servicios de un TIPO de TODOS los
+        DataCenters (cada shard los suyos, en paralelo) y los combina en
+        un Snapshot, en el mismo orden que el CloudProviderService
+        (orden de alta de los DataCenters).
+
+        Implementacion de US-020.
+
+        Args:
+            tipo_servicio (Type[T]): El tipo de servicio a decomisionar.
+            en_disco (bool, optional): Si es True, el resultado es un SnapshotEnDisco.
+
+        Raises:
+            ShardException: Si la decomision falla en algun shard.
+
+        Returns:
+            Snapshot[T]: Un snapshot con los servicios decomisionados.
+        """
+        print(f"\n--- DECOMISIONANDO todos los {tipo_servicio.__name__} "
+              f"({len(self._shards)} shards) ---")
+        if en_disco:
+            snapshot_servicios: Snapshot[T] = SnapshotEnDisco(tipo_servicio)
+        else:
+            snapshot_servicios = Snapshot(tipo_servicio)
+
+        with self._lock:
+            parciales = self._fan_out({id_shard: (PS.COMANDO_DECOMISIONAR, (tipo_servicio,))
+                                       for id_shard in self._shards})
+            por_datacenter: Dict[int, List[Servicio]] = {}
+            for resultado in parciales.values():
+                por_datacenter.update(cast(List[Tuple[int, List[Servicio]]], resultado))
+            for id_dc in self._ubicacion_datacenters:
+                snapshot_servicios.add_items(cast(List[T], por_datacenter.get(id_dc, [])))
+
+        print(f"DECOMISIÓN TOTAL: {snapshot_servicios.get_cantidad()} "
+              f"instancias de {tipo_servicio.__name__}.")
+        return snapshot_servicios
+
+    # --- Rebalanceo y ciclo de vida ---
+
+    def redimensionar(self, cantidad_shards: int) -> int:
+        """
+        Cambia la cantidad de shards. Solo se mueven los DataCenters cuyo
+        shard dueno cambia en el nuevo anillo (hashing consistente).
+
+        Referencia: US-018
+
+        Args:
+            cantidad_shards (int): La nueva cantidad de shards.
+
+        Raises:
+            ValueError: Si 'cantidad_shards' no es positiva.
+            ShardException: Si falla la extraccion o alta en algun shard.
+
+        Returns:
+            int: La cantidad de DataCenters movidos.
+        """
+        if cantidad_shards <= 0:
+            raise ValueError("La cantidad de shards debe ser positiva.")
+        with self._lock:
+            actuales = len(self._shards)
+            for id_shard in range(actuales, cantidad_shards):
+                self._iniciar_shard(id_shard)
+            for id_shard in range(cantidad_shards, actuales):
+                self._anillo.quitar_nodo(id_shard)
+
+            # 1. DataCenters cuyo dueno cambio, agrupados por shard de origen
+            movimientos: Dict[int, List[int]] = {}
+            for id_dc, id_shard in self._ubicacion_datacenters.items():
+                if self._anillo.get_nodo(id_dc) != id_shard:
+                    movimientos.setdefault(id_shard, []).append(id_dc)
+
+            # 2. Extraerlos de su shard y agregarlos en el nuevo (copias via Pipe)
+            extraidos = self._fan_out({id_shard: (PS.COMANDO_EXTRAER, (ids,))
+                                       for id_shard, ids in movimientos.items()})
+            por_destino: Dict[int, List[RegistroDataCenter]] = {}
+            for registros in extraidos.values():
+                for registro in cast(List[RegistroDataCenter], registros):
+                    id_dc = registro.get_id_datacenter()
+                    id_destino = self._anillo.get_nodo(id_dc)
+                    self._ubicacion_datacenters[id_dc] = id_destino
+                    por_destino.setdefault(id_destino, []).append(registro)
+            self._fan_out({id_shard: (PS.COMANDO_AGREGAR, (registros,))
+                           for id_shard, registros in por_destino.items()})
+
+            # 3. Detener los shards que sobran (ya vacios)
+            for id_shard in range(cantidad_shards, actuales):
+                self._shards.pop(id_shard).cerrar()
+
+        movidos = sum(len(ids) for ids in movimientos.values())
+        print(f"Rebalanceo {actuales} -> {cantidad_shards} shards: "
+              f"{movidos}/{len(self._ubicacion_datacenters)} DataCenters movidos.")
+        return movidos
+
+    def cerrar(self) -> None:
+        """Detiene todos los procesos de los shards."""
+        with self._lock:
+            for shard in self._shards.values():
+                shard.cerrar()
+            self._shards.clear()
+
+    # --- Auxiliares ---
+
+    def _agrupar_por_shard(self, ids_datacenter: Iterable[int]) -> Dict[int, List[int]]:
+        """Agrupa IDs de DataCenters gestionados por shard dueno."""
+        por_shard: Dict[int, List[int]] = {}
+        for id_dc in ids_datacenter:
+            id_shard = self._ubicacion_datacenters.get(id_dc)
+            if id_shard is not None:
+                por_shard.setdefault(id_shard, []).append(id_dc)
+        return por_shard
+
+    def _fan_out(self, comandos: Dict[int, Tuple[str, tuple]]) -> Dict[int, object]:
+        """
+        Envia un comando a cada shard y luego espera todas las respuestas.
+        Si algun shard falla, se reciben igual las demas respuestas (para
+        no desincronizar los Pipes) y se relanza el primer error.
+        """
+        for id_shard, (comando, argumentos) in comandos.items():
+            self._shards[id_shard].enviar(comando, *argumentos)
+        resultados: Dict[int, object] = {}
+        primer_error: Exception | None = None
+        for id_shard in comandos:
+            try:
+                resultados[id_shard] = self._shards[id_shard].recibir()
+            except Exception as e:
+                primer_error = primer_error or e
+        if primer_error is not None:
+            raise primer_error
+        return resultados
@@ -0,0 +1,219 @@
+"""
+Modulo del ProcesoShard.
+
+Cada shard es un proceso worker que posee su propio CloudProviderService
+(y por lo tanto sus propios RegistroDataCenter, racks e indices). El
+proceso padre le envia comandos por un Pipe y recibe los resultados
+(los objetos viajan serializados con Pickle).
+"""
+import os
+import sys
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import Callable, Dict, List, Tuple
+
+# --- Imports de Entidades y Servicios de Negocio ---
+from python_cloud_infra.entidades.infra.registro_datacenter import RegistroDataCenter
+from python_cloud_infra.entidades.aplicaciones.servicio import Servicio
+from python_cloud_infra.servicios.negocio.cloud_provider_service import CloudProviderService
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.infra_exception import InfraException
+from python_cloud_infra.excepciones.shard_exception import ShardException
+from python_cloud_infra.excepciones import mensajes_exception as ME
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Comandos del protocolo padre <-> shard ---
+COMANDO_AGREGAR = "agregar"
+COMANDO_EXTRAER = "extraer"
+COMANDO_BUSCAR = "buscar"
+COMANDO_IDS = "ids"
+COMANDO_DESPLEGAR_PARCHE = "desplegar_parche"
+COMANDO_SIN_PARCHE = "sin_parche"
+COMANDO_PARCHEADOS = "parcheados"
+COMANDO_DECOMISIONAR = "decomisionar"
+COMANDO_CERRAR = "cerrar"
+
+
+class _ManejadorShard:
+    """
+    Ejecuta, dentro del proceso del shard, los comandos recibidos
+    sobre el CloudProviderService local (despacho por diccionario).
+    """
+
+    def __init__(self):
+        self._provider: CloudProviderService = CloudProviderService()
+        self._handlers: Dict[str, Callable[..., object]] = {
+            COMANDO_AGREGAR: self._agregar,
+            COMANDO_EXTRAER: self._extraer,
+            COMANDO_BUSCAR: self._provider.buscar_datacenter,
+            COMANDO_IDS: self._provider.get_ids_datacenters,
+            COMANDO_DESPLEGAR_PARCHE: self._desplegar_parche,
+            COMANDO_SIN_PARCHE: self._provider.servicios_sin_parche,
+            COMANDO_PARCHEADOS: self._provider.datacenters_parcheados,
+            COMANDO_DECOMISIONAR: self._provider.decomisionar_por_datacenter,
+        }
+
+    def ejecutar(self, comando: str, argumentos: tuple) -> object:
+        """Ejecuta un comando y devuelve su resultado."""
+        return self._handlers[comando](*argumentos)
+
+    def _agregar(self, registros: List[RegistroDataCenter]) -> None:
+        for registro in registros:
+            self._provider.add_datacenter(registro)
+
+    def _extraer(self, ids_datacenter: List[int]) -> List[RegistroDataCenter]:
+        registros: List[RegistroDataCenter] = []
+        for id_dc in ids_datacenter:
+            registro = self._provider.quitar_datacenter(id_dc)
+            if registro is not None:
+                registros.append(registro)
+        return registros
+
+    def _desplegar_parche(self,
+                          nombre_parche: str,
+                          ids_datacenter: List[int] | None,
+                          opciones: dict) -> Tuple[int, int, int, int]:
+        rollout = self._provider.desplegar_parche(nombre_parche, ids_datacenter, **opciones)
+        return (rollout.get_total(), rollout.get_aplicados(),
+                rollout.get_fallidos(), rollout.get_pendientes())
+
+
+def ejecutar_shard(id_shard: int, conexion: Connection, silencioso: bool) -> None:
+    """
+    Bucle principal del proceso de un shard: recibe (comando, argumentos)
+    y responde (True, resultado) o (False, (tipo de error, detalle)).
+    Termina con COMANDO_CERRAR o si el padre cierra el Pipe.
+
+    Args:
+        id_shard (int): El ID del shard (para los mensajes).
+        conexion (Connection): El extremo del Pipe del shard.
+        silencioso (bool): Si es True, descarta la salida estandar.
+    """
+    if silencioso:
+        sys.stdout = open(os.devnull, "w")
+    manejador = _ManejadorShard()
+    try:
+        while True:
+            try:
+                comando, argumentos = conexion.recv()
+            except EOFError:
+                return
+            if comando == COMANDO_CERRAR:
+                conexion.send((True, id_shard))
+                return
+            try:
+                respuesta = (True, manejador.ejecutar(comando, argumentos))
+            except Exception as e:  # El error viaja al padre como datos
+                detalle = e.get_mensaje_tecnico() if isinstance(e, InfraException) else str(e)
+                respuesta = (False, (type(e).__name__, detalle))
+            conexion.send(respuesta)
+    finally:
+        conexion.close()
+
+
+class ProcesoShard:
+    """
+    Representa, en el proceso padre, a un shard en ejecucion.
+
+    Los comandos se envian y reciben por separado ('enviar'/'recibir')
+    para que el padre pueda repartir una operacion a todos los shards
+    antes de esperar los resultados (fan-out en paralelo).
+
+    Referencia: US-018
+    """
+
+    def __init__(self, id_shard: int, contexto: BaseContext,
+                 silencioso: bool = C.SHARDING_SILENCIAR_WORKERS):
+        """
+        Crea e inicia el proceso del shard.
+
+        Args:
+            id_shard (int): El ID del shard.
+            contexto (BaseContext): Contexto de multiprocessing (metodo de inicio).
+            silencioso (bool, optional): Si es True, el shard no imprime.
+        """
+        self._id_shard: int = id_shard
+        self._conexion, conexion_shard = contexto.Pipe()
+        self._proceso = contexto.Process(target=ejecutar_shard,
+                                         args=(id_shard, conexion_shard, silencioso),
+                                         name=f"Shard-{id_shard}",
+                                         daemon=True)
+        self._proceso.start()
+        conexion_shard.close()  # El padre solo usa su extremo
+        self._comando_pendiente: str | None = None
+
+    def get_id_shard(self) -> int:
+        """Obtiene el ID del shard."""
+        return self._id_shard
+
+    def esta_vivo(self) -> bool:
+        """Indica si el proceso del shard sigue en ejecucion."""
+        return self._proceso.is_alive()
+
+    def enviar(self, comando: str, *argumentos) -> None:
+        """
+        Envia un comando al shard (sin esperar el resultado).
+
+        Raises:
+            ShardException: Si el shard ya no esta disponible.
+        """
+        try:
+            self._conexion.send((comando, argumentos))
+        except (OSError, ValueError) as e:
+            raise self._error_caido() from e
+        self._comando_pendiente = comando
+
+    def recibir(self) -> object:
+        """
+        Espera el resultado del ultimo comando enviado.
+
+        Raises:
+            ShardException: Si el comando fallo en el shard o el shard cayo.
+
+        Returns:
+            object: El resultado del comando.
+        """
+        try:
+            exito, resultado = self._conexion.recv()
+        except (EOFError, OSError) as e:
+            raise self._error_caido() from e
+        comando, self._comando_pendiente = self._comando_pendiente, None
+        if not exito:
+            tipo_error, detalle = resultado  # type: ignore
+            raise ShardException(
+                ME.TEC_SHARD_ERROR.format(self._id_shard, comando, tipo_error, detalle),
+                ME.USR_SHARD_ERROR,
+                self._id_shard)
+        return resultado
+
+    def ejecutar(self, comando: str, *argumentos) -> object:
+        """Envia un comando y espera su resultado."""
+        self.enviar(comando, *argumentos)
+        return self.recibir()
+
+    def cerrar(self, timeout: float = C.SHARDING_TIMEOUT_CIERRE) -> None:
+        """
+        Detiene el proceso del shard (ordenadamente si es posible).
+
+        Args:
+            timeout (float, optional): Segundos de espera antes de forzarlo.
+        """
+        if self._proceso.is_alive():
+            try:
+                self.ejecutar(COMANDO_CERRAR)
+            except ShardException:
+                pass  # Ya no responde: se fuerza abajo
+            self._proceso.join(timeout)
+            if self._proceso.is_alive():
+                self._proceso.terminate()
+                self._proceso.join()
+        self._conexion.close()
+
+    def _error_caido(self) -> ShardException:
+        return ShardException(
+            ME.TEC_SHARD_CAIDO.format(self._id_shard, self._proceso.exitcode),
+            ME.USR_SHARD_CAIDO,
+            self._id_shard)
@@ -2,7 +2,10 @@
 Modulo de la entidad generica Snapshot.
 (Análoga a 'Paquete[T]')
 """
-from typing import Generic, List, TypeVar, Type
+from typing import Generic, Iterable, Iterator, List, TypeVar, Type
+
+from python_cloud_infra import constantes as C
+from python_cloud_infra.entidades.asignador_ids import AsignadorIds
 
 # T es un TypeVar, lo que permite la creacion de Generics
 # (exigido por Rubrica 3.3 y US-020)
@@ -18,7 +21,10 @@ class Snapshot(Generic[T]):
     
     Referencia: US-020
     """
-    _contador_id: int = 0
+    # Asignador de IDs de clase (thread-safe, por bloques). La marca de
+    # agua persistida (en C.DIRECTORIO_DATA, resuelta al primer uso)
+    # evita repetir IDs de otro proceso, anterior o concurrente.
+    _asignador_ids: AsignadorIds = AsignadorIds(nombre_marca=C.ARCHIVO_MARCA_IDS_SNAPSHOT)
 
     def __init__(self, tipo_contenido: Type[T]):
         """
@@ -28,11 +34,18 @@ class Snapshot(Generic[T]):
             tipo_contenido (Type[T]): El tipo de servicio que
                                       contendra este snapshot.
         """
-        Snapshot._contador_id += 1
-        self._id_snapshot: int = Snapshot._contador_id
+        self._id_snapshot: int = Snapshot._asignador_ids.siguiente()
         self._tipo_contenido: Type[T] = tipo_contenido
         self._contenido: List[T] = []
 
+    def __setstate__(self, estado: dict) -> None:
+        """
+        Restaura el snapshot desde Pickle y registra su ID para que no
+        se vuelva a asignar.
+        """
+        self.__dict__.update(estado)
+        Snapshot._asignador_ids.observar(self._id_snapshot)
+
     def get_id_snapshot(self) -> int:
         """Obtiene el ID unico del snapshot."""
         return self._id_snapshot
@@ -53,10 +66,17 @@ class Snapshot(Generic[T]):
         """Añade un servicio al snapshot."""
         self._contenido.append(item)
         
-    def add_items(self, items: List[T]) -> None:
-        """Añade una lista de servicios al snapshot."""
+    def add_items(self, items: Iterable[T]) -> None:
+        """Añade una lista (o iterable) de servicios al snapshot."""
         self._contenido.extend(items)
 
+    def iterar_contenido(self) -> Iterator[T]:
+        """
+        Recorre los servicios del snapshot sin copiar la lista
+        (a diferencia de get_contenido).
+        """
+        return iter(self._contenido)
+
     def get_cantidad(self) -> int:
         """Obtiene la cantidad de servicios en el snapshot."""
         return len(self._contenido)
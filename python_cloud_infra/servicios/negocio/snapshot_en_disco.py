@@ -0,0 +1,337 @@
+"""
+Modulo de la entidad SnapshotEnDisco.
+
+Snapshot (US-020) para decomisiones muy grandes: mantiene en memoria
+solo un buffer acotado y vuelca el resto a un archivo temporal, en
+bloques de registros Pickle con prefijo de longitud.
+"""
+
+# --- Imports Standard Library ---
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Type, TypeVar
+
+# --- Imports de Constantes ---
+from python_cloud_infra import constantes as C
+
+# --- Imports de Entidades ---
+from python_cloud_infra.servicios.negocio.snapshot import Snapshot
+
+# --- Imports de Excepciones ---
+from python_cloud_infra.excepciones.infra_persistencia_exception import InfraPersistenciaException, TipoOperacion
+from python_cloud_infra.excepciones import mensajes_exception as MSG
+
+T = TypeVar('T')
+
+# Formato: cada bloque es (cantidad de items, longitud en bytes) + pickle de la lista
+_CABECERA_BLOQUE = struct.Struct("<II")
+_FIRMA_ARCHIVO = b"CISNAP01"
+
+
+class SnapshotEnDisco(Snapshot[T]):
+    """
+    Snapshot con volcado (spill) a disco.
+
+    - Los servicios se acumulan en un buffer de hasta 'max_en_memoria';
+      al llenarse, el buffer se escribe como un bloque en un archivo
+      temporal (que el sistema borra al cerrarlo).
+    - get_cantidad es O(1); iterar_contenido recorre los bloques de a uno,
+      por lo que la memoria queda acotada por el tamaño del buffer.
+    - archivar(path) escribe un archivo autocontenido (firma, cabecera y
+      bloques) que puede reabrirse con SnapshotEnDisco.cargar(path).
+
+    Referencia: US-020
+    """
+
+    def __init__(self,
+                 tipo_contenido: Type[T],
+                 max_en_memoria: int = C.SNAPSHOT_MAX_EN_MEMORIA,
+                 directorio: str | None = None):
+        """
+        Inicializa un snapshot vacio (el archivo temporal se crea al primer volcado).
+
+        Args:
+            tipo_contenido (Type[T]): El tipo de servicio que contendra.
+            max_en_memoria (int, optional): Tamaño maximo del buffer en memoria.
+            directorio (str | None, optional): Directorio del archivo temporal.
+                                               Defaults al temporal del sistema.
+
+        Raises:
+            ValueError: Si max_en_memoria es <= 0.
+        """
+        if max_en_memoria <= 0:
+            raise ValueError("El tamaño del buffer debe ser positivo")
+        super().__init__(tipo_contenido)
+
+        self._max_en_memoria: int = max_en_memoria
+        self._directorio: str | None = directorio
+        self._archivo: BinaryIO | None = None
+        self._bytes_volcados: int = 0
+        self._cantidad_volcada: int = 0
+
+    # --- Contenido ---
+
+    def add_item(self, item: T) -> None:
+        """Añade un servicio; si el buffer se llena, se vuelca a disco."""
+        self._contenido.append(item)
+        if len(self._contenido) >= self._max_en_memoria:
+            self._volcar()
+
+    def add_items(self, items: Iterable[T]) -> None:
+        """Añade una lista (o iterable) de servicios, volcando a medida que hace falta."""
+        for item in items:
+            self.add_item(item)
+
+    def get_cantidad(self) -> int:
+        """Obtiene la cantidad de servicios en el snapshot (O(1))."""
+        return self._cantidad_volcada + len(self._contenido)
+
+    def get_contenido(self) -> List[T]:
+        """
+        Obtiene TODOS los servicios en una lista nueva.
+        Para snapshots grandes conviene usar iterar_contenido.
+        """
+        return list(self.iterar_contenido())
+
+    def iterar_contenido(self) -> Iterator[T]:
+        """
+        Recorre los servicios (primero los volcados, luego el buffer),
+        leyendo un bloque por vez.
+
+        Raises:
+            InfraPersistenciaException: Si un bloque del archivo temporal no se puede leer.
+        """
+        desplazamiento = 0
+        while self._archivo is not None and desplazamiento < self._bytes_volcados:
+            bloque, desplazamiento = self._leer_bloque(self._archivo, desplazamiento,
+                                                       self._get_nombre_temporal())
+            yield from bloque
+        yield from list(self._contenido)
+
+    def get_cantidad_en_memoria(self) -> int:
+        """Obtiene la cantidad de servicios en el buffer (aun no volcados)."""
+        return len(self._contenido)
+
+    def get_bytes_volcados(self) -> int:
+        """Obtiene los bytes escritos en el archivo temporal."""
+        return self._bytes_volcados
+
+    # --- Archivo ---
+
+    def archivar(self, path: str) -> str:
+        """
+        Escribe el snapshot completo en un archivo (escritura atomica),
+        copiando los bloques ya volcados sin deserializarlos.
+
+        Args:
+            path (str): El path destino (ej. "data/webapps.snap").
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de IO o Pickle.
+
+        Returns:
+            str: El path escrito.
+        """
+        path_temporal = path + C.EXTENSION_TEMPORAL
+        try:
+            cabecera = pickle.dumps({"tipo": self._tipo_contenido, "cantidad": self.get_cantidad()},
+                                    protocol=pickle.HIGHEST_PROTOCOL)
+            buffer = pickle.dumps(self._contenido, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, AttributeError, TypeError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_PICKLE.format(path) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_PICKLE,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path_temporal, 'wb') as destino:
+                destino.write(_FIRMA_ARCHIVO)
+                destino.write(_CABECERA_BLOQUE.pack(1, len(cabecera)))
+                destino.write(cabecera)
+                if self._archivo is not None:
+                    self._archivo.seek(0)
+                    shutil.copyfileobj(self._archivo, destino)
+                if self._contenido:
+                    destino.write(_CABECERA_BLOQUE.pack(len(self._contenido), len(buffer)))
+                    destino.write(buffer)
+            os.replace(path_temporal, path)
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(path) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_IO,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        return path
+
+    @classmethod
+    def cargar(cls,
+               path: str,
+               max_en_memoria: int = C.SNAPSHOT_MAX_EN_MEMORIA,
+               directorio: str | None = None) -> 'SnapshotEnDisco':
+        """
+        Reabre un snapshot archivado. Los bloques se copian a un archivo
+        temporal nuevo y se validan por su cabecera (sin deserializarlos).
+
+        Args:
+            path (str): El path del archivo escrito por 'archivar'.
+            max_en_memoria (int, optional): Tamaño maximo del buffer en memoria.
+            directorio (str | None, optional): Directorio del archivo temporal.
+
+        Raises:
+            InfraPersistenciaException: Si el archivo no existe o no es un snapshot valido.
+
+        Returns:
+            SnapshotEnDisco: El snapshot, listo para iterar o seguir agregando.
+        """
+        try:
+            with open(path, 'rb') as origen:
+                if origen.read(len(_FIRMA_ARCHIVO)) != _FIRMA_ARCHIVO:
+                    cls._lanzar_formato_invalido(path)
+                cabecera, _ = cls._leer_bloque(origen, len(_FIRMA_ARCHIVO), path)
+                if not isinstance(cabecera, dict) or "tipo" not in cabecera:
+                    cls._lanzar_formato_invalido(path)
+
+                snapshot = cls(cabecera["tipo"], max_en_memoria, directorio)
+                inicio = origen.tell()
+                archivo = snapshot._crear_archivo_temporal()
+                shutil.copyfileobj(origen, archivo)
+        except FileNotFoundError:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_NO_EXISTE.format(path),
+                mensaje_usuario=MSG.USR_LEER_NO_EXISTE,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_OTRO.format(path) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_OTRO,
+                nombre_archivo=path,
+                tipo_operacion=TipoOperacion.LEER
+            )
+
+        # Validar los bloques recorriendo solo sus cabeceras
+        tamano = archivo.tell()
+        desplazamiento = 0
+        cantidad = 0
+        while desplazamiento < tamano:
+            archivo.seek(desplazamiento)
+            datos = archivo.read(_CABECERA_BLOQUE.size)
+            if len(datos) < _CABECERA_BLOQUE.size:
+                snapshot.cerrar()
+                cls._lanzar_formato_invalido(path)
+            items, longitud = _CABECERA_BLOQUE.unpack(datos)
+            cantidad += items
+            desplazamiento += _CABECERA_BLOQUE.size + longitud
+        if desplazamiento != tamano or cantidad != cabecera.get("cantidad"):
+            snapshot.cerrar()
+            cls._lanzar_formato_invalido(path)
+
+        snapshot._bytes_volcados = tamano
+        snapshot._cantidad_volcada = cantidad
+        print(f"Snapshot cargado desde {path} ({cantidad} servicios, {inicio + tamano} bytes).")
+        return snapshot
+
+    def cerrar(self) -> None:
+        """Cierra (y borra) el archivo temporal y vacia el snapshot."""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        self._contenido = []
+        self._bytes_volcados = 0
+        self._cantidad_volcada = 0
+
+    def __enter__(self) -> 'SnapshotEnDisco':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.cerrar()
+
+    # --- Helpers privados ---
+
+    def _volcar(self) -> None:
+        """
+        Escribe el buffer como un bloque al final del archivo temporal.
+
+        Raises:
+            InfraPersistenciaException: Si ocurre un error de IO o Pickle.
+        """
+        if not self._contenido:
+            return
+        try:
+            datos = pickle.dumps(self._contenido, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, AttributeError, TypeError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_PICKLE.format(self._get_nombre_temporal()) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_PICKLE,
+                nombre_archivo=self._get_nombre_temporal(),
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        try:
+            archivo = self._archivo if self._archivo is not None else self._crear_archivo_temporal()
+            archivo.seek(self._bytes_volcados)
+            archivo.write(_CABECERA_BLOQUE.pack(len(self._contenido), len(datos)))
+            archivo.write(datos)
+        except OSError as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_ESCRIBIR_IO.format(self._get_nombre_temporal()) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_ESCRIBIR_IO,
+                nombre_archivo=self._get_nombre_temporal(),
+                tipo_operacion=TipoOperacion.ESCRIBIR
+            )
+        self._bytes_volcados += _CABECERA_BLOQUE.size + len(datos)
+        self._cantidad_volcada += len(self._contenido)
+        self._contenido = []
+
+    def _crear_archivo_temporal(self) -> BinaryIO:
+        """Crea el archivo temporal de volcado."""
+        self._archivo = tempfile.TemporaryFile(dir=self._directorio, suffix=C.EXTENSION_SNAPSHOT)
+        return self._archivo
+
+    def _get_nombre_temporal(self) -> str:
+        """Nombre legible del archivo temporal (para los mensajes de error)."""
+        return f"<snapshot {self._id_snapshot} en disco>"
+
+    @classmethod
+    def _leer_bloque(cls, archivo: BinaryIO, desplazamiento: int, nombre: str) -> Tuple[object, int]:
+        """
+        Lee el bloque que empieza en 'desplazamiento'.
+
+        Returns:
+            Tuple[object, int]: El contenido del bloque y el desplazamiento siguiente.
+        """
+        archivo.seek(desplazamiento)
+        cabecera = archivo.read(_CABECERA_BLOQUE.size)
+        if len(cabecera) < _CABECERA_BLOQUE.size:
+            cls._lanzar_formato_invalido(nombre)
+        _, longitud = _CABECERA_BLOQUE.unpack(cabecera)
+        datos = archivo.read(longitud)
+        if len(datos) < longitud:
+            cls._lanzar_formato_invalido(nombre)
+        try:
+            contenido = pickle.loads(datos)
+        except (pickle.UnpicklingError, EOFError, ImportError, AttributeError) as e:
+            raise InfraPersistenciaException(
+                mensaje_tecnico=MSG.TEC_LEER_CORRUPTO.format(nombre) + f" | Error: {e}",
+                mensaje_usuario=MSG.USR_LEER_CORRUPTO,
+                nombre_archivo=nombre,
+                tipo_operacion=TipoOperacion.LEER
+            )
+        return contenido, desplazamiento + _CABECERA_BLOQUE.size + longitud
+
+    @staticmethod
+    def _lanzar_formato_invalido(nombre: str) -> None:
+        """Lanza la excepcion de formato invalido."""
+        raise InfraPersistenciaException(
+            mensaje_tecnico=MSG.TEC_SNAPSHOT_FORMATO.format(nombre),
+            mensaje_usuario=MSG.USR_SNAPSHOT_FORMATO,
+            nombre_archivo=nombre,
+            tipo_operacion=TipoOperacion.LEER
+        )